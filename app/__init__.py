@@ -2,8 +2,10 @@ from flask import Flask, jsonify, render_template, session
 
 from app.routes import officer_role_routes
 from .database import init_db
+from .metrics import init_metrics
+from .profiler import init_profiler
 from .utils.errors import AppError
-from .routes import user_routes, organization_routes, event_routes, announcement_routes, membership_routes, officer_role_routes, web_routes
+from .routes import user_routes, organization_routes, event_routes, announcement_routes, membership_routes, officer_role_routes, web_routes, health_routes, upload_routes, metrics_routes, profile_routes
 
 def create_app(config: dict = None):
     app = Flask(__name__)
@@ -28,7 +30,16 @@ def create_app(config: dict = None):
     logging.getLogger('campus_hub').handlers = app.logger.handlers
     logging.getLogger('campus_hub').setLevel(app.logger.level)
 
+    # reject oversized upload requests before the form is parsed
+    if app.config.get('MAX_CONTENT_LENGTH') is None:
+        from .services.upload_store import DEFAULT_UPLOAD_SETTINGS
+        max_request = app.config.get('UPLOAD_MAX_REQUEST_BYTES') or DEFAULT_UPLOAD_SETTINGS['UPLOAD_MAX_REQUEST_BYTES']
+        app.config['MAX_CONTENT_LENGTH'] = max_request + 1024 * 1024  # headroom for the other form fields
+
     init_db(app)
+    init_metrics(app)
+    # opt-in (PROFILER_ENABLED); unsampled requests stay on the fast path
+    init_profiler(app)
 
     app.register_blueprint(user_routes.bp)
     app.register_blueprint(organization_routes.bp)
@@ -37,6 +48,10 @@ def create_app(config: dict = None):
     app.register_blueprint(membership_routes.bp)
     app.register_blueprint(officer_role_routes.bp)
     app.register_blueprint(web_routes.bp)
+    app.register_blueprint(health_routes.bp)
+    app.register_blueprint(upload_routes.bp)
+    app.register_blueprint(metrics_routes.bp)
+    app.register_blueprint(profile_routes.bp)
 
     # Inject current_user into templates
     @app.context_processor
@@ -54,7 +69,11 @@ def create_app(config: dict = None):
 
     @app.errorhandler(AppError)
     def handle_app_error(e):
-        return jsonify({'code': e.code, 'error': e.message}), 400
+        response = jsonify({'code': e.code, 'error': e.message})
+        response.status_code = e.status
+        if e.retry_after is not None:
+            response.headers['Retry-After'] = str(int(e.retry_after))
+        return response
 
     @app.errorhandler(Exception)
     def handle_general_error(e):
@@ -1,189 +1,341 @@
 import sqlite3
 import os
+import queue
+import threading
+import time
+from urllib.parse import quote
 from flask import g, current_app
 
-def get_db():
-    if 'db' not in g:
+from .utils.errors import AppError
+from .metrics import InstrumentedConnection
+
+# Defaults for the connection manager. Each can be overridden through the
+# Flask config (e.g. create_app({'DB_POOL_SIZE': 4})).
+DEFAULT_DB_SETTINGS = {
+    'DB_POOL_SIZE': 8,             # max read-write connections per database file
+    'DB_READ_POOL_SIZE': 16,       # max read-only connections per database file
+    'DB_POOL_TIMEOUT': 30.0,       # seconds to wait for a free connection
+    'DB_BUSY_TIMEOUT': 30.0,       # seconds sqlite waits on a locked database
+    'DB_JOURNAL_MODE': 'WAL',
+    'DB_SYNCHRONOUS': 'NORMAL',
+    'DB_CACHE_SIZE': -16000,       # negative = KiB, so roughly 16 MB of page cache
+    'DB_MMAP_SIZE': 256 * 1024 * 1024,
+    'DB_MIGRATION_BACKUP': True,   # online backup of an existing database before migrating it
+    'DB_MIGRATION_BACKUP_DIR': None,  # default: <instance_path>/backups
+    'DB_INSTRUMENT': True,         # count and time statements per request (app/metrics.py)
+}
+
+# seconds clients are told to wait (Retry-After) when the pool is exhausted
+POOL_RETRY_AFTER = 1
+
+
+def _setting(name):
+    try:
+        value = current_app.config.get(name)
+    except Exception:
+        value = None
+    return DEFAULT_DB_SETTINGS[name] if value is None else value
+
+
+def _resolve_db_path():
+    db_path = None
+    try:
+        # prefer Flask app config if available
+        db_path = current_app.config.get('DATABASE')
+    except Exception:
         db_path = None
-        try:
-            # prefer Flask app config if available
-            db_path = current_app.config.get('DATABASE')
-        except Exception:
-            db_path = None
-        if not db_path:
-            db_path = os.environ.get('DATABASE') or 'campus_hub.db'
-        g.db = sqlite3.connect(db_path, detect_types=sqlite3.PARSE_DECLTYPES)
-        g.db.row_factory = sqlite3.Row
+    if not db_path:
+        db_path = os.environ.get('DATABASE') or 'campus_hub.db'
+    return db_path
+
+
+class ConnectionPool:
+    """Bounded pool of sqlite3 connections for one database file.
+
+    Connections are created lazily up to ``size`` and handed out with
+    checkout()/checkin(). Read-write pools switch the database to WAL so that
+    the read-only pool's connections never block behind a writer's commit.
+    """
+
+    def __init__(self, db_path, readonly=False, size=8, timeout=30.0, busy_timeout=30.0,
+                 journal_mode='WAL', synchronous='NORMAL', cache_size=-16000, mmap_size=0, instrument=False):
+        self.db_path = db_path
+        self.readonly = readonly
+        self.size = max(1, int(size))
+        self.timeout = timeout
+        self.busy_timeout = busy_timeout
+        self.journal_mode = journal_mode
+        self.synchronous = synchronous
+        self.cache_size = cache_size
+        self.mmap_size = mmap_size
+        self.factory = InstrumentedConnection if instrument else sqlite3.Connection
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._in_use = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_time = 0.0
+        self._max_wait = 0.0
+        self._timeouts = 0
+
+    def _connect(self):
+        if self.readonly:
+            uri = 'file:' + quote(os.path.abspath(self.db_path)) + '?mode=ro'
+            conn = sqlite3.connect(uri, uri=True, timeout=self.busy_timeout, factory=self.factory,
+                                   detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False)
+        else:
+            conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout, factory=self.factory,
+                                   detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
         try:
             # Ensure SQLite enforces foreign key constraints (ON DELETE CASCADE)
-            g.db.execute('PRAGMA foreign_keys = ON')
-        except Exception:
-            # Not critical; continue without failing app startup
+            conn.execute('PRAGMA foreign_keys = ON')
+            if self.readonly:
+                conn.execute('PRAGMA query_only = ON')
+            elif self.journal_mode:
+                # journal_mode is persistent in the file; readers inherit it
+                conn.execute(f'PRAGMA journal_mode = {self.journal_mode}')
+            if self.synchronous:
+                conn.execute(f'PRAGMA synchronous = {self.synchronous}')
+            if self.cache_size:
+                conn.execute(f'PRAGMA cache_size = {int(self.cache_size)}')
+            if self.mmap_size:
+                conn.execute(f'PRAGMA mmap_size = {int(self.mmap_size)}')
+        except sqlite3.DatabaseError:
+            # Tuning is not critical; continue with SQLite defaults
             pass
+        return conn
+
+    def checkout(self):
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = None
+        waited = 0.0
+        if conn is None:
+            create = False
+            with self._lock:
+                if self._created < self.size:
+                    self._created += 1
+                    create = True
+            if create:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            else:
+                start = time.perf_counter()
+                try:
+                    conn = self._idle.get(timeout=self.timeout)
+                except queue.Empty:
+                    with self._lock:
+                        self._timeouts += 1
+                    # overload, not a bad request: tell clients and load balancers to retry
+                    raise AppError('DB_POOL_EXHAUSTED', 'Timed out waiting for a database connection',
+                                   status=503, retry_after=POOL_RETRY_AFTER)
+                waited = time.perf_counter() - start
+        with self._lock:
+            self._checkouts += 1
+            self._in_use += 1
+            if waited:
+                self._waits += 1
+                self._wait_time += waited
+                self._max_wait = max(self._max_wait, waited)
+        return conn
+
+    def checkin(self, conn):
+        try:
+            if conn.in_transaction:
+                # never hand a half-finished transaction to the next request
+                conn.rollback()
+        except sqlite3.Error:
+            # broken connection: drop it so a fresh one is created next time
+            try:
+                conn.close()
+            except Exception:
+                pass
+            with self._lock:
+                self._in_use -= 1
+                self._created -= 1
+            return
+        with self._lock:
+            self._in_use -= 1
+        self._idle.put(conn)
+
+    def close_all(self):
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                conn.close()
+            except Exception:
+                pass
+            with self._lock:
+                self._created -= 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'database': self.db_path,
+                'mode': 'ro' if self.readonly else 'rw',
+                'size': self.size,
+                'created': self._created,
+                'in_use': self._in_use,
+                'idle': self._idle.qsize(),
+                'checkouts': self._checkouts,
+                'waits': self._waits,
+                'wait_time_seconds': self._wait_time,
+                'max_wait_seconds': self._max_wait,
+                'timeouts': self._timeouts,
+            }
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path, readonly=False):
+    """Return (creating on first use) the pool for a database file and mode."""
+    key = (os.path.abspath(db_path) if db_path != ':memory:' else db_path, readonly)
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = ConnectionPool(
+                    db_path,
+                    readonly=readonly,
+                    size=_setting('DB_READ_POOL_SIZE' if readonly else 'DB_POOL_SIZE'),
+                    timeout=_setting('DB_POOL_TIMEOUT'),
+                    busy_timeout=_setting('DB_BUSY_TIMEOUT'),
+                    journal_mode=_setting('DB_JOURNAL_MODE'),
+                    synchronous=_setting('DB_SYNCHRONOUS'),
+                    cache_size=_setting('DB_CACHE_SIZE'),
+                    mmap_size=_setting('DB_MMAP_SIZE'),
+                    instrument=_setting('DB_INSTRUMENT'),
+                )
+                _pools[key] = pool
+    return pool
+
+
+def pool_stats():
+    """Return a list of metric dicts, one per connection pool."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    return [p.stats() for p in pools]
+
+
+def close_pools(db_path=None):
+    """Close idle pooled connections (all pools, or only those for db_path).
+
+    Also stops the matching write queue threads (app/write_queue.py), which
+    hold a connection of their own.
+    """
+    from .write_queue import close_write_queues
+    close_write_queues(db_path)
+    target = os.path.abspath(db_path) if db_path else None
+    with _pools_lock:
+        keys = [k for k in _pools if target is None or k[0] == target]
+        pools = [_pools.pop(k) for k in keys]
+    for pool in pools:
+        pool.close_all()
+
+
+def get_db():
+    """Return the request's read-write connection (checked out from the pool)."""
+    if 'db' not in g:
+        pool = get_pool(_resolve_db_path())
+        g.db = pool.checkout()
+        g._db_pool = pool
     return g.db
 
+
+def get_read_db():
+    """Return a read-only connection for queries that never write.
+
+    Falls back to the read-write connection for in-memory databases (which
+    cannot be shared between connections) or when the file cannot be opened
+    read-only yet (e.g. before init_db has created it).
+    """
+    if 'read_db' not in g:
+        db_path = _resolve_db_path()
+        if db_path == ':memory:' or not os.path.exists(db_path):
+            return get_db()
+        pool = get_pool(db_path, readonly=True)
+        try:
+            g.read_db = pool.checkout()
+        except sqlite3.Error as e:
+            current_app.logger.debug('Read-only connection unavailable, using read-write: %s', e)
+            return get_db()
+        g._read_db_pool = pool
+    return g.read_db
+
 def close_db(e=None):
     db = g.pop('db', None)
-    if db is not None:
-        db.close()
+    pool = g.pop('_db_pool', None)
+    if db is not None and pool is not None:
+        pool.checkin(db)
+    read_db = g.pop('read_db', None)
+    read_pool = g.pop('_read_db_pool', None)
+    if read_db is not None and read_pool is not None:
+        read_pool.checkin(read_db)
 
 def init_db(app):
+    """Bring the database schema up to date and kick off seeding of a new database.
+
+    When PRAGMA user_version already matches the latest migration this is a
+    header read plus one seed_state lookup: no schema DDL, no table counts
+    and no CSV work, which keeps every forked worker's startup cheap.
+    """
     with app.app_context():
         db = get_db()
-        # Prefer using the provided SQL schema (database/schema_v1.sql) so the
-        # table/column names match the CSV files and model classes.
-        try:
-            schema_path = os.path.abspath(os.path.join(app.root_path, '..', 'database', 'schema_v1.sql'))
-            if os.path.exists(schema_path):
-                with open(schema_path, 'r', encoding='utf-8') as f:
-                    sql = f.read()
-                # Make CREATE TABLE statements idempotent
-                sql = sql.replace('\nCREATE TABLE ', '\nCREATE TABLE IF NOT EXISTS ')
-                db.executescript(sql)
-            else:
-                # Fallback: create a minimal set of tables if the schema file is missing
-                cursor = db.cursor()
-                cursor.execute('''
-                CREATE TABLE IF NOT EXISTS users (
-                    UserID INTEGER PRIMARY KEY AUTOINCREMENT,
-                    FirstName TEXT,
-                    LastName TEXT,
-                    Email TEXT UNIQUE
-                )
-                ''')
-                cursor.execute('''
-                CREATE TABLE IF NOT EXISTS organizations (
-                    OrgID INTEGER PRIMARY KEY AUTOINCREMENT,
-                    OrgName TEXT,
-                    OrgDescription TEXT
-                )
-                ''')
-                cursor.execute('''
-                CREATE TABLE IF NOT EXISTS memberships (
-                    MembershipID INTEGER PRIMARY KEY AUTOINCREMENT,
-                    UserID INTEGER,
-                    OrgID INTEGER,
-                    Status TEXT
-                )
-                ''')
-                cursor.execute('''
-                CREATE TABLE IF NOT EXISTS officer_roles (
-                    OfficerRoleID INTEGER PRIMARY KEY AUTOINCREMENT,
-                    MembershipID INTEGER,
-                    RoleName TEXT,
-                    RoleStart DATETIME,
-                    RoleEnd DATETIME
-                )
-                ''')
-                cursor.execute('''
-                CREATE TABLE IF NOT EXISTS events (
-                    EventID INTEGER PRIMARY KEY AUTOINCREMENT,
-                    OrgID INTEGER,
-                    CreatedBy INTEGER,
-                    EventName TEXT,
-                    EventDescription TEXT,
-                    EventDate TEXT,
-                    Location TEXT
-                )
-                ''')
-                cursor.execute('''
-                CREATE TABLE IF NOT EXISTS announcements (
-                    AnnouncementID INTEGER PRIMARY KEY AUTOINCREMENT,
-                    OrgID INTEGER,
-                    CreatedBy INTEGER,
-                    Title TEXT,
-                    Content TEXT,
-                    DatePosted TEXT
-                )
-                ''')
-                db.commit()
-        except Exception as e:
-            # If schema application fails, continue — app startup shouldn't be blocked
-            # but log the problem so the developer can diagnose schema issues
-            try:
-                app.logger.exception('Failed to apply SQL schema during init_db')
-            except Exception:
-                # app.logger may not be available in some contexts; fall back to printing
-                import traceback; traceback.print_exc()
-        # Attempt to seed data from CSV files in the repository's data/ folder
-        # Import service modules here to avoid circular imports at module import time
-        # Allow skipping automatic seeding by setting SKIP_AUTO_SEED in the environment
-        if os.environ.get('SKIP_AUTO_SEED') is None:
-            try:
-                data_dir = os.path.abspath(os.path.join(app.root_path, '..', 'data'))
-
-                # Lazy imports to avoid circular import issues
-                from .services.organization_service import OrgService
-                from .services.user_service import UserService
-                from .services.event_service import EventService
-                from .services.announcement_service import AnnouncementService
-                from .services.membership_service import MembershipService
-                from .services.officer_role_service import OfficerRoleService
-
-                def table_count(table_name):
-                    try:
-                        row = db.execute(f"SELECT COUNT(*) as cnt FROM {table_name}").fetchone()
-                        return int(row['cnt']) if row is not None else 0
-                    except Exception as e:
-                        try:
-                            app.logger.debug('table_count error for %s: %s', table_name, e)
-                        except Exception:
-                            pass
-                        return 0
-
-                # Only import when the table is empty and the CSV file exists
-                if table_count('organizations') == 0:
-                    org_csv = os.path.join(data_dir, 'organizations.csv')
-                    if os.path.exists(org_csv):
-                        try:
-                            OrgService.import_organizations_from_csv(org_csv)
-                        except Exception as e:
-                            app.logger.exception('Failed to import organizations from CSV')
-
-                if table_count('users') == 0:
-                    users_csv = os.path.join(data_dir, 'users.csv')
-                    if os.path.exists(users_csv):
-                        try:
-                            UserService.import_users_from_csv(users_csv)
-                        except Exception as e:
-                            app.logger.exception('Failed to import users from CSV')
-
-                if table_count('events') == 0:
-                    events_csv = os.path.join(data_dir, 'events.csv')
-                    if os.path.exists(events_csv):
-                        try:
-                            EventService.import_events_from_csv(events_csv)
-                        except Exception as e:
-                            app.logger.exception('Failed to import events from CSV')
-
-                if table_count('announcements') == 0:
-                    ann_csv = os.path.join(data_dir, 'announcements.csv')
-                    if os.path.exists(ann_csv):
-                        try:
-                            AnnouncementService.import_announcements_from_csv(ann_csv)
-                        except Exception as e:
-                            app.logger.exception('Failed to import announcements from CSV')
-
-                if table_count('memberships') == 0:
-                    mem_csv = os.path.join(data_dir, 'membership.csv')
-                    if os.path.exists(mem_csv):
-                        try:
-                            MembershipService.import_memberships_from_csv(mem_csv)
-                        except Exception as e:
-                            app.logger.exception('Failed to import memberships from CSV')
-
-                if table_count('officer_roles') == 0:
-                    officers_csv = os.path.join(data_dir, 'officer_roles.csv')
-                    if os.path.exists(officers_csv):
-                        try:
-                            OfficerRoleService.import_officer_roles_from_csv(officers_csv)
-                        except Exception as e:
-                            app.logger.exception('Failed to import officer_roles from CSV')
-            except Exception as e:
-                try:
-                    app.logger.exception('Automatic seeding failed during init_db')
-                except Exception:
-                    import traceback; traceback.print_exc()
-
+        _apply_migrations(app, db)
+        _auto_seed(app, db)
         app.teardown_appcontext(close_db)
 
+
+def _apply_migrations(app, db):
+    """Run pending migrations; returns True if any were pending."""
+    from . import migrations
+    try:
+        version = migrations.get_version(db)
+        latest = migrations.latest_version()
+        if version >= latest:
+            if version > latest:
+                app.logger.warning('Database schema version %s is newer than this code (%s)', version, latest)
+            return False
+        db_path = _resolve_db_path()
+        # a database with tables but an old version holds data worth keeping
+        if _setting('DB_MIGRATION_BACKUP') and db_path != ':memory:' and migrations.has_tables(db):
+            backup_dir = _setting('DB_MIGRATION_BACKUP_DIR') or os.path.join(app.instance_path, 'backups')
+            path = migrations.backup_database(db, migrations.default_backup_path(db_path, version, backup_dir))
+            app.logger.info('Backed up database to %s before migrating', path)
+        migrations.migrate(db, logger=app.logger)
+    except Exception:
+        # If schema migration fails, continue — app startup shouldn't be blocked
+        # but log the problem so the developer can diagnose schema issues
+        app.logger.exception('Failed to migrate database schema during init_db')
+    return True
+
+
+def _auto_seed(app, db):
+    """Hand CSV seeding to SeedService if this database still needs it.
+
+    SEED_MODE: 'background' (default) seeds on a daemon thread so create_app
+    returns immediately; 'sync' (default under TESTING) seeds before
+    returning; 'off' disables it, as does the SKIP_AUTO_SEED environment variable.
+    """
+    mode = app.config.get('SEED_MODE') or ('sync' if app.testing else 'background')
+    if mode == 'off' or os.environ.get('SKIP_AUTO_SEED') is not None:
+        return
+    from .services.seed_service import SeedService
+    try:
+        if SeedService.needs_seeding(db):
+            SeedService.start(app, background=(mode != 'sync'))
+    except Exception:
+        app.logger.exception('Automatic seeding failed during init_db')
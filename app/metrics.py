@@ -0,0 +1,447 @@
+"""Request instrumentation: latency histograms, SQL accounting, Server-Timing.
+
+init_metrics(app) installs request hooks that time every request and
+record, per endpoint:
+  - request latency (histogram) and responses by status code;
+  - the number of SQL statements and the time spent in SQLite;
+  - template render time, per template (Flask's template signals).
+Pooled connections are created with InstrumentedConnection (see
+app/database.py), which reports each statement to the current request. The
+numbers are served in Prometheus text format at /metrics, only when
+METRICS_TOKEN is set and the scraper sends it as a bearer token. Each response
+also carries a Server-Timing header (app, db, tpl), which browser dev tools
+show next to the request.
+
+Metrics are kept per process. With several worker processes, each scrape
+sees one worker only, as with any in-process Prometheus client.
+"""
+
+import contextvars
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from flask import current_app, g, request, before_render_template, template_rendered
+from .query_log import repeat_threshold, report_repeats, report_slow, slow_threshold, statement_shape
+
+DEFAULT_METRICS_SETTINGS = {
+    'METRICS_ENABLED': True,
+    'SERVER_TIMING': True,
+    'METRICS_TOKEN': None,      # /metrics is served only when set (Authorization: Bearer <token>)
+}
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 250, 500)
+PREFIX = 'campus_hub'
+INF_LABEL = 'le="+Inf"'
+
+# stats of the request running in this context; None outside requests (seeding, workers, scripts)
+_current = contextvars.ContextVar('campus_hub_request_stats', default=None)
+
+
+def _setting(name):
+    value = current_app.config.get(name)
+    return DEFAULT_METRICS_SETTINGS[name] if value is None else value
+
+
+class RequestStats:
+    """Statement accounting for one tracked scope (a request or a track_queries() block)."""
+    __slots__ = ('scope', 'start', 'queries', 'sql_time', 'template_time', '_template_starts',
+                 'slow_threshold', 'repeat_threshold', 'shapes', 'slow_queries', 'repeated_queries')
+
+    def __init__(self, scope=None):
+        self.scope = scope
+        self.start = time.perf_counter()
+        self.queries = 0
+        self.sql_time = 0.0
+        self.template_time = 0.0
+        self._template_starts = []
+        # read once per scope; see app/query_log.py
+        self.slow_threshold = slow_threshold()
+        self.repeat_threshold = repeat_threshold()
+        self.shapes = {}            # statement shape -> [count, seconds, example sql]
+        self.slow_queries = 0
+        self.repeated_queries = []
+
+
+def current_stats():
+    return _current.get()
+
+
+def _record_statement(stats, cursor, sql, parameters, elapsed):
+    stats.queries += 1
+    stats.sql_time += elapsed
+    if stats.repeat_threshold:
+        shape = statement_shape(sql)
+        entry = stats.shapes.get(shape)
+        if entry is None:
+            stats.shapes[shape] = [1, elapsed, sql]
+        else:
+            entry[0] += 1
+            entry[1] += elapsed
+    if stats.slow_threshold is not None:
+        cursor._statement = (sql, parameters)
+        cursor._elapsed = elapsed
+        if elapsed >= stats.slow_threshold:
+            _report_slow(stats, cursor)
+
+
+def _record_fetch(stats, cursor, elapsed):
+    # time spent in SQLite, but not a new statement; may push the cursor's statement over the slow threshold
+    stats.sql_time += elapsed
+    if stats.slow_threshold is not None and cursor._statement is not None:
+        before = cursor._elapsed
+        cursor._elapsed = before + elapsed
+        if before < stats.slow_threshold <= cursor._elapsed:
+            _report_slow(stats, cursor)
+
+
+def _report_slow(stats, cursor):
+    sql, parameters = cursor._statement
+    stats.slow_queries += 1
+    try:
+        report_slow(cursor.connection, sql, parameters, cursor._elapsed, stats.scope)
+    except Exception:
+        # diagnostics must never break the query that triggered them
+        current_app.logger.exception('Could not record slow query')
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    __slots__ = ('_statement', '_elapsed')
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self._statement = None
+        self._elapsed = 0.0
+
+    def execute(self, sql, parameters=()):
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            stats = _current.get()
+            if stats is not None:
+                _record_statement(stats, self, sql, parameters, time.perf_counter() - start)
+
+    def executemany(self, sql, seq_of_parameters):
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            stats = _current.get()
+            if stats is not None:
+                _record_statement(stats, self, sql, None, time.perf_counter() - start)
+
+    def executescript(self, sql_script):
+        start = time.perf_counter()
+        try:
+            return super().executescript(sql_script)
+        finally:
+            stats = _current.get()
+            if stats is not None:
+                _record_statement(stats, self, sql_script, None, time.perf_counter() - start)
+
+    # sqlite computes rows lazily, so most of a SELECT's cost lands in the fetch
+    def fetchone(self):
+        start = time.perf_counter()
+        try:
+            return super().fetchone()
+        finally:
+            stats = _current.get()
+            if stats is not None:
+                _record_fetch(stats, self, time.perf_counter() - start)
+
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        try:
+            return super().fetchmany(self.arraysize if size is None else size)
+        finally:
+            stats = _current.get()
+            if stats is not None:
+                _record_fetch(stats, self, time.perf_counter() - start)
+
+    def fetchall(self):
+        start = time.perf_counter()
+        try:
+            return super().fetchall()
+        finally:
+            stats = _current.get()
+            if stats is not None:
+                _record_fetch(stats, self, time.perf_counter() - start)
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """sqlite3 connection whose statements are counted and timed for the current request."""
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    # the C shortcuts bypass Cursor.execute, so route them through an instrumented cursor
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+    def commit(self):
+        start = time.perf_counter()
+        try:
+            return super().commit()
+        finally:
+            stats = _current.get()
+            if stats is not None:
+                stats.sql_time += time.perf_counter() - start
+
+
+def finish_scope(stats):
+    """Write repeated_query findings for a finished scope."""
+    if stats.repeat_threshold and stats.shapes:
+        try:
+            stats.repeated_queries = report_repeats(stats.shapes, stats.repeat_threshold, stats.scope)
+        except Exception:
+            current_app.logger.exception('Could not record repeated queries')
+    return stats
+
+
+@contextmanager
+def track_queries(scope):
+    """Count statements (and log slow / repeated ones) outside a request, e.g. in scripts:
+
+        with track_queries('import_users') as stats:
+            UserService.import_users_from_csv(path)
+    """
+    stats = RequestStats(scope)
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+        finish_scope(stats)
+
+
+class Histogram:
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values, extra=None):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value):
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class MetricsRegistry:
+    """Thread-safe in-process store for the counters and histograms served at /metrics."""
+
+    # name -> (type, help, label names, buckets)
+    SPECS = {
+        'http_requests_total': ('counter', 'HTTP responses by endpoint, method and status.', ('endpoint', 'method', 'status'), None),
+        'http_request_duration_seconds': ('histogram', 'Request latency by endpoint.', ('endpoint', 'method'), LATENCY_BUCKETS),
+        'sql_queries_per_request': ('histogram', 'SQL statements executed per request.', ('endpoint',), QUERY_COUNT_BUCKETS),
+        'sql_duration_seconds': ('histogram', 'Time spent in SQLite per request.', ('endpoint',), LATENCY_BUCKETS),
+        'sql_queries_total': ('counter', 'SQL statements executed by requests.', ('endpoint',), None),
+        'template_render_seconds': ('histogram', 'Template render time.', ('template',), LATENCY_BUCKETS),
+        'slow_queries_total': ('counter', 'Statements over DB_SLOW_QUERY_MS (see app/query_log.py).', ('endpoint',), None),
+        'repeated_queries_total': ('counter', 'Statement shapes run more than DB_REPEAT_QUERY_THRESHOLD times in one request.', ('endpoint',), None),
+    }
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {name: {} for name in self.SPECS}
+
+    def _observe(self, name, labels, value):
+        series = self._values[name]
+        hist = series.get(labels)
+        if hist is None:
+            hist = series[labels] = Histogram(self.SPECS[name][3])
+        hist.observe(value)
+
+    def observe(self, name, labels, value):
+        with self._lock:
+            self._observe(name, labels, value)
+
+    def observe_request(self, endpoint, method, status, stats, elapsed):
+        """Record one finished request (one lock round trip for all of its series)."""
+        with self._lock:
+            key = (endpoint, method, str(status))
+            counter = self._values['http_requests_total']
+            counter[key] = counter.get(key, 0) + 1
+            counter = self._values['sql_queries_total']
+            counter[(endpoint,)] = counter.get((endpoint,), 0) + stats.queries
+            if stats.slow_queries:
+                counter = self._values['slow_queries_total']
+                counter[(endpoint,)] = counter.get((endpoint,), 0) + stats.slow_queries
+            if stats.repeated_queries:
+                counter = self._values['repeated_queries_total']
+                counter[(endpoint,)] = counter.get((endpoint,), 0) + len(stats.repeated_queries)
+            self._observe('http_request_duration_seconds', (endpoint, method), elapsed)
+            self._observe('sql_queries_per_request', (endpoint,), stats.queries)
+            self._observe('sql_duration_seconds', (endpoint,), stats.sql_time)
+
+    def reset(self):
+        with self._lock:
+            self._values = {name: {} for name in self.SPECS}
+
+    def render(self):
+        """Prometheus text exposition (format 0.0.4)."""
+        lines = []
+        with self._lock:
+            for name, (kind, help_text, label_names, _) in self.SPECS.items():
+                full = f'{PREFIX}_{name}'
+                lines.append(f'# HELP {full} {help_text}')
+                lines.append(f'# TYPE {full} {kind}')
+                for labels, value in sorted(self._values[name].items()):
+                    if kind == 'counter':
+                        lines.append(f'{full}{_labels(label_names, labels)} {_number(value)}')
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(value.buckets, value.counts):
+                        cumulative += count
+                        le = 'le="%s"' % _number(float(bound))
+                        lines.append(f'{full}_bucket{_labels(label_names, labels, le)} {cumulative}')
+                    lines.append(f'{full}_bucket{_labels(label_names, labels, INF_LABEL)} {value.count}')
+                    lines.append(f'{full}_sum{_labels(label_names, labels)} {_number(value.sum)}')
+                    lines.append(f'{full}_count{_labels(label_names, labels)} {value.count}')
+        lines.extend(_pool_lines())
+        lines.extend(_write_queue_lines())
+        return '\n'.join(lines) + '\n'
+
+
+def _pool_lines():
+    from .database import pool_stats
+    gauges = (
+        ('db_pool_connections_in_use', 'gauge', 'in_use', 'Pooled connections checked out.'),
+        ('db_pool_connections_idle', 'gauge', 'idle', 'Pooled connections waiting in the pool.'),
+        ('db_pool_checkouts_total', 'counter', 'checkouts', 'Connections handed out by the pool.'),
+        ('db_pool_waits_total', 'counter', 'waits', 'Checkouts that had to wait for a free connection.'),
+        ('db_pool_wait_seconds_total', 'counter', 'wait_time_seconds', 'Time spent waiting for a free connection.'),
+        ('db_pool_timeouts_total', 'counter', 'timeouts', 'Checkouts that timed out.'),
+    )
+    pools = pool_stats()
+    lines = []
+    for name, kind, key, help_text in gauges:
+        full = f'{PREFIX}_{name}'
+        lines.append(f'# HELP {full} {help_text}')
+        lines.append(f'# TYPE {full} {kind}')
+        for p in pools:
+            lines.append(f'{full}{_labels(("database", "mode"), (_database_label(p["database"]), p["mode"]))} {_number(p[key])}')
+    return lines
+
+
+def _database_label(path):
+    # the file name only: the absolute path says where the data lives on the host
+    return os.path.basename(path)
+
+
+def _write_queue_lines():
+    from .write_queue import write_queue_stats
+    gauges = (
+        ('db_write_queue_depth', 'gauge', 'queued', 'Write operations waiting for the writer thread.'),
+        ('db_write_batches_total', 'counter', 'batches', 'Group commits run by the writer thread.'),
+        ('db_write_operations_total', 'counter', 'operations', 'Write operations run by the writer thread.'),
+        ('db_write_failures_total', 'counter', 'failed', 'Write operations that raised or whose commit failed.'),
+        ('db_write_commit_seconds_total', 'counter', 'commit_time_seconds', 'Time spent running group commits.'),
+    )
+    writers = write_queue_stats()
+    lines = []
+    for name, kind, key, help_text in gauges:
+        full = f'{PREFIX}_{name}'
+        lines.append(f'# HELP {full} {help_text}')
+        lines.append(f'# TYPE {full} {kind}')
+        for w in writers:
+            lines.append(f'{full}{_labels(("database",), (_database_label(w["database"]),))} {_number(w[key])}')
+    return lines
+
+
+metrics = MetricsRegistry()
+
+
+def _endpoint():
+    # the endpoint name keeps label cardinality bounded (unlike raw paths)
+    return request.endpoint or 'unmatched'
+
+
+def _before_request():
+    stats = RequestStats(f'{request.method} {_endpoint()}')
+    g._metrics_stats = stats
+    g._metrics_token = _current.set(stats)
+
+
+def _after_request(response):
+    stats = g.pop('_metrics_stats', None)
+    if stats is None:
+        return response
+    elapsed = time.perf_counter() - stats.start
+    finish_scope(stats)
+    metrics.observe_request(_endpoint(), request.method, response.status_code, stats, elapsed)
+    if _setting('SERVER_TIMING'):
+        response.headers['Server-Timing'] = (
+            f'app;dur={elapsed * 1000:.1f}, '
+            f'db;dur={stats.sql_time * 1000:.1f};desc="{stats.queries} queries", '
+            f'tpl;dur={stats.template_time * 1000:.1f}'
+        )
+    return response
+
+
+def _teardown_request(exc=None):
+    token = g.pop('_metrics_token', None)
+    if token is not None:
+        try:
+            _current.reset(token)
+        except ValueError:
+            # torn down from a different context (e.g. a streamed response); just detach
+            _current.set(None)
+
+
+def _template_started(sender, template, context, **extra):
+    stats = _current.get()
+    if stats is not None:
+        stats._template_starts.append(time.perf_counter())
+
+
+def _template_finished(sender, template, context, **extra):
+    stats = _current.get()
+    if stats is None or not stats._template_starts:
+        return
+    elapsed = time.perf_counter() - stats._template_starts.pop()
+    if not stats._template_starts:
+        # nested renders are already inside the outer one
+        stats.template_time += elapsed
+    metrics.observe('template_render_seconds', (template.name or 'string',), elapsed)
+
+
+def init_metrics(app):
+    with app.app_context():
+        if not _setting('METRICS_ENABLED'):
+            return
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
+    before_render_template.connect(_template_started, app)
+    template_rendered.connect(_template_finished, app)
@@ -0,0 +1,31 @@
+"""Numbered schema migrations, tracked in PRAGMA user_version.
+
+To add a migration, create ``mNNNN_<description>.py`` with ``VERSION``,
+``DESCRIPTION`` and ``upgrade(db)``, and append it to
+``runner.MIGRATIONS``. Apply migrations with ``python scripts/migrate.py``.
+Each app process also applies them at startup in init_db.
+"""
+
+from .runner import (
+    MIGRATIONS,
+    backup_database,
+    default_backup_path,
+    get_version,
+    has_tables,
+    latest_version,
+    migrate,
+    migrate_database_file,
+    pending_migrations,
+)
+
+__all__ = [
+    'MIGRATIONS',
+    'backup_database',
+    'default_backup_path',
+    'get_version',
+    'has_tables',
+    'latest_version',
+    'migrate',
+    'migrate_database_file',
+    'pending_migrations',
+]
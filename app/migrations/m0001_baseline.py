@@ -0,0 +1,45 @@
+"""Baseline: create the schema from database/schema_v1.sql.
+
+Also adopts databases created before migrations existed (user_version 0).
+Their tables are kept, and only the missing indexes, search tables and
+triggers are created. The full-text index is then rebuilt from the content
+tables so that rows written before the index existed become searchable.
+"""
+
+import os
+import sqlite3
+
+from .utils import split_sql
+
+VERSION = 1
+DESCRIPTION = 'baseline schema (schema_v1.sql)'
+
+SCHEMA_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'database', 'schema_v1.sql'))
+FTS_TABLES = ('organizations_fts', 'announcements_fts', 'events_fts')
+
+
+def _fts5_available(db):
+    try:
+        db.execute('CREATE VIRTUAL TABLE temp._fts5_probe USING fts5(x)')
+        db.execute('DROP TABLE temp._fts5_probe')
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def upgrade(db):
+    with open(SCHEMA_PATH, 'r', encoding='utf-8') as f:
+        sql = f.read()
+    # adopt existing tables instead of failing on them
+    sql = sql.replace('\nCREATE TABLE ', '\nCREATE TABLE IF NOT EXISTS ')
+    if sql.startswith('CREATE TABLE '):
+        sql = sql.replace('CREATE TABLE ', 'CREATE TABLE IF NOT EXISTS ', 1)
+    fts = _fts5_available(db)
+    for statement in split_sql(sql):
+        if '_fts' in statement and not fts:
+            # no FTS5 in this SQLite build: /search uses its LIKE fallback
+            continue
+        db.execute(statement)
+    if fts:
+        for table in FTS_TABLES:
+            db.execute(f"INSERT INTO {table}({table}) VALUES('rebuild')")
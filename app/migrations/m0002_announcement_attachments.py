@@ -0,0 +1,15 @@
+"""Add announcements.Attachments (JSON list of uploaded files).
+
+Replaces scripts/migrate_add_attachments.py; a no-op on databases created
+from the current baseline.
+"""
+
+from .utils import table_columns
+
+VERSION = 2
+DESCRIPTION = 'announcements.Attachments column'
+
+
+def upgrade(db):
+    if 'Attachments' not in table_columns(db, 'announcements'):
+        db.execute('ALTER TABLE announcements ADD COLUMN Attachments TEXT')
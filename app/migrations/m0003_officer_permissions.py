@@ -0,0 +1,19 @@
+"""Add the officer_roles permission flag columns.
+
+Replaces scripts/migrate_add_officer_permissions.py; a no-op on databases
+created from the current baseline.
+"""
+
+from .utils import table_columns
+
+VERSION = 3
+DESCRIPTION = 'officer_roles permission flags'
+
+PERMISSION_COLUMNS = ('can_post_announcements', 'can_create_events', 'can_approve_members', 'can_assign_roles')
+
+
+def upgrade(db):
+    existing = table_columns(db, 'officer_roles')
+    for col in PERMISSION_COLUMNS:
+        if col not in existing:
+            db.execute(f'ALTER TABLE officer_roles ADD COLUMN {col} INTEGER DEFAULT 0')
@@ -0,0 +1,28 @@
+"""Add seed_state: a one-row table that serves as the CSV auto-seed lock and progress record.
+
+A database is marked 'pending' when the table is created. The first process
+to claim the row seeds it in the background, and the others only read it.
+See app/services/seed_service.py.
+"""
+
+VERSION = 4
+DESCRIPTION = 'seed_state lock/progress table'
+
+
+def upgrade(db):
+    db.execute('''
+        CREATE TABLE IF NOT EXISTS seed_state (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            status VARCHAR(20) NOT NULL DEFAULT 'pending',
+            owner VARCHAR(120),
+            step VARCHAR(40),
+            steps_done INTEGER NOT NULL DEFAULT 0,
+            steps_total INTEGER NOT NULL DEFAULT 0,
+            detail TEXT,
+            error TEXT,
+            started_at REAL,
+            heartbeat_at REAL,
+            finished_at REAL
+        )
+    ''')
+    db.execute("INSERT OR IGNORE INTO seed_state (id, status) VALUES (1, 'pending')")
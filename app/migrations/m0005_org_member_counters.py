@@ -0,0 +1,64 @@
+"""Denormalized per-org membership counters.
+
+organizations.ApprovedCount and organizations.PendingCount are kept current
+by triggers on memberships, so member totals and the pending badge are read
+from the org row instead of counting memberships. Status is matched
+case-insensitively, like MembershipService.count_memberships_by_org_and_status.
+OrgService.reconcile_member_counts() (scripts/reconcile_counters.py) repairs
+drift, for example after rows were changed with the triggers dropped.
+"""
+
+from .utils import table_columns
+
+VERSION = 5
+DESCRIPTION = 'organizations.ApprovedCount/PendingCount + membership triggers'
+
+RECONCILE_SQL = '''
+    UPDATE organizations SET
+        ApprovedCount = (SELECT COUNT(*) FROM memberships m WHERE m.OrgID = organizations.OrgID AND m.Status = 'approved' COLLATE NOCASE),
+        PendingCount = (SELECT COUNT(*) FROM memberships m WHERE m.OrgID = organizations.OrgID AND m.Status = 'pending' COLLATE NOCASE)
+'''
+
+TRIGGERS = (
+    '''
+    CREATE TRIGGER IF NOT EXISTS memberships_counts_ai AFTER INSERT ON memberships
+    WHEN LOWER(NEW.Status) IN ('approved', 'pending') BEGIN
+        UPDATE organizations SET
+            ApprovedCount = ApprovedCount + (LOWER(NEW.Status) = 'approved'),
+            PendingCount = PendingCount + (LOWER(NEW.Status) = 'pending')
+        WHERE OrgID = NEW.OrgID;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS memberships_counts_ad AFTER DELETE ON memberships
+    WHEN LOWER(OLD.Status) IN ('approved', 'pending') BEGIN
+        UPDATE organizations SET
+            ApprovedCount = ApprovedCount - (LOWER(OLD.Status) = 'approved'),
+            PendingCount = PendingCount - (LOWER(OLD.Status) = 'pending')
+        WHERE OrgID = OLD.OrgID;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS memberships_counts_au AFTER UPDATE OF Status, OrgID ON memberships
+    WHEN LOWER(OLD.Status) IS NOT LOWER(NEW.Status) OR OLD.OrgID IS NOT NEW.OrgID BEGIN
+        UPDATE organizations SET
+            ApprovedCount = ApprovedCount - (LOWER(OLD.Status) = 'approved'),
+            PendingCount = PendingCount - (LOWER(OLD.Status) = 'pending')
+        WHERE OrgID = OLD.OrgID AND LOWER(OLD.Status) IN ('approved', 'pending');
+        UPDATE organizations SET
+            ApprovedCount = ApprovedCount + (LOWER(NEW.Status) = 'approved'),
+            PendingCount = PendingCount + (LOWER(NEW.Status) = 'pending')
+        WHERE OrgID = NEW.OrgID AND LOWER(NEW.Status) IN ('approved', 'pending');
+    END
+    ''',
+)
+
+
+def upgrade(db):
+    cols = table_columns(db, 'organizations')
+    for col in ('ApprovedCount', 'PendingCount'):
+        if col not in cols:
+            db.execute(f'ALTER TABLE organizations ADD COLUMN {col} INTEGER NOT NULL DEFAULT 0')
+    for trigger in TRIGGERS:
+        db.execute(trigger)
+    db.execute(RECONCILE_SQL)
@@ -0,0 +1,75 @@
+"""Materialized home feed.
+
+feed_items holds one row per announcement and per event, keyed by
+SortKey (DatePosted for announcements, creation time for events).
+/ reads the newest page straight off idx_feed_items_sort. It doesn't
+load and sort every announcement in Python. Rows are added by
+AnnouncementService.create_announcement / EventService.create_event (and
+FeedService.sync_missing after bulk imports). They are removed by the delete
+triggers below, so org deletion and cascades keep the feed clean.
+"""
+
+VERSION = 6
+DESCRIPTION = 'feed_items table + backfill'
+
+STATEMENTS = (
+    '''
+    CREATE TABLE IF NOT EXISTS feed_items (
+        FeedItemID INTEGER PRIMARY KEY AUTOINCREMENT,
+        ItemType VARCHAR(20) NOT NULL,
+        ItemID INTEGER NOT NULL,
+        OrgID INTEGER NOT NULL,
+        SortKey DATETIME NOT NULL,
+        UNIQUE (ItemType, ItemID)
+    )
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_feed_items_sort ON feed_items(SortKey, FeedItemID)',
+    'CREATE INDEX IF NOT EXISTS idx_feed_items_org_sort ON feed_items(OrgID, SortKey, FeedItemID)',
+    '''
+    CREATE TRIGGER IF NOT EXISTS announcements_feed_ad AFTER DELETE ON announcements BEGIN
+        DELETE FROM feed_items WHERE ItemType = 'announcement' AND ItemID = OLD.AnnouncementID;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS announcements_feed_au AFTER UPDATE OF DatePosted, OrgID ON announcements BEGIN
+        UPDATE feed_items SET OrgID = NEW.OrgID, SortKey = COALESCE(NEW.DatePosted, SortKey)
+        WHERE ItemType = 'announcement' AND ItemID = NEW.AnnouncementID;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS events_feed_ad AFTER DELETE ON events BEGIN
+        DELETE FROM feed_items WHERE ItemType = 'event' AND ItemID = OLD.EventID;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS events_feed_au AFTER UPDATE OF OrgID ON events BEGIN
+        UPDATE feed_items SET OrgID = NEW.OrgID WHERE ItemType = 'event' AND ItemID = NEW.EventID;
+    END
+    ''',
+)
+
+
+# insert feed rows for any announcement/event that doesn't have one yet
+SYNC_SQL = (
+    '''
+    INSERT INTO feed_items (ItemType, ItemID, OrgID, SortKey)
+    SELECT 'announcement', a.AnnouncementID, a.OrgID, COALESCE(a.DatePosted, CURRENT_TIMESTAMP)
+    FROM announcements a
+    WHERE NOT EXISTS (SELECT 1 FROM feed_items f WHERE f.ItemType = 'announcement' AND f.ItemID = a.AnnouncementID)
+    ORDER BY a.AnnouncementID
+    ''',
+    '''
+    INSERT INTO feed_items (ItemType, ItemID, OrgID, SortKey)
+    SELECT 'event', e.EventID, e.OrgID, COALESCE(e.created_at, CURRENT_TIMESTAMP)
+    FROM events e
+    WHERE NOT EXISTS (SELECT 1 FROM feed_items f WHERE f.ItemType = 'event' AND f.ItemID = e.EventID)
+    ORDER BY e.EventID
+    ''',
+)
+
+
+def upgrade(db):
+    for statement in STATEMENTS:
+        db.execute(statement)
+    for sql in SYNC_SQL:
+        db.execute(sql)
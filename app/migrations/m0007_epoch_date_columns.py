@@ -0,0 +1,98 @@
+"""Integer epoch sort keys for the free-form date columns.
+
+Each date column gets a sibling *Ts INTEGER column (Unix seconds, UTC)
+parsed by app.utils.dates.to_epoch, plus indexes for range queries. The
+services fill the *Ts columns on every write and import. This migration
+backfills existing rows with to_epoch registered as a SQL function, so
+mixed CSV formats are normalized exactly as they are at write time.
+
+It also switches feed_items.SortKey (migration 0006) from text dates to
+the same epoch seconds, so the feed orders correctly across date formats.
+"""
+
+from ..utils.dates import to_epoch
+from .utils import table_columns
+
+VERSION = 7
+DESCRIPTION = 'epoch *Ts columns for date fields + feed SortKey as epoch'
+
+# table -> [(text column, epoch column)]
+DATE_COLUMNS = {
+    'announcements': [('DatePosted', 'DatePostedTs')],
+    'events': [('EventDate', 'EventDateTs')],
+    'memberships': [('DateApplied', 'DateAppliedTs')],
+    'officer_roles': [('StartDate', 'StartDateTs'), ('EndDate', 'EndDateTs')],
+}
+
+INDEXES = (
+    'CREATE INDEX IF NOT EXISTS idx_announcements_posted_ts ON announcements(DatePostedTs)',
+    'CREATE INDEX IF NOT EXISTS idx_announcements_org_posted_ts ON announcements(OrgID, DatePostedTs)',
+    'CREATE INDEX IF NOT EXISTS idx_events_date_ts ON events(EventDateTs)',
+    'CREATE INDEX IF NOT EXISTS idx_events_org_date_ts ON events(OrgID, EventDateTs)',
+    'CREATE INDEX IF NOT EXISTS idx_memberships_applied_ts ON memberships(DateAppliedTs)',
+    'CREATE INDEX IF NOT EXISTS idx_officer_roles_end_ts ON officer_roles(EndDateTs)',
+)
+
+# feed rows for any announcement/event that doesn't have one yet
+SYNC_SQL = (
+    '''
+    INSERT INTO feed_items (ItemType, ItemID, OrgID, SortKey)
+    SELECT 'announcement', a.AnnouncementID, a.OrgID, COALESCE(a.DatePostedTs, CAST(strftime('%s', 'now') AS INTEGER))
+    FROM announcements a
+    WHERE NOT EXISTS (SELECT 1 FROM feed_items f WHERE f.ItemType = 'announcement' AND f.ItemID = a.AnnouncementID)
+    ORDER BY a.AnnouncementID
+    ''',
+    '''
+    INSERT INTO feed_items (ItemType, ItemID, OrgID, SortKey)
+    SELECT 'event', e.EventID, e.OrgID, COALESCE(CAST(strftime('%s', e.created_at) AS INTEGER), CAST(strftime('%s', 'now') AS INTEGER))
+    FROM events e
+    WHERE NOT EXISTS (SELECT 1 FROM feed_items f WHERE f.ItemType = 'event' AND f.ItemID = e.EventID)
+    ORDER BY e.EventID
+    ''',
+)
+
+FEED_STATEMENTS = (
+    'DROP TRIGGER IF EXISTS announcements_feed_au',
+    '''
+    CREATE TRIGGER announcements_feed_au AFTER UPDATE OF DatePostedTs, OrgID ON announcements BEGIN
+        UPDATE feed_items SET OrgID = NEW.OrgID, SortKey = COALESCE(NEW.DatePostedTs, SortKey)
+        WHERE ItemType = 'announcement' AND ItemID = NEW.AnnouncementID;
+    END
+    ''',
+    '''
+    UPDATE feed_items SET SortKey = COALESCE(
+        (SELECT a.DatePostedTs FROM announcements a WHERE a.AnnouncementID = feed_items.ItemID),
+        CAST(strftime('%s', SortKey) AS INTEGER), SortKey)
+    WHERE ItemType = 'announcement'
+    ''',
+    '''
+    UPDATE feed_items SET SortKey = COALESCE(CAST(strftime('%s', SortKey) AS INTEGER), SortKey)
+    WHERE ItemType = 'event'
+    ''',
+) + SYNC_SQL
+
+
+def backfill(db, only_missing=True):
+    """Fill the *Ts columns from their text columns; returns the number of rows updated."""
+    db.create_function('campus_to_epoch', 1, to_epoch, deterministic=True)
+    updated = 0
+    for table, pairs in DATE_COLUMNS.items():
+        for text_col, ts_col in pairs:
+            sql = f'UPDATE {table} SET {ts_col} = campus_to_epoch({text_col}) WHERE {text_col} IS NOT NULL'
+            if only_missing:
+                sql += f' AND {ts_col} IS NULL'
+            updated += db.execute(sql).rowcount
+    return updated
+
+
+def upgrade(db):
+    for table, pairs in DATE_COLUMNS.items():
+        existing = table_columns(db, table)
+        for _, ts_col in pairs:
+            if ts_col not in existing:
+                db.execute(f'ALTER TABLE {table} ADD COLUMN {ts_col} INTEGER')
+    for statement in INDEXES:
+        db.execute(statement)
+    backfill(db, only_missing=False)
+    for statement in FEED_STATEMENTS:
+        db.execute(statement)
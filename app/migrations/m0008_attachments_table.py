@@ -0,0 +1,83 @@
+"""Move announcement attachments out of the Attachments JSON column.
+
+Each attachment becomes a row in announcement_attachments (indexed by
+AnnouncementID), and announcements.AttachmentCount is kept current by
+triggers. Listings read the count without decoding anything.
+AnnouncementService.load_attachments() fetches the rows for one page in a
+single query, and only on pages that render them.
+
+Existing JSON blobs are converted in bulk with json_each and then cleared.
+Blobs that aren't a valid JSON array are left as they are. The Attachments
+column itself stays, unused, because SQLite can't drop it cheaply.
+"""
+
+from .utils import table_columns
+
+VERSION = 8
+DESCRIPTION = 'announcement_attachments table + announcements.AttachmentCount'
+
+STATEMENTS = (
+    '''
+    CREATE TABLE IF NOT EXISTS announcement_attachments (
+        AttachmentID INTEGER PRIMARY KEY AUTOINCREMENT,
+        AnnouncementID INTEGER NOT NULL,
+        Position INTEGER NOT NULL DEFAULT 0,
+        Type TEXT NOT NULL DEFAULT 'file',
+        Url TEXT NOT NULL,
+        Filename TEXT,
+        MimeType TEXT,
+        FOREIGN KEY (AnnouncementID) REFERENCES announcements(AnnouncementID) ON DELETE CASCADE
+    )
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_announcement_attachments_ann ON announcement_attachments(AnnouncementID, Position)',
+)
+
+# list entries are objects ({type, url, filename, mimetype}); bare strings are treated as links
+CONVERT_SQL = '''
+    INSERT INTO announcement_attachments (AnnouncementID, Position, Type, Url, Filename, MimeType)
+    SELECT a.AnnouncementID, j.key,
+           CASE WHEN j.type = 'object' THEN COALESCE(json_extract(j.value, '$.type'), 'file') ELSE 'link' END,
+           CASE WHEN j.type = 'object' THEN json_extract(j.value, '$.url') ELSE j.value END,
+           CASE WHEN j.type = 'object' THEN json_extract(j.value, '$.filename') END,
+           CASE WHEN j.type = 'object' THEN json_extract(j.value, '$.mimetype') END
+    FROM announcements a, json_each(a.Attachments) j
+    WHERE a.Attachments IS NOT NULL AND json_valid(a.Attachments) AND json_type(a.Attachments) = 'array'
+      AND (j.type = 'text' OR json_extract(j.value, '$.url') IS NOT NULL)
+    ORDER BY a.AnnouncementID, j.key
+'''
+
+CLEAR_SQL = '''
+    UPDATE announcements SET Attachments = NULL
+    WHERE Attachments IS NOT NULL AND json_valid(Attachments) AND json_type(Attachments) = 'array'
+'''
+
+RECONCILE_SQL = '''
+    UPDATE announcements SET AttachmentCount =
+        (SELECT COUNT(*) FROM announcement_attachments t WHERE t.AnnouncementID = announcements.AnnouncementID)
+'''
+
+TRIGGERS = (
+    '''
+    CREATE TRIGGER IF NOT EXISTS announcement_attachments_count_ai AFTER INSERT ON announcement_attachments BEGIN
+        UPDATE announcements SET AttachmentCount = AttachmentCount + 1 WHERE AnnouncementID = NEW.AnnouncementID;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS announcement_attachments_count_ad AFTER DELETE ON announcement_attachments BEGIN
+        UPDATE announcements SET AttachmentCount = AttachmentCount - 1 WHERE AnnouncementID = OLD.AnnouncementID;
+    END
+    ''',
+)
+
+
+def upgrade(db):
+    if 'AttachmentCount' not in table_columns(db, 'announcements'):
+        db.execute('ALTER TABLE announcements ADD COLUMN AttachmentCount INTEGER NOT NULL DEFAULT 0')
+    for statement in STATEMENTS:
+        db.execute(statement)
+    # bulk-convert before the triggers exist, then count once
+    db.execute(CONVERT_SQL)
+    db.execute(CLEAR_SQL)
+    db.execute(RECONCILE_SQL)
+    for statement in TRIGGERS:
+        db.execute(statement)
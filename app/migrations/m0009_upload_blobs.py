@@ -0,0 +1,59 @@
+"""Content-addressed upload store (app/services/upload_store.py).
+
+upload_blobs has one row per distinct file content, keyed by SHA-256. An
+attachment points at its blob through announcement_attachments.BlobSha256,
+and triggers keep upload_blobs.RefCount equal to the number of attachments
+using it. Blobs whose count drops to 0 are removed by
+UploadStore.collect_garbage() (scripts/gc_uploads.py).
+
+Attachments uploaded before this migration keep their /static/uploads URLs
+and have no blob.
+"""
+
+from .utils import table_columns
+
+VERSION = 9
+DESCRIPTION = 'upload_blobs table + attachment blob refcounts'
+
+STATEMENTS = (
+    '''
+    CREATE TABLE IF NOT EXISTS upload_blobs (
+        Sha256 TEXT PRIMARY KEY,
+        Size INTEGER NOT NULL,
+        MimeType TEXT,
+        RefCount INTEGER NOT NULL DEFAULT 0,
+        created_at REAL NOT NULL
+    )
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_upload_blobs_unreferenced ON upload_blobs(created_at) WHERE RefCount <= 0',
+    'CREATE INDEX IF NOT EXISTS idx_announcement_attachments_blob ON announcement_attachments(BlobSha256) WHERE BlobSha256 IS NOT NULL',
+)
+
+RECONCILE_SQL = '''
+    UPDATE upload_blobs SET RefCount =
+        (SELECT COUNT(*) FROM announcement_attachments t WHERE t.BlobSha256 = upload_blobs.Sha256)
+'''
+
+TRIGGERS = (
+    '''
+    CREATE TRIGGER IF NOT EXISTS announcement_attachments_blob_ai AFTER INSERT ON announcement_attachments
+    WHEN NEW.BlobSha256 IS NOT NULL BEGIN
+        UPDATE upload_blobs SET RefCount = RefCount + 1 WHERE Sha256 = NEW.BlobSha256;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS announcement_attachments_blob_ad AFTER DELETE ON announcement_attachments
+    WHEN OLD.BlobSha256 IS NOT NULL BEGIN
+        UPDATE upload_blobs SET RefCount = RefCount - 1 WHERE Sha256 = OLD.BlobSha256;
+    END
+    ''',
+)
+
+
+def upgrade(db):
+    if 'BlobSha256' not in table_columns(db, 'announcement_attachments'):
+        db.execute('ALTER TABLE announcement_attachments ADD COLUMN BlobSha256 TEXT')
+    for statement in STATEMENTS:
+        db.execute(statement)
+    for statement in TRIGGERS:
+        db.execute(statement)
@@ -0,0 +1,30 @@
+"""Derived image/video variants for attachments (app/services/derivatives.py).
+
+Each attachment row gets the URLs of its resized thumbnail, web-sized image
+and video poster frame, plus VariantStatus:
+  NULL     nothing to derive (links, documents, legacy uploads without a blob)
+  pending  queued for the derivative workers
+  ready    at least one variant was written
+  skipped  no variant possible here (e.g. Pillow / ffmpeg not installed)
+  failed   the source could not be processed
+Templates use a variant URL when one is set and the original otherwise.
+"""
+
+from .utils import table_columns
+
+VERSION = 10
+DESCRIPTION = 'announcement_attachments variant URLs + status'
+
+COLUMNS = ('ThumbUrl', 'WebUrl', 'PosterUrl', 'VariantStatus')
+
+
+def upgrade(db):
+    existing = table_columns(db, 'announcement_attachments')
+    for col in COLUMNS:
+        if col not in existing:
+            db.execute(f'ALTER TABLE announcement_attachments ADD COLUMN {col} TEXT')
+    db.execute("CREATE INDEX IF NOT EXISTS idx_announcement_attachments_pending ON announcement_attachments(AttachmentID) "
+               "WHERE VariantStatus = 'pending'")
+    # blob-backed media uploaded before this migration can be processed by scripts/build_derivatives.py
+    db.execute("UPDATE announcement_attachments SET VariantStatus = 'pending' "
+               "WHERE BlobSha256 IS NOT NULL AND VariantStatus IS NULL AND (MimeType LIKE 'image/%' OR MimeType LIKE 'video/%')")
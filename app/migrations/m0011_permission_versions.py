@@ -0,0 +1,65 @@
+"""Per-org permission versions for the permission cache.
+
+permission_versions holds one counter per organization. Triggers bump it
+whenever a write can change what user_permissions_for_org returns for a
+member of that org:
+  - an officer role is added, changed or removed;
+  - a membership is deleted or moved to another user or org.
+Each cache entry records the version it was filled under
+(app/services/permission_cache.py), so a revocation in one worker process
+is seen by every other process on its next check instead of after the
+TTL. Orgs without a row are at version 0.
+"""
+
+VERSION = 11
+DESCRIPTION = 'permission_versions table + officer_roles/memberships triggers'
+
+TABLE = '''
+    CREATE TABLE IF NOT EXISTS permission_versions (
+        OrgID INTEGER PRIMARY KEY,
+        Version INTEGER NOT NULL DEFAULT 0
+    )
+'''
+
+_BUMP_ORG = '''
+        INSERT INTO permission_versions (OrgID, Version) VALUES ({org}, 1)
+        ON CONFLICT(OrgID) DO UPDATE SET Version = Version + 1;'''
+
+_BUMP_MEMBERSHIP = '''
+        INSERT INTO permission_versions (OrgID, Version)
+        SELECT OrgID, 1 FROM memberships WHERE MembershipID = {membership}
+        ON CONFLICT(OrgID) DO UPDATE SET Version = Version + 1;'''
+
+TRIGGERS = (
+    f'''
+    CREATE TRIGGER IF NOT EXISTS officer_roles_perm_version_ai AFTER INSERT ON officer_roles
+    WHEN NEW.MembershipID IS NOT NULL BEGIN{_BUMP_MEMBERSHIP.format(membership='NEW.MembershipID')}
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS officer_roles_perm_version_au AFTER UPDATE ON officer_roles BEGIN{_BUMP_MEMBERSHIP.format(membership='OLD.MembershipID')}{_BUMP_MEMBERSHIP.format(membership='NEW.MembershipID')}
+    END
+    ''',
+    # a role deleted by its membership's ON DELETE CASCADE finds no membership row;
+    # memberships_perm_version_ad covers that case
+    f'''
+    CREATE TRIGGER IF NOT EXISTS officer_roles_perm_version_ad AFTER DELETE ON officer_roles
+    WHEN OLD.MembershipID IS NOT NULL BEGIN{_BUMP_MEMBERSHIP.format(membership='OLD.MembershipID')}
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS memberships_perm_version_ad AFTER DELETE ON memberships BEGIN{_BUMP_ORG.format(org='OLD.OrgID')}
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS memberships_perm_version_au AFTER UPDATE OF UserID, OrgID ON memberships
+    WHEN OLD.UserID IS NOT NEW.UserID OR OLD.OrgID IS NOT NEW.OrgID BEGIN{_BUMP_ORG.format(org='OLD.OrgID')}{_BUMP_ORG.format(org='NEW.OrgID')}
+    END
+    ''',
+)
+
+
+def upgrade(db):
+    db.execute(TABLE)
+    for trigger in TRIGGERS:
+        db.execute(trigger)
@@ -0,0 +1,74 @@
+"""Posting time for events, used as their feed SortKey.
+
+Events were keyed in feed_items by created_at, the row's insert time. A
+bulk load (seed, CSV import, synthetic data) stamps every event with the
+load time, so they all shared one SortKey and buried every announcement.
+events.DatePostedTs (Unix seconds) now records when the event was posted:
+the services set it on create, and bulk loads take it from the file or,
+failing that, from the event date when that is in the past.
+
+Existing rows are backfilled from created_at, capped at EventDateTs (an
+event is announced before it happens), and their feed rows re-keyed.
+
+It also indexes organizations.ApprovedCount for the home page's popular
+organizations sidebar, which replaced a scan of every organization.
+"""
+
+from .utils import table_columns
+
+VERSION = 12
+DESCRIPTION = 'events.DatePostedTs as the event feed SortKey + organizations ApprovedCount index'
+
+_CREATED_TS = "CAST(strftime('%s', created_at) AS INTEGER)"
+
+BACKFILL = f'''
+    UPDATE events SET DatePostedTs = CASE
+        WHEN EventDateTs IS NOT NULL AND ({_CREATED_TS} IS NULL OR EventDateTs < {_CREATED_TS}) THEN EventDateTs
+        ELSE {_CREATED_TS}
+    END
+    WHERE DatePostedTs IS NULL
+'''
+
+STATEMENTS = (
+    'CREATE INDEX IF NOT EXISTS idx_organizations_approved_count ON organizations(ApprovedCount DESC, OrgID)',
+    '''
+    UPDATE feed_items SET SortKey = COALESCE(
+        (SELECT e.DatePostedTs FROM events e WHERE e.EventID = feed_items.ItemID), SortKey)
+    WHERE ItemType = 'event'
+    ''',
+    'DROP TRIGGER IF EXISTS events_feed_au',
+    '''
+    CREATE TRIGGER events_feed_au AFTER UPDATE OF DatePostedTs, OrgID ON events BEGIN
+        UPDATE feed_items SET OrgID = NEW.OrgID, SortKey = COALESCE(NEW.DatePostedTs, SortKey)
+        WHERE ItemType = 'event' AND ItemID = NEW.EventID;
+    END
+    ''',
+)
+
+# feed rows for any announcement/event that doesn't have one yet
+SYNC_SQL = (
+    '''
+    INSERT INTO feed_items (ItemType, ItemID, OrgID, SortKey)
+    SELECT 'announcement', a.AnnouncementID, a.OrgID, COALESCE(a.DatePostedTs, CAST(strftime('%s', 'now') AS INTEGER))
+    FROM announcements a
+    WHERE NOT EXISTS (SELECT 1 FROM feed_items f WHERE f.ItemType = 'announcement' AND f.ItemID = a.AnnouncementID)
+    ORDER BY a.AnnouncementID
+    ''',
+    '''
+    INSERT INTO feed_items (ItemType, ItemID, OrgID, SortKey)
+    SELECT 'event', e.EventID, e.OrgID, COALESCE(e.DatePostedTs, CAST(strftime('%s', 'now') AS INTEGER))
+    FROM events e
+    WHERE NOT EXISTS (SELECT 1 FROM feed_items f WHERE f.ItemType = 'event' AND f.ItemID = e.EventID)
+    ORDER BY e.EventID
+    ''',
+)
+
+
+def upgrade(db):
+    if 'DatePostedTs' not in table_columns(db, 'events'):
+        db.execute('ALTER TABLE events ADD COLUMN DatePostedTs INTEGER')
+    db.execute(BACKFILL)
+    for statement in STATEMENTS:
+        db.execute(statement)
+    for sql in SYNC_SQL:
+        db.execute(sql)
@@ -0,0 +1,12 @@
+"""Index announcements by CreatedBy.
+
+The profile page counts a user's announcements by the officer roles that
+posted them; without this index each view scanned every announcement.
+"""
+
+VERSION = 13
+DESCRIPTION = 'announcements CreatedBy index'
+
+
+def upgrade(db):
+    db.execute('CREATE INDEX IF NOT EXISTS idx_announcements_created_by ON announcements(CreatedBy)')
@@ -0,0 +1,133 @@
+"""Migration engine.
+
+Migrations are modules in this package named ``mNNNN_<description>.py``,
+registered in order in ``MIGRATIONS``. Each one defines ``VERSION``,
+``DESCRIPTION`` and ``upgrade(db)``. The schema version lives in
+``PRAGMA user_version``. Reading it is a single header lookup, so a process
+whose database is already current does no DDL at all.
+
+Every migration runs in its own ``BEGIN IMMEDIATE`` transaction together
+with the ``user_version`` bump. Worker processes that start at the same time
+serialize on the write lock, and after the first one finishes the others see
+the new version and skip the migration. ``upgrade()`` must not commit and
+must not use ``executescript`` (which commits implicitly).
+"""
+
+import os
+import sqlite3
+import time
+
+from ..utils.errors import AppError
+from . import (
+    m0001_baseline, m0002_announcement_attachments, m0003_officer_permissions, m0004_seed_state,
+    m0005_org_member_counters, m0006_feed_items, m0007_epoch_date_columns, m0008_attachments_table,
+    m0009_upload_blobs, m0010_attachment_variants, m0011_permission_versions, m0012_event_posted_ts,
+    m0013_announcement_creator_index,
+)
+
+DEFAULT_BACKUP_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'instance', 'backups'))
+
+MIGRATIONS = [
+    m0001_baseline,
+    m0002_announcement_attachments,
+    m0003_officer_permissions,
+    m0004_seed_state,
+    m0005_org_member_counters,
+    m0006_feed_items,
+    m0007_epoch_date_columns,
+    m0008_attachments_table,
+    m0009_upload_blobs,
+    m0010_attachment_variants,
+    m0011_permission_versions,
+    m0012_event_posted_ts,
+    m0013_announcement_creator_index,
+]
+
+
+def latest_version():
+    return MIGRATIONS[-1].VERSION
+
+
+def get_version(db):
+    return int(db.execute('PRAGMA user_version').fetchone()[0])
+
+
+def pending_migrations(db, target=None):
+    target = latest_version() if target is None else target
+    current = get_version(db)
+    return [m for m in MIGRATIONS if current < m.VERSION <= target]
+
+
+def has_tables(db):
+    """True if the database already holds any schema objects (i.e. is not brand new)."""
+    row = db.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' LIMIT 1").fetchone()
+    return row is not None
+
+
+def backup_database(db, dest_path):
+    """Copy a live database to dest_path with the sqlite3 online backup API.
+
+    Unlike copying the file, this is consistent while other connections are
+    writing and includes pages still sitting in the WAL.
+    """
+    if os.path.dirname(dest_path):
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+    dest = sqlite3.connect(dest_path)
+    try:
+        db.backup(dest)
+    finally:
+        dest.close()
+    return dest_path
+
+
+def default_backup_path(db_path, version, backup_dir=None):
+    """<backup_dir>/<db file name>.backup_v<version>_<timestamp>.
+
+    backup_dir defaults to DEFAULT_BACKUP_DIR (instance/backups, which git
+    ignores), so backups never land next to a database in the source tree.
+    """
+    ts = time.strftime('%Y%m%d%H%M%S')
+    return os.path.join(backup_dir or DEFAULT_BACKUP_DIR, f'{os.path.basename(db_path)}.backup_v{version}_{ts}')
+
+
+def migrate(db, target=None, logger=None):
+    """Apply pending migrations up to target (default: latest). Returns the versions applied."""
+    applied = []
+    if db.in_transaction:
+        db.commit()
+    for migration in pending_migrations(db, target):
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            # another process may have applied it while we waited for the lock
+            if get_version(db) >= migration.VERSION:
+                db.rollback()
+                continue
+            migration.upgrade(db)
+            db.execute(f'PRAGMA user_version = {int(migration.VERSION)}')
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise AppError('MIGRATION_ERROR', f'Migration {migration.VERSION} ({migration.DESCRIPTION}) failed', original_exception=e)
+        applied.append(migration.VERSION)
+        if logger is not None:
+            logger.info('Applied migration %04d: %s', migration.VERSION, migration.DESCRIPTION)
+    return applied
+
+
+def migrate_database_file(db_path, target=None, backup=True, backup_path=None, logger=None, backup_dir=None):
+    """Open db_path, back it up if it has data and needs migrating, and migrate it.
+
+    Returns (version_before, version_after, backup_path_or_None).
+    """
+    db = sqlite3.connect(db_path, timeout=30.0)
+    db.row_factory = sqlite3.Row
+    try:
+        db.execute('PRAGMA foreign_keys = ON')
+        before = get_version(db)
+        written = None
+        if backup and pending_migrations(db, target) and has_tables(db):
+            written = backup_database(db, backup_path or default_backup_path(db_path, before, backup_dir))
+        migrate(db, target, logger=logger)
+        return before, get_version(db), written
+    finally:
+        db.close()
@@ -0,0 +1,25 @@
+"""Helpers shared by the migration modules."""
+
+import sqlite3
+
+
+def split_sql(script):
+    """Split a SQL script into complete statements (trigger bodies stay intact)."""
+    statements = []
+    buf = []
+    for line in script.splitlines(keepends=True):
+        if not buf and (not line.strip() or line.lstrip().startswith('--')):
+            continue
+        buf.append(line)
+        candidate = ''.join(buf)
+        if sqlite3.complete_statement(candidate):
+            statements.append(candidate.strip())
+            buf = []
+    tail = ''.join(buf).strip()
+    if tail:
+        statements.append(tail)
+    return statements
+
+
+def table_columns(db, table):
+    return {row[1] for row in db.execute(f'PRAGMA table_info({table})').fetchall()}
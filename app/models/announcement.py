@@ -1,19 +1,43 @@
-class Announcement:
-    def __init__(self, AnnouncementID, OrgID, CreatedBy, Title, Content, DatePosted=None, Attachments=None, created_at=None, updated_at=None, **kwargs):
+from .record import Record
+
+
+class Announcement(Record):
+    __slots__ = ('AnnouncementID', 'OrgID', 'CreatedBy', 'Title', 'Content', 'DatePosted', 'Attachments', 'AttachmentCount',
+                 'created_at', 'updated_at', 'flair', 'link')
+
+    ROW_FIELDS = (
+        ('AnnouncementID', ('AnnouncementID',), None),
+        ('OrgID', ('OrgID',), None),
+        ('CreatedBy', ('CreatedBy',), None),
+        ('Title', ('Title',), None),
+        ('Content', ('Content',), None),
+        # filled by AnnouncementService.load_attachments(); the count comes from the row
+        ('Attachments', ('Attachments',), None),
+        ('AttachmentCount', ('AttachmentCount',), 0),
+        ('DatePosted', ('DatePosted',), None),
+        # UI helpers — may be None if not provided by services
+        ('flair', ('flair',), None),
+        ('link', ('link',), None),
+    )
+
+    def __init__(self, AnnouncementID, OrgID, CreatedBy, Title, Content, DatePosted=None, Attachments=None, created_at=None, updated_at=None,
+                 flair=None, link=None, AttachmentCount=0, **kwargs):
         self.AnnouncementID = AnnouncementID
         self.OrgID = OrgID
         self.CreatedBy = CreatedBy
         self.Title = Title
         self.Content = Content
         self.DatePosted = DatePosted
-        # Attachments may be stored as JSON text in the DB or as a Python object
+        # list of attachment dicts once loaded (announcement_attachments table)
         self.Attachments = Attachments
+        self.AttachmentCount = AttachmentCount
 
-        # attach optional audit timestamps and any additional fields
+        # optional audit timestamps and UI helpers; any additional fields go to _extra
         self.created_at = created_at
         self.updated_at = updated_at
-        for k, v in kwargs.items():
-            setattr(self, k, v)
+        self.flair = flair
+        self.link = link
+        self._extra = kwargs
 
     def to_dict(self):
         return {
@@ -23,8 +47,8 @@ class Announcement:
             "Title": self.Title,
             "Content": self.Content,
             "Attachments": self.Attachments,
+            "AttachmentCount": self.AttachmentCount,
             "DatePosted": self.DatePosted,
-            # UI helpers — may be None if not provided by services
-            "flair": getattr(self, 'flair', None),
-            "link": getattr(self, 'link', None)
-        }
\ No newline at end of file
+            "flair": self.flair,
+            "link": self.link
+        }
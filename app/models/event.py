@@ -1,4 +1,19 @@
-class Event:
+from .record import Record
+
+
+class Event(Record):
+    __slots__ = ('EventID', 'OrgID', 'CreatedBy', 'EventName', 'EventDescription', 'EventDate', 'Location')
+
+    ROW_FIELDS = (
+        ('EventID', ('EventID',), None),
+        ('OrgID', ('OrgID',), None),
+        ('CreatedBy', ('CreatedBy',), None),
+        ('EventName', ('EventName',), None),
+        ('EventDescription', ('EventDescription', 'Description'), None),
+        ('EventDate', ('EventDate',), None),
+        ('Location', ('Location',), None),
+    )
+
     def __init__(self, EventID, OrgID, CreatedBy, EventName=None, EventDescription=None, Description=None, EventDate=None, Location=None, **kwargs):
         self.EventID = EventID
         self.OrgID = OrgID
@@ -9,9 +24,8 @@ class Event:
         self.EventDate = EventDate
         self.Location = Location
 
-        # Attach additional fields (created_at, updated_at, etc.) if present
-        for k, v in kwargs.items():
-            setattr(self, k, v)
+        # additional fields (created_at, updated_at, etc.) are kept for get()
+        self._extra = kwargs
 
     def to_dict(self):
         return {
@@ -23,4 +37,3 @@ class Event:
             "EventDate": self.EventDate,
             "Location": self.Location
         }
-    
\ No newline at end of file
@@ -1,4 +1,18 @@
-class Membership:
+from .record import Record
+
+
+class Membership(Record):
+    __slots__ = ('MembershipID', 'UserID', 'OrgID', 'Status', 'DateApplied', 'DateApproved', 'created_at', 'updated_at')
+
+    ROW_FIELDS = (
+        ('MembershipID', ('MembershipID',), None),
+        ('UserID', ('UserID',), None),
+        ('OrgID', ('OrgID',), None),
+        ('Status', ('Status',), None),
+        ('DateApplied', ('DateApplied',), None),
+        ('DateApproved', ('DateApproved',), None),
+    )
+
     def __init__(self, MembershipID, UserID, OrgID, Status=None, DateApplied=None, DateApproved=None, created_at=None, updated_at=None, **kwargs):
         self.MembershipID = MembershipID
         self.UserID = UserID
@@ -7,11 +21,10 @@ class Membership:
         self.DateApplied = DateApplied
         self.DateApproved = DateApproved
 
-        # attach optional audit timestamps and any additional fields
+        # optional audit timestamps; any additional fields go to _extra
         self.created_at = created_at
         self.updated_at = updated_at
-        for k, v in kwargs.items():
-            setattr(self, k, v)
+        self._extra = kwargs
 
     def to_dict(self):
         return {
@@ -21,4 +34,4 @@ class Membership:
             "Status": self.Status,
             "DateApplied": self.DateApplied,
             "DateApproved": self.DateApproved
-        }
\ No newline at end of file
+        }
@@ -50,8 +50,31 @@
 548,148,Coach,2024-04-25,2025-04-25
 549,149,Member,2024-04-28,2025-04-28"""
 
-class OfficerRole:
-    def __init__(self, OfficerRoleID, MembershipID, RoleName, RoleStart=None, RoleEnd=None, StartDate=None, EndDate=None, **kwargs):
+from .record import Record
+
+
+class OfficerRole(Record):
+    __slots__ = ('OfficerRoleID', 'MembershipID', 'RoleName', 'RoleStart', 'RoleEnd',
+                 'can_post_announcements', 'can_create_events', 'can_approve_members', 'can_assign_roles', 'user_name')
+
+    ROW_FIELDS = (
+        ('OfficerRoleID', ('OfficerRoleID',), None),
+        ('MembershipID', ('MembershipID',), None),
+        ('RoleName', ('RoleName',), None),
+        ('RoleStart', ('RoleStart', 'StartDate'), None),
+        ('RoleEnd', ('RoleEnd', 'EndDate'), None),
+        ('can_post_announcements', ('can_post_announcements',), None),
+        ('can_create_events', ('can_create_events',), None),
+        ('can_approve_members', ('can_approve_members',), None),
+        ('can_assign_roles', ('can_assign_roles',), None),
+        # UI-friendly aliases
+        ('user_name', ('user_name',), None),
+        ('role_name', ('RoleName',), None),
+    )
+
+    def __init__(self, OfficerRoleID, MembershipID, RoleName, RoleStart=None, RoleEnd=None, StartDate=None, EndDate=None,
+                 can_post_announcements=None, can_create_events=None, can_approve_members=None, can_assign_roles=None,
+                 user_name=None, **kwargs):
         self.OfficerRoleID = OfficerRoleID
         self.MembershipID = MembershipID
         self.RoleName = RoleName
@@ -59,13 +82,13 @@ class OfficerRole:
         self.RoleStart = RoleStart if RoleStart is not None else StartDate
         self.RoleEnd = RoleEnd if RoleEnd is not None else EndDate
         # permissions (stored as integers 0/1 in DB)
-        self.can_post_announcements = kwargs.get('can_post_announcements', getattr(self, 'can_post_announcements', None))
-        self.can_create_events = kwargs.get('can_create_events', getattr(self, 'can_create_events', None))
-        self.can_approve_members = kwargs.get('can_approve_members', getattr(self, 'can_approve_members', None))
-        self.can_assign_roles = kwargs.get('can_assign_roles', getattr(self, 'can_assign_roles', None))
+        self.can_post_announcements = can_post_announcements
+        self.can_create_events = can_create_events
+        self.can_approve_members = can_approve_members
+        self.can_assign_roles = can_assign_roles
+        self.user_name = user_name
 
-        for k, v in kwargs.items():
-            setattr(self, k, v)
+        self._extra = kwargs
 
     def to_dict(self):
         return {
@@ -74,11 +97,11 @@ class OfficerRole:
             "RoleName": self.RoleName,
             "RoleStart": self.RoleStart,
             "RoleEnd": self.RoleEnd,
-            "can_post_announcements": getattr(self, 'can_post_announcements', 0),
-            "can_create_events": getattr(self, 'can_create_events', 0),
-            "can_approve_members": getattr(self, 'can_approve_members', 0),
-            "can_assign_roles": getattr(self, 'can_assign_roles', 0),
+            "can_post_announcements": self.can_post_announcements,
+            "can_create_events": self.can_create_events,
+            "can_approve_members": self.can_approve_members,
+            "can_assign_roles": self.can_assign_roles,
             # UI-friendly aliases
-            "user_name": getattr(self, 'user_name', None),
-            "role_name": getattr(self, 'RoleName', None)
-        }
\ No newline at end of file
+            "user_name": self.user_name,
+            "role_name": self.RoleName
+        }
@@ -1,20 +1,42 @@
-class Organization:
-    def __init__(self, OrgID, OrgName, OrgDescription=None, Description=None, **kwargs):
+from .record import Record
+
+
+class Organization(Record):
+    __slots__ = ('OrgID', 'OrgName', 'OrgDescription', 'ApprovedCount', 'PendingCount', 'contact_email', 'created_at')
+
+    ROW_FIELDS = (
+        ('OrgID', ('OrgID',), None),
+        ('OrgName', ('OrgName',), None),
+        ('OrgDescription', ('OrgDescription', 'Description'), None),
+        # trigger-maintained membership counters (see migration 0005)
+        ('ApprovedCount', ('ApprovedCount',), None),
+        ('PendingCount', ('PendingCount',), None),
+        # optional UI fields
+        ('contact_email', ('contact_email',), None),
+        ('created_at', ('created_at',), None),
+    )
+
+    def __init__(self, OrgID, OrgName, OrgDescription=None, Description=None, ApprovedCount=None, PendingCount=None,
+                 contact_email=None, created_at=None, **kwargs):
         self.OrgID = OrgID
         self.OrgName = OrgName
         # Accept either OrgDescription or Description column names from DB/CSV
         self.OrgDescription = OrgDescription if OrgDescription is not None else Description
+        self.ApprovedCount = ApprovedCount
+        self.PendingCount = PendingCount
+        self.contact_email = contact_email
+        self.created_at = created_at
 
-        # Attach any additional fields silently to avoid unexpected kwarg errors
-        for k, v in kwargs.items():
-            setattr(self, k, v)
+        # Keep any additional fields silently to avoid unexpected kwarg errors
+        self._extra = kwargs
 
     def to_dict(self):
         return {
             "OrgID": self.OrgID,
             "OrgName": self.OrgName,
             "OrgDescription": self.OrgDescription,
-            # optional UI fields
-            "contact_email": getattr(self, 'contact_email', None),
-            "created_at": getattr(self, 'created_at', None)
-        }
\ No newline at end of file
+            "ApprovedCount": self.ApprovedCount,
+            "PendingCount": self.PendingCount,
+            "contact_email": self.contact_email,
+            "created_at": self.created_at
+        }
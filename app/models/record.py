@@ -0,0 +1,85 @@
+"""Shared base for the __slots__ models.
+
+Models are built once per row on every list endpoint, so they keep their
+fields in __slots__ instead of a per-instance __dict__. Columns a model
+doesn't declare are kept in one `_extra` dict; read them with get(). (A
+__getattr__ fallback would slow every attribute read.)
+
+Most callers only want the to_dict() mapping. Record.row_to_dict() and
+Record.rows_to_dicts() build it straight from a sqlite3.Row or plain tuple
+row, skipping the model instance. A subclass describes its output in
+ROW_FIELDS. For each cursor column layout the class compiles an
+itemgetter plan once and caches it.
+"""
+
+from operator import itemgetter
+
+# (model class, column names) -> compiled row mapper
+_MAPPERS = {}
+
+
+def _compile(cls, columns):
+    index = {name: i for i, name in enumerate(columns)}
+    template, keys, positions = {}, [], []
+    for key, sources, default in cls.ROW_FIELDS:
+        template[key] = default
+        for source in sources:
+            if source in index:
+                keys.append(key)
+                positions.append(index[source])
+                break
+    if not positions:
+        return lambda row: dict(template)
+    getter = itemgetter(*positions)
+    if len(positions) == 1:
+        key = keys[0]
+
+        def map_one(row):
+            d = dict(template)
+            d[key] = getter(row)
+            return d
+        return map_one
+    keys = tuple(keys)
+
+    def map_row(row):
+        # copying the template keeps to_dict() key order and fills defaults
+        d = dict(template)
+        d.update(zip(keys, getter(row)))
+        return d
+    return map_row
+
+
+class Record:
+    __slots__ = ('_extra',)
+
+    # (output key, candidate source columns (first present wins), default), in to_dict() order
+    ROW_FIELDS = ()
+
+    def get(self, name, default=None):
+        """Return a field or an undeclared extra column (kept in _extra), or default."""
+        try:
+            return getattr(self, name)
+        except AttributeError:
+            return self._extra.get(name, default)
+
+    @classmethod
+    def row_mapper(cls, columns):
+        """Return a function mapping a row laid out as `columns` to the to_dict() mapping."""
+        cache_key = (cls, tuple(columns))
+        mapper = _MAPPERS.get(cache_key)
+        if mapper is None:
+            mapper = _MAPPERS[cache_key] = _compile(cls, cache_key[1])
+        return mapper
+
+    @classmethod
+    def row_to_dict(cls, row, columns=None):
+        """to_dict() for one sqlite3.Row (or a tuple row plus its column names)."""
+        return cls.row_mapper(row.keys() if columns is None else columns)(row)
+
+    @classmethod
+    def rows_to_dicts(cls, rows, columns=None):
+        """to_dict() for every row of one result set; the column layout is resolved once."""
+        if not rows:
+            return []
+        mapper = cls.row_mapper(rows[0].keys() if columns is None else columns)
+        return [mapper(row) for row in rows]
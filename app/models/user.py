@@ -1,4 +1,17 @@
-class User:
+from .record import Record
+
+
+class User(Record):
+    __slots__ = ('UserID', 'FirstName', 'LastName', 'Email', 'PasswordHash')
+
+    # PasswordHash is never part of the serialized form
+    ROW_FIELDS = (
+        ('UserID', ('UserID',), None),
+        ('FirstName', ('FirstName',), None),
+        ('LastName', ('LastName',), None),
+        ('Email', ('Email',), None),
+    )
+
     def __init__(self, UserID, FirstName, LastName, Email, PasswordHash=None, **kwargs):
         # Core visible fields
         self.UserID = UserID
@@ -9,9 +22,8 @@ class User:
         # Internal / optional fields (keep but don't expose in to_dict)
         self.PasswordHash = PasswordHash
 
-        # Accept and ignore any additional fields coming from DB rows
-        for k, v in kwargs.items():
-            setattr(self, k, v)
+        # Accept any additional fields coming from DB rows
+        self._extra = kwargs
 
     def to_dict(self):
         # Do NOT include PasswordHash when serializing for responses
@@ -20,4 +32,4 @@ class User:
             "FirstName": self.FirstName,
             "LastName": self.LastName,
             "Email": self.Email
-        }
\ No newline at end of file
+        }
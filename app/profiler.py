@@ -0,0 +1,224 @@
+"""Opt-in sampled request profiler.
+
+With PROFILER_ENABLED on, init_profiler(app) profiles:
+  - a random PROFILE_SAMPLE_RATE fraction of requests (default 0: none), and
+  - any request carrying PROFILE_HEADER with a valid signed token (see
+    profile_token() / scripts/profile_token.py).
+Only requests to PROFILE_BLUEPRINTS are considered (default: the web pages).
+Unsampled requests pay one dict lookup and one random() call.
+
+PROFILE_MODE selects the profiler:
+  sample    a background thread samples the request thread's stack every
+            PROFILE_INTERVAL seconds and writes collapsed stacks (.collapsed),
+            ready for flamegraph.pl or speedscope. Low overhead.
+  cprofile  cProfile for the request thread, written as a pstats dump
+            (.pstats). Exact call counts, but it slows the request noticeably.
+Files go to PROFILE_DIR (default <instance_path>/profiles), named
+<timestamp>-<endpoint>-<duration>ms-<pid>. Only the newest
+PROFILE_MAX_FILES are kept. Profiled responses carry X-Profile-Id.
+/_profiles lists and downloads the files (same signed token).
+"""
+
+import cProfile
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from flask import current_app, g, request
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+
+DEFAULT_PROFILER_SETTINGS = {
+    'PROFILER_ENABLED': False,
+    'PROFILE_SAMPLE_RATE': 0.0,
+    'PROFILE_HEADER': 'X-Campus-Hub-Profile',
+    'PROFILE_TOKEN_MAX_AGE': 3600,      # seconds a signed token stays valid
+    'PROFILE_BLUEPRINTS': ('web',),     # None / empty: every request
+    'PROFILE_MODE': 'sample',           # 'sample' (collapsed stacks) or 'cprofile' (pstats)
+    'PROFILE_INTERVAL': 0.005,          # seconds between stack samples
+    'PROFILE_DIR': None,                # default: <instance_path>/profiles
+    'PROFILE_MAX_FILES': 200,
+}
+
+TOKEN_SALT = 'campus-hub-profile'
+PROFILE_NAME_RE = re.compile(r'^[0-9]+-[A-Za-z0-9_.]+-[0-9]+ms-[0-9]+\.(collapsed|pstats)$')
+
+
+def _setting(name, app=None):
+    value = (app or current_app).config.get(name)
+    return DEFAULT_PROFILER_SETTINGS[name] if value is None else value
+
+
+def profile_token(app):
+    """Signed token that enables profiling (PROFILE_HEADER) and the /_profiles endpoints."""
+    return URLSafeTimedSerializer(app.secret_key, salt=TOKEN_SALT).dumps('profile')
+
+
+def valid_token(token):
+    if not token:
+        return False
+    try:
+        URLSafeTimedSerializer(current_app.secret_key, salt=TOKEN_SALT).loads(
+            token, max_age=float(_setting('PROFILE_TOKEN_MAX_AGE')))
+    except BadSignature:
+        return False
+    return True
+
+
+def profile_dir():
+    path = _setting('PROFILE_DIR') or os.path.join(current_app.instance_path, 'profiles')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+class StackSampler:
+    """Samples one thread's Python stack from a helper thread; counts collapsed stacks."""
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='campus-hub-profiler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+                frame = frame.f_back
+            if stack:
+                self.counts[';'.join(reversed(stack))] += 1
+
+    def write(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.counts.most_common():
+                f.write(f'{stack} {count}\n')
+
+
+class CProfileRun:
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+
+    def start(self):
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+
+    def write(self, path):
+        self.profile.dump_stats(path)
+
+
+class RequestProfiler:
+    """Request hooks; settings are read once by init_profiler so the unsampled path stays cheap."""
+
+    def __init__(self, app):
+        self.rate = float(_setting('PROFILE_SAMPLE_RATE', app))
+        self.header = _setting('PROFILE_HEADER', app)
+        blueprints = _setting('PROFILE_BLUEPRINTS', app)
+        self.blueprints = frozenset(blueprints) if blueprints else None
+        self.mode = _setting('PROFILE_MODE', app)
+        self.interval = float(_setting('PROFILE_INTERVAL', app))
+        self._lock = threading.Lock()
+        self.profiled = 0
+
+    def _wanted(self):
+        if self.blueprints is not None and request.blueprint not in self.blueprints:
+            return False
+        token = request.headers.get(self.header)
+        if token is not None:
+            return valid_token(token)
+        return self.rate > 0 and random.random() < self.rate
+
+    def before_request(self):
+        if not self._wanted():
+            return
+        if self.mode == 'cprofile':
+            run = CProfileRun()
+        else:
+            run = StackSampler(threading.get_ident(), self.interval)
+        g._profile_run = (run, time.perf_counter())
+        run.start()
+
+    def after_request(self, response):
+        entry = g.pop('_profile_run', None)
+        if entry is None:
+            return response
+        run, start = entry
+        run.stop()
+        elapsed_ms = int((time.perf_counter() - start) * 1000)
+        endpoint = re.sub(r'[^A-Za-z0-9_.]', '_', request.endpoint or 'unmatched')
+        ext = 'pstats' if isinstance(run, CProfileRun) else 'collapsed'
+        name = f'{time.time_ns() // 1000}-{endpoint}-{elapsed_ms}ms-{os.getpid()}.{ext}'
+        try:
+            directory = profile_dir()
+            run.write(os.path.join(directory, name))
+            self._rotate(directory)
+        except OSError:
+            current_app.logger.exception('Could not write request profile')
+            return response
+        with self._lock:
+            self.profiled += 1
+        response.headers['X-Profile-Id'] = name
+        return response
+
+    def teardown_request(self, exc=None):
+        # after_request did not run (e.g. an unhandled exception): stop without writing
+        entry = g.pop('_profile_run', None)
+        if entry is not None:
+            entry[0].stop()
+
+    def _rotate(self, directory):
+        with self._lock:
+            names = sorted(n for n in os.listdir(directory) if PROFILE_NAME_RE.match(n))
+            for old in names[:max(0, len(names) - int(_setting('PROFILE_MAX_FILES')))]:
+                try:
+                    os.remove(os.path.join(directory, old))
+                except FileNotFoundError:
+                    pass
+
+
+def list_profiles():
+    """Profile files, newest first."""
+    directory = profile_dir()
+    profiles = []
+    for name in sorted(os.listdir(directory), reverse=True):
+        m = PROFILE_NAME_RE.match(name)
+        if not m:
+            continue
+        stamp, rest = name.split('-', 1)
+        endpoint, duration, _ = rest.rsplit('-', 2)
+        st = os.stat(os.path.join(directory, name))
+        profiles.append({
+            'name': name,
+            'endpoint': endpoint,
+            'duration_ms': int(duration[:-2]),
+            'format': m.group(1),
+            'size': st.st_size,
+            'created': int(stamp) / 1e6,
+        })
+    return profiles
+
+
+def init_profiler(app):
+    if not _setting('PROFILER_ENABLED', app):
+        return None
+    profiler = RequestProfiler(app)
+    app.extensions['campus_hub_profiler'] = profiler
+    app.before_request(profiler.before_request)
+    app.after_request(profiler.after_request)
+    app.teardown_request(profiler.teardown_request)
+    return profiler
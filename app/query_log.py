@@ -0,0 +1,230 @@
+"""Slow-query and repeated-query (N+1) findings, written as rotating JSONL.
+
+The instrumented connections (app/metrics.py) report statements run inside
+a tracked scope, which is every request plus any block wrapped in
+metrics.track_queries(). Two kinds of finding are written:
+  slow_query      a statement whose execute + fetch time reached
+                  DB_SLOW_QUERY_MS. The record includes its bound parameters
+                  (only when DB_QUERY_LOG_PARAMS is on) and its EXPLAIN QUERY
+                  PLAN. full_scan lists the tables read by a plain SCAN, i.e.
+                  without an index.
+  repeated_query  a statement shape (whitespace and literals normalised, IN
+                  lists collapsed) run more than DB_REPEAT_QUERY_THRESHOLD
+                  times in one scope. This is the usual sign of a per-row
+                  lookup that should be one batched query.
+Each finding is one JSON object per line in DB_QUERY_LOG (default
+<instance_path>/query_log.jsonl). The file rotates at
+DB_QUERY_LOG_MAX_BYTES. Each shape is logged at most once per
+DB_QUERY_LOG_INTERVAL seconds, so a hot path cannot flood the disk.
+"""
+
+import json
+import logging
+import logging.handlers
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from flask import current_app
+
+DEFAULT_QUERY_LOG_SETTINGS = {
+    'DB_SLOW_QUERY_MS': 200,            # None / 0 disables slow-query logging
+    'DB_REPEAT_QUERY_THRESHOLD': 20,    # None / 0 disables repeated-query detection
+    'DB_QUERY_LOG': None,               # default: <instance_path>/query_log.jsonl
+    'DB_QUERY_LOG_MAX_BYTES': 10 * 1024 * 1024,
+    'DB_QUERY_LOG_BACKUPS': 5,
+    'DB_QUERY_LOG_PARAMS': None,        # log bound parameters; default: only when debugging / testing
+    'DB_QUERY_LOG_INTERVAL': 60,        # seconds between findings for the same statement shape
+}
+
+MAX_SQL_CHARS = 2000
+MAX_PARAM_CHARS = 200
+EXPLAINABLE = ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST_RE = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+_SPACE_RE = re.compile(r'\s+')
+_SCAN_RE = re.compile(r'^SCAN (\w+)(?: AS \w+)?$')
+
+_shapes = {}
+_SHAPE_CACHE_SIZE = 4096
+
+
+def _setting(name):
+    value = current_app.config.get(name)
+    return DEFAULT_QUERY_LOG_SETTINGS[name] if value is None else value
+
+
+def slow_threshold():
+    """Slow-query threshold in seconds, or None when disabled."""
+    ms = _setting('DB_SLOW_QUERY_MS')
+    return float(ms) / 1000.0 if ms else None
+
+
+def repeat_threshold():
+    n = _setting('DB_REPEAT_QUERY_THRESHOLD')
+    return int(n) if n else None
+
+
+def statement_shape(sql):
+    """Normalised form of a statement, so the same query with other values counts as one."""
+    shape = _shapes.get(sql)
+    if shape is None:
+        shape = _STRING_RE.sub('?', sql)
+        shape = _NUMBER_RE.sub('?', shape)
+        shape = _IN_LIST_RE.sub('(?...)', shape)
+        shape = _SPACE_RE.sub(' ', shape).strip()
+        if len(_shapes) >= _SHAPE_CACHE_SIZE:
+            _shapes.clear()
+        _shapes[sql] = shape
+    return shape
+
+
+def _json_param(value):
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return f'<{len(value)} bytes>'
+    if isinstance(value, str) and len(value) > MAX_PARAM_CHARS:
+        return value[:MAX_PARAM_CHARS] + '...'
+    if value is None or isinstance(value, (int, float, str)):
+        return value
+    return str(value)[:MAX_PARAM_CHARS]
+
+
+def _json_params(parameters):
+    if isinstance(parameters, dict):
+        return {k: _json_param(v) for k, v in parameters.items()}
+    return [_json_param(v) for v in parameters]
+
+
+def explain(conn, sql, parameters=()):
+    """EXPLAIN QUERY PLAN details for sql, or None if it cannot be explained."""
+    if not sql.lstrip().upper().startswith(EXPLAINABLE):
+        return None
+    try:
+        # a plain cursor, so the EXPLAIN itself is not counted or logged
+        rows = sqlite3.Cursor(conn).execute('EXPLAIN QUERY PLAN ' + sql, parameters).fetchall()
+    except sqlite3.Error:
+        return None
+    return [row[3] for row in rows]
+
+
+def full_scans(plan):
+    """Tables the plan reads without an index."""
+    tables = []
+    for detail in plan or ():
+        m = _SCAN_RE.match(detail)
+        if m and m.group(1) != 'CONSTANT':
+            tables.append(m.group(1))
+    return tables
+
+
+class QueryLog:
+    """Rate-limited JSONL writer; the logging handler takes care of rotation and locking."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._logger = None
+        self._path = None
+        self._last = {}
+        self.written = 0
+        self.suppressed = 0
+
+    def _get_logger(self):
+        path = _setting('DB_QUERY_LOG') or os.path.join(current_app.instance_path, 'query_log.jsonl')
+        with self._lock:
+            if self._logger is None or self._path != path:
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+                handler = logging.handlers.RotatingFileHandler(
+                    path, maxBytes=int(_setting('DB_QUERY_LOG_MAX_BYTES')),
+                    backupCount=int(_setting('DB_QUERY_LOG_BACKUPS')), encoding='utf-8', delay=True)
+                handler.setFormatter(logging.Formatter('%(message)s'))
+                logger = logging.getLogger('campus_hub.query_log')
+                logger.propagate = False  # findings go to the JSONL file only
+                logger.setLevel(logging.INFO)
+                for old in list(logger.handlers):
+                    logger.removeHandler(old)
+                    old.close()
+                logger.addHandler(handler)
+                self._logger, self._path = logger, path
+            return self._logger
+
+    def _allow(self, key):
+        now = time.monotonic()
+        interval = float(_setting('DB_QUERY_LOG_INTERVAL'))
+        with self._lock:
+            last = self._last.get(key)
+            if last is not None and now - last < interval:
+                self.suppressed += 1
+                return False
+            if len(self._last) >= _SHAPE_CACHE_SIZE:
+                self._last.clear()
+            self._last[key] = now
+            return True
+
+    def write(self, finding):
+        if not self._allow((finding['kind'], finding['shape'])):
+            return False
+        finding = dict(finding, ts=datetime.now(timezone.utc).isoformat(timespec='milliseconds'), pid=os.getpid())
+        try:
+            self._get_logger().info(json.dumps(finding, default=str))
+        except OSError:
+            current_app.logger.exception('Could not write to the query log')
+            return False
+        with self._lock:
+            self.written += 1
+        return True
+
+    def reset(self):
+        with self._lock:
+            self._last.clear()
+            self.written = 0
+            self.suppressed = 0
+
+
+query_log = QueryLog()
+
+
+def _log_params():
+    value = current_app.config.get('DB_QUERY_LOG_PARAMS')
+    if value is None:
+        return bool(current_app.debug or current_app.testing)
+    return bool(value)
+
+
+def report_slow(conn, sql, parameters, elapsed, scope):
+    """Write a slow_query finding for one statement."""
+    shape = statement_shape(sql)
+    plan = explain(conn, sql, parameters) if parameters is not None else None
+    finding = {
+        'kind': 'slow_query',
+        'scope': scope,
+        'duration_ms': round(elapsed * 1000, 3),
+        'sql': sql[:MAX_SQL_CHARS],
+        'shape': shape[:MAX_SQL_CHARS],
+        'plan': plan,
+        'full_scan': full_scans(plan),
+    }
+    if _log_params() and parameters is not None:
+        finding['params'] = _json_params(parameters)
+    return query_log.write(finding)
+
+
+def report_repeats(shapes, threshold, scope):
+    """Write a repeated_query finding for each shape run more than threshold times; returns them."""
+    findings = []
+    for shape, (count, total, example) in shapes.items():
+        if count > threshold:
+            finding = {
+                'kind': 'repeated_query',
+                'scope': scope,
+                'count': count,
+                'total_ms': round(total * 1000, 3),
+                'sql': example[:MAX_SQL_CHARS],
+                'shape': shape[:MAX_SQL_CHARS],
+            }
+            query_log.write(finding)
+            findings.append(finding)
+    return findings
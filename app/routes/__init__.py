@@ -1,6 +1,6 @@
-from . import user_routes, organization_routes, event_routes, announcement_routes, membership_routes, officer_role_routes, web_routes
+from . import user_routes, organization_routes, event_routes, announcement_routes, membership_routes, officer_role_routes, web_routes, health_routes, upload_routes, metrics_routes, profile_routes
 
 __all__ = [
 	'user_routes', 'organization_routes', 'event_routes', 'announcement_routes',
-	'membership_routes', 'officer_role_routes', 'web_routes'
+	'membership_routes', 'officer_role_routes', 'web_routes', 'health_routes', 'upload_routes', 'metrics_routes', 'profile_routes'
 ]
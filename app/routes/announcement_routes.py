@@ -1,17 +1,37 @@
 from flask import Blueprint, request, jsonify
 from ..services.announcement_service import AnnouncementService
 from ..utils.errors import AppError
+from ..utils.export import export_response
+from ..utils.pagination import parse_page_args, paginated_response, int_filter
 
 bp = Blueprint('announcements', __name__, url_prefix='/announcements')
 
 @bp.route('/', methods=['GET'])
 def get_announcements():
-    return jsonify(AnnouncementService.get_all_announcements())
+    # keyset pagination: ?limit=&after=<last id>; next cursor in X-Next-Cursor / Link
+    after, limit = parse_page_args()
+    items, next_cursor = AnnouncementService.get_announcements_page(
+        after, limit,
+        org_id=int_filter('org_id'),
+        date_from=request.args.get('date_from'),
+        date_to=request.args.get('date_to'),
+        with_attachments=True,
+    )
+    return paginated_response(items, next_cursor, limit)
+
+@bp.route('/export', methods=['GET'])
+def export_announcements():
+    # streams every row as NDJSON (default) or CSV (?format=csv), optionally gzipped (?gzip=1)
+    return export_response(AnnouncementService.open_export_cursor(), 'announcements')
 
 @bp.route('/import', methods=['POST'])
 def import_announcements():
     file_path = request.json.get('file_path')
     if not file_path:
         raise AppError('INVALID_REQUEST', 'file_path is required')
+    # mode=bulk uses the chunked executemany importer and returns a per-row report
+    if (request.json.get('mode') or request.args.get('mode')) == 'bulk':
+        report = AnnouncementService.bulk_import_announcements_from_csv(file_path, request.json.get('chunk_size'))
+        return jsonify({'message': 'Announcements import finished', 'report': report})
     AnnouncementService.import_announcements_from_csv(file_path)
     return jsonify({'message': 'Announcements imported successfully'})
\ No newline at end of file
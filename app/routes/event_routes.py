@@ -1,17 +1,36 @@
 from flask import Blueprint, request, jsonify
 from ..services.event_service import EventService
 from ..utils.errors import AppError
+from ..utils.export import export_response
+from ..utils.pagination import parse_page_args, paginated_response, int_filter
 
 bp = Blueprint('events', __name__, url_prefix='/events')
 
 @bp.route('/', methods=['GET'])
 def get_events():
-    return jsonify(EventService.get_all_events())
+    # keyset pagination: ?limit=&after=<last id>; next cursor in X-Next-Cursor / Link
+    after, limit = parse_page_args()
+    items, next_cursor = EventService.get_events_page(
+        after, limit,
+        org_id=int_filter('org_id'),
+        date_from=request.args.get('date_from'),
+        date_to=request.args.get('date_to'),
+    )
+    return paginated_response(items, next_cursor, limit)
+
+@bp.route('/export', methods=['GET'])
+def export_events():
+    # streams every row as NDJSON (default) or CSV (?format=csv), optionally gzipped (?gzip=1)
+    return export_response(EventService.open_export_cursor(), 'events')
 
 @bp.route('/import', methods=['POST'])
 def import_events():
     file_path = request.json.get('file_path')
     if not file_path:
         raise AppError('INVALID_REQUEST', 'file_path is required')
+    # mode=bulk uses the chunked executemany importer and returns a per-row report
+    if (request.json.get('mode') or request.args.get('mode')) == 'bulk':
+        report = EventService.bulk_import_events_from_csv(file_path, request.json.get('chunk_size'))
+        return jsonify({'message': 'Events import finished', 'report': report})
     EventService.import_events_from_csv(file_path)
     return jsonify({'message': 'Events imported successfully'})
\ No newline at end of file
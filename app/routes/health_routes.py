@@ -0,0 +1,36 @@
+import os
+from flask import Blueprint, current_app, jsonify
+from ..services.seed_service import SeedService
+
+bp = Blueprint('health', __name__, url_prefix='/healthz')
+
+@bp.route('/live', methods=['GET'])
+def live():
+    # the process is up and serving requests
+    return jsonify({'status': 'ok'})
+
+@bp.route('/ready', methods=['GET'])
+def ready():
+    # not ready until the schema exists and the one-shot CSV seed job has finished
+    state = SeedService.get_state()
+    if state is None:
+        return jsonify({'status': 'not_ready', 'reason': 'schema not migrated'}), 503
+    seeding_off = current_app.config.get('SEED_MODE') == 'off' or os.environ.get('SKIP_AUTO_SEED') is not None
+    body = {
+        'seed': {
+            'status': state['status'],
+            'step': state['step'],
+            'steps_done': state['steps_done'],
+            'steps_total': state['steps_total'],
+            'detail': state['detail'],
+            'error': state['error'],
+        },
+    }
+    if state['status'] == 'done' or seeding_off:
+        body['status'] = 'ready'
+        return jsonify(body)
+    body['status'] = 'not_ready'
+    if state['status'] == 'failed':
+        # a crashed seed leaves the database partly empty: keep traffic away and say why
+        body['reason'] = 'seed failed: ' + (state['error'] or 'unknown error')
+    return jsonify(body), 503
@@ -1,17 +1,38 @@
 from flask import Blueprint, request, jsonify
 from ..services.membership_service import MembershipService
 from ..utils.errors import AppError
+from ..utils.export import export_response
+from ..utils.pagination import parse_page_args, paginated_response, int_filter
 
 bp = Blueprint('memberships', __name__, url_prefix='/memberships')
 
 @bp.route('/', methods=['GET'])
 def get_memberships():
-    return jsonify(MembershipService.get_all_memberships())
+    # keyset pagination: ?limit=&after=<last id>; next cursor in X-Next-Cursor / Link
+    after, limit = parse_page_args()
+    items, next_cursor = MembershipService.get_memberships_page(
+        after, limit,
+        org_id=int_filter('org_id'),
+        user_id=int_filter('user_id'),
+        status=request.args.get('status'),
+        date_from=request.args.get('date_from'),
+        date_to=request.args.get('date_to'),
+    )
+    return paginated_response(items, next_cursor, limit)
+
+@bp.route('/export', methods=['GET'])
+def export_memberships():
+    # streams every row as NDJSON (default) or CSV (?format=csv), optionally gzipped (?gzip=1)
+    return export_response(MembershipService.open_export_cursor(), 'memberships')
 
 @bp.route('/import', methods=['POST'])
 def import_memberships():
     file_path = request.json.get('file_path')
     if not file_path:
         raise AppError('INVALID_REQUEST', 'file_path is required')
+    # mode=bulk uses the chunked executemany importer and returns a per-row report
+    if (request.json.get('mode') or request.args.get('mode')) == 'bulk':
+        report = MembershipService.bulk_import_memberships_from_csv(file_path, request.json.get('chunk_size'))
+        return jsonify({'message': 'Memberships import finished', 'report': report})
     MembershipService.import_memberships_from_csv(file_path)
     return jsonify({'message': 'Memberships imported successfully'})
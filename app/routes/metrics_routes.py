@@ -0,0 +1,16 @@
+import hmac
+from flask import Blueprint, Response, jsonify, request
+from ..metrics import metrics, _setting
+
+bp = Blueprint('metrics', __name__)
+
+@bp.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    # Prometheus text exposition of this process's request / SQL / template metrics;
+    # per-endpoint traffic is not public, so it is only served to a scraper holding METRICS_TOKEN
+    token = _setting('METRICS_TOKEN')
+    if not _setting('METRICS_ENABLED') or not token:
+        return jsonify({'code': 'NOT_FOUND', 'error': 'Metrics are disabled'}), 404
+    if not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return jsonify({'code': 'FORBIDDEN', 'error': 'A valid metrics token is required'}), 403
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
@@ -1,17 +1,35 @@
 from flask import Blueprint, request, jsonify
 from ..services.officer_role_service import OfficerRoleService
 from ..utils.errors import AppError
+from ..utils.export import export_response
+from ..utils.pagination import parse_page_args, paginated_response, int_filter
 
 bp = Blueprint('officer_roles', __name__, url_prefix='/officer_roles')
 
 @bp.route('/', methods=['GET'])
 def get_officer_roles():
-    return jsonify(OfficerRoleService.get_all_officer_roles())
+    # keyset pagination: ?limit=&after=<last id>; next cursor in X-Next-Cursor / Link
+    after, limit = parse_page_args()
+    items, next_cursor = OfficerRoleService.get_officer_roles_page(
+        after, limit,
+        membership_id=int_filter('membership_id'),
+        org_id=int_filter('org_id'),
+    )
+    return paginated_response(items, next_cursor, limit)
+
+@bp.route('/export', methods=['GET'])
+def export_officer_roles():
+    # streams every row as NDJSON (default) or CSV (?format=csv), optionally gzipped (?gzip=1)
+    return export_response(OfficerRoleService.open_export_cursor(), 'officer_roles')
 
 @bp.route('/import', methods=['POST'])
 def import_officer_roles():
     file_path = request.json.get('file_path')
     if not file_path:
         raise AppError('INVALID_REQUEST', 'file_path is required')
+    # mode=bulk uses the chunked executemany importer and returns a per-row report
+    if (request.json.get('mode') or request.args.get('mode')) == 'bulk':
+        report = OfficerRoleService.bulk_import_officer_roles_from_csv(file_path, request.json.get('chunk_size'))
+        return jsonify({'message': 'Officer roles import finished', 'report': report})
     OfficerRoleService.import_officer_roles_from_csv(file_path)
     return jsonify({'message': 'Officer roles imported successfully'})
@@ -1,17 +1,31 @@
 from flask import Blueprint, request, jsonify
 from ..services.organization_service import OrgService
 from ..utils.errors import AppError
+from ..utils.export import export_response
+from ..utils.pagination import parse_page_args, paginated_response
 
 bp = Blueprint('organizations', __name__, url_prefix='/organizations')
 
 @bp.route('/', methods=['GET'])
 def get_organizations():
-    return jsonify(OrgService.get_all_organizations())
+    # keyset pagination: ?limit=&after=<last id>; next cursor in X-Next-Cursor / Link
+    after, limit = parse_page_args()
+    items, next_cursor = OrgService.get_organizations_page(after, limit)
+    return paginated_response(items, next_cursor, limit)
+
+@bp.route('/export', methods=['GET'])
+def export_organizations():
+    # streams every row as NDJSON (default) or CSV (?format=csv), optionally gzipped (?gzip=1)
+    return export_response(OrgService.open_export_cursor(), 'organizations')
 
 @bp.route('/import', methods=['POST'])
 def import_organizations():
     file_path = request.json.get('file_path')
     if not file_path:
         raise AppError('INVALID_REQUEST', 'file_path is required')
+    # mode=bulk uses the chunked executemany importer and returns a per-row report
+    if (request.json.get('mode') or request.args.get('mode')) == 'bulk':
+        report = OrgService.bulk_import_organizations_from_csv(file_path, request.json.get('chunk_size'))
+        return jsonify({'message': 'Organizations import finished', 'report': report})
     OrgService.import_organizations_from_csv(file_path)
     return jsonify({'message': 'Organizations imported successfully'})
\ No newline at end of file
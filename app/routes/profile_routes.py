@@ -0,0 +1,32 @@
+import os
+from flask import Blueprint, current_app, jsonify, request, send_file
+from ..profiler import PROFILE_NAME_RE, _setting, list_profiles, profile_dir, valid_token
+
+bp = Blueprint('profiles', __name__, url_prefix='/_profiles')
+
+def _check_access():
+    # profiles expose code paths and timings: same signed token as the profiling header,
+    # and only in the header (a query string ends up in access logs and browser history)
+    if 'campus_hub_profiler' not in current_app.extensions:
+        return jsonify({'code': 'NOT_FOUND', 'error': 'Profiling is disabled'}), 404
+    token = request.headers.get(_setting('PROFILE_HEADER'))
+    if not valid_token(token):
+        return jsonify({'code': 'FORBIDDEN', 'error': 'A valid profile token is required'}), 403
+    return None
+
+@bp.route('', methods=['GET'])
+def get_profiles():
+    denied = _check_access()
+    if denied:
+        return denied
+    return jsonify(list_profiles())
+
+@bp.route('/<name>', methods=['GET'])
+def download_profile(name):
+    denied = _check_access()
+    if denied:
+        return denied
+    path = os.path.join(profile_dir(), name) if PROFILE_NAME_RE.match(name) else None
+    if path is None or not os.path.exists(path):
+        return jsonify({'code': 'NOT_FOUND', 'error': 'Profile not found'}), 404
+    return send_file(path, mimetype='application/octet-stream', as_attachment=True, download_name=name)
@@ -0,0 +1,51 @@
+import os
+import re
+from flask import Blueprint, jsonify, send_file
+from ..services.upload_store import SNIFF_BYTES, UploadStore, inline_safe
+
+bp = Blueprint('uploads', __name__, url_prefix='/uploads')
+
+SHA256_RE = re.compile(r'^[0-9a-f]{64}$')
+VARIANT_RE = re.compile(r'^[a-z]+(-[0-9]+)?\.jpg$')
+# a blob URL names its content, so clients and proxies may cache it forever
+IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+# uploads are user content on the app's origin: even when opened directly,
+# a blob gets no scripts, forms or same-origin access
+UPLOAD_CSP = 'sandbox'
+
+@bp.route('/<sha256>', methods=['GET'])
+def get_blob(sha256):
+    return _send_blob(sha256, None)
+
+@bp.route('/<sha256>/<path:filename>', methods=['GET'])
+def get_blob_named(sha256, filename):
+    # the filename only sets the download name; the hash selects the content
+    return _send_blob(sha256, os.path.basename(filename))
+
+@bp.route('/variants/<sha256>/<name>', methods=['GET'])
+def get_variant(sha256, name):
+    # thumbnails / web-sized images / posters; the name encodes the size, so these are immutable too
+    path = UploadStore.variant_path(sha256, name) if SHA256_RE.match(sha256) and VARIANT_RE.match(name) else None
+    if path is None or not os.path.exists(path):
+        return jsonify({'code': 'NOT_FOUND', 'error': 'Variant not found'}), 404
+    resp = send_file(path, mimetype='image/jpeg', conditional=True, max_age=31536000)
+    resp.headers['Cache-Control'] = IMMUTABLE_CACHE
+    resp.headers['X-Content-Type-Options'] = 'nosniff'
+    resp.headers['Content-Security-Policy'] = UPLOAD_CSP
+    return resp
+
+def _send_blob(sha256, filename):
+    blob = UploadStore.get_blob(sha256) if SHA256_RE.match(sha256) else None
+    path = UploadStore.blob_path(sha256) if blob is not None else None
+    if blob is None or not os.path.exists(path):
+        return jsonify({'code': 'NOT_FOUND', 'error': 'Upload not found'}), 404
+    mimetype = blob['MimeType'] or 'application/octet-stream'
+    # the stored type was declared by the uploader; only render inline what the bytes confirm
+    with open(path, 'rb') as f:
+        inline = inline_safe(mimetype, f.read(SNIFF_BYTES))
+    resp = send_file(path, mimetype=mimetype, conditional=True, etag=sha256, max_age=31536000,
+                     as_attachment=not inline, download_name=filename or sha256)
+    resp.headers['Cache-Control'] = IMMUTABLE_CACHE
+    resp.headers['X-Content-Type-Options'] = 'nosniff'
+    resp.headers['Content-Security-Policy'] = UPLOAD_CSP
+    return resp
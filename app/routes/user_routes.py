@@ -1,17 +1,31 @@
 from flask import Blueprint, request, jsonify
 from ..services.user_service import UserService
 from ..utils.errors import AppError
+from ..utils.export import export_response
+from ..utils.pagination import parse_page_args, paginated_response
 
 bp = Blueprint('users', __name__, url_prefix='/users')
 
 @bp.route('/', methods=['GET'])
 def get_users():
-    return jsonify(UserService.get_all_users())
+    # keyset pagination: ?limit=&after=<last id>; next cursor in X-Next-Cursor / Link
+    after, limit = parse_page_args()
+    items, next_cursor = UserService.get_users_page(after, limit, email=request.args.get('email'))
+    return paginated_response(items, next_cursor, limit)
+
+@bp.route('/export', methods=['GET'])
+def export_users():
+    # streams every row as NDJSON (default) or CSV (?format=csv), optionally gzipped (?gzip=1)
+    return export_response(UserService.open_export_cursor(), 'users')
 
 @bp.route('/import', methods=['POST'])
 def import_users():
     file_path = request.json.get('file_path')
     if not file_path:
         raise AppError('INVALID_REQUEST', 'file_path is required')
+    # mode=bulk uses the chunked executemany importer and returns a per-row report
+    if (request.json.get('mode') or request.args.get('mode')) == 'bulk':
+        report = UserService.bulk_import_users_from_csv(file_path, request.json.get('chunk_size'))
+        return jsonify({'message': 'Users import finished', 'report': report})
     UserService.import_users_from_csv(file_path)
     return jsonify({'message': 'Users imported successfully'})
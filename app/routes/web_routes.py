@@ -5,6 +5,11 @@ from ..services.announcement_service import AnnouncementService
 from ..services.membership_service import MembershipService
 from ..services.user_service import UserService
 from ..services.officer_role_service import OfficerRoleService
+from ..services.search_service import SearchService
+from ..services.feed_service import FeedService
+from ..services.name_resolver import get_creator_resolver
+from ..services.upload_store import DEFAULT_UPLOAD_SETTINGS, UploadStore
+from ..utils.errors import AppError
 import functools
 
 
@@ -20,29 +25,11 @@ def login_required(view_func):
 
 bp = Blueprint('web', __name__)
 
+# organizations listed in the home page sidebar
+HOME_ORG_COUNT = 10
+# organizations per page of the /orgs directory
+ORG_PAGE_SIZE = 50
 
-def _resolve_creator_name(created_by, user_map):
-    """Resolve a CreatedBy value to a human-friendly name.
-    CreatedBy may be a UserID or an OfficerRoleID. Try user_map first, then
-    fall back to resolving officer_role -> membership -> user.
-    """
-    if created_by is None:
-        return None
-    try:
-        cid = int(created_by)
-    except Exception:
-        return None
-
-    # direct user id mapping
-    if cid in user_map:
-        return user_map[cid]
-
-    # fall back: CreatedBy may be an OfficerRoleID
-    orow = OfficerRoleService.get_user_by_officer_role(cid)
-    if orow:
-        return f"{orow.get('FirstName')} {orow.get('LastName')}"
-
-    return None
 
 # Use the raw dicts returned by service.get_all_*() so templates can rely on
 # canonical model keys (OrgID, OrgName, OrgDescription, EventName, EventDescription, EventDate, etc.)
@@ -50,101 +37,73 @@ def _resolve_creator_name(created_by, user_map):
 
 @bp.route('/')
 def home():
-    # Pass raw service outputs (lists of dicts using model.to_dict())
-    orgs = OrgService.get_all_organizations()
-    events = EventService.get_all_events()
-    announcements = AnnouncementService.get_all_announcements()
-    # show newest announcements first (DatePosted or created_at)
+    # the sidebar lists the most popular orgs, not every org on every page view
+    orgs = OrgService.get_popular_organizations(HOME_ORG_COUNT)
+    events = EventService.get_next_events(5)
+
+    # newest page of the materialized feed (announcements + events);
+    # ?before=<FeedItemID> continues from the previous page
     try:
-        announcements = sorted(announcements, key=lambda a: a.get('DatePosted') or a.get('created_at') or '', reverse=True)
-    except Exception as e:
-        current_app.logger.exception('Failed to sort announcements in home')
-        # fallback: leave order unchanged
-        pass
-
-    # map creators for announcements so we can show human-friendly names in the feed
-    users = UserService.get_all_users()
-    user_map = { u['UserID']: f"{u['FirstName']} {u['LastName']}" for u in users }
-    ann_mapped = []
-    for a in announcements:
-        ad = dict(a)
-        ad['CreatorName'] = _resolve_creator_name(a.get('CreatedBy'), user_map)
-        ann_mapped.append(ad)
-    announcements = ann_mapped
-
-    # joined_orgs: if user logged in, show organizations they're a member of
+        before = int(request.args['before']) if request.args.get('before') else None
+    except ValueError:
+        before = None
+    feed_items, next_cursor = FeedService.get_feed_page(before)
+    # the feed cards render attachments: one batched query for this page
+    AnnouncementService.load_attachments([i for i in feed_items if i['ItemType'] == 'announcement'])
+
+    # map creators so we can show human-friendly names in the feed
+    # (only the ids on this page are resolved, in batched queries)
+    feed_items = get_creator_resolver().annotate(feed_items)
+
+    # joined_orgs: if user logged in, show the organizations with an approved membership
     joined = []
     user_id = session.get('user_id')
     if user_id:
-        memberships = MembershipService.get_all_memberships()
-        org_map = {o['OrgID']: o for o in orgs}
-        for m in memberships:
-            try:
-                # Only include approved memberships in the joined organizations list.
-                status = (m.get('Status') or m.get('status') or '').lower()
-                if status != 'approved':
-                    continue
+        try:
+            joined = OrgService.get_orgs_for_user(int(user_id), status='approved')
+        except (TypeError, ValueError) as e:
+            current_app.logger.debug('Invalid session user id while building joined orgs: %s', e)
+
+    return render_template('home.html', joined_orgs=joined, feed_items=feed_items, next_cursor=next_cursor, events=events, orgs=orgs)
 
-                if int(m.get('UserID')) == int(user_id):
-                    org = org_map.get(int(m.get('OrgID')))
-                    if org and org not in joined:
-                        joined.append(org)
-            except Exception as e:
-                # non-fatal per-row problem; log and continue
-                current_app.logger.debug('Skipping membership row while building joined orgs: %s', e)
-                continue
 
-    return render_template('home.html', joined_orgs=joined, announcements=announcements, events=events, orgs=orgs)
+@bp.route('/orgs')
+def organizations():
+    # every organization, one keyset page at a time; ?after=<OrgID> continues
+    # from the previous page (the home sidebar only lists the popular ones)
+    try:
+        after = int(request.args['after']) if request.args.get('after') else None
+    except ValueError:
+        after = None
+    orgs, next_cursor = OrgService.get_organizations_page(after, ORG_PAGE_SIZE)
+    return render_template('organizations.html', orgs=orgs, next_cursor=next_cursor)
 
 
 @bp.route('/orgs/<int:org_id>')
 def org_detail(org_id):
-    orgs = OrgService.get_all_organizations()
-    org = next((o for o in orgs if int(o.get('OrgID')) == org_id), None)
+    org = OrgService.get_org_by_id(org_id)
     if not org:
         return redirect(url_for('web.home'))
 
     org_t = org
 
-    # member count (only count approved memberships, exclude pending/rejected)
-    memberships = MembershipService.get_all_memberships()
-    def _get_status(m):
-        try:
-            return (m.get('Status') or m.get('status') or '').lower()
-        except Exception:
-            return ''
-    def _is_approved(m):
-        return _get_status(m) == 'approved'
-    def _is_pending(m):
-        return _get_status(m) == 'pending'
-
-    member_count = sum(1 for m in memberships if int(m.get('OrgID') or 0) == org_id and _is_approved(m))
-    pending_count = sum(1 for m in memberships if int(m.get('OrgID') or 0) == org_id and _is_pending(m))
+    # member count (only approved memberships) and pending badge come from the
+    # trigger-maintained counters on the org row
+    member_count = org.get('ApprovedCount') or 0
+    pending_count = org.get('PendingCount') or 0
 
     # officers: fetch via service helper which joins officer_roles -> memberships -> users
     officers = OfficerRoleService.get_officers_by_org(org_id)
 
-    # announcements and events filtered by org (keep canonical keys)
-    announcements = [a for a in AnnouncementService.get_all_announcements() if int(a.get('OrgID') or 0) == org_id]
-    try:
-        announcements = sorted(announcements, key=lambda a: a.get('DatePosted') or a.get('created_at') or '', reverse=True)
-    except Exception as e:
-        current_app.logger.exception('Failed to sort announcements in org_detail')
-        pass
-    events = [e for e in EventService.get_all_events() if int(e.get('OrgID') or 0) == org_id]
-
-    # map announcement creators as well (they may be officer role ids)
-    ann_mapped = []
-    for a in announcements:
-        ad = dict(a)
-        # try to resolve CreatedBy to a human-friendly name
-        users = UserService.get_all_users()
-        user_map_local = { u['UserID']: f"{u['FirstName']} {u['LastName']}" for u in users }
-        ad['CreatorName'] = _resolve_creator_name(a.get('CreatedBy'), user_map_local)
-        ann_mapped.append(ad)
+    # announcements (newest first) and events for this org (keep canonical keys)
+    announcements = AnnouncementService.load_attachments(AnnouncementService.get_announcements_by_org(org_id))
+    events = EventService.get_events_by_org(org_id)
+
+    # map announcement and event creators (they may be officer role ids) in one batch
+    resolver = get_creator_resolver()
+    resolver.prime([a.get('CreatedBy') for a in announcements] + [e.get('CreatedBy') for e in events])
+    ann_mapped = resolver.annotate([dict(a) for a in announcements])
     # Map events into the shape the template expects (Description key and CreatorName)
-    users = UserService.get_all_users()
-    user_map = { u['UserID']: f"{u['FirstName']} {u['LastName']}" for u in users }
     ev_mapped = [
         {
             'EventID': e.get('EventID'),
@@ -153,7 +112,7 @@ def org_detail(org_id):
             'EventDate': e.get('EventDate'),
             'Location': e.get('Location'),
             'CreatedBy': e.get('CreatedBy'),
-            'CreatorName': _resolve_creator_name(e.get('CreatedBy'), user_map)
+            'CreatorName': resolver.name(e.get('CreatedBy'))
         }
         for e in events
     ]
@@ -179,15 +138,7 @@ def org_detail(org_id):
     if session.get('user_id'):
         try:
             uid = int(session.get('user_id'))
-            memberships = MembershipService.get_all_memberships()
-            for m in memberships:
-                try:
-                    if int(m.get('UserID') or 0) == uid and int(m.get('OrgID') or 0) == org_id:
-                        user_membership = m
-                        break
-                except Exception as e:
-                    current_app.logger.debug('Skipping membership row when determining user_membership: %s', e)
-                    continue
+            user_membership = MembershipService.get_membership_by_user_and_org(uid, org_id)
         except Exception as e:
             current_app.logger.exception('Error determining user membership for org_detail')
             user_membership = None
@@ -223,8 +174,7 @@ def org_detail(org_id):
 @login_required
 def org_admin(org_id):
     # Verify org exists
-    orgs = OrgService.get_all_organizations()
-    org = next((o for o in orgs if int(o.get('OrgID')) == org_id), None)
+    org = OrgService.get_org_by_id(org_id)
     if not org:
         return redirect(url_for('web.home'))
 
@@ -237,8 +187,7 @@ def org_admin(org_id):
 
     # memberships for this org
     memberships = MembershipService.get_memberships_by_org(org_id)
-    users = UserService.get_all_users()
-    user_map = { u['UserID']: f"{u['FirstName']} {u['LastName']}" for u in users }
+    user_map = get_creator_resolver().user_names(m.get('UserID') for m in memberships)
 
     # annotate memberships with user names
     for m in memberships:
@@ -252,9 +201,10 @@ def org_admin(org_id):
     # fetch current officers for sidebar using join helper
     officers = OfficerRoleService.get_officers_by_org(org_id)
 
-    member_count = sum(1 for m in memberships if (m.get('Status') or '').lower() == 'approved')
+    member_count = org.get('ApprovedCount') or 0
+    pending_count = org.get('PendingCount') or 0
 
-    return render_template('org_admin.html', org=org, memberships=memberships, pending_memberships=pending, officers=officers, member_count=member_count)
+    return render_template('org_admin.html', org=org, memberships=memberships, pending_memberships=pending, officers=officers, member_count=member_count, pending_count=pending_count)
 
 
 @bp.route('/orgs/<int:org_id>/admin/approve', methods=['POST'])
@@ -349,16 +299,8 @@ def request_join(org_id):
     if not user_id:
         return redirect(url_for('web.login') + f'?next={request.path}')
 
-    # check existing membership
-    existing = None
-    memberships = MembershipService.get_all_memberships()
-    for m in memberships:
-        try:
-            if int(m.get('UserID') or 0) == int(user_id) and int(m.get('OrgID') or 0) == org_id:
-                existing = m
-                break
-        except Exception:
-            continue
+    # check existing membership (served by idx_memberships_user_org)
+    existing = MembershipService.get_membership_by_user_and_org(user_id, org_id)
 
     if existing:
         status = (existing.get('Status') or '').lower()
@@ -380,14 +322,11 @@ def request_join(org_id):
 
 @bp.route('/events/<int:event_id>')
 def event_detail(event_id):
-    events = EventService.get_all_events()
-    ev = next((e for e in events if int(e.get('EventID') or 0) == event_id), None)
+    ev = EventService.get_event_by_id(event_id)
     if not ev:
         return redirect(url_for('web.home'))
     # try to map CreatedBy to a human-friendly name when possible
-    users = UserService.get_all_users()
-    user_map = { u['UserID']: f"{u['FirstName']} {u['LastName']}" for u in users }
-    creator_name = _resolve_creator_name(ev.get('CreatedBy'), user_map)
+    creator_name = get_creator_resolver().name(ev.get('CreatedBy'))
     # attach CreatorName and ensure a 'Description' key for templates
     ev_display = dict(ev)
     ev_display['CreatorName'] = creator_name
@@ -406,57 +345,23 @@ def search():
     if not q:
         return render_template('search_results.html', query=q, results=results)
 
-    ql = q.lower()
-    try:
-        orgs = OrgService.get_all_organizations()
-        for o in orgs:
-            name = (o.get('OrgName') or '')
-            desc = (o.get('OrgDescription') or '')
-            if ql in name.lower() or ql in desc.lower():
-                results['orgs'].append(o)
-    except Exception:
-        current_app.logger.exception('Failed searching organizations')
-
-    try:
-        ann = AnnouncementService.get_all_announcements()
-        for a in ann:
-            title = (a.get('Title') or '')
-            body = (a.get('Content') or '')
-            if ql in title.lower() or ql in body.lower():
-                results['announcements'].append(a)
-    except Exception:
-        current_app.logger.exception('Failed searching announcements')
-
     try:
-        evs = EventService.get_all_events()
-        for e in evs:
-            ename = (e.get('EventName') or '')
-            edesc = (e.get('EventDescription') or '')
-            if ql in (ename or '').lower() or ql in (edesc or '').lower():
-                results['events'].append(e)
-    except Exception:
-        current_app.logger.exception('Failed searching events')
-
+        page = int(request.args.get('page') or 1)
+    except ValueError:
+        page = 1
+    # ranked (BM25), paginated results from the FTS5 index
+    results = SearchService.search(q, page=page)
     return render_template('search_results.html', query=q, results=results)
 
 
 @bp.route('/events')
 def events():
-    # list all events (sorted ascending by EventDate when available)
-    events = EventService.get_all_events()
-    try:
-        events = sorted(events, key=lambda e: e.get('EventDate') or '')
-    except Exception:
-        pass
+    # list all events in date order (EventDateTs index; mixed date formats sort correctly)
+    events = EventService.get_events_between()
     # map creator names where possible
-    users = UserService.get_all_users()
-    user_map = { u['UserID']: f"{u['FirstName']} {u['LastName']}" for u in users }
-    ev_mapped = []
-    for e in events:
-        ed = dict(e)
-        ed['CreatorName'] = _resolve_creator_name(e.get('CreatedBy'), user_map)
-        ed['Description'] = e.get('EventDescription') or e.get('Description') or ''
-        ev_mapped.append(ed)
+    ev_mapped = get_creator_resolver().annotate([dict(e) for e in events])
+    for ed in ev_mapped:
+        ed['Description'] = ed.get('EventDescription') or ed.get('Description') or ''
     return render_template('events.html', events=ev_mapped)
 
 
@@ -545,32 +450,25 @@ def create_announcement(org_id):
                     for url in [u.strip() for u in links_raw.split(',') if u.strip()]:
                         attachments.append({'type': 'link', 'url': url})
 
-                # files
+                # files: streamed into the content-addressed store (identical files are stored once)
                 from werkzeug.utils import secure_filename
-                import os, time, random, string, mimetypes, json
-                upload_dir = os.path.join(current_app.root_path, 'static', 'uploads')
-                os.makedirs(upload_dir, exist_ok=True)
-                files = request.files.getlist('attachments')
-                for f in files:
-                    if not f or f.filename == '':
-                        continue
-                    filename = secure_filename(f.filename)
-                    # prefix with timestamp/random to avoid collisions
-                    prefix = str(int(time.time())) + '_' + ''.join(random.choices(string.ascii_lowercase+string.digits, k=6))
-                    dest_name = f"{prefix}_{filename}"
-                    dest_path = os.path.join(upload_dir, dest_name)
-                    f.save(dest_path)
-                    mime = f.mimetype or mimetypes.guess_type(dest_name)[0] or ''
-                    url_path = url_for('static', filename=f'uploads/{dest_name}')
-                    # categorize attachment by mime
-                    atype = 'file'
-                    if mime.startswith('image/'):
-                        atype = 'image'
-                    elif mime.startswith('video/'):
-                        atype = 'video'
-                    attachments.append({'type': atype, 'url': url_path, 'filename': dest_name, 'mimetype': mime})
-
-                # store attachments as JSON in DB
+                per_file = int(current_app.config.get('UPLOAD_MAX_FILE_BYTES') or DEFAULT_UPLOAD_SETTINGS['UPLOAD_MAX_FILE_BYTES'])
+                budget = int(current_app.config.get('UPLOAD_MAX_REQUEST_BYTES') or DEFAULT_UPLOAD_SETTINGS['UPLOAD_MAX_REQUEST_BYTES'])
+                try:
+                    for f in request.files.getlist('attachments'):
+                        if not f or f.filename == '':
+                            continue
+                        f.filename = secure_filename(f.filename)
+                        saved = UploadStore.save_upload(f, max_bytes=min(per_file, budget))
+                        budget -= saved['size']
+                        attachments.append(saved)
+                except AppError as e:
+                    if e.code != 'UPLOAD_TOO_LARGE':
+                        raise
+                    error = e.message
+
+            if not error:
+                # stored as announcement_attachments rows
                 AnnouncementService.create_announcement(org_id, created_by, title, content, None, attachments)
                 flash('Announcement posted')
             else:
@@ -640,12 +538,12 @@ def profile():
     # prefer the UserService helper
     user = UserService.get_user_row_by_id(user_id)
     # build user's organizations and roles for display
-    orgs = OrgService.get_all_organizations()
-    memberships = MembershipService.get_all_memberships()
-    officer_roles = OfficerRoleService.get_all_officer_roles()
+    # (only this user's rows: memberships, their orgs and roles, one query each)
+    orgs_by_id = {int(o['OrgID']): o for o in OrgService.get_orgs_for_user(user_id)}
+    memberships = MembershipService.get_memberships_by_user(user_id)
     # map membership id -> list of role names
     role_map = {}
-    for r in officer_roles:
+    for r in OfficerRoleService.get_roles_for_user(user_id):
         try:
             mid = int(r.get('MembershipID') or 0)
             if mid:
@@ -656,18 +554,14 @@ def profile():
     user_orgs = []
     for m in memberships:
         try:
-            if int(m.get('UserID') or 0) != int(user_id):
-                continue
-            oid = int(m.get('OrgID') or 0)
-            org = next((o for o in orgs if int(o.get('OrgID') or 0) == oid), None)
+            org = orgs_by_id.get(int(m.get('OrgID') or 0))
             roles = role_map.get(int(m.get('MembershipID') or 0), [])
             user_orgs.append({'org': org, 'membership': m, 'roles': roles})
         except Exception:
             continue
 
     # basic activity counts
-    announcements = AnnouncementService.get_all_announcements()
-    user_ann_count = sum(1 for a in announcements if str(a.get('CreatedBy')) == str(user_id) or a.get('CreatedBy') in (None, ''))
+    user_ann_count = AnnouncementService.count_for_user(user_id)
 
     # determine create permissions across user's organizations and pick a default org
     can_post_announcements_any = False
@@ -676,13 +570,15 @@ def profile():
     create_event_org_id = None
     try:
         uid = int(user_id)
+        # one query for every org instead of a permission lookup per org
+        perms_by_org = OfficerRoleService.user_permissions_for_all_orgs(uid)
         for uo in user_orgs:
             try:
                 org_obj = uo.get('org')
                 if not org_obj:
                     continue
                 oid = int(org_obj.get('OrgID') or 0)
-                perms = OfficerRoleService.user_permissions_for_org(oid, uid)
+                perms = perms_by_org.get(oid) or {}
                 if perms.get('can_post_announcements'):
                     can_post_announcements_any = True
                     if create_ann_org_id is None:
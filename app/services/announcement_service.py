@@ -1,10 +1,14 @@
 import csv
-import json
 import sqlite3
 from flask import current_app
-from ..database import get_db
+from ..database import get_db, get_read_db
 from ..models.announcement import Announcement
+from ..utils.dates import epoch_now, parse_bound, to_epoch
 from ..utils.errors import AppError
+from ..utils.pagination import keyset_page
+from .bulk_import import ImportSpec, bulk_import_csv
+from .derivatives import DerivativeService
+from .feed_service import FeedService
 
 class AnnouncementService:
 
@@ -12,28 +16,34 @@ class AnnouncementService:
     def create_announcement(org_id, created_by, title, content, date_posted, attachments=None):
         db = get_db()
         try:
-            att_val = None
-            if attachments:
-                try:
-                    att_val = json.dumps(attachments)
-                except (TypeError, ValueError) as e:
-                    current_app.logger.debug('Invalid attachments value; storing as NULL: %s', e)
-                    att_val = None
-
             # If date_posted is None, omit the DatePosted column so the
             # database DEFAULT (CURRENT_TIMESTAMP) is applied. Inserting
             # a NULL value would override the default and leave DatePosted empty.
+            # DatePostedTs is the parsed sort key (now, for the DEFAULT case)
             if date_posted is None:
-                db.execute(
-                    'INSERT INTO announcements (OrgID, CreatedBy, Title, Content, Attachments) VALUES (?, ?, ?, ?, ?)',
-                    (org_id, created_by, title, content, att_val)
+                cur = db.execute(
+                    'INSERT INTO announcements (OrgID, CreatedBy, Title, Content, DatePostedTs) VALUES (?, ?, ?, ?, ?)',
+                    (org_id, created_by, title, content, epoch_now())
                 )
             else:
-                db.execute(
-                    'INSERT INTO announcements (OrgID, CreatedBy, Title, Content, DatePosted, Attachments) VALUES (?, ?, ?, ?, ?, ?)',
-                    (org_id, created_by, title, content, date_posted, att_val)
+                cur = db.execute(
+                    'INSERT INTO announcements (OrgID, CreatedBy, Title, Content, DatePosted, DatePostedTs) VALUES (?, ?, ?, ?, ?, ?)',
+                    (org_id, created_by, title, content, date_posted, to_epoch(date_posted))
+                )
+            announcement_id = cur.lastrowid
+            rows = AnnouncementService._attachment_rows(announcement_id, attachments)
+            if rows:
+                db.executemany(
+                    'INSERT INTO announcement_attachments (AnnouncementID, Position, Type, Url, Filename, MimeType, BlobSha256, VariantStatus) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                    rows
                 )
+            # fan out to the home feed in the same transaction
+            FeedService.publish(db, 'announcement', announcement_id)
             db.commit()
+            if any(r[7] == 'pending' for r in rows):
+                # thumbnails / web-sized images / posters, built off the request path
+                DerivativeService.enqueue(announcement_id)
+            return announcement_id
         except sqlite3.DatabaseError as e:
             current_app.logger.exception('Database error while creating announcement')
             raise AppError('DB_ERROR', 'Could not create announcement', original_exception=e)
@@ -41,27 +51,154 @@ class AnnouncementService:
             current_app.logger.exception('Unexpected error while creating announcement')
             raise AppError('DB_ERROR', 'Could not create announcement', original_exception=e)
 
+    @staticmethod
+    def _attachment_rows(announcement_id, attachments):
+        """announcement_attachments parameter tuples for a list of {type, url, filename, mimetype[, sha256]} dicts.
+
+        sha256 links the row to an UploadStore blob, whose refcount the insert trigger bumps;
+        blob-backed images and videos are marked pending for the derivative workers.
+        """
+        rows = []
+        for position, a in enumerate(attachments or ()):
+            if isinstance(a, str):
+                a = {'type': 'link', 'url': a}
+            if not isinstance(a, dict) or not a.get('url'):
+                current_app.logger.debug('Skipping invalid attachment value: %r', a)
+                continue
+            mimetype = a.get('mimetype') or ''
+            pending = 'pending' if a.get('sha256') and mimetype.startswith(('image/', 'video/')) else None
+            rows.append((announcement_id, position, a.get('type') or 'file', a['url'], a.get('filename'), a.get('mimetype'), a.get('sha256'), pending))
+        return rows
+
+    @staticmethod
+    def get_attachments_by_announcement_ids(announcement_ids):
+        """Return {AnnouncementID: [attachment dict, ...]} for the given ids (one query)."""
+        ids = list(announcement_ids)
+        if not ids:
+            return {}
+        rows = get_read_db().execute(
+            f"SELECT AnnouncementID, Type, Url, Filename, MimeType, BlobSha256, ThumbUrl, WebUrl, PosterUrl FROM announcement_attachments WHERE AnnouncementID IN ({','.join('?' for _ in ids)}) ORDER BY AnnouncementID, Position",
+            ids
+        ).fetchall()
+        result = {}
+        for row in rows:
+            result.setdefault(row['AnnouncementID'], []).append(
+                {'type': row['Type'], 'url': row['Url'], 'filename': row['Filename'], 'mimetype': row['MimeType'], 'sha256': row['BlobSha256'],
+                 'thumb_url': row['ThumbUrl'], 'web_url': row['WebUrl'], 'poster_url': row['PosterUrl']})
+        return result
+
+    @staticmethod
+    def load_attachments(announcements):
+        """Fill 'Attachments' on announcement dicts in place, in one query; returns the list.
+
+        Listings leave Attachments as None, so only pages that render
+        attachments pay for them. AttachmentCount skips the query for
+        announcements that have none.
+        """
+        wanted = [a['AnnouncementID'] for a in announcements if a.get('AttachmentCount')]
+        by_id = AnnouncementService.get_attachments_by_announcement_ids(wanted)
+        for a in announcements:
+            a['Attachments'] = by_id.get(a['AnnouncementID']) or None
+        return announcements
+
     @staticmethod
     def get_all_announcements():
-        db = get_db()
+        db = get_read_db()
         # select only the announcement fields used by the model (exclude audit columns)
-        rows = db.execute('SELECT AnnouncementID, OrgID, CreatedBy, Title, Content, DatePosted, Attachments FROM announcements').fetchall()
-        import json
-        out = []
-        for row in rows:
-            d = dict(row)
-            # parse Attachments JSON if present
-            att = d.get('Attachments')
-            if att and isinstance(att, str):
-                try:
-                    d['Attachments'] = json.loads(att)
-                except json.JSONDecodeError as e:
-                    current_app.logger.debug('Failed to parse attachments JSON: %s', e)
-                    d['Attachments'] = None
-                except Exception:
-                    d['Attachments'] = None
-            out.append(Announcement(**d).to_dict())
-        return out
+        rows = db.execute('SELECT AnnouncementID, OrgID, CreatedBy, Title, Content, DatePosted, AttachmentCount FROM announcements').fetchall()
+        return Announcement.rows_to_dicts(rows)
+
+    @staticmethod
+    def count_for_user(user_id):
+        """Count the announcements posted under any of one user's officer roles (CreatedBy is an OfficerRoleID)."""
+        db = get_read_db()
+        row = db.execute(
+            'SELECT COUNT(*) FROM announcements WHERE CreatedBy IN '
+            '(SELECT orf.OfficerRoleID FROM officer_roles orf JOIN memberships m ON m.MembershipID = orf.MembershipID WHERE m.UserID = ?)',
+            (user_id,)).fetchone()
+        return int(row[0])
+
+    @staticmethod
+    def get_announcements_page(after=None, limit=100, org_id=None, date_from=None, date_to=None, with_attachments=False):
+        """Return (announcements, next_cursor) for one keyset page ordered by AnnouncementID.
+
+        date_from/date_to bound DatePosted (inclusive; any format app.utils.dates parses).
+        with_attachments loads the page's attachments in one extra query.
+        """
+        db = get_read_db()
+        conditions, params = [], []
+        if org_id is not None:
+            conditions.append('OrgID = ?')
+            params.append(org_id)
+        ts_from = parse_bound(date_from, 'date_from')
+        ts_to = parse_bound(date_to, 'date_to', end=True)
+        if ts_from is not None:
+            conditions.append('DatePostedTs >= ?')
+            params.append(ts_from)
+        if ts_to is not None:
+            conditions.append('DatePostedTs <= ?')
+            params.append(ts_to)
+        items, next_cursor = keyset_page(db, 'SELECT AnnouncementID, OrgID, CreatedBy, Title, Content, DatePosted, AttachmentCount FROM announcements', 'AnnouncementID',
+                                         conditions, params, after, limit, Announcement.rows_to_dicts, batch=True)
+        if with_attachments:
+            AnnouncementService.load_attachments(items)
+        return items, next_cursor
+
+    @staticmethod
+    def open_export_cursor():
+        """Return an executed cursor over every announcement (Attachments as a JSON array, or NULL), yielding plain tuples for streaming exports."""
+        cur = get_read_db().cursor()
+        cur.row_factory = None
+        return cur.execute(
+            'SELECT a.AnnouncementID, a.OrgID, a.CreatedBy, a.Title, a.Content, a.DatePosted, '
+            "CASE WHEN a.AttachmentCount > 0 THEN (SELECT json_group_array(json_object('type', t.Type, 'url', t.Url, 'filename', t.Filename, 'mimetype', t.MimeType, 'sha256', t.BlobSha256)) "
+            'FROM (SELECT * FROM announcement_attachments WHERE AnnouncementID = a.AnnouncementID ORDER BY Position) t) END AS Attachments '
+            'FROM announcements a ORDER BY a.AnnouncementID'
+        )
+
+    @staticmethod
+    def get_announcements_by_org(org_id):
+        """Return announcements for one organization, newest first."""
+        db = get_read_db()
+        rows = db.execute(
+            'SELECT AnnouncementID, OrgID, CreatedBy, Title, Content, DatePosted, AttachmentCount FROM announcements WHERE OrgID = ? ORDER BY DatePostedTs DESC, AnnouncementID DESC',
+            (org_id,)
+        ).fetchall()
+        return Announcement.rows_to_dicts(rows)
+
+    @staticmethod
+    def get_announcements_since(since, org_id=None, limit=None):
+        """Return announcements posted at or after `since` (any date value), newest first.
+
+        Served from idx_announcements_posted_ts / idx_announcements_org_posted_ts.
+        """
+        since_ts = to_epoch(since)
+        if since_ts is None:
+            raise AppError('INVALID_REQUEST', 'since is not a recognized date', log=False)
+        sql = 'SELECT AnnouncementID, OrgID, CreatedBy, Title, Content, DatePosted, AttachmentCount FROM announcements WHERE DatePostedTs >= ?'
+        params = [since_ts]
+        if org_id is not None:
+            sql += ' AND OrgID = ?'
+            params.append(org_id)
+        sql += ' ORDER BY DatePostedTs DESC, AnnouncementID DESC'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        rows = get_read_db().execute(sql, params).fetchall()
+        return Announcement.rows_to_dicts(rows)
+
+    @staticmethod
+    def get_announcements_by_ids(announcement_ids):
+        """Return {AnnouncementID: announcement dict} for the given ids (one query)."""
+        ids = list(announcement_ids)
+        if not ids:
+            return {}
+        db = get_read_db()
+        rows = db.execute(
+            f"SELECT AnnouncementID, OrgID, CreatedBy, Title, Content, DatePosted, AttachmentCount FROM announcements WHERE AnnouncementID IN ({','.join('?' for _ in ids)})",
+            ids
+        ).fetchall()
+        return {a['AnnouncementID']: a for a in Announcement.rows_to_dicts(rows)}
 
     @staticmethod
     def import_announcements_from_csv(file_path):
@@ -84,4 +221,27 @@ class AnnouncementService:
             raise AppError('CSV_IMPORT_ERROR', 'Error importing CSV', original_exception=e)
         except Exception as e:
             current_app.logger.exception('Unexpected error importing announcements from CSV')
-            raise AppError('CSV_IMPORT_ERROR', 'Error importing CSV', original_exception=e)
\ No newline at end of file
+            raise AppError('CSV_IMPORT_ERROR', 'Error importing CSV', original_exception=e)
+
+    @staticmethod
+    def bulk_import_announcements_from_csv(file_path, chunk_size=None):
+        """Import announcements with chunked executemany transactions; returns an import report."""
+        report = bulk_import_csv(file_path, _ANNOUNCEMENT_IMPORT_SPEC, chunk_size)
+        FeedService.sync_missing()
+        return report
+
+
+# A missing DatePosted falls back to CURRENT_TIMESTAMP, matching create_announcement
+_ANNOUNCEMENT_IMPORT_SPEC = ImportSpec(
+    'announcements',
+    'INSERT INTO announcements (OrgID, CreatedBy, Title, Content, DatePosted, DatePostedTs) VALUES (?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP), ?)',
+    {
+        'OrgID': ('OrgID', 'org_id'),
+        'CreatedBy': ('CreatedBy', 'created_by'),
+        'Title': ('Title', 'title'),
+        'Content': ('Content', 'content'),
+        'DatePosted': ('DatePosted', 'date_posted'),
+    },
+    lambda v: (v['OrgID'], v['CreatedBy'], v['Title'], v['Content'], v['DatePosted'],
+               to_epoch(v['DatePosted']) if v['DatePosted'] else epoch_now()),
+)
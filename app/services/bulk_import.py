@@ -0,0 +1,188 @@
+"""Bulk CSV import engine shared by the services.
+
+The per-row ``import_*_from_csv`` helpers call ``create_*`` (and therefore
+``db.commit()``) once per CSV row. This module reads a CSV in chunks, resolves
+the PascalCase / lowercase header variants once per file, and inserts each
+chunk with ``executemany`` inside a single transaction. When a chunk hits a
+constraint error, or INSERT OR IGNORE drops duplicates from it, it is replayed
+row by row so the report can name the exact CSV line that failed or was
+skipped while the other rows of the chunk are still inserted.
+"""
+
+import csv
+import sqlite3
+from flask import current_app
+from ..database import get_db
+from ..utils.errors import AppError
+
+DEFAULT_CHUNK_SIZE = 5000
+# cap the number of per-line entries kept in a report so a bad 1M-row file
+# doesn't produce a 1M-entry JSON response
+MAX_REPORTED_ROWS = 1000
+
+
+class ImportSpec:
+    """Describes how one entity's CSV maps onto an INSERT statement.
+
+    fields: ordered mapping of field name -> tuple of accepted CSV headers
+        (first non-empty value wins, mirroring ``row.get('A') or row.get('b')``).
+    required: field names that must be non-empty; rows missing them are skipped.
+    to_params: callable(values_dict) -> tuple of SQL parameters.
+    prepare_chunk: optional callable(list of (line, values_dict)) -> same list,
+        run once per chunk before to_params (e.g. to hash passwords in batch).
+    """
+
+    def __init__(self, name, insert_sql, fields, to_params, required=(), prepare_chunk=None):
+        self.name = name
+        self.insert_sql = insert_sql
+        self.fields = fields
+        self.to_params = to_params
+        self.required = tuple(required)
+        self.prepare_chunk = prepare_chunk
+
+
+class ImportReport:
+    """Counts and per-line details collected during a bulk import."""
+
+    def __init__(self, entity):
+        self.entity = entity
+        self.rows = 0
+        self.inserted = 0
+        self.skipped = 0
+        self.failed = 0
+        self.skipped_rows = []
+        self.failed_rows = []
+
+    def skip(self, line, reason):
+        self.skipped += 1
+        if len(self.skipped_rows) < MAX_REPORTED_ROWS:
+            self.skipped_rows.append({'line': line, 'reason': reason})
+
+    def fail(self, line, error):
+        self.failed += 1
+        if len(self.failed_rows) < MAX_REPORTED_ROWS:
+            self.failed_rows.append({'line': line, 'error': error})
+
+    def to_dict(self):
+        return {
+            'entity': self.entity,
+            'rows': self.rows,
+            'inserted': self.inserted,
+            'skipped': self.skipped,
+            'failed': self.failed,
+            'skipped_rows': self.skipped_rows,
+            'failed_rows': self.failed_rows,
+        }
+
+
+def _resolve_header(header, fields):
+    """Map each field to the column indexes of its accepted headers (resolved once per file)."""
+    positions = {h: i for i, h in enumerate(header)}
+    return [(field, [positions[h] for h in aliases if h in positions]) for field, aliases in fields.items()]
+
+
+def _row_values(row, resolved):
+    values = {}
+    width = len(row)
+    for field, indexes in resolved:
+        value = None
+        for i in indexes:
+            if i < width and row[i] != '':
+                value = row[i]
+                break
+        values[field] = value
+    return values
+
+
+def _flush(db, spec, chunk, report):
+    if spec.prepare_chunk is not None:
+        chunk = spec.prepare_chunk(chunk)
+    params = []
+    for line, values in chunk:
+        try:
+            params.append((line, spec.to_params(values)))
+        except (TypeError, ValueError) as e:
+            report.fail(line, str(e))
+    if not params:
+        return
+
+    if db.in_transaction:
+        db.commit()
+    try:
+        db.execute('BEGIN')
+        cur = db.executemany(spec.insert_sql, [p for _, p in params])
+        inserted = max(cur.rowcount, 0)
+        if inserted == len(params):
+            db.commit()
+            report.inserted += inserted
+            return
+        # INSERT OR IGNORE dropped duplicates without saying which; the replay names their lines
+        db.rollback()
+        current_app.logger.debug('Bulk chunk for %s ignored %d duplicate(s); replaying row by row',
+                                 spec.name, len(params) - inserted)
+    except sqlite3.DatabaseError as e:
+        db.rollback()
+        current_app.logger.debug('Bulk chunk for %s failed (%s); replaying row by row', spec.name, e)
+
+    # Replay the chunk one row at a time (still one transaction) to pinpoint failures and ignored duplicates.
+    db.execute('BEGIN')
+    try:
+        for line, p in params:
+            try:
+                cur = db.execute(spec.insert_sql, p)
+            except sqlite3.DatabaseError as e:
+                report.fail(line, str(e))
+                continue
+            if cur.rowcount > 0:
+                report.inserted += cur.rowcount
+            else:
+                report.skip(line, 'duplicate row ignored')
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+
+def bulk_import_csv(file_path, spec, chunk_size=None):
+    """Import a CSV file according to spec; return an ImportReport dict."""
+    try:
+        chunk_size = max(1, int(chunk_size or current_app.config.get('IMPORT_CHUNK_SIZE') or DEFAULT_CHUNK_SIZE))
+    except (TypeError, ValueError):
+        chunk_size = DEFAULT_CHUNK_SIZE
+    report = ImportReport(spec.name)
+    db = get_db()
+    try:
+        with open(file_path, newline='') as csvfile:
+            reader = csv.reader(csvfile)
+            header = next(reader, None)
+            if not header:
+                return report.to_dict()
+            resolved = _resolve_header([h.strip() for h in header], spec.fields)
+            chunk = []
+            for row in reader:
+                if not row:
+                    continue
+                report.rows += 1
+                line = reader.line_num
+                values = _row_values(row, resolved)
+                missing = [f for f in spec.required if not values.get(f)]
+                if missing:
+                    report.skip(line, 'missing required field(s): ' + ', '.join(missing))
+                    continue
+                chunk.append((line, values))
+                if len(chunk) >= chunk_size:
+                    _flush(db, spec, chunk, report)
+                    chunk = []
+            if chunk:
+                _flush(db, spec, chunk, report)
+    except (csv.Error, OSError) as e:
+        current_app.logger.exception('Error reading %s CSV for bulk import', spec.name)
+        raise AppError('CSV_IMPORT_ERROR', 'Error importing CSV', original_exception=e)
+    except AppError:
+        raise
+    except Exception as e:
+        current_app.logger.exception('Unexpected error during bulk import of %s', spec.name)
+        raise AppError('CSV_IMPORT_ERROR', 'Error importing CSV', original_exception=e)
+    current_app.logger.info('Bulk import of %s: %d inserted, %d skipped, %d failed',
+                            spec.name, report.inserted, report.skipped, report.failed)
+    return report.to_dict()
@@ -0,0 +1,223 @@
+"""Background derivative pipeline for image and video attachments.
+
+Feed and org pages used to embed every uploaded image at full size. After
+create_announcement commits, DerivativeService.enqueue() hands the new
+attachments to a small thread pool. The pool writes, next to the blob in
+the upload store:
+  thumb-<N>.jpg  a thumbnail (images, and video posters when Pillow is present)
+  web-<N>.jpg    a web-sized image, recorded only when it is smaller than the original
+  poster.jpg     a poster frame for videos (needs ffmpeg)
+The URLs go into announcement_attachments (migration 0010). Templates use
+them once they are set and the original until then.
+
+Work is keyed by blob, so an image uploaded again reuses the files already
+written. Pillow and ffmpeg are optional. Without them the status is
+'skipped' and pages keep serving the originals.
+"""
+
+import os
+import shutil
+import sqlite3
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+from ..database import get_db
+from .upload_store import UploadStore
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # optional dependency
+    Image = ImageOps = None
+
+DEFAULT_DERIVATIVE_SETTINGS = {
+    'DERIVATIVES_MODE': None,        # 'background' (default), 'sync' (default under TESTING) or 'off'
+    'DERIVATIVE_WORKERS': 2,
+    'DERIVATIVE_THUMB_SIZE': 320,
+    'DERIVATIVE_WEB_SIZE': 1280,
+    'DERIVATIVE_JPEG_QUALITY': 80,
+    'DERIVATIVE_FFMPEG': None,       # path to ffmpeg; default: looked up on PATH
+    'DERIVATIVE_TIMEOUT': 60,        # seconds per ffmpeg run
+}
+
+# refuse to decode absurdly large images (decompression bombs)
+MAX_IMAGE_PIXELS = 80_000_000
+
+
+def _setting(name):
+    value = current_app.config.get(name)
+    return DEFAULT_DERIVATIVE_SETTINGS[name] if value is None else value
+
+
+def _mode():
+    mode = _setting('DERIVATIVES_MODE')
+    if mode is None:
+        mode = 'sync' if current_app.testing else 'background'
+    return mode
+
+
+def _ffmpeg():
+    return _setting('DERIVATIVE_FFMPEG') or shutil.which('ffmpeg')
+
+
+def _replace_into(dest, write):
+    """Run write(tmp_path), then atomically move the result to dest."""
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(dest), suffix='.tmp')
+    os.close(fd)
+    try:
+        write(tmp)
+        os.replace(tmp, dest)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def render_image(src, dest, max_size, quality):
+    """Write a JPEG of src scaled to fit max_size x max_size (needs Pillow)."""
+    def write(tmp):
+        with Image.open(src) as im:
+            if im.width * im.height > MAX_IMAGE_PIXELS:
+                raise ValueError(f'image too large to process ({im.width}x{im.height})')
+            im.seek(0)  # first frame of animated images
+            im = ImageOps.exif_transpose(im)
+            im.thumbnail((max_size, max_size))
+            if im.mode not in ('RGB', 'L'):
+                im = im.convert('RGB')
+            im.save(tmp, 'JPEG', quality=quality, optimize=True, progressive=True)
+    _replace_into(dest, write)
+
+
+def render_poster(src, dest, max_size, ffmpeg, timeout):
+    """Write a JPEG poster frame of the video src using ffmpeg."""
+    def write(tmp):
+        subprocess.run(
+            [ffmpeg, '-hide_banner', '-loglevel', 'error', '-y', '-ss', '1', '-i', src, '-frames:v', '1',
+             '-vf', f"scale='min({max_size},iw)':-2", '-q:v', '4', '-f', 'image2', tmp],
+            check=True, timeout=timeout, stdin=subprocess.DEVNULL, capture_output=True,
+        )
+        if os.path.getsize(tmp) == 0:
+            raise ValueError('ffmpeg produced no frame')
+    _replace_into(dest, write)
+
+
+class DerivativeWorkerPool:
+    """Lazily started thread pool; Pillow releases the GIL while resizing and ffmpeg runs out of process."""
+
+    def __init__(self):
+        self._executor = None
+        self._workers = None
+
+    def submit(self, fn, *args, workers=2):
+        if self._executor is None or self._workers != workers:
+            self.shutdown(wait=False)
+            self._executor = ThreadPoolExecutor(max_workers=max(1, int(workers)), thread_name_prefix='campus-hub-derivatives')
+            self._workers = workers
+        return self._executor.submit(fn, *args)
+
+    def shutdown(self, wait=True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+
+derivative_pool = DerivativeWorkerPool()
+
+
+class DerivativeService:
+
+    @staticmethod
+    def build_variants(sha256, mimetype):
+        """Create (or reuse) the variants of one blob; returns (status, {column: url})."""
+        src = UploadStore.blob_path(sha256)
+        if not os.path.exists(src):
+            return 'failed', {}
+        mimetype = mimetype or ''
+        thumb_size = int(_setting('DERIVATIVE_THUMB_SIZE'))
+        web_size = int(_setting('DERIVATIVE_WEB_SIZE'))
+        quality = int(_setting('DERIVATIVE_JPEG_QUALITY'))
+        urls = {}
+        try:
+            image_src = src
+            if mimetype.startswith('video/'):
+                ffmpeg = _ffmpeg()
+                if ffmpeg:
+                    poster = UploadStore.variant_path(sha256, 'poster.jpg')
+                    if not os.path.exists(poster):
+                        render_poster(src, poster, web_size, ffmpeg, float(_setting('DERIVATIVE_TIMEOUT')))
+                    urls['PosterUrl'] = UploadStore.variant_url(sha256, 'poster.jpg')
+                    image_src = poster
+                else:
+                    image_src = None
+            elif not mimetype.startswith('image/'):
+                return None, {}
+
+            if image_src is not None and Image is not None:
+                thumb_name = f'thumb-{thumb_size}.jpg'
+                thumb = UploadStore.variant_path(sha256, thumb_name)
+                if not os.path.exists(thumb):
+                    render_image(image_src, thumb, thumb_size, quality)
+                urls['ThumbUrl'] = UploadStore.variant_url(sha256, thumb_name)
+                if image_src == src:
+                    web_name = f'web-{web_size}.jpg'
+                    web = UploadStore.variant_path(sha256, web_name)
+                    if not os.path.exists(web):
+                        render_image(src, web, web_size, quality)
+                    # a small original is already web-sized
+                    if os.path.getsize(web) < os.path.getsize(src):
+                        urls['WebUrl'] = UploadStore.variant_url(sha256, web_name)
+        except Exception as e:
+            # OSError / ffmpeg failures / Pillow's own errors for corrupt images
+            current_app.logger.warning('Could not build variants for blob %s (%s): %s', sha256, mimetype, e)
+            return 'failed', urls
+        return ('ready' if urls else 'skipped'), urls
+
+    @staticmethod
+    def process_pending(announcement_id=None, limit=None):
+        """Build variants for pending attachments (optionally of one announcement); returns {status: count}."""
+        db = get_db()
+        sql = "SELECT BlobSha256, MAX(MimeType) AS MimeType FROM announcement_attachments WHERE VariantStatus = 'pending'"
+        params = []
+        if announcement_id is not None:
+            sql += ' AND AnnouncementID = ?'
+            params.append(announcement_id)
+        sql += ' GROUP BY BlobSha256'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        counts = {}
+        for row in db.execute(sql, params).fetchall():
+            status, urls = DerivativeService.build_variants(row['BlobSha256'], row['MimeType'])
+            try:
+                # every pending attachment of the same blob shares the result
+                db.execute(
+                    "UPDATE announcement_attachments SET ThumbUrl = ?, WebUrl = ?, PosterUrl = ?, VariantStatus = ? "
+                    "WHERE BlobSha256 = ? AND VariantStatus = 'pending'",
+                    (urls.get('ThumbUrl'), urls.get('WebUrl'), urls.get('PosterUrl'), status, row['BlobSha256'])
+                )
+                db.commit()
+            except sqlite3.DatabaseError:
+                db.rollback()
+                current_app.logger.exception('Database error while recording attachment variants')
+                continue
+            counts[status] = counts.get(status, 0) + 1
+        return counts
+
+    @staticmethod
+    def enqueue(announcement_id):
+        """Schedule variant building for one announcement's attachments (after its commit)."""
+        mode = _mode()
+        if mode == 'off':
+            return None
+        if mode == 'sync':
+            return DerivativeService.process_pending(announcement_id)
+        app = current_app._get_current_object()
+
+        def job():
+            with app.app_context():
+                try:
+                    return DerivativeService.process_pending(announcement_id)
+                except Exception:
+                    current_app.logger.exception('Derivative job failed for announcement %s', announcement_id)
+
+        return derivative_pool.submit(job, workers=_setting('DERIVATIVE_WORKERS'))
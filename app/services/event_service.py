@@ -8,20 +8,28 @@ AppError with the original exception attached for easier debugging.
 import csv
 import sqlite3
 from flask import current_app
-from ..database import get_db
+from ..database import get_db, get_read_db
 from ..models.event import Event
+from ..utils.dates import epoch_now, parse_bound, to_epoch
 from ..utils.errors import AppError
+from ..utils.pagination import keyset_page
+from .bulk_import import ImportSpec, bulk_import_csv
+from .feed_service import FeedService
 
 class EventService:
     
     @staticmethod
-    def create_event(event_name, event_description, event_date, org_id, created_by=None, location=None):
+    def create_event(event_name, event_description, event_date, org_id, created_by=None, location=None, posted_ts=None):
         db = get_db()
         try:
-            db.execute(
-                'INSERT INTO events (OrgID, CreatedBy, EventName, Description, EventDate, Location) VALUES (?, ?, ?, ?, ?, ?)',
-                (org_id, created_by, event_name, event_description, event_date, location)
+            cur = db.execute(
+                'INSERT INTO events (OrgID, CreatedBy, EventName, Description, EventDate, Location, EventDateTs, DatePostedTs) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (org_id, created_by, event_name, event_description, event_date, location, to_epoch(event_date),
+                 posted_ts if posted_ts is not None else epoch_now())
             )
+            # fan out to the home feed in the same transaction
+            FeedService.publish(db, 'event', cur.lastrowid)
             db.commit()
         except sqlite3.DatabaseError as e:
             # Log and convert to AppError with the original exception attached
@@ -34,10 +42,10 @@ class EventService:
 
     @staticmethod
     def get_all_events():
-        db = get_db()
+        db = get_read_db()
         # map DB columns to Event model parameters (alias Description -> EventDescription)
         rows = db.execute('SELECT EventID, OrgID, CreatedBy, EventName, Description AS EventDescription, EventDate, Location FROM events').fetchall()
-        events = [Event(**dict(row)).to_dict() for row in rows]
+        events = Event.rows_to_dicts(rows)
         # demonstrate lambda usage: sort events by EventDate (fallback to EventName)
         try:
             events_sorted = sorted(
@@ -53,6 +61,113 @@ class EventService:
             current_app.logger.exception('Unexpected error while retrieving events')
             return events
 
+    @staticmethod
+    def get_events_page(after=None, limit=100, org_id=None, date_from=None, date_to=None):
+        """Return (events, next_cursor) for one keyset page ordered by EventID.
+
+        date_from/date_to bound EventDate (inclusive; any format app.utils.dates parses).
+        """
+        db = get_read_db()
+        conditions, params = [], []
+        if org_id is not None:
+            conditions.append('OrgID = ?')
+            params.append(org_id)
+        ts_from = parse_bound(date_from, 'date_from')
+        ts_to = parse_bound(date_to, 'date_to', end=True)
+        if ts_from is not None:
+            conditions.append('EventDateTs >= ?')
+            params.append(ts_from)
+        if ts_to is not None:
+            conditions.append('EventDateTs <= ?')
+            params.append(ts_to)
+        return keyset_page(db, 'SELECT EventID, OrgID, CreatedBy, EventName, Description AS EventDescription, EventDate, Location FROM events', 'EventID',
+                           conditions, params, after, limit, Event.rows_to_dicts, batch=True)
+
+    @staticmethod
+    def open_export_cursor():
+        """Return an executed cursor over every event, yielding plain tuples for streaming exports."""
+        cur = get_read_db().cursor()
+        cur.row_factory = None
+        return cur.execute('SELECT EventID, OrgID, CreatedBy, EventName, Description AS EventDescription, EventDate, Location FROM events ORDER BY EventID')
+
+    @staticmethod
+    def get_events_by_org(org_id):
+        """Return events for one organization ordered by EventDate (then EventName)."""
+        db = get_read_db()
+        rows = db.execute(
+            'SELECT EventID, OrgID, CreatedBy, EventName, Description AS EventDescription, EventDate, Location FROM events WHERE OrgID = ? ORDER BY EventDateTs, EventName',
+            (org_id,)
+        ).fetchall()
+        return Event.rows_to_dicts(rows)
+
+    @staticmethod
+    def get_event_by_id(event_id):
+        """Return a single event dict or None if it does not exist."""
+        db = get_read_db()
+        row = db.execute(
+            'SELECT EventID, OrgID, CreatedBy, EventName, Description AS EventDescription, EventDate, Location FROM events WHERE EventID = ?',
+            (event_id,)
+        ).fetchone()
+        return Event.row_to_dict(row) if row is not None else None
+
+    @staticmethod
+    def get_events_by_ids(event_ids):
+        """Return {EventID: event dict} for the given ids (one query)."""
+        ids = list(event_ids)
+        if not ids:
+            return {}
+        db = get_read_db()
+        rows = db.execute(
+            f"SELECT EventID, OrgID, CreatedBy, EventName, Description AS EventDescription, EventDate, Location FROM events WHERE EventID IN ({','.join('?' for _ in ids)})",
+            ids
+        ).fetchall()
+        return {e['EventID']: e for e in Event.rows_to_dicts(rows)}
+
+    @staticmethod
+    def get_next_events(limit=5):
+        """Return the first `limit` dated events in date order (uses idx_events_date_ts)."""
+        db = get_read_db()
+        rows = db.execute(
+            'SELECT EventID, OrgID, CreatedBy, EventName, Description AS EventDescription, EventDate, Location FROM events WHERE EventDateTs IS NOT NULL ORDER BY EventDateTs LIMIT ?',
+            (limit,)
+        ).fetchall()
+        return Event.rows_to_dicts(rows)
+
+    @staticmethod
+    def get_events_between(start=None, end=None, org_id=None, limit=None):
+        """Return events with start <= EventDate <= end in date order; either bound may be None.
+
+        Undated events (or dates that could not be parsed) sort first when
+        there is no lower bound, as they did in the old string sort.
+        """
+        conditions, params = [], []
+        start_ts, end_ts = to_epoch(start), to_epoch(end)
+        if start is not None and start_ts is None or end is not None and end_ts is None:
+            raise AppError('INVALID_REQUEST', 'start/end is not a recognized date', log=False)
+        if org_id is not None:
+            conditions.append('OrgID = ?')
+            params.append(org_id)
+        if start_ts is not None:
+            conditions.append('EventDateTs >= ?')
+            params.append(start_ts)
+        if end_ts is not None:
+            conditions.append('EventDateTs <= ?')
+            params.append(end_ts)
+        sql = 'SELECT EventID, OrgID, CreatedBy, EventName, Description AS EventDescription, EventDate, Location FROM events'
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        sql += ' ORDER BY EventDateTs, EventName'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        rows = get_read_db().execute(sql, params).fetchall()
+        return Event.rows_to_dicts(rows)
+
+    @staticmethod
+    def get_upcoming_events(limit=None, org_id=None, now=None):
+        """Return events dated from `now` (default: current time) onwards, soonest first."""
+        return EventService.get_events_between(now if now is not None else epoch_now(), None, org_id, limit)
+
     @staticmethod
     def import_events_from_csv(file_path):
         try:
@@ -73,7 +188,8 @@ class EventService:
                         continue
 
                     try:
-                        EventService.create_event(name, desc, date, org, created_by, location)
+                        EventService.create_event(name, desc, date, org, created_by, location,
+                                                  _posted_ts(row.get('DatePosted') or row.get('date_posted'), date))
                     except AppError as ae:
                         # Log and continue importing other rows
                         current_app.logger.exception('Failed to create event from CSV row')
@@ -83,4 +199,41 @@ class EventService:
             raise AppError('CSV_IMPORT_ERROR', 'Error importing CSV', original_exception=e)
         except Exception as e:
             current_app.logger.exception('Unexpected error importing events from CSV')
-            raise AppError('CSV_IMPORT_ERROR', 'Error importing CSV', original_exception=e)
\ No newline at end of file
+            raise AppError('CSV_IMPORT_ERROR', 'Error importing CSV', original_exception=e)
+
+    @staticmethod
+    def bulk_import_events_from_csv(file_path, chunk_size=None):
+        """Import events with chunked executemany transactions; returns an import report."""
+        report = bulk_import_csv(file_path, _EVENT_IMPORT_SPEC, chunk_size)
+        FeedService.sync_missing()
+        return report
+
+
+def _posted_ts(date_posted, event_date):
+    # an import is not the posting time: without a DatePosted column, a past
+    # event counts as posted on its date so a bulk load doesn't stack at the top of the feed
+    posted = to_epoch(date_posted)
+    if posted is not None:
+        return posted
+    now = epoch_now()
+    event_ts = to_epoch(event_date)
+    return min(event_ts, now) if event_ts is not None else now
+
+
+_EVENT_IMPORT_SPEC = ImportSpec(
+    'events',
+    'INSERT INTO events (OrgID, CreatedBy, EventName, Description, EventDate, Location, EventDateTs, DatePostedTs) '
+    'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+    {
+        'EventName': ('EventName', 'title', 'name'),
+        'EventDescription': ('EventDescription', 'description'),
+        'EventDate': ('EventDate', 'date'),
+        'OrgID': ('OrgID', 'organization_id', 'org_id'),
+        'CreatedBy': ('CreatedBy', 'created_by'),
+        'Location': ('Location', 'location'),
+        'DatePosted': ('DatePosted', 'date_posted'),
+    },
+    lambda v: (v['OrgID'], v['CreatedBy'], v['EventName'], v['EventDescription'], v['EventDate'], v['Location'],
+               to_epoch(v['EventDate']), _posted_ts(v['DatePosted'], v['EventDate'])),
+    required=('EventName', 'EventDate', 'OrgID'),
+)
@@ -0,0 +1,120 @@
+"""Home feed backed by the feed_items table (migration 0006; SortKey is epoch seconds since 0007).
+
+Announcements and events are both keyed by their DatePostedTs, the time
+they were posted (events since migration 0012).
+
+Writers call FeedService.publish() inside their own transaction, so a new
+announcement or event and its feed row commit together. Readers page through
+the feed newest-first with a keyset cursor (the last FeedItemID seen) and
+hydrate only the rows on the page. A page costs the same whether the
+database holds a hundred announcements or a million.
+"""
+
+import sqlite3
+from flask import current_app
+from ..database import get_db, get_read_db
+from ..utils.errors import AppError
+
+DEFAULT_FEED_SIZE = 20
+
+_PUBLISH_SQL = {
+    'announcement': (
+        "INSERT OR IGNORE INTO feed_items (ItemType, ItemID, OrgID, SortKey) "
+        "SELECT 'announcement', AnnouncementID, OrgID, COALESCE(DatePostedTs, CAST(strftime('%s', 'now') AS INTEGER)) "
+        'FROM announcements WHERE AnnouncementID = ?'
+    ),
+    'event': (
+        "INSERT OR IGNORE INTO feed_items (ItemType, ItemID, OrgID, SortKey) "
+        "SELECT 'event', EventID, OrgID, COALESCE(DatePostedTs, CAST(strftime('%s', 'now') AS INTEGER)) "
+        'FROM events WHERE EventID = ?'
+    ),
+}
+
+
+# feed rows for any announcement/event that doesn't have one yet (inserted
+# without publish(), e.g. bulk imports); keyed like _PUBLISH_SQL
+SYNC_SQL = (
+    '''
+    INSERT INTO feed_items (ItemType, ItemID, OrgID, SortKey)
+    SELECT 'announcement', a.AnnouncementID, a.OrgID, COALESCE(a.DatePostedTs, CAST(strftime('%s', 'now') AS INTEGER))
+    FROM announcements a
+    WHERE NOT EXISTS (SELECT 1 FROM feed_items f WHERE f.ItemType = 'announcement' AND f.ItemID = a.AnnouncementID)
+    ORDER BY a.AnnouncementID
+    ''',
+    '''
+    INSERT INTO feed_items (ItemType, ItemID, OrgID, SortKey)
+    SELECT 'event', e.EventID, e.OrgID, COALESCE(e.DatePostedTs, CAST(strftime('%s', 'now') AS INTEGER))
+    FROM events e
+    WHERE NOT EXISTS (SELECT 1 FROM feed_items f WHERE f.ItemType = 'event' AND f.ItemID = e.EventID)
+    ORDER BY e.EventID
+    ''',
+)
+
+
+class FeedService:
+
+    @staticmethod
+    def publish(db, item_type, item_id):
+        """Add one announcement/event to the feed; runs in the caller's transaction (no commit)."""
+        db.execute(_PUBLISH_SQL[item_type], (item_id,))
+
+    @staticmethod
+    def sync_missing():
+        """Add feed rows for announcements/events inserted without publish() (e.g. bulk imports)."""
+        db = get_db()
+        try:
+            for sql in SYNC_SQL:
+                db.execute(sql)
+            db.commit()
+        except sqlite3.DatabaseError as e:
+            current_app.logger.exception('Database error while syncing feed items')
+            raise AppError('DB_ERROR', 'Could not update feed', original_exception=e)
+
+    @staticmethod
+    def get_feed_page(before=None, limit=None, org_ids=None):
+        """Return (items, next_cursor) for the newest feed rows older than the `before` cursor.
+
+        Each item is the announcement or event dict with ItemType and
+        FeedItemID added. org_ids optionally restricts the feed to those orgs.
+        """
+        # the services import this module, so hydrate through lazy imports
+        from .announcement_service import AnnouncementService
+        from .event_service import EventService
+
+        if limit is None:
+            limit = int(current_app.config.get('HOME_FEED_SIZE') or DEFAULT_FEED_SIZE)
+        conditions, params = [], []
+        if before is not None:
+            conditions.append('(SortKey, FeedItemID) < (SELECT SortKey, FeedItemID FROM feed_items WHERE FeedItemID = ?)')
+            params.append(before)
+        if org_ids is not None:
+            org_ids = list(org_ids)
+            if not org_ids:
+                return [], None
+            conditions.append(f"OrgID IN ({','.join('?' for _ in org_ids)})")
+            params.extend(org_ids)
+        sql = 'SELECT FeedItemID, ItemType, ItemID FROM feed_items'
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        sql += ' ORDER BY SortKey DESC, FeedItemID DESC LIMIT ?'
+        params.append(limit + 1)
+
+        db = get_read_db()
+        rows = db.execute(sql, params).fetchall()
+        page = rows[:limit]
+        next_cursor = page[-1]['FeedItemID'] if len(rows) > limit else None
+
+        announcements = AnnouncementService.get_announcements_by_ids(
+            [r['ItemID'] for r in page if r['ItemType'] == 'announcement'])
+        events = EventService.get_events_by_ids([r['ItemID'] for r in page if r['ItemType'] == 'event'])
+        items = []
+        for r in page:
+            source = announcements if r['ItemType'] == 'announcement' else events
+            entity = source.get(r['ItemID'])
+            if entity is None:
+                continue
+            item = dict(entity)
+            item['ItemType'] = r['ItemType']
+            item['FeedItemID'] = r['FeedItemID']
+            items.append(item)
+        return items, next_cursor
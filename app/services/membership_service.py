@@ -1,21 +1,53 @@
 import csv
 import sqlite3
 from flask import current_app
-from ..database import get_db
+from ..database import get_read_db
 from ..models.membership import Membership
+from ..utils.dates import parse_bound
 from ..utils.errors import AppError
+from ..utils.pagination import keyset_page
+from ..write_queue import run_write
+from .bulk_import import ImportSpec, bulk_import_csv
+from .permission_cache import permission_cache
+
+
+# Write operations for run_write(): they run on the writer thread's connection and must not commit.
+
+def _insert_membership(db, user_id, organization_id, status):
+    db.execute(
+        'INSERT INTO memberships (UserID, OrgID, Status, DateApplied, DateApproved) VALUES (?, ?, ?, ?, ?)',
+        (user_id, organization_id, status, None, None)
+    )
+
+
+def _set_membership_status(db, membership_id, status):
+    """Apply a status change; returns the (UserID, OrgID) that owned the row, or None."""
+    # If the membership is being approved, set Status and DateApproved.
+    # If the membership is being rejected, remove the membership row entirely.
+    st = (status or '').lower()
+    # look the owner up first: a rejected membership row is deleted below
+    owner = db.execute('SELECT UserID, OrgID FROM memberships WHERE MembershipID = ?', (membership_id,)).fetchone()
+    if st == 'approved':
+        db.execute('UPDATE memberships SET Status = ?, DateApproved = CURRENT_TIMESTAMP WHERE MembershipID = ?', (status, membership_id))
+    elif st == 'rejected':
+        # delete the membership when a request is rejected
+        db.execute('DELETE FROM memberships WHERE MembershipID = ?', (membership_id,))
+    else:
+        # other statuses (e.g., Pending) - just update status and clear DateApproved
+        db.execute('UPDATE memberships SET Status = ?, DateApproved = NULL WHERE MembershipID = ?', (status, membership_id))
+    return (owner['UserID'], owner['OrgID']) if owner is not None else None
+
 
 class MembershipService:
 
     @staticmethod
     def create_membership(user_id, organization_id, status):
-        db = get_db()
         try:
-            db.execute(
-                'INSERT INTO memberships (UserID, OrgID, Status, DateApplied, DateApproved) VALUES (?, ?, ?, ?, ?)',
-                (user_id, organization_id, status, None, None)
-            )
-            db.commit()
+            # group-committed with other small writes (app/write_queue.py)
+            run_write(_insert_membership, user_id, organization_id, status)
+            permission_cache.invalidate(user_id, organization_id)
+        except AppError:
+            raise
         except sqlite3.DatabaseError as e:
             current_app.logger.exception('Database error while creating membership')
             raise AppError('DB_ERROR', 'Could not create membership', original_exception=e)
@@ -25,33 +57,86 @@ class MembershipService:
 
     @staticmethod
     def get_all_memberships():
-        db = get_db()
+        db = get_read_db()
         # select only fields the Membership model expects
         rows = db.execute('SELECT MembershipID, UserID, OrgID, Status, DateApplied, DateApproved FROM memberships').fetchall()
-        return [Membership(**dict(row)).to_dict() for row in rows]
+        return Membership.rows_to_dicts(rows)
+
+    @staticmethod
+    def get_memberships_page(after=None, limit=100, org_id=None, user_id=None, status=None, date_from=None, date_to=None):
+        """Return (memberships, next_cursor) for one keyset page ordered by MembershipID.
+
+        Filters are pushed into SQL; org_id + status is served by idx_memberships_org_status.
+        date_from/date_to bound DateApplied (inclusive; any format app.utils.dates parses).
+        """
+        db = get_read_db()
+        conditions, params = [], []
+        if org_id is not None:
+            conditions.append('OrgID = ?')
+            params.append(org_id)
+        if user_id is not None:
+            conditions.append('UserID = ?')
+            params.append(user_id)
+        if status:
+            conditions.append('Status = ? COLLATE NOCASE')
+            params.append(status)
+        ts_from = parse_bound(date_from, 'date_from')
+        ts_to = parse_bound(date_to, 'date_to', end=True)
+        if ts_from is not None:
+            conditions.append('DateAppliedTs >= ?')
+            params.append(ts_from)
+        if ts_to is not None:
+            conditions.append('DateAppliedTs <= ?')
+            params.append(ts_to)
+        return keyset_page(db, 'SELECT MembershipID, UserID, OrgID, Status, DateApplied, DateApproved FROM memberships', 'MembershipID',
+                           conditions, params, after, limit, Membership.rows_to_dicts, batch=True)
+
+    @staticmethod
+    def open_export_cursor():
+        """Return an executed cursor over every membership, yielding plain tuples for streaming exports."""
+        cur = get_read_db().cursor()
+        cur.row_factory = None
+        return cur.execute('SELECT MembershipID, UserID, OrgID, Status, DateApplied, DateApproved FROM memberships ORDER BY MembershipID')
 
     @staticmethod
     def get_memberships_by_org(org_id):
-        db = get_db()
+        db = get_read_db()
         rows = db.execute('SELECT MembershipID, UserID, OrgID, Status, DateApplied, DateApproved FROM memberships WHERE OrgID = ?', (org_id,)).fetchall()
-        return [Membership(**dict(row)).to_dict() for row in rows]
+        return Membership.rows_to_dicts(rows)
+
+    @staticmethod
+    def get_memberships_by_user(user_id):
+        """Return every membership of one user, in join order (idx_memberships_user_org)."""
+        db = get_read_db()
+        rows = db.execute('SELECT MembershipID, UserID, OrgID, Status, DateApplied, DateApproved FROM memberships WHERE UserID = ? ORDER BY MembershipID', (user_id,)).fetchall()
+        return Membership.rows_to_dicts(rows)
+
+    @staticmethod
+    def get_membership_by_user_and_org(user_id, org_id):
+        """Return the first membership dict for (user, org) or None."""
+        db = get_read_db()
+        row = db.execute('SELECT MembershipID, UserID, OrgID, Status, DateApplied, DateApproved FROM memberships WHERE UserID = ? AND OrgID = ? LIMIT 1', (user_id, org_id)).fetchone()
+        return Membership.row_to_dict(row) if row is not None else None
+
+    @staticmethod
+    def count_memberships_by_org_and_status(org_id, status):
+        """Count memberships of an org with the given status (case-insensitive).
+
+        Served by idx_memberships_org_status so the cost depends on the size of
+        the organization rather than the whole memberships table.
+        """
+        db = get_read_db()
+        row = db.execute('SELECT COUNT(*) AS cnt FROM memberships WHERE OrgID = ? AND Status = ? COLLATE NOCASE', (org_id, status)).fetchone()
+        return int(row['cnt']) if row is not None else 0
 
     @staticmethod
     def update_membership_status(membership_id, status):
-        db = get_db()
         try:
-            # If the membership is being approved, set Status and DateApproved.
-            # If the membership is being rejected, remove the membership row entirely.
-            st = (status or '').lower()
-            if st == 'approved':
-                db.execute('UPDATE memberships SET Status = ?, DateApproved = CURRENT_TIMESTAMP WHERE MembershipID = ?', (status, membership_id))
-            elif st == 'rejected':
-                # delete the membership when a request is rejected
-                db.execute('DELETE FROM memberships WHERE MembershipID = ?', (membership_id,))
-            else:
-                # other statuses (e.g., Pending) - just update status and clear DateApproved
-                db.execute('UPDATE memberships SET Status = ?, DateApproved = NULL WHERE MembershipID = ?', (status, membership_id))
-            db.commit()
+            owner = run_write(_set_membership_status, membership_id, status)
+            if owner is not None:
+                permission_cache.invalidate(*owner)
+        except AppError:
+            raise
         except sqlite3.DatabaseError as e:
             current_app.logger.exception('Database error while updating membership status')
             raise AppError('DB_ERROR', 'Could not update membership status', original_exception=e)
@@ -82,4 +167,25 @@ class MembershipService:
             raise AppError('CSV_IMPORT_ERROR', 'Error importing CSV', original_exception=e)
         except Exception as e:
             current_app.logger.exception('Unexpected error importing memberships from CSV')
-            raise AppError('CSV_IMPORT_ERROR', 'Error importing CSV', original_exception=e)
\ No newline at end of file
+            raise AppError('CSV_IMPORT_ERROR', 'Error importing CSV', original_exception=e)
+
+    @staticmethod
+    def bulk_import_memberships_from_csv(file_path, chunk_size=None):
+        """Import memberships with chunked executemany transactions; returns an import report."""
+        report = bulk_import_csv(file_path, _MEMBERSHIP_IMPORT_SPEC, chunk_size)
+        permission_cache.invalidate()
+        return report
+
+
+# DateApplied/DateApproved are available in CSV but, like create_membership, are stored as NULL
+_MEMBERSHIP_IMPORT_SPEC = ImportSpec(
+    'memberships',
+    'INSERT INTO memberships (UserID, OrgID, Status, DateApplied, DateApproved) VALUES (?, ?, ?, NULL, NULL)',
+    {
+        'UserID': ('UserID', 'user_id'),
+        'OrgID': ('OrgID', 'organization_id'),
+        'Status': ('Status', 'status'),
+    },
+    lambda v: (v['UserID'], v['OrgID'], v['Status']),
+    required=('UserID', 'OrgID'),
+)
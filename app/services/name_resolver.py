@@ -0,0 +1,77 @@
+"""Request-scoped resolution of CreatedBy / UserID values to display names.
+
+Pages used to build a map of every user just to label a handful of rows.
+CreatorNameResolver collects the ids a page needs, resolves them in one
+batched query per kind (users first, then officer_roles -> memberships ->
+users for ids that are not user ids) and memoizes the results on flask.g
+for the rest of the request.
+"""
+
+from flask import g
+from .user_service import UserService
+from .officer_role_service import OfficerRoleService
+
+
+def _as_int(value):
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class CreatorNameResolver:
+
+    def __init__(self):
+        self._names = {}
+        self._user_names = {}
+
+    def prime(self, values):
+        """Resolve every not-yet-known CreatedBy value in values with batched queries."""
+        ids = {i for i in map(_as_int, values) if i is not None and i not in self._names}
+        if not ids:
+            return
+        # CreatedBy may be a UserID; try that first (as the old user_map lookup did)
+        found = UserService.get_user_names_by_ids(ids)
+        self._user_names.update(found)
+        self._names.update(found)
+        remaining = ids - set(found)
+        if remaining:
+            # fall back: CreatedBy may be an OfficerRoleID
+            by_role = OfficerRoleService.get_user_names_by_officer_role_ids(remaining)
+            for cid in remaining:
+                self._names[cid] = by_role.get(cid)
+
+    def name(self, created_by):
+        cid = _as_int(created_by)
+        if cid is None:
+            return None
+        if cid not in self._names:
+            self.prime([cid])
+        return self._names.get(cid)
+
+    def annotate(self, items, source='CreatedBy', target='CreatorName'):
+        """Set items[i][target] to the resolved name of items[i][source] (in place)."""
+        self.prime(item.get(source) for item in items)
+        for item in items:
+            item[target] = self.name(item.get(source))
+        return items
+
+    def user_names(self, user_ids):
+        """Return {UserID: name} for plain user ids (no officer-role fallback)."""
+        ids = {i for i in map(_as_int, user_ids) if i is not None}
+        missing = ids - set(self._user_names)
+        if missing:
+            found = UserService.get_user_names_by_ids(missing)
+            for i in missing:
+                self._user_names[i] = found.get(i)
+        return {i: self._user_names.get(i) for i in ids}
+
+
+def get_creator_resolver():
+    """Return the resolver memoized for the current request."""
+    resolver = g.get('_creator_resolver')
+    if resolver is None:
+        resolver = g._creator_resolver = CreatorNameResolver()
+    return resolver
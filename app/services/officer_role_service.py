@@ -1,9 +1,23 @@
 import csv
 import sqlite3
 from flask import current_app
-from ..database import get_db
+from ..database import get_db, get_read_db
 from ..models.officer_role import OfficerRole
+from ..utils.dates import to_epoch
 from ..utils.errors import AppError
+from ..utils.pagination import keyset_page
+from ..write_queue import run_write
+from .bulk_import import ImportSpec, bulk_import_csv
+from .user_service import IN_BATCH_SIZE
+from .permission_cache import permission_cache, invalidate_membership, org_version, user_org_versions
+
+
+def _insert_membership_role(db, membership_id, role_name, perms):
+    # run_write() operation: runs on the writer thread's connection and must not commit
+    cur = db.execute('INSERT INTO officer_roles (MembershipID, RoleName, StartDate, EndDate, can_post_announcements, can_create_events, can_approve_members, can_assign_roles) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                     (membership_id, role_name, None, None, int(bool(perms.get('can_post_announcements'))), int(bool(perms.get('can_create_events'))), int(bool(perms.get('can_approve_members'))), int(bool(perms.get('can_assign_roles')))))
+    return cur.lastrowid
+
 
 class OfficerRoleService:
 
@@ -26,7 +40,7 @@ class OfficerRoleService:
 
     @staticmethod
     def get_all_officer_roles():
-        db = get_db()
+        db = get_read_db()
         # select canonical columns from schema (StartDate/EndDate) — model accepts these
         try:
             rows = db.execute(
@@ -40,7 +54,42 @@ class OfficerRoleService:
             current_app.logger.exception('Unexpected error retrieving officer roles')
             rows = db.execute('SELECT OfficerRoleID, MembershipID, RoleName, StartDate, EndDate FROM officer_roles').fetchall()
 
-        return [OfficerRole(**dict(row)).to_dict() for row in rows]
+        return OfficerRole.rows_to_dicts(rows)
+
+    @staticmethod
+    def get_officer_roles_page(after=None, limit=100, membership_id=None, org_id=None):
+        """Return (officer_roles, next_cursor) for one keyset page ordered by OfficerRoleID."""
+        db = get_read_db()
+        conditions, params = [], []
+        if membership_id is not None:
+            conditions.append('MembershipID = ?')
+            params.append(membership_id)
+        if org_id is not None:
+            conditions.append('MembershipID IN (SELECT MembershipID FROM memberships WHERE OrgID = ?)')
+            params.append(org_id)
+        return keyset_page(db, 'SELECT OfficerRoleID, MembershipID, RoleName, StartDate, EndDate, can_post_announcements, can_create_events, can_approve_members, can_assign_roles FROM officer_roles', 'OfficerRoleID',
+                           conditions, params, after, limit, OfficerRole.rows_to_dicts, batch=True)
+
+    @staticmethod
+    def get_roles_expiring_before(before, since=None):
+        """Return officer roles whose EndDate falls in [since, before], soonest first (idx_officer_roles_end_ts)."""
+        before_ts, since_ts = to_epoch(before), to_epoch(since)
+        if before_ts is None or since is not None and since_ts is None:
+            raise AppError('INVALID_REQUEST', 'before/since is not a recognized date', log=False)
+        sql = 'SELECT OfficerRoleID, MembershipID, RoleName, StartDate, EndDate, can_post_announcements, can_create_events, can_approve_members, can_assign_roles FROM officer_roles WHERE EndDateTs <= ?'
+        params = [before_ts]
+        if since_ts is not None:
+            sql += ' AND EndDateTs >= ?'
+            params.append(since_ts)
+        rows = get_read_db().execute(sql + ' ORDER BY EndDateTs, OfficerRoleID', params).fetchall()
+        return OfficerRole.rows_to_dicts(rows)
+
+    @staticmethod
+    def open_export_cursor():
+        """Return an executed cursor over every officer role, yielding plain tuples for streaming exports."""
+        cur = get_read_db().cursor()
+        cur.row_factory = None
+        return cur.execute('SELECT OfficerRoleID, MembershipID, RoleName, StartDate AS RoleStart, EndDate AS RoleEnd, can_post_announcements, can_create_events, can_approve_members, can_assign_roles FROM officer_roles ORDER BY OfficerRoleID')
 
     @staticmethod
     def import_officer_roles_from_csv(file_path):
@@ -55,8 +104,9 @@ class OfficerRoleService:
                     role_end = r.get('EndDate') or r.get('RoleEnd')
                     try:
                         db = get_db()
-                        db.execute('INSERT OR IGNORE INTO officer_roles (OfficerRoleID, MembershipID, RoleName, StartDate, EndDate, can_post_announcements, can_create_events, can_approve_members, can_assign_roles) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
-                                   (r.get('OfficerRoleID'), membership, role_name, role_start, role_end, r.get('can_post_announcements') or 0, r.get('can_create_events') or 0, r.get('can_approve_members') or 0, r.get('can_assign_roles') or 0))
+                        db.execute('INSERT OR IGNORE INTO officer_roles (OfficerRoleID, MembershipID, RoleName, StartDate, EndDate, can_post_announcements, can_create_events, can_approve_members, can_assign_roles, StartDateTs, EndDateTs) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                                   (r.get('OfficerRoleID'), membership, role_name, role_start, role_end, r.get('can_post_announcements') or 0, r.get('can_create_events') or 0, r.get('can_approve_members') or 0, r.get('can_assign_roles') or 0,
+                                    to_epoch(role_start), to_epoch(role_end)))
                         db.commit()
                     except sqlite3.DatabaseError as e:
                         current_app.logger.exception('Database error while creating officer role from CSV')
@@ -64,6 +114,7 @@ class OfficerRoleService:
                     except Exception as e:
                         current_app.logger.exception('Unexpected error while creating officer role from CSV')
                         raise AppError('DB_ERROR', 'Could not create officer role from CSV', original_exception=e)
+            permission_cache.invalidate()
         except (csv.Error, OSError) as e:
             current_app.logger.exception('Error reading officer_roles CSV')
             raise AppError('CSV_IMPORT_ERROR', 'Error importing CSV', original_exception=e)
@@ -71,6 +122,13 @@ class OfficerRoleService:
             current_app.logger.exception('Unexpected error importing officer_roles from CSV')
             raise AppError('CSV_IMPORT_ERROR', 'Error importing CSV', original_exception=e)
 
+    @staticmethod
+    def bulk_import_officer_roles_from_csv(file_path, chunk_size=None):
+        """Import officer roles with chunked executemany transactions; returns an import report."""
+        report = bulk_import_csv(file_path, _OFFICER_ROLE_IMPORT_SPEC, chunk_size)
+        permission_cache.invalidate()
+        return report
+
     @staticmethod
     def get_or_create_officer_role_for_user(org_id, user_id, role_name='Creator'):
         """
@@ -96,6 +154,7 @@ class OfficerRoleService:
                                  (user_id, org_id, 'Approved', None, None))
                 db.commit()
                 membership_id = cur.lastrowid
+                permission_cache.invalidate(user_id, org_id)
 
             # Try to find an officer role for that membership
             orow = db.execute('SELECT OfficerRoleID FROM officer_roles WHERE MembershipID = ? LIMIT 1', (membership_id,)).fetchone()
@@ -107,6 +166,7 @@ class OfficerRoleService:
             cur2 = db.execute('INSERT INTO officer_roles (MembershipID, RoleName, StartDate, EndDate, can_post_announcements, can_create_events, can_approve_members, can_assign_roles) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
                               (membership_id, role_name, None, None, 1, 1, 1, 1))
             db.commit()
+            permission_cache.invalidate(user_id, org_id)
             return cur2.lastrowid
         except sqlite3.DatabaseError as e:
             current_app.logger.exception('Database error in get_or_create_officer_role_for_user')
@@ -118,13 +178,12 @@ class OfficerRoleService:
     @staticmethod
     def assign_role_to_membership(membership_id, role_name, permissions=None):
         """Assign a role to a membership with explicit permissions."""
-        db = get_db()
         try:
-            perms = permissions or {}
-            cur = db.execute('INSERT INTO officer_roles (MembershipID, RoleName, StartDate, EndDate, can_post_announcements, can_create_events, can_approve_members, can_assign_roles) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
-                             (membership_id, role_name, None, None, int(bool(perms.get('can_post_announcements'))), int(bool(perms.get('can_create_events'))), int(bool(perms.get('can_approve_members'))), int(bool(perms.get('can_assign_roles')))))
-            db.commit()
-            return cur.lastrowid
+            role_id = run_write(_insert_membership_role, membership_id, role_name, permissions or {})
+            invalidate_membership(get_read_db(), membership_id)
+            return role_id
+        except AppError:
+            raise
         except sqlite3.DatabaseError as e:
             current_app.logger.exception('Database error while assigning role to membership')
             raise AppError('DB_ERROR', 'Could not assign role to membership', original_exception=e)
@@ -134,8 +193,16 @@ class OfficerRoleService:
 
     @staticmethod
     def user_permissions_for_org(org_id, user_id):
-        """Return aggregated permission flags for a user within an organization."""
-        db = get_db()
+        """Return aggregated permission flags for a user within an organization.
+
+        Results are served from the per-process permission cache while the org's
+        permission version (read first, see permission_cache) is unchanged.
+        """
+        db = get_read_db()
+        version = org_version(db, org_id)
+        cached = permission_cache.get(user_id, org_id, version)
+        if cached is not None:
+            return cached
         try:
             mem = db.execute('SELECT MembershipID, Status FROM memberships WHERE USERID = ? AND OrgID = ? LIMIT 1', (user_id, org_id)).fetchone()
         except sqlite3.DatabaseError as e:
@@ -149,7 +216,9 @@ class OfficerRoleService:
             mem = dict(mem)
 
         if not mem or not mem.get('MembershipID'):
-            return {'can_post_announcements': 0, 'can_create_events': 0, 'can_approve_members': 0, 'can_assign_roles': 0}
+            perms = {'can_post_announcements': 0, 'can_create_events': 0, 'can_approve_members': 0, 'can_assign_roles': 0}
+            permission_cache.set(user_id, org_id, perms, version)
+            return perms
 
         membership_id = mem['MembershipID']
         try:
@@ -170,18 +239,75 @@ class OfficerRoleService:
             # If the role is explicitly 'Admin', grant all permissions
             role_name = (rr.get('RoleName') or '')
             if isinstance(role_name, str) and role_name.lower() == 'admin':
-                return {'can_post_announcements': 1, 'can_create_events': 1, 'can_approve_members': 1, 'can_assign_roles': 1}
+                perms = {'can_post_announcements': 1, 'can_create_events': 1, 'can_approve_members': 1, 'can_assign_roles': 1}
+                break
             perms['can_post_announcements'] = perms['can_post_announcements'] or int(rr.get('can_post_announcements') or 0)
             perms['can_create_events'] = perms['can_create_events'] or int(rr.get('can_create_events') or 0)
             perms['can_approve_members'] = perms['can_approve_members'] or int(rr.get('can_approve_members') or 0)
             perms['can_assign_roles'] = perms['can_assign_roles'] or int(rr.get('can_assign_roles') or 0)
 
+        permission_cache.set(user_id, org_id, perms, version)
         return perms
 
+    @staticmethod
+    def user_permissions_for_all_orgs(user_id):
+        """Return {OrgID: permission flags} for every org the user has a membership in.
+
+        One JOIN query replaces a user_permissions_for_org call per org. Like the
+        single-org lookup, only the user's first membership row per org counts,
+        and an 'Admin' role grants every permission. Results also warm the
+        permission cache.
+        """
+        db = get_read_db()
+        # versions before permissions, as in user_permissions_for_org
+        versions = user_org_versions(db, user_id) or {}
+        try:
+            rows = db.execute(
+                '''SELECT m.OrgID AS OrgID,
+                       MAX(CASE WHEN LOWER(orf.RoleName) = 'admin' THEN 1 ELSE 0 END) AS is_admin,
+                       MAX(CAST(COALESCE(orf.can_post_announcements, 0) AS INTEGER)) AS can_post_announcements,
+                       MAX(CAST(COALESCE(orf.can_create_events, 0) AS INTEGER)) AS can_create_events,
+                       MAX(CAST(COALESCE(orf.can_approve_members, 0) AS INTEGER)) AS can_approve_members,
+                       MAX(CAST(COALESCE(orf.can_assign_roles, 0) AS INTEGER)) AS can_assign_roles
+                   FROM memberships m
+                   LEFT JOIN officer_roles orf ON orf.MembershipID = m.MembershipID
+                   WHERE m.UserID = ?
+                     AND m.MembershipID = (SELECT MIN(m2.MembershipID) FROM memberships m2 WHERE m2.UserID = m.UserID AND m2.OrgID = m.OrgID)
+                   GROUP BY m.OrgID''',
+                (user_id,)
+            ).fetchall()
+        except sqlite3.DatabaseError as e:
+            current_app.logger.debug('DB error in user_permissions_for_all_orgs: %s', e)
+            return {}
+        result = {}
+        for r in rows:
+            if r['is_admin']:
+                perms = {'can_post_announcements': 1, 'can_create_events': 1, 'can_approve_members': 1, 'can_assign_roles': 1}
+            else:
+                perms = {k: int(r[k] or 0) for k in ('can_post_announcements', 'can_create_events', 'can_approve_members', 'can_assign_roles')}
+            result[r['OrgID']] = perms
+            permission_cache.set(user_id, r['OrgID'], perms, versions.get(r['OrgID']))
+        return result
+
+    @staticmethod
+    def permission_cache_stats():
+        """Hit/miss counters for the permission cache."""
+        return permission_cache.stats()
+
+    @staticmethod
+    def get_roles_for_user(user_id):
+        """Return the officer roles held through any of one user's memberships."""
+        db = get_read_db()
+        rows = db.execute(
+            'SELECT orf.OfficerRoleID, orf.MembershipID, orf.RoleName, orf.StartDate, orf.EndDate '
+            'FROM officer_roles orf JOIN memberships m ON m.MembershipID = orf.MembershipID WHERE m.UserID = ? ORDER BY orf.OfficerRoleID',
+            (user_id,)).fetchall()
+        return OfficerRole.rows_to_dicts(rows)
+
     @staticmethod
     def get_officers_by_org(org_id):
         """Return a list of officers (with user_name, user_id, role_name and permissions) for a given org."""
-        db = get_db()
+        db = get_read_db()
         try:
             # join officer_roles -> memberships -> users to get user info and permissions
             # Exclude plain 'Member' roles from the officers list — only show users who hold an officer-type role
@@ -235,12 +361,34 @@ class OfficerRoleService:
 
         return officers
 
+    @staticmethod
+    def get_user_names_by_officer_role_ids(officer_role_ids):
+        """Return {OfficerRoleID: 'First Last'} resolved through memberships -> users in batched JOINs."""
+        ids = sorted({int(i) for i in officer_role_ids if i is not None})
+        names = {}
+        if not ids:
+            return names
+        db = get_read_db()
+        try:
+            for i in range(0, len(ids), IN_BATCH_SIZE):
+                batch = ids[i:i + IN_BATCH_SIZE]
+                placeholders = ','.join('?' * len(batch))
+                rows = db.execute(
+                    f'SELECT orf.OfficerRoleID AS OfficerRoleID, u.FirstName AS FirstName, u.LastName AS LastName FROM officer_roles orf JOIN memberships m ON m.MembershipID = orf.MembershipID JOIN users u ON u.UserID = m.UserID WHERE orf.OfficerRoleID IN ({placeholders})',
+                    batch
+                ).fetchall()
+                for row in rows:
+                    names[row['OfficerRoleID']] = f"{row['FirstName']} {row['LastName']}"
+        except sqlite3.DatabaseError as e:
+            current_app.logger.debug('Error resolving users by officer roles: %s', e)
+        return names
+
     @staticmethod
     def get_user_by_officer_role(officer_role_id):
         """Resolve an OfficerRoleID to the underlying user row (dict) if possible.
         Returns a dict with UserID, FirstName, LastName or None.
         """
-        db = get_db()
+        db = get_read_db()
         try:
             row = db.execute(
                 'SELECT u.UserID as UserID, u.FirstName as FirstName, u.LastName as LastName FROM officer_roles orf JOIN memberships m ON m.MembershipID = orf.MembershipID JOIN users u ON u.UserID = m.UserID WHERE orf.OfficerRoleID = ? LIMIT 1',
@@ -249,4 +397,26 @@ class OfficerRoleService:
             return dict(row) if row is not None else None
         except Exception as e:
             current_app.logger.debug('Error resolving user by officer role: %s', e)
-            return None
\ No newline at end of file
+            return None
+
+
+# CSV uses OfficerRoleID, MembershipID, RoleName, RoleStart, RoleEnd
+_OFFICER_ROLE_IMPORT_SPEC = ImportSpec(
+    'officer_roles',
+    'INSERT OR IGNORE INTO officer_roles (OfficerRoleID, MembershipID, RoleName, StartDate, EndDate, can_post_announcements, can_create_events, can_approve_members, can_assign_roles, StartDateTs, EndDateTs) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+    {
+        'OfficerRoleID': ('OfficerRoleID',),
+        'MembershipID': ('MembershipID', 'membership_id'),
+        'RoleName': ('RoleName', 'name'),
+        'StartDate': ('StartDate', 'RoleStart'),
+        'EndDate': ('EndDate', 'RoleEnd'),
+        'can_post_announcements': ('can_post_announcements',),
+        'can_create_events': ('can_create_events',),
+        'can_approve_members': ('can_approve_members',),
+        'can_assign_roles': ('can_assign_roles',),
+    },
+    lambda v: (v['OfficerRoleID'], v['MembershipID'], v['RoleName'], v['StartDate'], v['EndDate'],
+               v['can_post_announcements'] or 0, v['can_create_events'] or 0,
+               v['can_approve_members'] or 0, v['can_assign_roles'] or 0,
+               to_epoch(v['StartDate']), to_epoch(v['EndDate'])),
+)
@@ -1,9 +1,19 @@
 import csv
 import sqlite3
 from flask import current_app
-from ..database import get_db
+from ..database import get_db, get_read_db
 from ..models.organization import Organization
 from ..utils.errors import AppError
+from ..utils.pagination import keyset_page
+from .bulk_import import ImportSpec, bulk_import_csv
+from .permission_cache import permission_cache
+
+# recompute the trigger-maintained member counters from memberships
+_RECONCILE_SQL = '''
+    UPDATE organizations SET
+        ApprovedCount = (SELECT COUNT(*) FROM memberships m WHERE m.OrgID = organizations.OrgID AND m.Status = 'approved' COLLATE NOCASE),
+        PendingCount = (SELECT COUNT(*) FROM memberships m WHERE m.OrgID = organizations.OrgID AND m.Status = 'pending' COLLATE NOCASE)
+'''
 
 class OrgService:
 
@@ -33,10 +43,10 @@ class OrgService:
 
     @staticmethod
     def get_all_organizations():
-        db = get_db()
+        db = get_read_db()
         # return canonical keys expected by Organization model
-        rows = db.execute('SELECT OrgID, OrgName, Description AS OrgDescription FROM organizations').fetchall()
-        orgs = [Organization(**dict(row)).to_dict() for row in rows]
+        rows = db.execute('SELECT OrgID, OrgName, Description AS OrgDescription, ApprovedCount, PendingCount FROM organizations').fetchall()
+        orgs = Organization.rows_to_dicts(rows)
 
         # Demonstrate lambda usage in data processing: sort organizations by OrgName
         # (case-insensitive). This satisfies the "lambda functions" requirement
@@ -52,6 +62,77 @@ class OrgService:
 
         return orgs_sorted
 
+    @staticmethod
+    def get_popular_organizations(limit=10):
+        """Return the `limit` organizations with the most approved members (home sidebar)."""
+        rows = get_read_db().execute(
+            'SELECT OrgID, OrgName, Description AS OrgDescription, ApprovedCount, PendingCount FROM organizations '
+            'ORDER BY ApprovedCount DESC, OrgID LIMIT ?', (limit,)).fetchall()
+        return Organization.rows_to_dicts(rows)
+
+    @staticmethod
+    def get_organizations_page(after=None, limit=100):
+        """Return (organizations, next_cursor) for one keyset page ordered by OrgID."""
+        db = get_read_db()
+        return keyset_page(db, 'SELECT OrgID, OrgName, Description AS OrgDescription, ApprovedCount, PendingCount FROM organizations', 'OrgID',
+                           [], [], after, limit, Organization.rows_to_dicts, batch=True)
+
+    @staticmethod
+    def open_export_cursor():
+        """Return an executed cursor over every organization, yielding plain tuples for streaming exports."""
+        cur = get_read_db().cursor()
+        cur.row_factory = None
+        return cur.execute('SELECT OrgID, OrgName, Description AS OrgDescription FROM organizations ORDER BY OrgID')
+
+    @staticmethod
+    def get_org_by_id(org_id):
+        """Return a single organization dict (Organization.to_dict shape) or None."""
+        db = get_read_db()
+        row = db.execute('SELECT OrgID, OrgName, Description AS OrgDescription, ApprovedCount, PendingCount FROM organizations WHERE OrgID = ?', (org_id,)).fetchone()
+        return Organization.row_to_dict(row) if row is not None else None
+
+    @staticmethod
+    def get_orgs_for_user(user_id, status=None):
+        """Return the organizations a user has a membership in (optionally with a given status), in join order."""
+        db = get_read_db()
+        sql = ('SELECT o.OrgID, o.OrgName, o.Description AS OrgDescription, o.ApprovedCount, o.PendingCount '
+               'FROM memberships m JOIN organizations o ON o.OrgID = m.OrgID WHERE m.UserID = ?')
+        params = [user_id]
+        if status is not None:
+            sql += ' AND m.Status = ? COLLATE NOCASE'
+            params.append(status)
+        sql += ' GROUP BY o.OrgID ORDER BY MIN(m.MembershipID)'
+        rows = db.execute(sql, params).fetchall()
+        return Organization.rows_to_dicts(rows)
+
+    @staticmethod
+    def get_member_counts(org_id):
+        """Return {'approved': n, 'pending': n} from the trigger-maintained counters on the org row."""
+        db = get_read_db()
+        row = db.execute('SELECT ApprovedCount, PendingCount FROM organizations WHERE OrgID = ?', (org_id,)).fetchone()
+        if row is None:
+            return {'approved': 0, 'pending': 0}
+        return {'approved': int(row['ApprovedCount'] or 0), 'pending': int(row['PendingCount'] or 0)}
+
+    @staticmethod
+    def reconcile_member_counts():
+        """Recompute ApprovedCount/PendingCount from memberships; returns the OrgIDs that had drifted."""
+        db = get_db()
+        try:
+            drifted = [r['OrgID'] for r in db.execute(
+                '''SELECT o.OrgID FROM organizations o
+                   WHERE o.ApprovedCount != (SELECT COUNT(*) FROM memberships m WHERE m.OrgID = o.OrgID AND m.Status = 'approved' COLLATE NOCASE)
+                      OR o.PendingCount != (SELECT COUNT(*) FROM memberships m WHERE m.OrgID = o.OrgID AND m.Status = 'pending' COLLATE NOCASE)'''
+            ).fetchall()]
+            if drifted:
+                placeholders = ','.join('?' for _ in drifted)
+                db.execute(_RECONCILE_SQL + f' WHERE OrgID IN ({placeholders})', drifted)
+            db.commit()
+            return drifted
+        except sqlite3.DatabaseError as e:
+            current_app.logger.exception('Database error while reconciling member counts')
+            raise AppError('DB_ERROR', 'Could not reconcile member counts', original_exception=e)
+
     @staticmethod
     def import_organizations_from_csv(file_path):
         try:
@@ -73,6 +154,11 @@ class OrgService:
             current_app.logger.exception('Unexpected error importing organizations from CSV')
             raise AppError('CSV_IMPORT_ERROR', 'Error importing CSV', original_exception=e)
 
+    @staticmethod
+    def bulk_import_organizations_from_csv(file_path, chunk_size=None):
+        """Import organizations with chunked executemany transactions; returns an import report."""
+        return bulk_import_csv(file_path, _ORG_IMPORT_SPEC, chunk_size)
+
     @staticmethod
     def update_organization(org_id, name=None, description=None):
         """Update organization name and/or description."""
@@ -130,9 +216,22 @@ class OrgService:
             # Finally remove the organization itself
             db.execute('DELETE FROM organizations WHERE OrgID = ?', (org_id,))
             db.commit()
+            permission_cache.invalidate(org_id=org_id)
         except sqlite3.DatabaseError as e:
             current_app.logger.exception('Database error while deleting organization')
             raise AppError('DB_ERROR', 'Could not delete organization', original_exception=e)
         except Exception as e:
             current_app.logger.exception('Unexpected error while deleting organization')
-            raise AppError('DB_ERROR', 'Could not delete organization', original_exception=e)
\ No newline at end of file
+            raise AppError('DB_ERROR', 'Could not delete organization', original_exception=e)
+
+
+_ORG_IMPORT_SPEC = ImportSpec(
+    'organizations',
+    'INSERT OR IGNORE INTO organizations (OrgName, Description) VALUES (?, ?)',
+    {
+        'OrgName': ('OrgName', 'name'),
+        'OrgDescription': ('OrgDescription', 'description'),
+    },
+    lambda v: (v['OrgName'], v['OrgDescription']),
+    required=('OrgName',),
+)
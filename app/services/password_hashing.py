@@ -0,0 +1,84 @@
+"""Batch password hashing for user imports.
+
+PBKDF2 is CPU-bound, so hashing a large roster one row at a time dominates
+import time. hash_passwords() fans the work out to a pool of worker processes
+(one per core by default) and yields the hashes back in input order so the
+bulk importer can insert them as they arrive.
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from passlib.hash import pbkdf2_sha256
+
+# below this many passwords the pool start-up cost outweighs the gain
+MIN_PARALLEL_BATCH = 16
+
+
+def _hash_plaintext(password):
+    # module-level so it can be pickled to worker processes
+    return pbkdf2_sha256.hash(password)
+
+
+def default_worker_count():
+    return os.cpu_count() or 1
+
+
+def _can_fork():
+    return 'fork' in multiprocessing.get_all_start_methods() and threading.active_count() == 1
+
+
+class PasswordHashPool:
+    """Context manager owning the worker pool for one import.
+
+    Worker processes are forked only when the platform supports it and the
+    caller is the process's only thread (scripts/seed_db.py, a CLI import).
+    Forking a multi-threaded process, such as a server seeding on its
+    background thread or importing on a request thread, can leave the child
+    stuck on locks held by other threads (logging, the connection pools). A
+    spawned child would re-run the app entrypoint (run.py builds the app at
+    import). Everywhere else a thread pool is used: passlib hashes through
+    hashlib's OpenSSL PBKDF2, which releases the GIL, so threads still use
+    every core.
+    """
+
+    def __init__(self, workers=None):
+        self.workers = max(1, int(workers or default_worker_count()))
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def _get_executor(self):
+        if self._executor is None:
+            if _can_fork():
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context('fork'))
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def map(self, passwords):
+        """Yield pbkdf2_sha256 hashes for passwords, in order."""
+        passwords = list(passwords)
+        if self.workers <= 1 or len(passwords) < MIN_PARALLEL_BATCH:
+            for p in passwords:
+                yield _hash_plaintext(p)
+            return
+        chunksize = max(1, len(passwords) // (self.workers * 4))
+        yield from self._get_executor().map(_hash_plaintext, passwords, chunksize=chunksize)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+def hash_passwords(passwords, workers=None):
+    """Hash an iterable of plaintext passwords in parallel; returns a list in input order."""
+    with PasswordHashPool(workers) as pool:
+        return list(pool.map(passwords))
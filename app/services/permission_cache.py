@@ -0,0 +1,157 @@
+"""In-process cache for OfficerRoleService.user_permissions_for_org.
+
+Entries are keyed by (database, user_id, org_id), so apps on different
+database files in one process never share them. They expire after
+PERMISSION_CACHE_TTL seconds (default 30; 0 disables caching).
+
+Each entry also records the org's row in permission_versions (migration
+0011), which triggers bump on every role or membership change that can
+alter permissions. Callers read the version before they read the cache
+or the permissions, and an entry filled under another version is a miss.
+A revoked officer therefore loses access on the next check in every
+worker process, not only in the one that made the change. The services
+that change memberships or roles also invalidate the affected keys
+explicitly, which frees the memory early.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from flask import current_app
+
+DEFAULT_TTL = 30.0
+DEFAULT_MAX_ENTRIES = 10000
+
+
+def _db_key():
+    from ..database import _resolve_db_path
+    path = _resolve_db_path()
+    return path if path == ':memory:' else os.path.abspath(path)
+
+
+def _key(user_id, org_id):
+    try:
+        return _db_key(), int(user_id), int(org_id)
+    except (TypeError, ValueError):
+        return None
+
+
+def org_version(db, org_id):
+    """Current permission version of an org (0 if never bumped), or None when unavailable."""
+    try:
+        row = db.execute('SELECT Version FROM permission_versions WHERE OrgID = ?', (org_id,)).fetchone()
+    except sqlite3.DatabaseError:
+        # database not migrated yet: entries fall back to TTL-only expiry
+        return None
+    return row[0] if row is not None else 0
+
+
+def user_org_versions(db, user_id):
+    """{OrgID: permission version} for every org the user has a membership in, or None when unavailable."""
+    try:
+        rows = db.execute(
+            'SELECT m.OrgID, COALESCE(v.Version, 0) FROM memberships m '
+            'LEFT JOIN permission_versions v ON v.OrgID = m.OrgID WHERE m.UserID = ?', (user_id,)
+        ).fetchall()
+    except sqlite3.DatabaseError:
+        return None
+    return {r[0]: r[1] for r in rows}
+
+
+class PermissionCache:
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = {}          # (database, user_id, org_id) -> (expires_at, version, perms)
+        self._by_org = {}           # (database, org_id) -> set of user_ids, for org-wide invalidation
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _ttl():
+        try:
+            ttl = current_app.config.get('PERMISSION_CACHE_TTL')
+        except RuntimeError:
+            ttl = None
+        return DEFAULT_TTL if ttl is None else float(ttl)
+
+    def get(self, user_id, org_id, version=None):
+        """Cached permissions filled under this org version, or None."""
+        key = _key(user_id, org_id)
+        if key is None:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now and entry[1] == version:
+                self.hits += 1
+                return dict(entry[2])
+            self.misses += 1
+            return None
+
+    def set(self, user_id, org_id, perms, version=None):
+        """Cache perms read after the org's permission version was `version`."""
+        key = _key(user_id, org_id)
+        ttl = self._ttl()
+        if key is None or ttl <= 0:
+            return
+        with self._lock:
+            if len(self._entries) >= self.max_entries and key not in self._entries:
+                # simple bound: drop everything rather than track LRU order
+                self._entries.clear()
+                self._by_org.clear()
+            self._entries[key] = (time.monotonic() + ttl, version, dict(perms))
+            self._by_org.setdefault(key[:1] + key[2:], set()).add(key[1])
+
+    def invalidate(self, user_id=None, org_id=None):
+        """Drop one (user, org) entry or every entry of an org of the current database, or everything."""
+        with self._lock:
+            self.invalidations += 1
+            if org_id is None:
+                if user_id is None:
+                    self._entries.clear()
+                    self._by_org.clear()
+                else:
+                    db_key, uid = _db_key(), int(user_id)
+                    for key in [k for k in self._entries if k[0] == db_key and k[1] == uid]:
+                        self._entries.pop(key, None)
+                        self._by_org.get((db_key, key[2]), set()).discard(uid)
+                return
+            org_key = (_db_key(), int(org_id))
+            users = self._by_org.get(org_key, set())
+            targets = list(users) if user_id is None else [int(user_id)]
+            for uid in targets:
+                self._entries.pop((org_key[0], uid, org_key[1]), None)
+                users.discard(uid)
+            if not users:
+                self._by_org.pop(org_key, None)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+                'entries': len(self._entries),
+                'hit_ratio': (self.hits / lookups) if lookups else 0.0,
+            }
+
+
+permission_cache = PermissionCache()
+
+
+def invalidate_membership(db, membership_id):
+    """Invalidate the (user, org) entry that owns a membership row."""
+    try:
+        row = db.execute('SELECT UserID, OrgID FROM memberships WHERE MembershipID = ?', (membership_id,)).fetchone()
+    except Exception:
+        row = None
+    if row is None:
+        # unknown membership: be conservative
+        permission_cache.invalidate()
+    else:
+        permission_cache.invalidate(row['UserID'], row['OrgID'])
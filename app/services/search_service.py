@@ -0,0 +1,157 @@
+"""Full-text search over organizations, announcements and events.
+
+Backed by the FTS5 tables declared at the end of database/schema_v1.sql
+(organizations_fts, announcements_fts, events_fts). Results are ranked with
+BM25 and come back with highlighted snippets. If the SQLite build has no FTS5
+the queries fall back to LIKE scans so /search keeps working.
+"""
+
+import re
+import sqlite3
+from flask import current_app
+from markupsafe import Markup, escape
+from ..database import get_db, get_read_db
+from ..utils.errors import AppError
+
+# control characters used as highlight markers; they never occur in user
+# text, so the snippet can be HTML-escaped first and the markers swapped after
+_HL_OPEN = '\x02'
+_HL_CLOSE = '\x03'
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+FTS_TABLES = ('organizations_fts', 'announcements_fts', 'events_fts')
+
+_SEARCH_SQL = {
+    'orgs': (
+        'SELECT o.OrgID, o.OrgName, o.Description AS OrgDescription, '
+        'highlight(organizations_fts, 0, char(2), char(3)) AS TitleHighlight, '
+        "snippet(organizations_fts, 1, char(2), char(3), '…', 24) AS Snippet "
+        'FROM organizations_fts JOIN organizations o ON o.OrgID = organizations_fts.rowid '
+        'WHERE organizations_fts MATCH ? ORDER BY bm25(organizations_fts, 10.0, 1.0) LIMIT ? OFFSET ?'
+    ),
+    'announcements': (
+        'SELECT a.AnnouncementID, a.OrgID, a.CreatedBy, a.Title, a.Content, a.DatePosted, '
+        'highlight(announcements_fts, 0, char(2), char(3)) AS TitleHighlight, '
+        "snippet(announcements_fts, 1, char(2), char(3), '…', 24) AS Snippet "
+        'FROM announcements_fts JOIN announcements a ON a.AnnouncementID = announcements_fts.rowid '
+        'WHERE announcements_fts MATCH ? ORDER BY bm25(announcements_fts, 10.0, 1.0) LIMIT ? OFFSET ?'
+    ),
+    'events': (
+        'SELECT e.EventID, e.OrgID, e.CreatedBy, e.EventName, e.Description AS EventDescription, e.EventDate, e.Location, '
+        'highlight(events_fts, 0, char(2), char(3)) AS TitleHighlight, '
+        "snippet(events_fts, -1, char(2), char(3), '…', 24) AS Snippet "
+        'FROM events_fts JOIN events e ON e.EventID = events_fts.rowid '
+        'WHERE events_fts MATCH ? ORDER BY bm25(events_fts, 10.0, 1.0, 2.0) LIMIT ? OFFSET ?'
+    ),
+}
+
+# LIKE fallback for SQLite builds without FTS5 (newest rows first)
+_FALLBACK_SQL = {
+    'orgs': (
+        'SELECT OrgID, OrgName, Description AS OrgDescription, OrgName AS TitleHighlight, Description AS Snippet '
+        'FROM organizations WHERE OrgName LIKE ? OR Description LIKE ? ORDER BY OrgID DESC LIMIT ? OFFSET ?'
+    ),
+    'announcements': (
+        'SELECT AnnouncementID, OrgID, CreatedBy, Title, Content, DatePosted, Title AS TitleHighlight, Content AS Snippet '
+        'FROM announcements WHERE Title LIKE ? OR Content LIKE ? ORDER BY AnnouncementID DESC LIMIT ? OFFSET ?'
+    ),
+    'events': (
+        'SELECT EventID, OrgID, CreatedBy, EventName, Description AS EventDescription, EventDate, Location, '
+        'EventName AS TitleHighlight, Description AS Snippet '
+        'FROM events WHERE EventName LIKE ? OR Description LIKE ? ORDER BY EventID DESC LIMIT ? OFFSET ?'
+    ),
+}
+
+
+def build_match_query(q):
+    """Turn free text into an FTS5 MATCH expression.
+
+    Every word becomes a quoted prefix term, so punctuation and FTS keywords
+    (AND, NEAR, ...) in user input can't produce syntax errors.
+    Returns None when the text contains no searchable words.
+    """
+    tokens = _TOKEN_RE.findall(q or '')
+    if not tokens:
+        return None
+    return ' '.join(f'"{t}"*' for t in tokens)
+
+
+def _fts_unavailable(error):
+    """True when an OperationalError means FTS5 or one of FTS_TABLES is missing."""
+    message = str(error)
+    if message.startswith('no such module'):
+        return True
+    return message.startswith('no such table') and message.rsplit('.', 1)[-1].endswith(FTS_TABLES)
+
+
+def render_highlight(text):
+    """HTML-escape text and turn the highlight markers into <mark> tags."""
+    if not text:
+        return Markup('')
+    return Markup(str(escape(text)).replace(_HL_OPEN, '<mark>').replace(_HL_CLOSE, '</mark>'))
+
+
+class SearchService:
+
+    @staticmethod
+    def _search_section(db, section, match, q, limit, offset):
+        try:
+            rows = db.execute(_SEARCH_SQL[section], (match, limit + 1, offset)).fetchall()
+        except sqlite3.OperationalError as e:
+            # no such module/table: fts5 missing or index not created yet; anything
+            # else (locked, I/O, bad schema) is a real failure, not a cue to scan
+            if not _fts_unavailable(e):
+                raise
+            current_app.logger.debug('FTS search unavailable for %s, using LIKE fallback: %s', section, e)
+            like = f'%{q}%'
+            rows = db.execute(_FALLBACK_SQL[section], (like, like, limit + 1, offset)).fetchall()
+        items = []
+        for row in rows[:limit]:
+            d = dict(row)
+            d['TitleHighlight'] = render_highlight(d.get('TitleHighlight'))
+            d['Snippet'] = render_highlight(d.get('Snippet'))
+            items.append(d)
+        return items, len(rows) > limit
+
+    @staticmethod
+    def search(q, page=1, per_page=None):
+        """Search all three sections; returns a dict of ranked, paginated results.
+
+        Each section holds at most per_page rows for the requested page and
+        a has_more_<section> flag tells the template whether a next page exists.
+        """
+        if per_page is None:
+            per_page = int(current_app.config.get('SEARCH_PAGE_SIZE') or 10)
+        page = max(1, int(page or 1))
+        results = {'orgs': [], 'announcements': [], 'events': [], 'page': page, 'per_page': per_page, 'has_more': False}
+        match = build_match_query(q)
+        if not match:
+            return results
+        db = get_read_db()
+        offset = (page - 1) * per_page
+        for section in ('orgs', 'announcements', 'events'):
+            try:
+                items, more = SearchService._search_section(db, section, match, q, per_page, offset)
+            except sqlite3.DatabaseError:
+                current_app.logger.exception('Failed searching %s', section)
+                items, more = [], False
+            results[section] = items
+            results['has_more_' + section] = more
+            results['has_more'] = results['has_more'] or more
+        return results
+
+    @staticmethod
+    def rebuild_index():
+        """(Re)populate the FTS tables from their content tables.
+
+        Used to backfill databases created before the index existed; the
+        triggers keep it current afterwards.
+        """
+        db = get_db()
+        try:
+            for table in FTS_TABLES:
+                db.execute(f"INSERT INTO {table}({table}) VALUES('rebuild')")
+            db.commit()
+        except sqlite3.DatabaseError as e:
+            current_app.logger.exception('Failed to rebuild search index')
+            raise AppError('DB_ERROR', 'Could not rebuild search index', original_exception=e)
@@ -0,0 +1,185 @@
+"""One-shot CSV auto-seeding, run off the request path.
+
+init_db used to import every data/*.csv inline in create_app, hashing every
+user password before the first request could be served, and each forked
+worker raced to do the same. Now the single seed_state row (migration 0004)
+serves as a lock. The first process to claim it with BEGIN IMMEDIATE seeds
+the database and records progress there. Other processes leave it alone
+unless the owner's heartbeat goes stale (SEED_LOCK_STALE seconds), which
+means the owner died part-way through. /healthz/ready reports the row.
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from flask import current_app
+from ..database import get_db
+from .announcement_service import AnnouncementService
+from .event_service import EventService
+from .membership_service import MembershipService
+from .officer_role_service import OfficerRoleService
+from .organization_service import OrgService
+from .user_service import UserService
+
+# FOREIGN KEY order: memberships need users/orgs, officer_roles need
+# memberships, events/announcements reference officer_roles.
+SEED_STEPS = (
+    ('organizations', 'organizations.csv'),
+    ('users', 'users.csv'),
+    ('memberships', 'membership.csv'),
+    ('officer_roles', 'officer_roles.csv'),
+    ('events', 'events.csv'),
+    ('announcements', 'announcements.csv'),
+)
+
+DEFAULT_LOCK_STALE = 600.0
+
+
+def _importer(table):
+    return {
+        'organizations': OrgService.bulk_import_organizations_from_csv,
+        'users': UserService.bulk_import_users_from_csv,
+        'memberships': MembershipService.bulk_import_memberships_from_csv,
+        'officer_roles': OfficerRoleService.bulk_import_officer_roles_from_csv,
+        'events': EventService.bulk_import_events_from_csv,
+        'announcements': AnnouncementService.bulk_import_announcements_from_csv,
+    }[table]
+
+
+def _owner():
+    return f'{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}'
+
+
+class SeedService:
+
+    @staticmethod
+    def _lock_stale():
+        return float(current_app.config.get('SEED_LOCK_STALE') or DEFAULT_LOCK_STALE)
+
+    @staticmethod
+    def get_state(db=None):
+        """Return the seed_state row as a dict, or None if the table doesn't exist yet."""
+        db = db or get_db()
+        try:
+            row = db.execute('SELECT * FROM seed_state WHERE id = 1').fetchone()
+        except sqlite3.OperationalError:
+            return None
+        if row is None:
+            return None
+        state = dict(row)
+        state['detail'] = json.loads(state['detail']) if state.get('detail') else {}
+        return state
+
+    @staticmethod
+    def needs_seeding(db=None):
+        """True if the database is waiting to be seeded or its seeder died."""
+        state = SeedService.get_state(db)
+        if state is None or state['status'] == 'done':
+            return False
+        if state['status'] == 'running':
+            return (time.time() - (state.get('heartbeat_at') or 0)) > SeedService._lock_stale()
+        return True
+
+    @staticmethod
+    def claim(db=None):
+        """Try to take the seed lock; returns the owner token or None."""
+        db = db or get_db()
+        owner = _owner()
+        if db.in_transaction:
+            db.commit()
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            row = db.execute('SELECT status, heartbeat_at FROM seed_state WHERE id = 1').fetchone()
+            if row is None or row['status'] == 'done':
+                db.rollback()
+                return None
+            if row['status'] == 'running' and (time.time() - (row['heartbeat_at'] or 0)) <= SeedService._lock_stale():
+                db.rollback()
+                return None
+            now = time.time()
+            db.execute(
+                "UPDATE seed_state SET status = 'running', owner = ?, step = NULL, steps_done = 0, steps_total = ?, "
+                'detail = NULL, error = NULL, started_at = ?, heartbeat_at = ?, finished_at = NULL WHERE id = 1',
+                (owner, len(SEED_STEPS), now, now)
+            )
+            db.commit()
+        except sqlite3.DatabaseError:
+            db.rollback()
+            current_app.logger.exception('Could not claim the seed lock')
+            return None
+        return owner
+
+    @staticmethod
+    def _progress(db, owner, **fields):
+        fields['heartbeat_at'] = time.time()
+        cols = ', '.join(f'{k} = ?' for k in fields)
+        db.execute(f'UPDATE seed_state SET {cols} WHERE id = 1 AND owner = ?', (*fields.values(), owner))
+        db.commit()
+
+    @staticmethod
+    def run(owner, data_dir):
+        """Import every empty table from its CSV, recording progress; requires an app context."""
+        db = get_db()
+        detail = {}
+        errors = []
+        for done, (table, csv_name) in enumerate(SEED_STEPS):
+            SeedService._progress(db, owner, step=table, steps_done=done, detail=json.dumps(detail))
+            csv_path = os.path.join(data_dir, csv_name)
+            # Only import when the table is empty and the CSV file exists
+            if not os.path.exists(csv_path) or db.execute(f'SELECT 1 FROM {table} LIMIT 1').fetchone() is not None:
+                detail[table] = 'skipped'
+                continue
+            try:
+                report = _importer(table)(csv_path)
+                detail[table] = {k: report[k] for k in ('inserted', 'skipped', 'failed')}
+            except Exception as e:
+                current_app.logger.exception('Failed to import %s from CSV', table)
+                detail[table] = 'error'
+                errors.append(f'{table}: {e}')
+        status = 'failed' if errors else 'done'
+        SeedService._progress(db, owner, status=status, step=None, steps_done=len(SEED_STEPS),
+                              detail=json.dumps(detail), error='; '.join(errors) or None, finished_at=time.time())
+        current_app.logger.info('Database seeding %s: %s', status, detail)
+        return status
+
+    @staticmethod
+    def mark_done(db=None):
+        """Record that the database was seeded by other means (e.g. scripts/seed_db.py)."""
+        db = db or get_db()
+        now = time.time()
+        db.execute("UPDATE seed_state SET status = 'done', owner = ?, step = NULL, finished_at = ?, heartbeat_at = ? WHERE id = 1",
+                   (_owner(), now, now))
+        db.commit()
+
+    @staticmethod
+    def start(app, background=True):
+        """Claim the seed lock and seed, on a daemon thread unless background is False.
+
+        Returns the thread (background), the final status (foreground), or
+        None when another process holds the lock or nothing needs seeding.
+        """
+        data_dir = os.path.abspath(os.path.join(app.root_path, '..', 'data'))
+
+        def job():
+            with app.app_context():
+                owner = SeedService.claim()
+                if owner is None:
+                    return None
+                try:
+                    return SeedService.run(owner, data_dir)
+                except Exception as e:
+                    current_app.logger.exception('Automatic seeding failed')
+                    try:
+                        SeedService._progress(get_db(), owner, status='failed', error=str(e), finished_at=time.time())
+                    except sqlite3.DatabaseError:
+                        pass
+                    return 'failed'
+
+        if not background:
+            return job()
+        thread = threading.Thread(target=job, name='campus-hub-seed', daemon=True)
+        thread.start()
+        return thread
@@ -0,0 +1,240 @@
+"""Content-addressed storage for uploaded attachment files.
+
+An upload is streamed in UPLOAD_CHUNK_SIZE pieces while its SHA-256 is
+computed, and stored once under blobs/<sha[:2]>/<sha>. Uploads up to
+UPLOAD_SPOOL_SIZE stay in memory until the hash is known, so re-uploading
+a file that is already stored writes nothing to disk; larger ones are
+spooled to a temp file and renamed into place (or discarded if the blob
+already exists). upload_blobs (migration 0009) records each blob and its
+reference count. Blobs are served by /uploads/<sha256> with immutable
+cache headers, since a URL can never point at different bytes. The MIME
+type comes from the client, so it never decides on its own whether a blob
+is rendered inline (see inline_safe()).
+"""
+
+import hashlib
+import mimetypes
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+from flask import current_app, url_for
+from ..database import get_db, get_read_db
+from ..utils.errors import AppError
+
+DEFAULT_UPLOAD_SETTINGS = {
+    'UPLOAD_DIR': None,                         # default: <instance_path>/uploads
+    'UPLOAD_CHUNK_SIZE': 64 * 1024,
+    'UPLOAD_SPOOL_SIZE': 1024 * 1024,           # hash in memory up to this size before touching disk
+    'UPLOAD_MAX_FILE_BYTES': 25 * 1024 * 1024,
+    'UPLOAD_MAX_REQUEST_BYTES': 100 * 1024 * 1024,
+    'UPLOAD_GC_GRACE': 3600,                    # seconds an unreferenced blob is kept (uploads in flight)
+}
+
+# (offset, leading bytes, MIME types that content may be served inline as).
+# The type recorded for a blob is whatever the client declared, so /uploads
+# only renders a blob inline when its bytes match one of these formats and the
+# recorded type is one of that format's types; everything else (SVG, HTML sent
+# as image/png, ...) is served as a download.
+_INLINE_SIGNATURES = (
+    (0, b'\x89PNG\r\n\x1a\n', ('image/png', 'image/apng')),
+    (0, b'\xff\xd8\xff', ('image/jpeg', 'image/pjpeg')),
+    (0, b'GIF87a', ('image/gif',)),
+    (0, b'GIF89a', ('image/gif',)),
+    (8, b'WEBP', ('image/webp',)),
+    (8, b'WAVE', ('audio/wav', 'audio/x-wav', 'audio/wave')),
+    (4, b'ftyp', ('video/mp4', 'video/quicktime', 'video/x-m4v', 'audio/mp4', 'audio/x-m4a')),
+    (0, b'\x1a\x45\xdf\xa3', ('video/webm', 'audio/webm')),
+    (0, b'OggS', ('audio/ogg', 'video/ogg', 'application/ogg')),
+    (0, b'ID3', ('audio/mpeg',)),
+    (0, b'fLaC', ('audio/flac', 'audio/x-flac')),
+)
+SNIFF_BYTES = 12
+
+
+def _setting(name):
+    value = current_app.config.get(name)
+    return DEFAULT_UPLOAD_SETTINGS[name] if value is None else value
+
+
+def inline_safe(mimetype, head):
+    """True if content starting with head may be rendered inline as mimetype."""
+    mimetype = (mimetype or '').split(';')[0].strip().lower()
+    for offset, magic, types in _INLINE_SIGNATURES:
+        if head[offset:offset + len(magic)] == magic:
+            return mimetype in types
+    return False
+
+
+def attachment_type(mimetype):
+    """Attachment 'type' used by the templates for a MIME type."""
+    mimetype = mimetype or ''
+    if mimetype.startswith('image/'):
+        return 'image'
+    if mimetype.startswith('video/'):
+        return 'video'
+    return 'file'
+
+
+class UploadStore:
+
+    @staticmethod
+    def root():
+        root = _setting('UPLOAD_DIR') or os.path.join(current_app.instance_path, 'uploads')
+        os.makedirs(os.path.join(root, 'tmp'), exist_ok=True)
+        return root
+
+    @staticmethod
+    def blob_path(sha256):
+        return os.path.join(UploadStore.root(), 'blobs', sha256[:2], sha256)
+
+    @staticmethod
+    def store(stream, mimetype=None, max_bytes=None):
+        """Stream a file into the store; returns {'sha256', 'size', 'mimetype', 'written'}.
+
+        Raises AppError('UPLOAD_TOO_LARGE') once more than max_bytes
+        (default UPLOAD_MAX_FILE_BYTES) have been read. 'written' is False
+        when the content was already stored.
+        """
+        chunk_size = int(_setting('UPLOAD_CHUNK_SIZE'))
+        spool_size = int(_setting('UPLOAD_SPOOL_SIZE'))
+        limit = int(_setting('UPLOAD_MAX_FILE_BYTES')) if max_bytes is None else max_bytes
+        tmp_dir = os.path.join(UploadStore.root(), 'tmp')
+        digest = hashlib.sha256()
+        buffer = bytearray()
+        spool = None
+        size = 0
+        try:
+            while True:
+                chunk = stream.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > limit:
+                    raise AppError('UPLOAD_TOO_LARGE', f'File exceeds the {limit} byte upload limit', log=False)
+                digest.update(chunk)
+                if spool is not None:
+                    spool.write(chunk)
+                    continue
+                buffer += chunk
+                if len(buffer) > spool_size:
+                    spool = tempfile.NamedTemporaryFile(dir=tmp_dir, delete=False)
+                    spool.write(buffer)
+                    buffer = None
+            sha256 = digest.hexdigest()
+            path = UploadStore.blob_path(sha256)
+            written = not os.path.exists(path)
+            if written:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                if spool is None:
+                    spool = tempfile.NamedTemporaryFile(dir=tmp_dir, delete=False)
+                    spool.write(buffer)
+                spool.close()
+                # atomic: concurrent uploads of the same bytes just replace each other
+                os.replace(spool.name, path)
+                spool = None
+        except OSError as e:
+            current_app.logger.exception('Error writing upload to the blob store')
+            raise AppError('UPLOAD_ERROR', 'Could not store upload', original_exception=e)
+        finally:
+            if spool is not None:
+                spool.close()
+                try:
+                    os.remove(spool.name)
+                except OSError:
+                    pass
+
+        db = get_db()
+        try:
+            now = time.time()
+            db.execute('INSERT OR IGNORE INTO upload_blobs (Sha256, Size, MimeType, RefCount, created_at) VALUES (?, ?, ?, 0, ?)',
+                       (sha256, size, mimetype, now))
+            # re-uploading an unreferenced blob restarts its garbage-collection grace period
+            db.execute('UPDATE upload_blobs SET created_at = ? WHERE Sha256 = ? AND RefCount <= 0', (now, sha256))
+            db.commit()
+        except sqlite3.DatabaseError as e:
+            current_app.logger.exception('Database error while recording upload blob')
+            raise AppError('DB_ERROR', 'Could not store upload', original_exception=e)
+        return {'sha256': sha256, 'size': size, 'mimetype': mimetype, 'written': written}
+
+    @staticmethod
+    def variant_dir(sha256):
+        return os.path.join(UploadStore.root(), 'variants', sha256[:2], sha256)
+
+    @staticmethod
+    def variant_path(sha256, name):
+        """Path of a derived file (thumbnail, poster...) of a blob; see app/services/derivatives.py."""
+        return os.path.join(UploadStore.variant_dir(sha256), name)
+
+    @staticmethod
+    def variant_url(sha256, name):
+        # built by hand: background workers have no request context for url_for
+        root = (current_app.config.get('APPLICATION_ROOT') or '/').rstrip('/')
+        return f'{root}/uploads/variants/{sha256}/{name}'
+
+    @staticmethod
+    def save_upload(file_storage, max_bytes=None):
+        """Store a werkzeug FileStorage; returns the attachment dict for create_announcement."""
+        filename = os.path.basename(file_storage.filename or '') or 'upload'
+        mimetype = file_storage.mimetype or mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        blob = UploadStore.store(file_storage.stream, mimetype, max_bytes)
+        return {
+            'type': attachment_type(mimetype),
+            'url': UploadStore.url(blob['sha256'], filename),
+            'filename': filename,
+            'mimetype': mimetype,
+            'sha256': blob['sha256'],
+            'size': blob['size'],
+        }
+
+    @staticmethod
+    def url(sha256, filename=None):
+        if filename:
+            return url_for('uploads.get_blob_named', sha256=sha256, filename=filename)
+        return url_for('uploads.get_blob', sha256=sha256)
+
+    @staticmethod
+    def get_blob(sha256):
+        row = get_read_db().execute('SELECT Sha256, Size, MimeType, RefCount, created_at FROM upload_blobs WHERE Sha256 = ?',
+                                    (sha256,)).fetchone()
+        return dict(row) if row is not None else None
+
+    @staticmethod
+    def stats():
+        """Blob count, bytes on disk, references and the bytes deduplication saved."""
+        row = get_read_db().execute(
+            'SELECT COUNT(*) AS blobs, COALESCE(SUM(Size), 0) AS stored_bytes, COALESCE(SUM(RefCount), 0) AS refs, '
+            'COALESCE(SUM(Size * MAX(RefCount - 1, 0)), 0) AS saved_bytes FROM upload_blobs'
+        ).fetchone()
+        return dict(row)
+
+    @staticmethod
+    def collect_garbage(grace=None):
+        """Delete unreferenced blobs older than grace seconds; returns (blobs, bytes) removed."""
+        grace = float(_setting('UPLOAD_GC_GRACE') if grace is None else grace)
+        db = get_db()
+        removed, freed = 0, 0
+        try:
+            cutoff = time.time() - grace
+            rows = db.execute('SELECT Sha256, Size FROM upload_blobs WHERE RefCount <= 0 AND created_at < ?',
+                              (cutoff,)).fetchall()
+            for row in rows:
+                # re-check in the delete so a blob referenced or re-uploaded meanwhile survives
+                # (a re-upload restarts created_at and may have skipped writing the existing file)
+                cur = db.execute('DELETE FROM upload_blobs WHERE Sha256 = ? AND RefCount <= 0 AND created_at < ?',
+                                 (row['Sha256'], cutoff))
+                if cur.rowcount:
+                    db.commit()
+                    try:
+                        os.remove(UploadStore.blob_path(row['Sha256']))
+                    except FileNotFoundError:
+                        pass
+                    shutil.rmtree(UploadStore.variant_dir(row['Sha256']), ignore_errors=True)
+                    removed += 1
+                    freed += row['Size']
+            db.commit()
+        except sqlite3.DatabaseError as e:
+            current_app.logger.exception('Database error while collecting upload garbage')
+            raise AppError('DB_ERROR', 'Could not collect unreferenced uploads', original_exception=e)
+        return removed, freed
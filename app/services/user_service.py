@@ -2,32 +2,39 @@ import csv
 import os
 import sqlite3
 from flask import current_app
-from ..database import get_db
+from ..database import get_db, get_read_db
 from ..models.user import User
 from ..utils.errors import AppError
+from ..utils.pagination import keyset_page
+from .bulk_import import ImportSpec, bulk_import_csv
+from .password_hashing import PasswordHashPool
 from passlib.hash import pbkdf2_sha256
 
+# keep IN (...) lists under SQLite's default bound-parameter limit
+IN_BATCH_SIZE = 500
+
+
 class UserService:
 
+    @staticmethod
+    def hash_password(password=None):
+        """Return the PasswordHash value to store for a plaintext or pre-hashed password."""
+        # Determine password hash to store. If no password provided, use a
+        # default from environment or fallback to a safe default.
+        if not password:
+            return pbkdf2_sha256.hash(_default_password())
+        p = str(password)
+        # If the value already looks like a passlib pbkdf2_sha256 hash,
+        # store it as-is. Otherwise hash the provided plaintext.
+        if p.startswith('$pbkdf2-sha256$'):
+            return p
+        return pbkdf2_sha256.hash(p)
+
     @staticmethod
     def create_user(first_name, last_name, email, password=None):
         db = get_db()
         try:
-            # Determine password hash to store. If a password was provided and
-            # looks like a bcrypt hash (starts with $2), assume it's already
-            # hashed. Otherwise hash the plaintext. If no password provided,
-            # use a default from environment or fallback to a safe default.
-            if not password:
-                default_pw = os.environ.get('SEED_DEFAULT_PASSWORD', 'pass123')
-                hashed = pbkdf2_sha256.hash(default_pw)
-            else:
-                p = str(password)
-                # If the value already looks like a passlib pbkdf2_sha256 hash,
-                # store it as-is. Otherwise hash the provided plaintext.
-                if p.startswith('$pbkdf2-sha256$'):
-                    hashed = p
-                else:
-                    hashed = pbkdf2_sha256.hash(p)
+            hashed = UserService.hash_password(password)
 
             db.execute(
                 'INSERT OR IGNORE INTO users (FirstName, LastName, Email, PasswordHash) VALUES (?, ?, ?, ?)',
@@ -43,23 +50,57 @@ class UserService:
 
     @staticmethod
     def get_all_users():
-        db = get_db()
+        db = get_read_db()
         # select only public fields so model construction doesn't receive audit columns
         rows = db.execute('SELECT UserID, FirstName, LastName, Email FROM users').fetchall()
-        return [User(**dict(row)).to_dict() for row in rows]
+        return User.rows_to_dicts(rows)
+
+    @staticmethod
+    def get_user_names_by_ids(user_ids):
+        """Return {UserID: 'First Last'} for the given ids using batched IN queries."""
+        ids = sorted({int(i) for i in user_ids if i is not None})
+        names = {}
+        if not ids:
+            return names
+        db = get_read_db()
+        for i in range(0, len(ids), IN_BATCH_SIZE):
+            batch = ids[i:i + IN_BATCH_SIZE]
+            placeholders = ','.join('?' * len(batch))
+            rows = db.execute(f'SELECT UserID, FirstName, LastName FROM users WHERE UserID IN ({placeholders})', batch).fetchall()
+            for row in rows:
+                names[row['UserID']] = f"{row['FirstName']} {row['LastName']}"
+        return names
+
+    @staticmethod
+    def get_users_page(after=None, limit=100, email=None):
+        """Return (users, next_cursor) for one keyset page ordered by UserID."""
+        db = get_read_db()
+        conditions, params = [], []
+        if email:
+            conditions.append('Email = ?')
+            params.append(email)
+        return keyset_page(db, 'SELECT UserID, FirstName, LastName, Email FROM users', 'UserID',
+                           conditions, params, after, limit, User.rows_to_dicts, batch=True)
+
+    @staticmethod
+    def open_export_cursor():
+        """Return an executed cursor over every user (PasswordHash excluded), yielding plain tuples for streaming exports."""
+        cur = get_read_db().cursor()
+        cur.row_factory = None
+        return cur.execute('SELECT UserID, FirstName, LastName, Email FROM users ORDER BY UserID')
 
     @staticmethod
     def get_user_row_by_email(email):
         """Return the raw DB row (as a dict) for the given email, including PasswordHash.
         Returns None if not found.
         """
-        db = get_db()
+        db = get_read_db()
         row = db.execute('SELECT * FROM users WHERE Email = ?', (email,)).fetchone()
         return dict(row) if row is not None else None
 
     @staticmethod
     def get_user_row_by_id(user_id):
-        db = get_db()
+        db = get_read_db()
         row = db.execute('SELECT UserID, FirstName, LastName, Email, created_at FROM users WHERE UserID = ?', (user_id,)).fetchone()
         return dict(row) if row is not None else None
 
@@ -93,3 +134,61 @@ class UserService:
         except Exception as e:
             current_app.logger.exception('Unexpected error importing users from CSV')
             raise AppError('CSV_IMPORT_ERROR', 'Error importing CSV', original_exception=e)
+
+    @staticmethod
+    def bulk_import_users_from_csv(file_path, chunk_size=None, workers=None, share_default_hash=None):
+        """Import users with chunked executemany transactions; returns an import report.
+
+        Plaintext passwords are hashed in a process pool (PASSWORD_HASH_WORKERS,
+        default one per core) and streamed back in row order. Rows without a
+        password get SEED_DEFAULT_PASSWORD; with share_default_hash (or the
+        IMPORT_SHARE_DEFAULT_PASSWORD_HASH config flag) that default is hashed
+        once per import and the same hash is stored for every such row.
+        """
+        if workers is None:
+            workers = current_app.config.get('PASSWORD_HASH_WORKERS')
+        if share_default_hash is None:
+            share_default_hash = bool(current_app.config.get('IMPORT_SHARE_DEFAULT_PASSWORD_HASH'))
+        default_pw = _default_password()
+        shared = {}
+
+        with PasswordHashPool(workers) as pool:
+            def hash_chunk(chunk):
+                pending, plaintexts = [], []
+                for _, values in chunk:
+                    p = values.get('password')
+                    if p and p.startswith('$pbkdf2-sha256$'):
+                        values['PasswordHash'] = p
+                    elif not p and share_default_hash:
+                        if 'hash' not in shared:
+                            shared['hash'] = pbkdf2_sha256.hash(default_pw)
+                        values['PasswordHash'] = shared['hash']
+                    else:
+                        pending.append(values)
+                        plaintexts.append(p or default_pw)
+                for values, hashed in zip(pending, pool.map(plaintexts)):
+                    values['PasswordHash'] = hashed
+                return chunk
+
+            spec = ImportSpec(
+                'users',
+                'INSERT OR IGNORE INTO users (FirstName, LastName, Email, PasswordHash) VALUES (?, ?, ?, ?)',
+                _USER_IMPORT_FIELDS,
+                lambda v: (v['FirstName'], v['LastName'], v['Email'], v['PasswordHash']),
+                required=('FirstName', 'LastName', 'Email'),
+                prepare_chunk=hash_chunk,
+            )
+            return bulk_import_csv(file_path, spec, chunk_size)
+
+
+def _default_password():
+    return os.environ.get('SEED_DEFAULT_PASSWORD', 'pass123')
+
+
+_USER_IMPORT_FIELDS = {
+    'FirstName': ('FirstName', 'first_name'),
+    'LastName': ('LastName', 'last_name'),
+    'Email': ('Email', 'email'),
+    # CSV may include a pre-hashed PasswordHash or a plaintext 'password'
+    'password': ('PasswordHash', 'password'),
+}
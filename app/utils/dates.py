@@ -0,0 +1,97 @@
+"""Date normalization for the *Ts epoch columns (migration 0007).
+
+Dates come from HTML forms, CSV files and CURRENT_TIMESTAMP defaults in
+several formats. They are parsed once, when a row is written, into integer
+Unix seconds stored next to the original text (DatePosted -> DatePostedTs,
+and so on). Range queries and ORDER BY then use an integer index instead of
+comparing strings. Naive values are taken as UTC, the same as SQLite's
+CURRENT_TIMESTAMP.
+"""
+
+import time
+from datetime import date, datetime, timedelta, timezone
+
+from .errors import AppError
+
+# tried in order after datetime.fromisoformat()
+_FORMATS = (
+    '%m/%d/%Y %H:%M:%S',
+    '%m/%d/%Y %H:%M',
+    '%m/%d/%Y %I:%M %p',
+    '%m/%d/%Y',
+    '%m/%d/%y',
+    '%Y/%m/%d %H:%M:%S',
+    '%Y/%m/%d',
+    '%d %b %Y',
+    '%d %B %Y',
+    '%b %d, %Y',
+    '%B %d, %Y',
+    '%b %d %Y',
+)
+
+
+def parse_datetime(value):
+    """Parse a date/datetime value into an aware UTC datetime, or None if it can't be parsed."""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        dt = value
+    elif isinstance(value, date):
+        dt = datetime(value.year, value.month, value.day)
+    elif isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, tz=timezone.utc)
+    else:
+        text = str(value).strip()
+        if not text:
+            return None
+        dt = None
+        try:
+            # handles 'YYYY-MM-DD', 'YYYY-MM-DD HH:MM[:SS[.ffffff]]', 'T' separators, 'Z' and offsets
+            dt = datetime.fromisoformat(text)
+        except ValueError:
+            for fmt in _FORMATS:
+                try:
+                    dt = datetime.strptime(text, fmt)
+                    break
+                except ValueError:
+                    continue
+        if dt is None:
+            return None
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def to_epoch(value):
+    """Return integer Unix seconds for a date value, or None if it can't be parsed."""
+    dt = parse_datetime(value)
+    return int(dt.timestamp()) if dt is not None else None
+
+
+def epoch_now():
+    return int(time.time())
+
+
+def _is_date_only(value):
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return True
+    text = str(value).strip()
+    # e.g. '2026-03-01' or '03/01/2026': no time component
+    return ':' not in text and 'T' not in text
+
+
+def parse_bound(value, name='date', end=False):
+    """Parse a query-string range bound into epoch seconds (None if empty).
+
+    A date-only upper bound (end=True) covers the whole day, so
+    date_to=2026-03-01 includes events at 2026-03-01 18:00.
+    Raises AppError for values that can't be parsed.
+    """
+    if value in (None, ''):
+        return None
+    dt = parse_datetime(value)
+    if dt is None:
+        raise AppError('INVALID_REQUEST', f'{name} is not a recognized date', log=False)
+    if end and _is_date_only(value):
+        dt = dt + timedelta(days=1) - timedelta(seconds=1)
+    return int(dt.timestamp())
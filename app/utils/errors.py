@@ -8,11 +8,17 @@ class AppError(Exception):
 
     Optionally accepts an original_exception for debugging. On construction
     it will log the error so unexpected failures are visible in logs.
+
+    status is the HTTP status the app's error handler answers with: 400 for
+    bad input (the default), 503 for overload such as an exhausted connection
+    pool. retry_after (seconds) is sent as a Retry-After header.
     """
-    def __init__(self, code, message, original_exception=None, log=True):
+    def __init__(self, code, message, original_exception=None, log=True, status=400, retry_after=None):
         self.code = code
         self.message = message
         self.original_exception = original_exception
+        self.status = status
+        self.retry_after = retry_after
         if log:
             try:
                 if original_exception:
@@ -0,0 +1,81 @@
+"""Keyset (seek) pagination helpers for the JSON list endpoints.
+
+A page is requested with ``limit`` and ``after`` (the last primary key the
+client has seen). Services fetch ``limit + 1`` rows ordered by primary key
+starting after the cursor, so each request reads at most one page of rows no
+matter how large the table is. The response body stays a JSON array; the
+cursor for the next page is sent in the ``X-Next-Cursor`` header and as a
+``Link: <...>; rel="next"`` URL.
+"""
+
+from flask import current_app, jsonify, request, url_for
+from .errors import AppError
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def _int_arg(args, name, minimum=None):
+    raw = args.get(name)
+    if raw in (None, ''):
+        return None
+    try:
+        value = int(raw)
+    except (TypeError, ValueError):
+        raise AppError('INVALID_REQUEST', f'{name} must be an integer', log=False)
+    if minimum is not None and value < minimum:
+        raise AppError('INVALID_REQUEST', f'{name} must be >= {minimum}', log=False)
+    return value
+
+
+def parse_page_args(args=None):
+    """Return (after, limit) from the query string, clamped to the configured page size."""
+    args = request.args if args is None else args
+    default = int(current_app.config.get('API_PAGE_SIZE') or DEFAULT_PAGE_SIZE)
+    maximum = int(current_app.config.get('API_MAX_PAGE_SIZE') or MAX_PAGE_SIZE)
+    limit = _int_arg(args, 'limit', minimum=1) or default
+    return _int_arg(args, 'after', minimum=0), min(limit, maximum)
+
+
+def int_filter(name, args=None):
+    """Parse an optional integer filter (e.g. org_id) from the query string."""
+    return _int_arg(request.args if args is None else args, name)
+
+
+def keyset_page(db, select_sql, pk, conditions, params, after, limit, to_item, batch=False):
+    """Run one keyset page query.
+
+    select_sql: 'SELECT ... FROM table' without WHERE/ORDER/LIMIT.
+    conditions/params: extra WHERE clauses (ANDed) and their parameters.
+    to_item converts one row, or the whole list of page rows when batch is
+    True (e.g. Model.rows_to_dicts).
+    Returns (items, next_cursor) where next_cursor is None on the last page.
+    """
+    conditions = list(conditions)
+    params = list(params)
+    if after is not None:
+        conditions.append(f'{pk} > ?')
+        params.append(after)
+    sql = select_sql
+    if conditions:
+        sql += ' WHERE ' + ' AND '.join(conditions)
+    sql += f' ORDER BY {pk} LIMIT ?'
+    params.append(limit + 1)
+    rows = db.execute(sql, params).fetchall()
+    items = to_item(rows[:limit]) if batch else [to_item(row) for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = rows[limit - 1][pk.split('.')[-1]]
+    return items, next_cursor
+
+
+def paginated_response(items, next_cursor, limit):
+    """jsonify a page and attach the next-page cursor headers."""
+    resp = jsonify(items)
+    if next_cursor is not None:
+        args = request.args.to_dict()
+        args.update({'after': next_cursor, 'limit': limit})
+        next_url = url_for(request.endpoint, _external=False, **(request.view_args or {}), **args)
+        resp.headers['X-Next-Cursor'] = str(next_cursor)
+        resp.headers['Link'] = f'<{next_url}>; rel="next"'
+    return resp
@@ -0,0 +1,346 @@
+"""Single-writer queue with group commit for small, frequent writes.
+
+SQLite allows one writer at a time. When many requests each run a
+one-row INSERT and commit it themselves (join requests during club-fair
+week, approvals), they wait on each other's locks. They see long tails, and
+once the busy timeout runs out, 'database is locked' errors.
+
+run_write(op, *args) hands op(conn, *args) to the WriteQueue of the app's
+database instead. The queue has one thread and one connection per
+database file. The thread takes every operation that queued up while its
+previous commit ran (at most WRITE_QUEUE_MAX_BATCH) and runs the group in a
+single BEGIN IMMEDIATE ... COMMIT transaction. Each operation runs inside
+its own SAVEPOINT. An operation that raises is rolled back alone and its
+caller gets the exception; the rest of the group still commits. Callers
+block until the commit that contains their operation has finished, so a
+route that redirects after run_write() returns reads its own write, as
+before.
+
+A caller waits up to WRITE_QUEUE_TIMEOUT for its operation to start. If
+it has not started by then it is cancelled, and the caller gets
+AppError('DB_WRITE_TIMEOUT'), answered as 503 with Retry-After. An
+operation starts only once its group holds the write lock, so after that
+the caller waits for the real outcome instead of reporting a failure for a
+write that then commits. The writer's busy timeout is capped below
+WRITE_QUEUE_TIMEOUT, so a group locked out by another process fails with
+the same error before its callers give up.
+
+WRITE_QUEUE_MAX_DELAY_MS makes the thread wait that long for more
+operations while writes are arriving concurrently (the last group had more
+than one operation, or more are already queued); a lone caller is never
+delayed. The default of 0 is right when commits are cheap (WAL with
+DB_SYNCHRONOUS = 'NORMAL'). A few milliseconds pays off when every commit
+waits for the disk (DB_SYNCHRONOUS = 'FULL' on a slow disk).
+
+Operations get a plain sqlite3 connection (rows as sqlite3.Row). They must
+not commit or roll back themselves. They run on the writer thread, so they
+cannot use g, the request, or get_db(): look up what is needed first and
+pass it in as arguments. Statements run on the writer thread are not
+counted in the request's Server-Timing header.
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from flask import current_app, g
+
+from .database import ConnectionPool, _resolve_db_path, _setting as _db_setting, get_db
+from .utils.errors import AppError
+
+# Overridable through the Flask config, like DEFAULT_DB_SETTINGS.
+DEFAULT_WRITE_QUEUE_SETTINGS = {
+    'WRITE_QUEUE_ENABLED': True,
+    'WRITE_QUEUE_MAX_BATCH': 64,       # operations per transaction
+    'WRITE_QUEUE_MAX_DELAY_MS': 0.0,   # extra wait for more operations; see the module docstring
+    'WRITE_QUEUE_TIMEOUT': 30.0,       # seconds a caller waits for its operation to start
+}
+
+# the writer's busy timeout is capped at this share of WRITE_QUEUE_TIMEOUT, so
+# a group stuck behind another process's lock fails before its callers give up
+WRITER_BUSY_TIMEOUT_SHARE = 0.5
+# seconds sent in Retry-After when a write times out (see AppError.retry_after)
+WRITE_RETRY_AFTER = 1
+
+_STOP = object()
+
+
+def _busy_error(error):
+    return AppError('DB_WRITE_TIMEOUT', 'The database is busy, try again', original_exception=error, log=False,
+                    status=503, retry_after=WRITE_RETRY_AFTER)
+
+
+def _setting(name):
+    try:
+        value = current_app.config.get(name)
+    except Exception:
+        value = None
+    return DEFAULT_WRITE_QUEUE_SETTINGS[name] if value is None else value
+
+
+class WriteQueue:
+    """One writer thread and connection for a database file; see the module docstring."""
+
+    def __init__(self, db_path, max_batch=64, max_delay=0.0, busy_timeout=30.0,
+                 journal_mode='WAL', synchronous='NORMAL', cache_size=-16000, mmap_size=0):
+        self.db_path = db_path
+        self.max_batch = max(1, int(max_batch))
+        self.max_delay = max(0.0, float(max_delay))
+        self._connection_settings = dict(busy_timeout=busy_timeout, journal_mode=journal_mode, synchronous=synchronous,
+                                         cache_size=cache_size, mmap_size=mmap_size)
+        self._pending = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._batches = 0
+        self._operations = 0
+        self._failed = 0
+        self._largest_batch = 0
+        self._commit_time = 0.0
+
+    def submit(self, op, *args, timeout=None):
+        """Run op(conn, *args) in the next group commit and return its result (or raise its exception)."""
+        future = Future()
+        self._ensure_running()
+        self._pending.put((op, args, future))
+        try:
+            return future.result(timeout)
+        except FutureTimeout:
+            # never run it later if it has not started yet
+            if future.cancel():
+                raise AppError('DB_WRITE_TIMEOUT', 'Timed out waiting for the database writer',
+                               status=503, retry_after=WRITE_RETRY_AFTER)
+        # already running inside a transaction that holds the write lock: it
+        # finishes shortly, and reporting a failure now could hide a committed write
+        return future.result()
+
+    def _ensure_running(self):
+        with self._lock:
+            if self._pid != os.getpid():
+                # threads do not survive fork(): a forked worker starts its own writer
+                self._pending = queue.Queue()
+                self._thread = None
+                self._pid = os.getpid()
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='campus-hub-writer', daemon=True)
+                self._thread.start()
+
+    def close(self, timeout=5.0):
+        """Finish the queued operations, then stop the writer thread and close its connection."""
+        with self._lock:
+            thread = self._thread if self._pid == os.getpid() else None
+            self._thread = None
+        if thread is not None and thread.is_alive():
+            self._pending.put(_STOP)
+            thread.join(timeout)
+
+    def _run(self):
+        pool = ConnectionPool(self.db_path, size=1, **self._connection_settings)
+        try:
+            conn = pool.checkout()
+        except Exception as e:
+            # fail what is queued now; the next submit() starts a new thread and tries again
+            self._fail_pending(e)
+            return
+        # transactions are opened and committed explicitly in _commit_batch
+        conn.isolation_level = None
+        pending = self._pending
+        try:
+            stop = False
+            last_size = 0
+            while not stop:
+                item = pending.get()
+                if item is _STOP:
+                    break
+                batch = [item]
+                # only hold the transaction open when writes are arriving concurrently;
+                # a lone caller (a CSV import, a quiet hour) commits right away
+                linger = self.max_delay if last_size > 1 or not pending.empty() else 0.0
+                deadline = time.monotonic() + linger
+                while len(batch) < self.max_batch:
+                    remaining = deadline - time.monotonic()
+                    try:
+                        item = pending.get(timeout=remaining) if remaining > 0 else pending.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is _STOP:
+                        stop = True
+                        break
+                    batch.append(item)
+                self._commit_batch(conn, batch)
+                last_size = len(batch)
+        finally:
+            pool.checkin(conn)
+            pool.close_all()
+
+    def _fail_pending(self, error):
+        while True:
+            try:
+                item = self._pending.get_nowait()
+            except queue.Empty:
+                return
+            if item is not _STOP and item[2].set_running_or_notify_cancel():
+                item[2].set_exception(error)
+
+    def _commit_batch(self, conn, batch):
+        start = time.perf_counter()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+        except Exception as e:
+            # locked past the writer's busy timeout: nothing in the group ran, so the callers can retry
+            live = [future for _, _, future in batch if future.set_running_or_notify_cancel()]
+            self._count(len(live), len(live))
+            for future in live:
+                future.set_exception(_busy_error(e) if isinstance(e, sqlite3.OperationalError) else e)
+            return
+        # marked running only now, while the write lock is held: a caller whose timeout
+        # expires before this point can still cancel, one after it gets the real outcome
+        live = [(op, args, future) for op, args, future in batch if future.set_running_or_notify_cancel()]
+        outcomes = []
+        try:
+            for op, args, _ in live:
+                conn.execute('SAVEPOINT write_op')
+                try:
+                    outcomes.append((op(conn, *args), None))
+                except Exception as e:
+                    conn.execute('ROLLBACK TO write_op')
+                    outcomes.append((None, e))
+                conn.execute('RELEASE write_op')
+            conn.execute('COMMIT')
+        except Exception as e:
+            # COMMIT (or a savepoint statement) failed: nothing in the group was written
+            try:
+                if conn.in_transaction:
+                    conn.execute('ROLLBACK')
+            except sqlite3.Error:
+                pass
+            self._count(len(live), len(live))
+            for _, _, future in live:
+                future.set_exception(e)
+            return
+        if not live:
+            return
+        failed = sum(1 for _, error in outcomes if error is not None)
+        self._count(len(live), failed, time.perf_counter() - start)
+        for (_, _, future), (value, error) in zip(live, outcomes):
+            if error is None:
+                future.set_result(value)
+            else:
+                future.set_exception(error)
+
+    def _count(self, operations, failed, commit_time=None):
+        with self._lock:
+            self._batches += 1
+            self._operations += operations
+            self._failed += failed
+            if commit_time is not None:
+                self._largest_batch = max(self._largest_batch, operations)
+                self._commit_time += commit_time
+
+    def stats(self):
+        with self._lock:
+            return {
+                'database': self.db_path,
+                'queued': self._pending.qsize(),
+                'batches': self._batches,
+                'operations': self._operations,
+                'failed': self._failed,
+                'largest_batch': self._largest_batch,
+                'commit_time_seconds': self._commit_time,
+            }
+
+
+_queues = {}
+_queues_lock = threading.Lock()
+
+
+def get_write_queue(db_path=None):
+    """Return (creating on first use) the WriteQueue for a database file, or None when it is disabled.
+
+    In-memory databases cannot be shared between connections, so they never get one.
+    """
+    if not _setting('WRITE_QUEUE_ENABLED'):
+        return None
+    db_path = db_path or _resolve_db_path()
+    if db_path == ':memory:':
+        return None
+    key = os.path.abspath(db_path)
+    writer = _queues.get(key)
+    if writer is None:
+        with _queues_lock:
+            writer = _queues.get(key)
+            if writer is None:
+                writer = WriteQueue(
+                    db_path,
+                    max_batch=_setting('WRITE_QUEUE_MAX_BATCH'),
+                    max_delay=float(_setting('WRITE_QUEUE_MAX_DELAY_MS')) / 1000.0,
+                    busy_timeout=min(float(_db_setting('DB_BUSY_TIMEOUT')),
+                                     float(_setting('WRITE_QUEUE_TIMEOUT')) * WRITER_BUSY_TIMEOUT_SHARE),
+                    journal_mode=_db_setting('DB_JOURNAL_MODE'),
+                    synchronous=_db_setting('DB_SYNCHRONOUS'),
+                    cache_size=_db_setting('DB_CACHE_SIZE'),
+                    mmap_size=_db_setting('DB_MMAP_SIZE'),
+                )
+                _queues[key] = writer
+    return writer
+
+
+def run_write(op, *args):
+    """Run op(conn, *args) in a committed transaction and return its result.
+
+    Goes through the database's WriteQueue so that concurrent callers share
+    commits. Runs inline on get_db() instead when the queue is disabled, when the
+    database is in memory, or when this request already has a write transaction
+    open (the writer would otherwise wait on that transaction's lock).
+
+    In that last case op joins the open transaction inside a SAVEPOINT: a
+    failure undoes only op, and nothing is committed. The caller that opened
+    the transaction still owns it and must commit (or roll back) as before.
+    """
+    writer = get_write_queue()
+    db = g.get('db')
+    if writer is None or (db is not None and db.in_transaction):
+        db = get_db()
+        if db.in_transaction:
+            return _run_in_savepoint(db, op, args)
+        try:
+            result = op(db, *args)
+            db.commit()
+        except Exception:
+            if db.in_transaction:
+                db.rollback()
+            raise
+        return result
+    return writer.submit(op, *args, timeout=_setting('WRITE_QUEUE_TIMEOUT'))
+
+
+def _run_in_savepoint(db, op, args):
+    # op inside someone else's transaction: roll back only op on failure, never commit
+    db.execute('SAVEPOINT run_write')
+    try:
+        result = op(db, *args)
+    except Exception:
+        db.execute('ROLLBACK TO run_write')
+        db.execute('RELEASE run_write')
+        raise
+    db.execute('RELEASE run_write')
+    return result
+
+
+def write_queue_stats():
+    """Return a list of metric dicts, one per write queue."""
+    with _queues_lock:
+        writers = list(_queues.values())
+    return [w.stats() for w in writers]
+
+
+def close_write_queues(db_path=None):
+    """Stop the writer threads (all, or only the one for db_path) after their queued work."""
+    target = os.path.abspath(db_path) if db_path else None
+    with _queues_lock:
+        keys = [k for k in _queues if target is None or k == target]
+        writers = [_queues.pop(k) for k in keys]
+    for writer in writers:
+        writer.close()
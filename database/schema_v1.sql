@@ -77,4 +77,61 @@ CREATE TABLE events (
     updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (OrgID) REFERENCES organizations(OrgID) ON DELETE CASCADE,
     FOREIGN KEY (CreatedBy) REFERENCES officer_roles(OfficerRoleID) ON DELETE CASCADE
-);
\ No newline at end of file
+);
+
+-- Indexes for org-scoped lookups (org page, admin page, permission checks)
+CREATE INDEX IF NOT EXISTS idx_memberships_org_status ON memberships(OrgID, Status COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_memberships_user_org ON memberships(UserID, OrgID);
+CREATE INDEX IF NOT EXISTS idx_officer_roles_membership ON officer_roles(MembershipID);
+CREATE INDEX IF NOT EXISTS idx_announcements_org_posted ON announcements(OrgID, DatePosted);
+CREATE INDEX IF NOT EXISTS idx_events_org_date ON events(OrgID, EventDate);
+
+-- Indexes for date-range filters on the paginated JSON list endpoints
+CREATE INDEX IF NOT EXISTS idx_events_date ON events(EventDate);
+CREATE INDEX IF NOT EXISTS idx_announcements_posted ON announcements(DatePosted);
+
+-- Full-text search (FTS5, external content tables) kept in sync by triggers.
+-- Keep this section last: if the SQLite build lacks FTS5 only these statements
+-- fail and /search falls back to LIKE queries. Existing databases can be
+-- backfilled with: python scripts/rebuild_search_index.py
+CREATE VIRTUAL TABLE IF NOT EXISTS organizations_fts USING fts5(
+    OrgName, Description, content='organizations', content_rowid='OrgID', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS organizations_fts_ai AFTER INSERT ON organizations BEGIN
+    INSERT INTO organizations_fts(rowid, OrgName, Description) VALUES (new.OrgID, new.OrgName, new.Description);
+END;
+CREATE TRIGGER IF NOT EXISTS organizations_fts_ad AFTER DELETE ON organizations BEGIN
+    INSERT INTO organizations_fts(organizations_fts, rowid, OrgName, Description) VALUES ('delete', old.OrgID, old.OrgName, old.Description);
+END;
+CREATE TRIGGER IF NOT EXISTS organizations_fts_au AFTER UPDATE OF OrgName, Description ON organizations BEGIN
+    INSERT INTO organizations_fts(organizations_fts, rowid, OrgName, Description) VALUES ('delete', old.OrgID, old.OrgName, old.Description);
+    INSERT INTO organizations_fts(rowid, OrgName, Description) VALUES (new.OrgID, new.OrgName, new.Description);
+END;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS announcements_fts USING fts5(
+    Title, Content, content='announcements', content_rowid='AnnouncementID', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS announcements_fts_ai AFTER INSERT ON announcements BEGIN
+    INSERT INTO announcements_fts(rowid, Title, Content) VALUES (new.AnnouncementID, new.Title, new.Content);
+END;
+CREATE TRIGGER IF NOT EXISTS announcements_fts_ad AFTER DELETE ON announcements BEGIN
+    INSERT INTO announcements_fts(announcements_fts, rowid, Title, Content) VALUES ('delete', old.AnnouncementID, old.Title, old.Content);
+END;
+CREATE TRIGGER IF NOT EXISTS announcements_fts_au AFTER UPDATE OF Title, Content ON announcements BEGIN
+    INSERT INTO announcements_fts(announcements_fts, rowid, Title, Content) VALUES ('delete', old.AnnouncementID, old.Title, old.Content);
+    INSERT INTO announcements_fts(rowid, Title, Content) VALUES (new.AnnouncementID, new.Title, new.Content);
+END;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5(
+    EventName, Description, Location, content='events', content_rowid='EventID', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS events_fts_ai AFTER INSERT ON events BEGIN
+    INSERT INTO events_fts(rowid, EventName, Description, Location) VALUES (new.EventID, new.EventName, new.Description, new.Location);
+END;
+CREATE TRIGGER IF NOT EXISTS events_fts_ad AFTER DELETE ON events BEGIN
+    INSERT INTO events_fts(events_fts, rowid, EventName, Description, Location) VALUES ('delete', old.EventID, old.EventName, old.Description, old.Location);
+END;
+CREATE TRIGGER IF NOT EXISTS events_fts_au AFTER UPDATE OF EventName, Description, Location ON events BEGIN
+    INSERT INTO events_fts(events_fts, rowid, EventName, Description, Location) VALUES ('delete', old.EventID, old.EventName, old.Description, old.Location);
+    INSERT INTO events_fts(rowid, EventName, Description, Location) VALUES (new.EventID, new.EventName, new.Description, new.Location);
+END;
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+scripts/backfill_date_keys.py
+
+Fill any NULL *Ts epoch columns (DatePostedTs, EventDateTs, ...) from their
+text date columns. The services set them on every write; this repairs rows
+written by tools that bypass the services. Safe to run at any time.
+
+Run from repository root:
+    python scripts/backfill_date_keys.py
+"""
+import os
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, '..'))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from app import create_app
+
+
+def main():
+    os.environ['SKIP_AUTO_SEED'] = '1'
+    app = create_app()
+    with app.app_context():
+        from app.database import get_db
+        from app.migrations.m0007_epoch_date_columns import backfill
+        db = get_db()
+        updated = backfill(db, only_missing=True)
+        db.commit()
+    print(f'Filled date keys on {updated} row(s).')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+scripts/bench_models.py
+
+Micro-benchmark of the per-row cost of turning query rows into the dicts
+the services return:
+
+  legacy      dict(row) -> model with a per-instance __dict__ -> to_dict()
+              (the pre-__slots__ Event model, reproduced below)
+  model       Event(**dict(row)).to_dict() with the __slots__ model
+  row_to_dict Event.row_to_dict(row), one sqlite3.Row at a time
+  batch       Event.rows_to_dicts(rows), column plan resolved once
+  tuples      Event.rows_to_dicts(rows, columns) on a row_factory=None cursor
+
+Uses an in-memory table, so it measures Python-side cost only.
+
+Run from repository root:
+    python scripts/bench_models.py [--rows 20000] [--repeat 5]
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import timeit
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, '..'))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from app.models.event import Event
+
+SELECT = 'SELECT EventID, OrgID, CreatedBy, EventName, Description AS EventDescription, EventDate, Location FROM events'
+
+
+class LegacyEvent:
+    def __init__(self, EventID, OrgID, CreatedBy, EventName=None, EventDescription=None, Description=None, EventDate=None, Location=None, **kwargs):
+        self.EventID = EventID
+        self.OrgID = OrgID
+        self.CreatedBy = CreatedBy
+        self.EventName = EventName
+        self.EventDescription = EventDescription if EventDescription is not None else Description
+        self.EventDate = EventDate
+        self.Location = Location
+        for k, v in kwargs.items():
+            setattr(self, k, v)
+
+    def to_dict(self):
+        return {
+            "EventID": self.EventID,
+            "OrgID": self.OrgID,
+            "CreatedBy": self.CreatedBy,
+            "EventName": self.EventName,
+            "EventDescription": self.EventDescription,
+            "EventDate": self.EventDate,
+            "Location": self.Location
+        }
+
+
+def build_db(n):
+    db = sqlite3.connect(':memory:')
+    db.execute('CREATE TABLE events (EventID INTEGER PRIMARY KEY, OrgID INTEGER, CreatedBy INTEGER, EventName TEXT, '
+               'Description TEXT, EventDate TEXT, Location TEXT)')
+    db.executemany('INSERT INTO events VALUES (?, ?, ?, ?, ?, ?, ?)',
+                   ((i, i % 50, i % 200, f'Event {i}', 'A description of the event', '2026-03-01', 'Room 101')
+                    for i in range(1, n + 1)))
+    return db
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    db = build_db(args.rows)
+    db.row_factory = sqlite3.Row
+    rows = db.execute(SELECT).fetchall()
+    cur = db.cursor()
+    cur.row_factory = None
+    tuples = cur.execute(SELECT).fetchall()
+    columns = [d[0] for d in cur.description]
+
+    cases = [
+        ('legacy', lambda: [LegacyEvent(**dict(row)).to_dict() for row in rows]),
+        ('model', lambda: [Event(**dict(row)).to_dict() for row in rows]),
+        ('row_to_dict', lambda: [Event.row_to_dict(row) for row in rows]),
+        ('batch', lambda: Event.rows_to_dicts(rows)),
+        ('tuples', lambda: Event.rows_to_dicts(tuples, columns)),
+    ]
+    expected = cases[0][1]()
+    baseline = None
+    print(f'{args.rows} rows, best of {args.repeat}')
+    for name, fn in cases:
+        assert fn() == expected, name
+        best = min(timeit.repeat(fn, number=1, repeat=args.repeat))
+        per_row = best / args.rows * 1e9
+        baseline = baseline or per_row
+        print(f'  {name:<12} {per_row:8.0f} ns/row  {baseline / per_row:5.2f}x')
+
+
+if __name__ == '__main__':
+    main()
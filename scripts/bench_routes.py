@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+scripts/bench_routes.py
+
+Route-level benchmark suite (tools/benchmarks.py). Builds synthetic databases
+at several scales (cached under instance/bench), times each page and JSON
+list endpoint through the Flask test client, and prints p50/p95/p99 latency
+and statements per request.
+
+With a baseline file (default scripts/bench_routes_baseline.json) the run is
+compared against it and the script exits with status 1 when a route runs
+more queries, scales worse with dataset size, or changes status. Slower
+absolute latency is reported as a warning, and fails the run only when the
+baseline was recorded on the same host.
+
+Run from repository root:
+    python scripts/bench_routes.py                      # compare with the baseline
+    python scripts/bench_routes.py --update             # record a new baseline
+    python scripts/bench_routes.py --scales 1000:20,50000:400 --iterations 50 --json out.json
+"""
+import argparse
+import json
+import os
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, '..'))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from tools import benchmarks
+
+DEFAULT_BASELINE = os.path.join(SCRIPT_DIR, 'bench_routes_baseline.json')
+
+
+def parse_scales(text):
+    scales = []
+    for part in text.split(','):
+        users, _, orgs = part.partition(':')
+        scales.append((int(users), int(orgs or max(5, int(users) // 200))))
+    return scales
+
+
+def print_report(report):
+    for label, scale in report['scales'].items():
+        print(f"\n{label} ({scale['users']} users, {scale['orgs']} orgs)")
+        print(f"  {'route':<20} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'queries':>8} {'sql ms':>8}  status")
+        for name, r in scale['routes'].items():
+            queries = '-' if r['queries'] is None else r['queries']
+            sql_ms = '-' if r['sql_ms'] is None else f"{r['sql_ms']:.2f}"
+            print(f"  {name:<20} {r['p50_ms']:8.2f} {r['p95_ms']:8.2f} {r['p99_ms']:8.2f} {queries:>8} {sql_ms:>8}  {r['status']}")
+    if report.get('growth'):
+        print('\nGrowth (log-log slope of p50 vs. users; 0 = flat, 1 = linear):')
+        for name, slope in report['growth'].items():
+            print(f"  {name:<20} {slope:6.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the routes against synthetic datasets.')
+    parser.add_argument('--scales', type=parse_scales, default=list(benchmarks.DEFAULT_SCALES),
+                        help='Comma-separated users:orgs pairs (default: %s)' % ','.join(f'{u}:{o}' for u, o in benchmarks.DEFAULT_SCALES))
+    parser.add_argument('--seed', default=benchmarks.DEFAULT_SEED)
+    parser.add_argument('--iterations', type=int, default=benchmarks.DEFAULT_ITERATIONS)
+    parser.add_argument('--warmup', type=int, default=benchmarks.DEFAULT_WARMUP)
+    parser.add_argument('--rounds', type=int, default=benchmarks.DEFAULT_ROUNDS,
+                        help='Passes over all routes that the iterations are split into')
+    parser.add_argument('--routes', help='Comma-separated route names to run (default: all)')
+    parser.add_argument('--cache-dir', help='Where the synthetic databases are kept (default: instance/bench)')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--update', action='store_true', help='Write this run as the new baseline instead of comparing')
+    parser.add_argument('--json', help='Also write the full report to this file')
+    parser.add_argument('--max-ratio', type=float, default=benchmarks.DEFAULT_MAX_RATIO,
+                        help='Flag p50 or p95 above the baseline value times this factor')
+    parser.add_argument('--min-delta-ms', type=float, default=benchmarks.DEFAULT_MIN_DELTA_MS,
+                        help='Ignore latency regressions smaller than this many milliseconds')
+    parser.add_argument('--max-growth-delta', type=float, default=benchmarks.DEFAULT_MAX_GROWTH_DELTA,
+                        help='Fail when a growth slope exceeds the baseline slope by more than this')
+    args = parser.parse_args()
+
+    routes = benchmarks.ROUTES
+    if args.routes:
+        wanted = set(args.routes.split(','))
+        routes = tuple(r for r in routes if r[0] in wanted)
+        if not routes:
+            parser.error('no matching routes: ' + args.routes)
+
+    # the benchmark databases are built explicitly; never seed them from data/*.csv
+    os.environ['SKIP_AUTO_SEED'] = '1'
+    report = benchmarks.run_suite(scales=args.scales, seed=args.seed, iterations=args.iterations, warmup=args.warmup,
+                                  rounds=args.rounds, routes=routes, cache_dir=args.cache_dir,
+                                  progress=lambda msg: print(msg, flush=True))
+    print_report(report)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.update:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+            f.write('\n')
+        print(f'\nBaseline written to {args.baseline}')
+        return
+    if not os.path.exists(args.baseline):
+        print(f'\nNo baseline at {args.baseline}; run with --update to record one.')
+        return
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    problems, warnings = benchmarks.compare(report, baseline, max_ratio=args.max_ratio, min_delta_ms=args.min_delta_ms,
+                                            max_growth_delta=args.max_growth_delta)
+    if warnings:
+        print('\nSlower than the baseline (recorded on another host, so not gated):')
+        for w in warnings:
+            print(f'  {w}')
+    if problems:
+        print('\nRegressions against the baseline:')
+        for p in problems:
+            print(f'  {p}')
+        sys.exit(1)
+    print('\nNo regressions against the baseline.')
+
+
+if __name__ == '__main__':
+    main()
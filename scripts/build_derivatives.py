@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+scripts/build_derivatives.py
+
+Build thumbnails, web-sized images and video posters for attachments still
+marked 'pending' (uploads from before migration 0010, or jobs lost when a
+worker process exited). With --retry, rows that were 'skipped' or 'failed'
+are queued again first, e.g. after installing Pillow or ffmpeg.
+
+Run from repository root:
+    python scripts/build_derivatives.py [--retry] [--limit N]
+"""
+import argparse
+import os
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, '..'))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from app import create_app
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build attachment variants')
+    parser.add_argument('--retry', action='store_true', help="re-queue 'skipped' and 'failed' attachments")
+    parser.add_argument('--limit', type=int, default=None, help='maximum number of blobs to process')
+    args = parser.parse_args()
+    os.environ['SKIP_AUTO_SEED'] = '1'
+    app = create_app()
+    with app.app_context():
+        from app.database import get_db
+        from app.services.derivatives import DerivativeService
+        if args.retry:
+            db = get_db()
+            db.execute("UPDATE announcement_attachments SET VariantStatus = 'pending' WHERE VariantStatus IN ('skipped', 'failed')")
+            db.commit()
+        counts = DerivativeService.process_pending(limit=args.limit)
+    if not counts:
+        print('Nothing pending.')
+    for status, n in sorted(counts.items()):
+        print(f'{status}: {n} blob(s)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+scripts/gc_uploads.py
+
+Delete upload blobs that no attachment references any more (for example
+after announcements were deleted), once they are older than
+UPLOAD_GC_GRACE seconds. Prints the upload store totals afterwards.
+
+Run from repository root:
+    python scripts/gc_uploads.py [--grace SECONDS]
+"""
+import argparse
+import os
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, '..'))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from app import create_app
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Remove unreferenced upload blobs')
+    parser.add_argument('--grace', type=float, default=None, help='minimum age in seconds (default: UPLOAD_GC_GRACE)')
+    args = parser.parse_args()
+    os.environ['SKIP_AUTO_SEED'] = '1'
+    app = create_app()
+    with app.app_context():
+        from app.services.upload_store import UploadStore
+        removed, freed = UploadStore.collect_garbage(args.grace)
+        stats = UploadStore.stats()
+    print(f'Removed {removed} blob(s), {freed} bytes.')
+    print(f"Store: {stats['blobs']} blob(s), {stats['stored_bytes']} bytes, {stats['refs']} reference(s), "
+          f"{stats['saved_bytes']} bytes saved by deduplication.")
+
+
+if __name__ == '__main__':
+    main()
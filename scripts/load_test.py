@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+scripts/load_test.py
+
+Concurrent load test (tools/loadtest.py). Worker threads run a weighted mix of
+scenarios (browse, search, join, approve, post) against the app, in process
+or on a local port. The report shows throughput, latency percentiles, error
+rate and 'database is locked' counts per scenario.
+
+Without --database, a synthetic campus (--users/--orgs, cached under
+instance/bench) is copied to a temporary file, so the writes made by the
+test never reach a real database.
+
+Run from repository root:
+    python scripts/load_test.py --concurrency 32 --duration 30
+    python scripts/load_test.py --mix join=70,approve=20,browse=10 --users 50000 --orgs 300
+    # against a running server; --database must be the file that server uses
+    python scripts/load_test.py --target http://127.0.0.1:5000 --database campus_hub.db
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, '..'))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from tools import loadtest
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+def print_report(report):
+    print(f"\n{report['target']}: {report['concurrency']} threads for {report['duration_s']:.1f}s")
+    print(f"  {'scenario':<10} {'ops':>7} {'ops/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7} {'err %':>6} {'locked':>7}")
+    rows = list(report['scenarios'].items()) + [('total', report['total'])]
+    for name, s in rows:
+        print(f"  {name:<10} {s['ops']:>7} {s['throughput_per_s']:>8.1f} {s['p50_ms'] or 0:>8.1f} {s['p95_ms'] or 0:>8.1f} "
+              f"{s['p99_ms'] or 0:>8.1f} {s['errors']:>7} {s['error_rate'] * 100:>6.1f} {s['locked']:>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a concurrent scenario mix against the app.')
+    parser.add_argument('--target', default='inprocess', help="'inprocess' (default) or a base URL such as http://127.0.0.1:5000")
+    parser.add_argument('--database', help='Database file to use as is (default: a temporary copy of a synthetic campus)')
+    parser.add_argument('--users', type=int, default=5000, help='Synthetic campus size when --database is not given')
+    parser.add_argument('--orgs', type=int, default=60)
+    parser.add_argument('--mix', type=parse_mix, default=dict(loadtest.DEFAULT_MIX),
+                        help='Scenario weights, e.g. browse=50,join=30,approve=10 (default: %s)'
+                             % ','.join(f'{k}={v}' for k, v in loadtest.DEFAULT_MIX.items()))
+    parser.add_argument('--concurrency', type=int, default=loadtest.DEFAULT_CONCURRENCY, help='Worker threads (virtual users)')
+    parser.add_argument('--duration', type=float, default=loadtest.DEFAULT_DURATION, help='Seconds to run')
+    parser.add_argument('--max-ops', type=int, help='Stop each thread after this many operations')
+    parser.add_argument('--seed', default='0', help='Seed for scenario choices')
+    parser.add_argument('--password', help='Password of the seeded users for HTTP logins (default: SEED_DEFAULT_PASSWORD or pass123)')
+    parser.add_argument('--json', help='Also write the full report to this file')
+    args = parser.parse_args()
+
+    os.environ['SKIP_AUTO_SEED'] = '1'
+    tmpdir = None
+    db_path = args.database
+    if db_path is None:
+        if args.target != 'inprocess':
+            parser.error('--database is required with an HTTP --target')
+        from tools.benchmarks import prepare_database
+        print(f'Preparing synthetic campus ({args.users} users, {args.orgs} orgs)...', flush=True)
+        source = prepare_database(args.users, args.orgs)
+        tmpdir = tempfile.mkdtemp(prefix='campus_hub_load_')
+        db_path = os.path.join(tmpdir, 'load.db')
+        shutil.copy(source, db_path)
+
+    try:
+        report = loadtest.run_load(db_path, target=args.target, mix=args.mix, concurrency=args.concurrency,
+                                   duration=args.duration, max_ops=args.max_ops, seed=args.seed, password=args.password)
+    except ValueError as e:
+        parser.error(str(e))
+    finally:
+        if tmpdir is not None:
+            from app.database import close_pools
+            close_pools(db_path)
+            shutil.rmtree(tmpdir, ignore_errors=True)
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+scripts/migrate.py
+
+Apply numbered schema migrations (app/migrations) to a database file. Before
+changing a database that already has tables, it writes a backup with the
+sqlite3 online backup API to instance/backups (or --backup-path). The backup
+is safe to take while the app is running.
+
+Run from repository root:
+    python scripts/migrate.py                 # migrate campus_hub.db to the latest version
+    python scripts/migrate.py --status        # show current / latest version and pending migrations
+    python scripts/migrate.py --target 2 --no-backup
+    python scripts/migrate.py --backup-only   # just take an online backup
+"""
+import argparse
+import logging
+import os
+import sqlite3
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, '..'))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from app import migrations
+
+
+def run(db_path, target=None, backup=True, backup_path=None):
+    """Migrate db_path and print what happened; returns a process exit code."""
+    if not os.path.exists(db_path):
+        print(f"ERROR: database file not found at {db_path}")
+        return 2
+    logger = logging.getLogger('campus_hub.migrate')
+    try:
+        before, after, written = migrations.migrate_database_file(db_path, target=target, backup=backup,
+                                                                  backup_path=backup_path, logger=logger)
+    except Exception as e:
+        print(f"Migration failed: {e}")
+        return 3
+    if written:
+        print(f"Backup created: {written}")
+    if before == after:
+        print(f"Schema already at version {after}. Nothing to do.")
+    else:
+        print(f"Migrated schema from version {before} to {after}.")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Apply schema migrations to the campus_hub database.')
+    parser.add_argument('--db', default=os.environ.get('DATABASE', 'campus_hub.db'), help='database file (default: campus_hub.db)')
+    parser.add_argument('--target', type=int, default=None, help='migrate up to this version (default: latest)')
+    parser.add_argument('--status', action='store_true', help='show versions and pending migrations, change nothing')
+    parser.add_argument('--no-backup', action='store_true', help='skip the pre-migration backup')
+    parser.add_argument('--backup-path', default=None, help='where to write the backup')
+    parser.add_argument('--backup-only', action='store_true', help='write an online backup and exit')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    if args.status or args.backup_only:
+        if not os.path.exists(args.db):
+            print(f"ERROR: database file not found at {args.db}")
+            sys.exit(2)
+        conn = sqlite3.connect(args.db)
+        try:
+            version = migrations.get_version(conn)
+            if args.backup_only:
+                dest = args.backup_path or migrations.default_backup_path(args.db, version)
+                print(f"Backup created: {migrations.backup_database(conn, dest)}")
+                return
+            print(f"Current version: {version}")
+            print(f"Latest version:  {migrations.latest_version()}")
+            for m in migrations.pending_migrations(conn, args.target):
+                print(f"  pending {m.VERSION:04d}: {m.DESCRIPTION}")
+        finally:
+            conn.close()
+        return
+
+    sys.exit(run(args.db, target=args.target, backup=not args.no_backup, backup_path=args.backup_path))
+
+
+if __name__ == '__main__':
+    main()
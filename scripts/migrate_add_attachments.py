@@ -1,63 +1,30 @@
 #!/usr/bin/env python3
 """
-Simple migration helper to add an Attachments column to the announcements table
-if it doesn't already exist. Creates a timestamped backup of the DB first.
+Add the Attachments column to the announcements table.
+
+Kept for existing instructions; the change is now migration 0002 in
+app/migrations and this is equivalent to `python scripts/migrate.py --target 2`
+(which also applies the baseline if needed). An online backup is taken first.
 
 Run from the project root (where campus_hub.db lives):
-    py scripts\migrate_add_attachments.py
+    py scripts\\migrate_add_attachments.py
 
 This script is safe to run multiple times.
 """
-import sqlite3
-import shutil
 import os
 import sys
-from datetime import datetime
-
-DB = "campus_hub.db"
-
-
-def main():
-    cwd = os.getcwd()
-    db_path = os.path.join(cwd, DB)
 
-    if not os.path.exists(db_path):
-        print(f"ERROR: database file not found at {db_path}")
-        sys.exit(2)
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, SCRIPT_DIR)
 
-    # Create a backup
-    ts = datetime.now().strftime("%Y%m%d%H%M%S")
-    backup_path = f"{db_path}.backup_{ts}"
-    shutil.copy2(db_path, backup_path)
-    print(f"Backup created: {backup_path}")
+from migrate import run
 
-    conn = sqlite3.connect(db_path)
-    cur = conn.cursor()
-
-    try:
-        cur.execute("PRAGMA table_info('announcements');")
-        rows = cur.fetchall()
-        cols = [r[1] for r in rows]
-
-        if 'Attachments' in cols:
-            print("Column 'Attachments' already exists on announcements. Nothing to do.")
-            return
-
-        print("Adding 'Attachments' TEXT column to announcements table...")
-        cur.execute("ALTER TABLE announcements ADD COLUMN Attachments TEXT;")
-        conn.commit()
-        print("Column added successfully.")
+DB = "campus_hub.db"
 
-        # show resulting schema info for announcements
-        cur.execute("PRAGMA table_info('announcements');")
-        for r in cur.fetchall():
-            print(r)
 
-    except sqlite3.DatabaseError as e:
-        print("Database error:", e)
-        sys.exit(3)
-    finally:
-        conn.close()
+def main():
+    sys.exit(run(os.path.join(os.getcwd(), DB), target=2))
 
 
 if __name__ == '__main__':
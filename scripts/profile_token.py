@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+scripts/profile_token.py
+
+Print a signed token for the request profiler (app/profiler.py). Send it
+in the PROFILE_HEADER header (default X-Campus-Hub-Profile) to profile
+that request, and use it to list and download profiles from /_profiles.
+The token is signed with FLASK_SECRET and expires after
+PROFILE_TOKEN_MAX_AGE seconds.
+
+Run from repository root (with the same FLASK_SECRET as the server):
+    python scripts/profile_token.py
+"""
+import os
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, '..'))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from app import create_app
+
+
+def main():
+    os.environ['SKIP_AUTO_SEED'] = '1'
+    app = create_app()
+    from app.profiler import _setting, profile_token
+    token = profile_token(app)
+    with app.app_context():
+        header = _setting('PROFILE_HEADER')
+    print(token)
+    print(f"\n  curl -H '{header}: {token}' -o /dev/null -D - http://localhost:5000/", file=sys.stderr)
+    print(f"  curl -H '{header}: {token}' http://localhost:5000/_profiles", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
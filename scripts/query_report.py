@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+scripts/query_report.py
+
+Summarise the slow / repeated query findings written by app/query_log.py
+(DB_QUERY_LOG, default instance/query_log.jsonl, plus its rotated .1, .2...
+files). One line per statement shape, worst first.
+
+Run from repository root:
+    python scripts/query_report.py [--log PATH] [--top N]
+"""
+import argparse
+import glob
+import json
+import os
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, '..'))
+
+
+def load(path):
+    findings = []
+    for name in sorted(glob.glob(glob.escape(path) + '*')):
+        with open(name, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    try:
+                        findings.append(json.loads(line))
+                    except ValueError:
+                        continue
+    return findings
+
+
+def summarise(findings):
+    groups = {}
+    for f in findings:
+        g = groups.setdefault((f['kind'], f['shape']), {
+            'kind': f['kind'], 'shape': f['shape'], 'findings': 0, 'worst_ms': 0.0, 'max_count': 0,
+            'scopes': set(), 'full_scan': set(),
+        })
+        g['findings'] += 1
+        g['worst_ms'] = max(g['worst_ms'], f.get('duration_ms') or f.get('total_ms') or 0.0)
+        g['max_count'] = max(g['max_count'], f.get('count') or 1)
+        g['scopes'].add(f.get('scope') or '-')
+        g['full_scan'].update(f.get('full_scan') or ())
+    return sorted(groups.values(), key=lambda g: (g['worst_ms'], g['findings']), reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Summarise the query log')
+    parser.add_argument('--log', default=os.path.join(REPO_ROOT, 'instance', 'query_log.jsonl'))
+    parser.add_argument('--top', type=int, default=20)
+    args = parser.parse_args()
+    groups = summarise(load(args.log))
+    if not groups:
+        print(f'No findings in {args.log}*')
+        return
+    for g in groups[:args.top]:
+        extra = f" x{g['max_count']}/scope" if g['kind'] == 'repeated_query' else ''
+        scans = f" FULL SCAN: {', '.join(sorted(g['full_scan']))}" if g['full_scan'] else ''
+        print(f"{g['kind']:<15} {g['worst_ms']:>10.1f} ms  {g['findings']:>4} finding(s){extra}{scans}")
+        print(f"    {g['shape'][:200]}")
+        print(f"    in: {', '.join(sorted(g['scopes']))}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+scripts/rebuild_search_index.py
+
+Backfill (or repair) the FTS5 search index used by /search. Databases created
+before the index existed have empty *_fts tables; the triggers only index rows
+written afterwards. Safe to run multiple times.
+
+Run from repository root:
+    python scripts/rebuild_search_index.py
+"""
+import os
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, '..'))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from app import create_app
+from app.database import get_db
+
+
+def main():
+    # don't trigger CSV auto-seeding just to rebuild the index
+    os.environ['SKIP_AUTO_SEED'] = '1'
+    app = create_app()
+    with app.app_context():
+        from app.services.search_service import SearchService, FTS_TABLES
+        SearchService.rebuild_index()
+        db = get_db()
+        for table in FTS_TABLES:
+            cnt = db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            print(f"{table}: {cnt} rows indexed")
+    print('Search index rebuilt.')
+
+
+if __name__ == '__main__':
+    main()
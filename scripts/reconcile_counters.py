@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+scripts/reconcile_counters.py
+
+Recompute the denormalized organizations.ApprovedCount / PendingCount
+counters from the memberships table and report which orgs had drifted.
+Triggers keep them current; this repairs drift from writes that bypassed
+the triggers. Safe to run at any time.
+
+Run from repository root:
+    python scripts/reconcile_counters.py
+"""
+import os
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, '..'))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from app import create_app
+
+
+def main():
+    os.environ['SKIP_AUTO_SEED'] = '1'
+    app = create_app()
+    with app.app_context():
+        from app.services.organization_service import OrgService
+        drifted = OrgService.reconcile_member_counts()
+    if drifted:
+        print(f"Repaired counters for {len(drifted)} organization(s): {', '.join(str(i) for i in drifted)}")
+    else:
+        print('All organization counters are consistent.')
+
+
+if __name__ == '__main__':
+    main()
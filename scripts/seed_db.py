@@ -7,10 +7,16 @@ Run from repository root:
     python scripts/seed_db.py
 Re-run and recreate DB:
     python scripts/seed_db.py --recreate-db
+Load a synthetic campus instead of data/*.csv (same rows for the same --seed):
+    python scripts/seed_db.py --recreate-db --users 1000000 --orgs 5000 --seed 42
+Write the synthetic campus as CSV files only, then import them with the bulk importers:
+    python scripts/seed_db.py --users 100000 --orgs 800 --csv-out /tmp/campus
+    python scripts/seed_db.py --recreate-db --data-dir /tmp/campus --bulk
 """
 import os
 import sys
 import argparse
+import time
 
 # Ensure the repository root is on sys.path so imports like `from app import ...`
 # work when this script is run as `python scripts/seed_db.py` (the script's
@@ -37,17 +43,50 @@ def run_import(service, func_name, csv_path, errors):
         print(f"Error importing {os.path.basename(csv_path)}: {e}")
 
 
+def report_progress(table, rows):
+    print(f"{table}: {rows} rows")
+
+
 def main():
     parser = argparse.ArgumentParser(description='Seed the campus_hub database from CSV files.')
     parser.add_argument('--recreate-db', action='store_true', help='Delete existing campus_hub.db before creating schema')
+    parser.add_argument('--data-dir', help='Directory holding the CSV files (default: data/)')
+    parser.add_argument('--bulk', action='store_true', help='Use the chunked bulk importers (needed for large or pre-hashed CSVs)')
+    parser.add_argument('--users', type=int, help='Generate a synthetic campus with this many users instead of importing CSVs')
+    parser.add_argument('--orgs', type=int, help='Number of synthetic organizations (default: users / 200, at least 5)')
+    parser.add_argument('--seed', default='0', help='Random seed for the synthetic campus (default: 0)')
+    parser.add_argument('--events-per-org', type=int, default=12, help='Average synthetic events per organization')
+    parser.add_argument('--announcements-per-org', type=int, default=20, help='Average synthetic announcements per organization')
+    parser.add_argument('--csv-out', help='With --users/--orgs: write the synthetic CSV files to this directory and exit')
     args = parser.parse_args()
 
+    dataset = None
+    if args.users or args.orgs:
+        from tools.synthetic_data import SyntheticDataset
+        users = args.users or 1000
+        dataset = SyntheticDataset(users=users, orgs=args.orgs or max(5, users // 200), seed=args.seed,
+                                   events_per_org=args.events_per_org, announcements_per_org=args.announcements_per_org)
+    elif args.csv_out:
+        parser.error('--csv-out needs --users and/or --orgs')
+
+    if dataset is not None and args.csv_out:
+        from tools.synthetic_data import write_csv
+        out_dir = os.path.abspath(args.csv_out)
+        start = time.perf_counter()
+        write_csv(dataset, out_dir, progress=report_progress)
+        print(f"Wrote synthetic CSV files to {out_dir} in {time.perf_counter() - start:.1f}s")
+        return
+
     # Optionally remove existing DB so schema_v1.sql can be applied fresh
     repo_db = os.path.abspath(os.path.join(REPO_ROOT, 'campus_hub.db'))
     if args.recreate_db:
         if os.path.exists(repo_db):
             print(f"Removing existing DB at {repo_db}")
             os.remove(repo_db)
+        # WAL side files would otherwise be replayed into the new database
+        for suffix in ('-wal', '-shm'):
+            if os.path.exists(repo_db + suffix):
+                os.remove(repo_db + suffix)
 
         # Determine and print the default password that will be used for seeded users
         # (can be overridden with SEED_DEFAULT_PASSWORD environment variable).
@@ -59,7 +98,7 @@ def main():
     os.environ['SKIP_AUTO_SEED'] = '1'
     app = create_app()
     with app.app_context():
-        data_dir = os.path.abspath(os.path.join(app.root_path, '..', 'data'))
+        data_dir = os.path.abspath(args.data_dir or os.path.join(app.root_path, '..', 'data'))
 
         # Lazy import services to avoid circular imports
         from app.services.organization_service import OrgService
@@ -71,17 +110,33 @@ def main():
 
         errors = []
 
-        # Import order matters because of FOREIGN KEY constraints:
-        # - memberships reference users and organizations
-        # - officer_roles reference memberships
-        # - events and announcements reference officer_roles and organizations
-        # Therefore import in this order: organizations, users, memberships, officer_roles, events, announcements
-        run_import(OrgService, 'import_organizations_from_csv', os.path.join(data_dir, 'organizations.csv'), errors)
-        run_import(UserService, 'import_users_from_csv', os.path.join(data_dir, 'users.csv'), errors)
-        run_import(MembershipService, 'import_memberships_from_csv', os.path.join(data_dir, 'membership.csv'), errors)
-        run_import(OfficerRoleService, 'import_officer_roles_from_csv', os.path.join(data_dir, 'officer_roles.csv'), errors)
-        run_import(EventService, 'import_events_from_csv', os.path.join(data_dir, 'events.csv'), errors)
-        run_import(AnnouncementService, 'import_announcements_from_csv', os.path.join(data_dir, 'announcements.csv'), errors)
+        if dataset is not None:
+            from tools.synthetic_data import load_database
+            start = time.perf_counter()
+            try:
+                load_database(dataset, progress=report_progress)
+                print(f"Loaded synthetic campus (seed={dataset.seed}) in {time.perf_counter() - start:.1f}s")
+            except Exception as e:
+                errors.append(('synthetic data', str(e)))
+                print(f"Error loading synthetic data: {e}")
+        else:
+            prefix = 'bulk_' if args.bulk else ''
+            # Import order matters because of FOREIGN KEY constraints:
+            # - memberships reference users and organizations
+            # - officer_roles reference memberships
+            # - events and announcements reference officer_roles and organizations
+            # Therefore import in this order: organizations, users, memberships, officer_roles, events, announcements
+            run_import(OrgService, prefix + 'import_organizations_from_csv', os.path.join(data_dir, 'organizations.csv'), errors)
+            run_import(UserService, prefix + 'import_users_from_csv', os.path.join(data_dir, 'users.csv'), errors)
+            run_import(MembershipService, prefix + 'import_memberships_from_csv', os.path.join(data_dir, 'membership.csv'), errors)
+            run_import(OfficerRoleService, prefix + 'import_officer_roles_from_csv', os.path.join(data_dir, 'officer_roles.csv'), errors)
+            run_import(EventService, prefix + 'import_events_from_csv', os.path.join(data_dir, 'events.csv'), errors)
+            run_import(AnnouncementService, prefix + 'import_announcements_from_csv', os.path.join(data_dir, 'announcements.csv'), errors)
+
+        # record the seed so app processes don't start their own seeding job
+        from app.services.seed_service import SeedService
+        if not errors:
+            SeedService.mark_done()
 
         db = get_db()
         tables = ['organizations', 'users', 'events', 'announcements', 'memberships', 'officer_roles']
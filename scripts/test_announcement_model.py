@@ -1,14 +1,11 @@
-import importlib.util
 import os
+import sys
 
-# Load the announcement model module directly (avoids importing the app package)
+# Import the announcement model through the app package
 here = os.path.dirname(__file__)
-model_path = os.path.abspath(os.path.join(here, '..', 'app', 'models', 'announcement.py'))
-spec = importlib.util.spec_from_file_location('ann_model', model_path)
-ann_mod = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(ann_mod)
+sys.path.insert(0, os.path.abspath(os.path.join(here, '..')))
 
-Announcement = ann_mod.Announcement
+from app.models.announcement import Announcement
 
 row = {'AnnouncementID': 1, 'OrgID': 2, 'CreatedBy': 3, 'Title': 'Hi', 'Content': 'Hello', 'DatePosted': '2025-12-16', 'created_at': '2025-12-16 12:00:00'}
 a = Announcement(**row)
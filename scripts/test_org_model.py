@@ -1,14 +1,11 @@
 import os
-import importlib.util
+import sys
 
-# Load the organization model module directly (avoids importing the app package)
+# Import the organization model through the app package
 here = os.path.dirname(__file__)
-model_path = os.path.abspath(os.path.join(here, '..', 'app', 'models', 'organization.py'))
-spec = importlib.util.spec_from_file_location('org_model', model_path)
-org_mod = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(org_mod)
+sys.path.insert(0, os.path.abspath(os.path.join(here, '..')))
 
-Organization = org_mod.Organization
+from app.models.organization import Organization
 
 row = {'OrgID': 1, 'OrgName': 'Test Org', 'Description': 'desc from DB'}
 o = Organization(**row)
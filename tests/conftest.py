@@ -0,0 +1,38 @@
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from app import create_app
+from app.database import close_pools
+
+
+@pytest.fixture
+def make_app(tmp_path):
+    """Factory for apps on a fresh database under tmp_path: make_app(seed=True, **config).
+
+    seed=True loads data/*.csv before returning (SEED_MODE 'sync', the
+    TESTING default); seed=False leaves the tables empty. No pre-migration
+    backups are written. The pools and writer threads are closed after the test.
+    """
+    paths = []
+
+    def make(seed=True, **config):
+        path = str(tmp_path / f'campus_{len(paths)}.db')
+        paths.append(path)
+        app_config = {'TESTING': True, 'DATABASE': path, 'DB_MIGRATION_BACKUP': False}
+        if not seed:
+            app_config['SEED_MODE'] = 'off'
+        app_config.update(config)
+        return create_app(app_config)
+
+    yield make
+    for path in paths:
+        close_pools(path)
+
+
+@pytest.fixture
+def app(make_app):
+    """A seeded app on its own database."""
+    return make_app()
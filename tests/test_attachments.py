@@ -0,0 +1,75 @@
+import json
+import os
+import sqlite3
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from app import migrations
+from app.database import get_db
+from app.services.announcement_service import AnnouncementService
+from app.services.officer_role_service import OfficerRoleService
+from app.services.organization_service import OrgService
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / 'legacy.db')
+
+
+def test_migration_converts_json_blobs_in_bulk(db_path):
+    conn = sqlite3.connect(db_path)
+    migrations.migrate(conn, target=7)
+    conn.executescript('''
+        PRAGMA foreign_keys = OFF;
+        INSERT INTO organizations (OrgID, OrgName) VALUES (1, 'Org');
+        INSERT INTO announcements (AnnouncementID, OrgID, CreatedBy, Title, Content) VALUES (1, 1, 1, 'a', ''), (2, 1, 1, 'b', ''), (3, 1, 1, 'c', '');
+    ''')
+    blob = [{'type': 'image', 'url': '/static/uploads/x.png', 'filename': 'x.png', 'mimetype': 'image/png'}, 'https://example.com']
+    conn.execute('UPDATE announcements SET Attachments = ? WHERE AnnouncementID = 1', (json.dumps(blob),))
+    conn.execute("UPDATE announcements SET Attachments = 'not json' WHERE AnnouncementID = 2")
+    conn.commit()
+
+    migrations.migrate(conn)
+    rows = conn.execute('SELECT AnnouncementID, Position, Type, Url, Filename FROM announcement_attachments ORDER BY AttachmentID').fetchall()
+    assert rows == [(1, 0, 'image', '/static/uploads/x.png', 'x.png'), (1, 1, 'link', 'https://example.com', None)]
+    counts = dict(conn.execute('SELECT AnnouncementID, AttachmentCount FROM announcements').fetchall())
+    assert counts == {1: 2, 2: 0, 3: 0}
+    # converted blobs are cleared; unparseable ones are left for inspection
+    blobs = dict(conn.execute('SELECT AnnouncementID, Attachments FROM announcements').fetchall())
+    assert blobs == {1: None, 2: 'not json', 3: None}
+    conn.close()
+
+
+def test_listings_skip_attachments_until_loaded(make_app):
+    app = make_app(seed=False)
+    with app.app_context():
+        org_id = OrgService.create_organization('Attach Club', '')
+        db = get_db()
+        db.execute("INSERT INTO users (FirstName, LastName, Email, PasswordHash) VALUES ('A', 'B', 'att@example.com', 'x')")
+        db.commit()
+        user_id = db.execute("SELECT UserID FROM users WHERE Email = 'att@example.com'").fetchone()['UserID']
+        role_id = OfficerRoleService.get_or_create_officer_role_for_user(org_id, user_id)
+        files = [{'type': 'link', 'url': 'https://example.com/a'}, {'type': 'file', 'url': '/static/uploads/b.pdf', 'filename': 'b.pdf'}]
+        ann_id = AnnouncementService.create_announcement(org_id, role_id, 'With files', 'Body', None, files)
+        AnnouncementService.create_announcement(org_id, role_id, 'Plain', 'Body', None)
+
+        listing = {a['Title']: a for a in AnnouncementService.get_announcements_by_org(org_id)}
+        assert listing['With files']['Attachments'] is None and listing['With files']['AttachmentCount'] == 2
+        assert listing['Plain']['AttachmentCount'] == 0
+
+        AnnouncementService.load_attachments(list(listing.values()))
+        assert [a['url'] for a in listing['With files']['Attachments']] == ['https://example.com/a', '/static/uploads/b.pdf']
+        assert listing['Plain']['Attachments'] is None
+
+        page, _ = AnnouncementService.get_announcements_page(org_id=org_id, with_attachments=True)
+        assert {a['Title']: a['Attachments'] is not None for a in page} == {'With files': True, 'Plain': False}
+
+        # the org page renders attachments, so it loads them
+        html = app.test_client().get(f'/orgs/{org_id}').get_data(as_text=True)
+        assert '/static/uploads/b.pdf' in html
+
+        db.execute('DELETE FROM announcements WHERE AnnouncementID = ?', (ann_id,))
+        db.commit()
+        assert db.execute('SELECT COUNT(*) FROM announcement_attachments WHERE AnnouncementID = ?', (ann_id,)).fetchone()[0] == 0
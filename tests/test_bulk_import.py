@@ -0,0 +1,87 @@
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from app.database import get_db
+
+
+@pytest.fixture
+def app(make_app, tmp_path):
+    # start from an empty schema so the bulk importers populate everything
+    app = make_app(seed=False)
+    app.config['TMPDIR'] = str(tmp_path)
+    return app
+
+
+def _write(app, name, text):
+    path = os.path.join(app.config['TMPDIR'], name)
+    with open(path, 'w', newline='') as f:
+        f.write(text)
+    return path
+
+
+def test_bulk_import_reports_inserted_skipped_and_failed_lines(app):
+    client = app.test_client()
+    orgs = _write(app, 'orgs.csv', 'OrgName,OrgDescription\nChess,Board games\nChess,Duplicate name\n,No name\n')
+    rv = client.post('/organizations/import', json={'file_path': orgs, 'mode': 'bulk'})
+    report = rv.get_json()['report']
+    assert report['inserted'] == 1
+    assert report['skipped'] == 2
+    # the missing name and the ignored duplicate are both reported by line
+    assert {(r['line'], r['reason']) for r in report['skipped_rows']} == {
+        (4, 'missing required field(s): OrgName'), (3, 'duplicate row ignored')}
+
+    # lowercase header variants are accepted too
+    users = _write(app, 'users.csv', 'first_name,last_name,email,password\nAda,L,ada@example.com,secret\nBob,M,bob@example.com,\n')
+    report = client.post('/users/import', json={'file_path': users, 'mode': 'bulk'}).get_json()['report']
+    assert report['inserted'] == 2 and report['failed'] == 0
+
+    # second row references a missing user and must fail with its own line number
+    mems = _write(app, 'mem.csv', 'UserID,OrgID,Status\n1,1,Approved\n999,1,Pending\n2,1,Pending\n')
+    report = client.post('/memberships/import', json={'file_path': mems, 'mode': 'bulk', 'chunk_size': 10}).get_json()['report']
+    assert report['inserted'] == 2
+    assert report['failed'] == 1 and report['failed_rows'][0]['line'] == 3
+
+    with app.app_context():
+        db = get_db()
+        assert db.execute('SELECT COUNT(*) FROM memberships').fetchone()[0] == 2
+        pw = db.execute("SELECT PasswordHash FROM users WHERE Email = 'bob@example.com'").fetchone()[0]
+        assert pw.startswith('$pbkdf2-sha256$')
+
+
+def test_parallel_hashing_preserves_order_and_shared_default(app):
+    from passlib.hash import pbkdf2_sha256
+    from app.services.password_hashing import hash_passwords, MIN_PARALLEL_BATCH
+    from app.services.user_service import UserService
+
+    plain = [f'pw{i}' for i in range(MIN_PARALLEL_BATCH)]
+    hashes = hash_passwords(plain, workers=2)
+    assert all(pbkdf2_sha256.verify(p, h) for p, h in zip(plain, hashes))
+
+    rows = ''.join(f'U{i},L,u{i}@example.com,\n' for i in range(3))
+    path = _write(app, 'defaults.csv', 'FirstName,LastName,Email,password\n' + rows)
+    with app.app_context():
+        report = UserService.bulk_import_users_from_csv(path, share_default_hash=True)
+        assert report['inserted'] == 3
+        stored = {r[0] for r in get_db().execute("SELECT PasswordHash FROM users WHERE Email LIKE 'u%@example.com'")}
+        assert len(stored) == 1
+
+
+def test_hash_pool_uses_threads_inside_a_threaded_process():
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    from app.services.password_hashing import PasswordHashPool
+
+    executors = []
+
+    def hash_in_thread():
+        with PasswordHashPool(workers=2) as pool:
+            executors.append(pool._get_executor())
+
+    # the seed job and request handlers run like this: never fork from here
+    t = threading.Thread(target=hash_in_thread)
+    t.start()
+    t.join()
+    assert isinstance(executors[0], ThreadPoolExecutor)
@@ -0,0 +1,93 @@
+import os
+import sys
+import sqlite3
+import tempfile
+import threading
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from app.database import ConnectionPool, get_pool
+from app.utils.errors import AppError
+
+
+@pytest.fixture
+def db_path():
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE t (id INTEGER PRIMARY KEY, v TEXT)')
+    conn.commit()
+    conn.close()
+    yield path
+    for suffix in ('', '-wal', '-shm'):
+        try:
+            os.remove(path + suffix)
+        except OSError:
+            pass
+
+
+def test_pool_enables_wal_and_reuses_connections(db_path):
+    pool = ConnectionPool(db_path, size=2)
+    conn = pool.checkout()
+    assert conn.execute('PRAGMA journal_mode').fetchone()[0].lower() == 'wal'
+    pool.checkin(conn)
+    again = pool.checkout()
+    assert again is conn
+    pool.checkin(again)
+    stats = pool.stats()
+    assert stats['checkouts'] == 2 and stats['created'] == 1 and stats['in_use'] == 0
+    pool.close_all()
+
+
+def test_readonly_pool_rejects_writes_and_reads_during_write(db_path):
+    rw = ConnectionPool(db_path, size=1)
+    ro = ConnectionPool(db_path, readonly=True, size=1)
+    writer = rw.checkout()
+    writer.execute("INSERT INTO t (v) VALUES ('pending')")  # open write transaction
+    reader = ro.checkout()
+    # WAL readers are not blocked by the open write transaction
+    assert reader.execute('SELECT COUNT(*) FROM t').fetchone()[0] == 0
+    with pytest.raises(sqlite3.OperationalError):
+        reader.execute("INSERT INTO t (v) VALUES ('nope')")
+    writer.commit()
+    assert reader.execute('SELECT COUNT(*) FROM t').fetchone()[0] == 1
+    rw.checkin(writer)
+    ro.checkin(reader)
+    rw.close_all()
+    ro.close_all()
+
+
+def test_pool_is_bounded_and_records_waits(db_path):
+    pool = ConnectionPool(db_path, size=1, timeout=0.05)
+    conn = pool.checkout()
+    with pytest.raises(AppError):
+        pool.checkout()
+    assert pool.stats()['timeouts'] == 1
+
+    pool.timeout = 5
+    got = []
+    t = threading.Thread(target=lambda: got.append(pool.checkout()))
+    t.start()
+    threading.Event().wait(0.05)
+    pool.checkin(conn)
+    t.join(5)
+    assert got and got[0] is conn
+    assert pool.stats()['waits'] == 1
+    pool.checkin(got[0])
+    pool.close_all()
+
+
+def test_exhausted_pool_answers_503_with_retry_after(make_app):
+    app = make_app(seed=False, DB_READ_POOL_SIZE=1, DB_POOL_TIMEOUT=0.05)
+    with app.app_context():
+        pool = get_pool(app.config['DATABASE'], readonly=True)
+        held = pool.checkout()
+        try:
+            rv = app.test_client().get('/memberships/')
+        finally:
+            pool.checkin(held)
+    assert rv.status_code == 503
+    assert rv.headers['Retry-After'] == '1'
+    assert rv.get_json()['code'] == 'DB_POOL_EXHAUSTED'
+    assert app.test_client().get('/memberships/?limit=abc').status_code == 400
@@ -0,0 +1,78 @@
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from app.database import get_db
+from app.migrations.m0007_epoch_date_columns import backfill
+from app.services.announcement_service import AnnouncementService
+from app.services.event_service import EventService
+from app.services.officer_role_service import OfficerRoleService
+from app.services.organization_service import OrgService
+from app.utils.dates import parse_bound, to_epoch
+from app.utils.errors import AppError
+
+
+@pytest.fixture
+def app(make_app):
+    return make_app(seed=False)
+
+
+def _officer(org_id, email):
+    db = get_db()
+    db.execute("INSERT INTO users (FirstName, LastName, Email, PasswordHash) VALUES ('Date', 'Tester', ?, 'x')", (email,))
+    user_id = db.execute('SELECT UserID FROM users WHERE Email = ?', (email,)).fetchone()['UserID']
+    db.commit()
+    return OfficerRoleService.get_or_create_officer_role_for_user(org_id, user_id)
+
+
+def test_mixed_formats_parse_to_the_same_instant():
+    expected = to_epoch('2026-03-05 14:30:00')
+    assert to_epoch('2026-03-05T14:30') == expected
+    assert to_epoch('03/05/2026 2:30 PM') == expected
+    assert to_epoch('2026-03-05T15:30:00+01:00') == expected
+    assert to_epoch('5 Mar 2026') == to_epoch('2026-03-05')
+    assert to_epoch('next tuesday') is None
+    assert to_epoch('') is None
+
+
+def test_date_only_upper_bound_covers_the_whole_day():
+    assert parse_bound('2026-03-05', end=True) == to_epoch('2026-03-05 23:59:59')
+    assert parse_bound('2026-03-05 12:00', end=True) == to_epoch('2026-03-05 12:00')
+    assert parse_bound('') is None
+    with pytest.raises(AppError):
+        parse_bound('soon', 'date_from')
+
+
+def test_range_queries_order_mixed_formats_chronologically(app):
+    with app.app_context():
+        org_id = OrgService.create_organization('Date Club', 'dates')
+        role_id = _officer(org_id, 'dates@example.com')
+        # as strings these sort 03/.., 2026-.., 2026-..; chronologically 2026-02-28 comes first
+        for name, when in (('B', '03/01/2026 09:00'), ('C', '2026-03-01 18:00'), ('A', '2026-02-28')):
+            EventService.create_event(name, '', when, org_id, role_id, 'Room 1')
+
+        names = [e['EventName'] for e in EventService.get_events_between(org_id=org_id)]
+        assert names == ['A', 'B', 'C']
+        names = [e['EventName'] for e in EventService.get_events_between('2026-03-01', '2026-03-01 23:59:59', org_id)]
+        assert names == ['B', 'C']
+        events, _ = EventService.get_events_page(org_id=org_id, date_from='03/01/2026', date_to='2026-03-01')
+        assert {e['EventName'] for e in events} == {'B', 'C'}
+
+        AnnouncementService.create_announcement(org_id, role_id, 'old', '', '01/15/2026')
+        AnnouncementService.create_announcement(org_id, role_id, 'new', '', '2026-02-01 08:00')
+        assert [a['Title'] for a in AnnouncementService.get_announcements_since('2026-01-20', org_id)] == ['new']
+
+
+def test_backfill_fills_rows_written_without_keys(app):
+    with app.app_context():
+        org_id = OrgService.create_organization('Legacy Club', 'raw rows')
+        role_id = _officer(org_id, 'legacy@example.com')
+        db = get_db()
+        db.execute("INSERT INTO events (OrgID, CreatedBy, EventName, EventDate) VALUES (?, ?, 'raw', 'March 9, 2026')", (org_id, role_id))
+        db.commit()
+        assert db.execute("SELECT EventDateTs FROM events WHERE EventName = 'raw'").fetchone()[0] is None
+        assert backfill(db) == 1
+        db.commit()
+        assert db.execute("SELECT EventDateTs FROM events WHERE EventName = 'raw'").fetchone()[0] == to_epoch('2026-03-09')
@@ -0,0 +1,85 @@
+import io
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from app.database import get_db
+from app.services import derivatives
+from app.services.announcement_service import AnnouncementService
+from app.services.derivatives import DerivativeService
+from app.services.organization_service import OrgService
+from app.services.officer_role_service import OfficerRoleService
+
+
+@pytest.fixture
+def app(make_app, tmp_path):
+    return make_app(seed=False, UPLOAD_DIR=str(tmp_path / 'uploads'))
+
+
+def _post(app, files):
+    client = app.test_client()
+    with app.app_context():
+        org_id = OrgService.create_organization('Photo Club', '')
+        db = get_db()
+        db.execute("INSERT INTO users (FirstName, LastName, Email, PasswordHash) VALUES ('P', 'C', 'pc@example.com', 'x')")
+        db.commit()
+        user_id = db.execute("SELECT UserID FROM users WHERE Email = 'pc@example.com'").fetchone()['UserID']
+        OfficerRoleService.get_or_create_officer_role_for_user(org_id, user_id)
+    with client.session_transaction() as sess:
+        sess['user_id'] = user_id
+    data = {'title': 'Gallery', 'content': 'Photos', 'attachments': files}
+    resp = client.post(f'/orgs/{org_id}/create_announcement', data=data, content_type='multipart/form-data')
+    assert resp.status_code == 302
+    return client, org_id
+
+
+def _attachments(app, org_id):
+    with app.app_context():
+        anns = AnnouncementService.load_attachments(AnnouncementService.get_announcements_by_org(org_id))
+        status = dict(get_db().execute('SELECT Filename, VariantStatus FROM announcement_attachments').fetchall())
+    return anns[0]['Attachments'], status
+
+
+def test_without_pillow_originals_are_served(app, monkeypatch):
+    monkeypatch.setattr(derivatives, 'Image', None)
+    client, org_id = _post(app, [(io.BytesIO(b'not really a png'), 'a.png', 'image/png'),
+                                 (io.BytesIO(b'minutes'), 'notes.txt', 'text/plain')])
+    attachments, status = _attachments(app, org_id)
+    assert status == {'a.png': 'skipped', 'notes.txt': None}
+    assert attachments[0]['web_url'] is None
+    page = client.get(f'/orgs/{org_id}').get_data(as_text=True)
+    assert f'src="{attachments[0]["url"]}"' in page
+
+
+def test_variants_are_recorded_shared_and_rendered(app, monkeypatch):
+    def fake_render(src, dest, max_size, quality):
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        with open(dest, 'wb') as f:
+            f.write(b'\xff\xd8' + b'j' * (max_size // 100))
+
+    monkeypatch.setattr(derivatives, 'Image', object())
+    monkeypatch.setattr(derivatives, 'render_image', fake_render)
+    photo = b'p' * 5000
+    client, org_id = _post(app, [(io.BytesIO(photo), 'a.png', 'image/png'), (io.BytesIO(photo), 'b.png', 'image/png')])
+    attachments, status = _attachments(app, org_id)
+    assert status == {'a.png': 'ready', 'b.png': 'ready'}
+    sha = attachments[0]['sha256']
+    assert attachments[0]['thumb_url'] == attachments[1]['thumb_url'] == f'/uploads/variants/{sha}/thumb-320.jpg'
+    assert attachments[0]['web_url'] == f'/uploads/variants/{sha}/web-1280.jpg'
+
+    page = client.get(f'/orgs/{org_id}').get_data(as_text=True)
+    assert f'src="{attachments[0]["web_url"]}"' in page and f'href="{attachments[0]["url"]}"' in page
+    resp = client.get(attachments[0]['web_url'])
+    assert resp.status_code == 200 and resp.mimetype == 'image/jpeg'
+    assert resp.headers['Cache-Control'] == 'public, max-age=31536000, immutable'
+    assert client.get(f'/uploads/variants/{sha}/..%2Fsecret.jpg').status_code == 404
+
+    # a rebuild reuses the files already on disk
+    monkeypatch.setattr(derivatives, 'render_image', lambda *a: pytest.fail('variant rebuilt'))
+    with app.app_context():
+        db = get_db()
+        db.execute("UPDATE announcement_attachments SET VariantStatus = 'pending'")
+        db.commit()
+        assert DerivativeService.process_pending() == {'ready': 1}
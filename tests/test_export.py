@@ -0,0 +1,34 @@
+import csv
+import gzip
+import io
+import json
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+
+
+@pytest.fixture
+def client(app):
+    with app.test_client() as client:
+        yield client
+
+
+def test_ndjson_export_matches_list_endpoint(client):
+    listed = client.get('/users/?limit=1000').get_json()
+    rv = client.get('/users/export')
+    assert rv.mimetype == 'application/x-ndjson'
+    exported = [json.loads(line) for line in rv.get_data(as_text=True).splitlines()]
+    assert exported == listed
+    assert 'PasswordHash' not in exported[0]
+
+
+def test_gzipped_csv_export_round_trips_headers(client):
+    rv = client.get('/memberships/export?format=csv&gzip=1')
+    assert rv.mimetype == 'application/gzip'
+    assert 'memberships.csv.gz' in rv.headers['Content-Disposition']
+    rows = list(csv.DictReader(io.StringIO(gzip.decompress(rv.get_data()).decode('utf-8'))))
+    assert rows and set(rows[0]) >= {'MembershipID', 'UserID', 'OrgID', 'Status'}
+    assert client.get('/memberships/export?format=xml').status_code == 400
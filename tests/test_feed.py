@@ -0,0 +1,59 @@
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from app.services.announcement_service import AnnouncementService
+from app.services.event_service import EventService
+from app.services.feed_service import FeedService
+from app.services.officer_role_service import OfficerRoleService
+from app.services.organization_service import OrgService
+
+
+@pytest.fixture
+def app(make_app):
+    return make_app(HOME_FEED_SIZE=7)
+
+
+def _walk(before=None):
+    seen = []
+    while True:
+        items, before = FeedService.get_feed_page(before)
+        seen.extend(items)
+        if before is None:
+            return seen
+
+
+def test_feed_pages_cover_every_item_newest_first(app):
+    with app.app_context():
+        items = _walk()
+        total = len(AnnouncementService.get_all_announcements()) + len(EventService.get_all_events())
+        assert len(items) == total
+        assert len({(i['ItemType'], i['FeedItemID']) for i in items}) == total
+        anns = [i['DatePosted'] for i in items if i['ItemType'] == 'announcement']
+        assert anns == sorted(anns, reverse=True)
+
+
+def test_new_posts_fan_out_and_deletes_clean_up(app):
+    with app.app_context():
+        org_id = OrgService.get_all_organizations()[0]['OrgID']
+        role_id = OfficerRoleService.get_or_create_officer_role_for_user(org_id, 1)
+        AnnouncementService.create_announcement(org_id, role_id, 'Fresh news', 'Body', '2999-01-01 00:00:00')
+        top, _ = FeedService.get_feed_page()
+        assert top[0]['ItemType'] == 'announcement' and top[0]['Title'] == 'Fresh news'
+
+        EventService.create_event('Late event', 'desc', '2999-02-01', org_id, role_id, 'Hall')
+        assert any(i['ItemType'] == 'event' and i['EventName'] == 'Late event' for i in _walk())
+
+        OrgService.delete_organization(org_id)
+        assert all(i['OrgID'] != org_id for i in _walk())
+
+
+def test_home_renders_feed_with_older_link(app):
+    client = app.test_client()
+    html = client.get('/').get_data(as_text=True)
+    assert 'Older posts' in html
+    with app.app_context():
+        _, cursor = FeedService.get_feed_page()
+    assert client.get(f'/?before={cursor}').status_code == 200
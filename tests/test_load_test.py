@@ -0,0 +1,56 @@
+import os
+import sys
+import threading
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from app.database import get_db
+from tools.loadtest import run_load
+from tools.synthetic_data import SyntheticDataset, load_database
+
+
+@pytest.fixture
+def app(make_app):
+    app = make_app(seed=False)
+    with app.app_context():
+        load_database(SyntheticDataset(users=300, orgs=6, seed=5, password='pw'))
+    return app
+
+
+def _counts(app):
+    with app.app_context():
+        db = get_db()
+        return (db.execute('SELECT COUNT(*) FROM memberships').fetchone()[0],
+                db.execute('SELECT COUNT(*) FROM announcements').fetchone()[0])
+
+
+def test_inprocess_mix_runs_every_scenario_and_writes(app):
+    before = _counts(app)
+    report = run_load(app.config['DATABASE'], mix={'browse': 1, 'search': 1, 'join': 1, 'approve': 1, 'post': 1},
+                      concurrency=3, duration=30, max_ops=12, app=app)
+    assert set(report['scenarios']) == {'browse', 'search', 'join', 'approve', 'post'}
+    total = report['total']
+    assert total['ops'] == 36 and total['errors'] == 0 and total['locked'] == 0
+    assert total['p50_ms'] <= total['p99_ms'] <= total['max_ms']
+    join, post = report['scenarios']['join'], report['scenarios']['post']
+    assert join['statuses'] == {'302': join['ops']}
+    # joins of orgs the student already belongs to don't add a row
+    memberships, announcements = _counts(app)
+    assert before[0] <= memberships <= before[0] + join['ops']
+    assert announcements - before[1] == post['ops']
+
+
+def test_http_target_logs_in_and_reports(app):
+    from werkzeug.serving import make_server
+
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        report = run_load(app.config['DATABASE'], target=f'http://127.0.0.1:{server.server_port}',
+                          mix={'browse': 1, 'post': 1}, concurrency=2, duration=30, max_ops=4, password='pw')
+    finally:
+        server.shutdown()
+    assert report['total']['ops'] == 8
+    assert report['total']['errors'] == 0
@@ -0,0 +1,86 @@
+import os
+import re
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from app.database import get_db
+from app.metrics import metrics, InstrumentedConnection
+
+TOKEN = 'scrape-token'
+AUTH = {'Authorization': f'Bearer {TOKEN}'}
+
+
+@pytest.fixture
+def app(make_app):
+    app = make_app(seed=False, METRICS_TOKEN=TOKEN)
+    metrics.reset()
+    return app
+
+
+def _server_timing(resp):
+    header = resp.headers['Server-Timing']
+    queries = int(re.search(r'desc="(\d+) queries"', header).group(1))
+    return header, queries
+
+
+def test_server_timing_counts_queries_per_request(app):
+    client = app.test_client()
+
+    @app.route('/_twice')
+    def twice():
+        db = get_db()
+        for _ in range(2):
+            db.execute('SELECT COUNT(*) FROM users').fetchone()
+        return 'ok'
+
+    header, queries = _server_timing(client.get('/_twice'))
+    assert queries == 2
+    assert header.startswith('app;dur=') and 'tpl;dur=' in header
+    _, home_queries = _server_timing(client.get('/'))
+    assert home_queries > 0
+
+    with app.app_context():
+        assert isinstance(get_db(), InstrumentedConnection)
+        # outside a request nothing is recorded
+        get_db().execute('SELECT 1').fetchone()
+
+
+def test_metrics_endpoint_exposes_prometheus_text(app):
+    client = app.test_client()
+    client.get('/')
+    client.get('/')
+    client.get('/no-such-page')
+    assert client.get('/metrics').status_code == 403
+    assert client.get('/metrics', headers={'Authorization': 'Bearer wrong'}).status_code == 403
+    resp = client.get('/metrics', headers=AUTH)
+    assert resp.status_code == 200
+    assert resp.mimetype == 'text/plain'
+    text = resp.get_data(as_text=True)
+    assert 'campus_hub_http_requests_total{endpoint="web.home",method="GET",status="200"} 2' in text
+    assert 'campus_hub_http_request_duration_seconds_count{endpoint="web.home",method="GET"} 2' in text
+    assert 'campus_hub_http_request_duration_seconds_bucket{endpoint="web.home",method="GET",le="+Inf"} 2' in text
+    assert re.search(r'campus_hub_sql_queries_total\{endpoint="web.home"\} [1-9]', text)
+    assert 'campus_hub_template_render_seconds_count{template="home.html"} 2' in text
+    assert 'endpoint="unmatched"' in text
+    assert 'campus_hub_db_pool_checkouts_total{' in text
+    # databases are labelled by file name, never by their path on the host
+    assert f'database="{os.path.basename(app.config["DATABASE"])}"' in text
+    assert app.config['DATABASE'] not in text
+    # every sample line is "name{labels} value"
+    for line in text.splitlines():
+        assert line.startswith('#') or re.match(r'^[a-z_]+(\{.*\})? [0-9.e+-]+$', line), line
+
+
+def test_metrics_can_be_disabled(make_app):
+    client = make_app(seed=False, METRICS_ENABLED=False, METRICS_TOKEN=TOKEN).test_client()
+    resp = client.get('/')
+    assert 'Server-Timing' not in resp.headers
+    assert client.get('/metrics', headers=AUTH).status_code == 404
+
+
+def test_metrics_endpoint_is_off_without_a_token(make_app):
+    client = make_app(seed=False).test_client()
+    assert 'Server-Timing' in client.get('/').headers
+    assert client.get('/metrics').status_code == 404
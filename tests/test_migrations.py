@@ -0,0 +1,111 @@
+import os
+import sqlite3
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from app import create_app, migrations
+from app.database import close_pools
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / 'legacy.db')
+    yield path
+    close_pools(path)
+
+
+def test_fresh_database_is_migrated_and_restart_skips_ddl(db_path, monkeypatch):
+    create_app({'TESTING': True, 'DATABASE': db_path})
+    conn = sqlite3.connect(db_path)
+    assert migrations.get_version(conn) == migrations.latest_version()
+    assert conn.execute('SELECT COUNT(*) FROM organizations').fetchone()[0] > 0
+    conn.close()
+
+    def fail(*args, **kwargs):
+        raise AssertionError('schema work on a current database')
+
+    monkeypatch.setattr(migrations, 'migrate', fail)
+    monkeypatch.setattr('app.services.seed_service.SeedService.start', fail)
+    create_app({'TESTING': True, 'DATABASE': db_path})
+
+
+def test_legacy_database_is_backed_up_and_upgraded(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.executescript('''
+        CREATE TABLE organizations (OrgID INTEGER PRIMARY KEY AUTOINCREMENT, OrgName TEXT, Description TEXT);
+        CREATE TABLE announcements (AnnouncementID INTEGER PRIMARY KEY AUTOINCREMENT, OrgID INTEGER, CreatedBy INTEGER,
+                                    Title TEXT, Content TEXT, DatePosted DATETIME);
+        CREATE TABLE officer_roles (OfficerRoleID INTEGER PRIMARY KEY AUTOINCREMENT, MembershipID INTEGER, RoleName TEXT,
+                                    StartDate DATETIME, EndDate DATETIME);
+        INSERT INTO organizations (OrgName, Description) VALUES ('Chess Club', 'Weekly chess');
+    ''')
+    conn.close()
+
+    # by default backups go to instance/backups, never next to the database
+    default = migrations.default_backup_path(db_path, 0)
+    assert os.path.dirname(default) == migrations.runner.DEFAULT_BACKUP_DIR
+    assert os.path.basename(default).startswith(os.path.basename(db_path) + '.backup_v0_')
+
+    before, after, backup = migrations.migrate_database_file(db_path, backup_dir=os.path.dirname(db_path))
+    assert (before, after) == (0, migrations.latest_version())
+    assert backup and os.path.exists(backup)
+
+    conn = sqlite3.connect(db_path)
+    cols = {r[1] for r in conn.execute('PRAGMA table_info(announcements)')}
+    assert 'Attachments' in cols
+    cols = {r[1] for r in conn.execute('PRAGMA table_info(officer_roles)')}
+    assert {'can_post_announcements', 'can_assign_roles'} <= cols
+    # pre-existing rows were indexed for search by the baseline
+    assert conn.execute("SELECT COUNT(*) FROM organizations_fts WHERE organizations_fts MATCH 'chess'").fetchone()[0] == 1
+    conn.close()
+
+    old = sqlite3.connect(backup)
+    assert migrations.get_version(old) == 0
+    assert 'Attachments' not in {r[1] for r in old.execute('PRAGMA table_info(announcements)')}
+    old.close()
+
+    # running again is a no-op and takes no new backup
+    assert migrations.migrate_database_file(db_path, backup_dir=os.path.dirname(db_path)) == (after, after, None)
+
+
+def test_background_seed_reports_readiness(make_app):
+    from app.services.seed_service import SEED_STEPS, SeedService
+
+    app = make_app(seed=False)
+    client = app.test_client()
+    # seeding disabled: nothing to wait for
+    assert client.get('/healthz/ready').status_code == 200
+
+    app.config['SEED_MODE'] = 'background'
+    with app.app_context():
+        assert SeedService.needs_seeding()
+    resp = client.get('/healthz/ready')
+    assert resp.status_code == 503 and resp.json['seed']['status'] == 'pending'
+
+    thread = SeedService.start(app)
+    thread.join(60)
+    resp = client.get('/healthz/ready')
+    assert resp.status_code == 200
+    seed = resp.json['seed']
+    assert seed['status'] == 'done' and seed['steps_done'] == len(SEED_STEPS)
+    assert seed['detail']['events']['inserted'] > 0
+    with app.app_context():
+        # a second claim finds the job finished
+        assert SeedService.claim() is None
+        assert not SeedService.needs_seeding()
+
+
+def test_failed_seed_is_not_ready(make_app):
+    from app.database import get_db
+
+    app = make_app(seed=False)
+    with app.app_context():
+        db = get_db()
+        db.execute("UPDATE seed_state SET status = 'failed', error = 'users: disk full' WHERE id = 1")
+        db.commit()
+    app.config['SEED_MODE'] = 'background'
+    resp = app.test_client().get('/healthz/ready')
+    assert resp.status_code == 503
+    assert resp.json['status'] == 'not_ready' and resp.json['reason'] == 'seed failed: users: disk full'
@@ -0,0 +1,48 @@
+import os
+import sqlite3
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from app.models.announcement import Announcement
+from app.models.event import Event
+from app.models.officer_role import OfficerRole
+from app.models.organization import Organization
+from app.models.user import User
+
+
+@pytest.fixture
+def db():
+    conn = sqlite3.connect(':memory:')
+    conn.row_factory = sqlite3.Row
+    yield conn
+    conn.close()
+
+
+@pytest.mark.parametrize('model, select', [
+    (Event, "SELECT 1 AS EventID, 2 AS OrgID, 3 AS CreatedBy, 'Party' AS EventName, 'Fun' AS Description, '2026-01-01' AS EventDate, 'Hall' AS Location"),
+    (OfficerRole, "SELECT 10 AS OfficerRoleID, 5 AS MembershipID, 'President' AS RoleName, '2024-01-01' AS StartDate, NULL AS EndDate, 1 AS can_post_announcements"),
+    (Organization, "SELECT 7 AS OrgID, 'Chess' AS OrgName, 'Weekly' AS Description, 3 AS ApprovedCount, 1 AS PendingCount"),
+    (Announcement, "SELECT 1 AS AnnouncementID, 2 AS OrgID, 3 AS CreatedBy, 'Hi' AS Title, 'Body' AS Content, NULL AS DatePosted, 'x' AS extra_col"),
+    (User, "SELECT 1 AS UserID, 'Ada' AS FirstName, 'L' AS LastName, 'ada@example.com' AS Email, 'secret' AS PasswordHash"),
+])
+def test_row_fast_path_matches_model_to_dict(db, model, select):
+    row = db.execute(select).fetchone()
+    expected = model(**dict(row)).to_dict()
+    assert model.row_to_dict(row) == expected
+    assert list(model.row_to_dict(row)) == list(expected)
+    assert model.rows_to_dicts([row, row]) == [expected, expected]
+
+    cur = db.cursor()
+    cur.row_factory = None
+    tuples = cur.execute(select).fetchall()
+    assert model.rows_to_dicts(tuples, [d[0] for d in cur.description]) == [expected]
+
+
+def test_models_use_slots_and_keep_extra_columns():
+    a = Announcement(1, 2, 3, 'Hi', 'Body', created_at='2026-01-01', Category='news')
+    assert not hasattr(a, '__dict__')
+    assert a.created_at == '2026-01-01'
+    assert a.get('Category') == 'news' and a.get('missing', 0) == 0
+    assert 'PasswordHash' not in User(1, 'A', 'B', 'a@b.c', PasswordHash='x').to_dict()
@@ -0,0 +1,124 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from app.services.organization_service import OrgService
+from app.services.membership_service import MembershipService
+from app.services.announcement_service import AnnouncementService
+from app.services.event_service import EventService
+
+
+def test_org_scoped_lookups_match_full_table_filters(app):
+    with app.app_context():
+        org_id = 1
+        org = OrgService.get_org_by_id(org_id)
+        assert org is not None and int(org['OrgID']) == org_id
+        assert OrgService.get_org_by_id(999999) is None
+
+        memberships = MembershipService.get_all_memberships()
+        approved = sum(1 for m in memberships if int(m['OrgID']) == org_id and (m['Status'] or '').lower() == 'approved')
+        pending = sum(1 for m in memberships if int(m['OrgID']) == org_id and (m['Status'] or '').lower() == 'pending')
+        assert MembershipService.count_memberships_by_org_and_status(org_id, 'approved') == approved
+        assert MembershipService.count_memberships_by_org_and_status(org_id, 'Pending') == pending
+
+        anns = AnnouncementService.get_announcements_by_org(org_id)
+        expected = [a for a in AnnouncementService.get_all_announcements() if int(a['OrgID']) == org_id]
+        assert sorted(a['AnnouncementID'] for a in anns) == sorted(a['AnnouncementID'] for a in expected)
+
+        events = EventService.get_events_by_org(org_id)
+        expected_ev = [e for e in EventService.get_all_events() if int(e['OrgID']) == org_id]
+        assert sorted(e['EventID'] for e in events) == sorted(e['EventID'] for e in expected_ev)
+        if events:
+            assert EventService.get_event_by_id(events[0]['EventID'])['EventName'] == events[0]['EventName']
+
+
+def test_org_and_event_pages_render(app):
+    client = app.test_client()
+    assert client.get('/orgs/1').status_code == 200
+    assert client.get('/orgs/999999').status_code == 302
+    with app.app_context():
+        events = EventService.get_all_events()
+    if events:
+        assert client.get(f"/events/{events[0]['EventID']}").status_code == 200
+
+
+def test_creator_name_resolver_matches_per_row_lookup(app):
+    from app.services.name_resolver import CreatorNameResolver
+    from app.services.officer_role_service import OfficerRoleService
+    from app.services.user_service import UserService
+
+    with app.test_request_context():
+        user_map = {u['UserID']: f"{u['FirstName']} {u['LastName']}" for u in UserService.get_all_users()}
+        role_ids = [r['OfficerRoleID'] for r in OfficerRoleService.get_all_officer_roles()][:5]
+        ids = [1, 2, None, 'bad', 10 ** 9] + role_ids
+        resolver = CreatorNameResolver()
+        items = resolver.annotate([{'CreatedBy': i} for i in ids])
+        for item in items:
+            cid = item['CreatedBy']
+            if not isinstance(cid, int):
+                assert item['CreatorName'] is None
+                continue
+            if cid in user_map:
+                expected = user_map[cid]
+            else:
+                row = OfficerRoleService.get_user_by_officer_role(cid)
+                expected = f"{row['FirstName']} {row['LastName']}" if row else None
+            assert item['CreatorName'] == expected
+
+
+def test_member_counters_follow_membership_changes(app):
+    from app.database import get_db
+
+    def actual(org_id, status):
+        return MembershipService.count_memberships_by_org_and_status(org_id, status)
+
+    with app.app_context():
+        for org in OrgService.get_all_organizations():
+            assert org['ApprovedCount'] == actual(org['OrgID'], 'approved')
+            assert org['PendingCount'] == actual(org['OrgID'], 'pending')
+
+        before = OrgService.get_member_counts(1)
+        MembershipService.create_membership(2, 1, 'Pending')
+        mid = get_db().execute('SELECT MAX(MembershipID) FROM memberships').fetchone()[0]
+        assert OrgService.get_member_counts(1) == {'approved': before['approved'], 'pending': before['pending'] + 1}
+        MembershipService.update_membership_status(mid, 'Approved')
+        assert OrgService.get_member_counts(1) == {'approved': before['approved'] + 1, 'pending': before['pending']}
+        MembershipService.update_membership_status(mid, 'Rejected')
+        assert OrgService.get_member_counts(1) == before
+
+        # drift introduced behind the triggers' back is repaired
+        db = get_db()
+        db.execute('UPDATE organizations SET ApprovedCount = ApprovedCount + 5 WHERE OrgID = 1')
+        db.commit()
+        assert OrgService.reconcile_member_counts() == [1]
+        assert OrgService.get_member_counts(1) == before
+        assert OrgService.reconcile_member_counts() == []
+
+
+def test_profile_lookups_are_scoped_to_the_user(app):
+    from app.services.officer_role_service import OfficerRoleService
+
+    with app.app_context():
+        roles = OfficerRoleService.get_all_officer_roles()
+        role_memberships = {int(r['MembershipID']) for r in roles if r.get('MembershipID')}
+        memberships = MembershipService.get_all_memberships()
+        # a user who holds an officer role, so the roles and announcement count are exercised
+        user_id = next(int(m['UserID']) for m in memberships if int(m['MembershipID']) in role_memberships)
+
+        mine = [m for m in memberships if int(m['UserID']) == user_id]
+        assert [m['MembershipID'] for m in MembershipService.get_memberships_by_user(user_id)] == \
+            sorted(m['MembershipID'] for m in mine)
+        mine_ids = {int(m['MembershipID']) for m in mine}
+        my_roles = [r for r in roles if r.get('MembershipID') and int(r['MembershipID']) in mine_ids]
+        assert sorted(r['OfficerRoleID'] for r in OfficerRoleService.get_roles_for_user(user_id)) == \
+            sorted(r['OfficerRoleID'] for r in my_roles)
+        role_ids = {int(r['OfficerRoleID']) for r in my_roles}
+        expected = sum(1 for a in AnnouncementService.get_all_announcements() if int(a['CreatedBy']) in role_ids)
+        assert AnnouncementService.count_for_user(user_id) == expected
+
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess['user_id'] = user_id
+    rv = client.get('/profile')
+    assert rv.status_code == 200
@@ -0,0 +1,62 @@
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+
+
+@pytest.fixture
+def client(app):
+    with app.test_client() as client:
+        yield client
+
+
+def _walk(client, url):
+    seen = []
+    while url:
+        rv = client.get(url)
+        assert rv.status_code == 200
+        seen.extend(rv.get_json())
+        link = rv.headers.get('Link')
+        url = link[1:link.index('>')] if link else None
+    return seen
+
+
+def test_keyset_pages_cover_table_without_overlap(client):
+    full = _walk(client, '/users/?limit=1000')
+    paged = _walk(client, '/users/?limit=7')
+    assert [u['UserID'] for u in paged] == [u['UserID'] for u in full]
+    assert len(paged) == len(set(u['UserID'] for u in paged))
+
+    first = client.get('/users/?limit=7')
+    assert len(first.get_json()) == 7
+    assert first.headers['X-Next-Cursor'] == str(first.get_json()[-1]['UserID'])
+
+
+def test_filters_are_applied(client):
+    rows = _walk(client, '/memberships/?org_id=1&status=approved&limit=3')
+    assert rows and all(int(m['OrgID']) == 1 and m['Status'].lower() == 'approved' for m in rows)
+    assert client.get('/memberships/?limit=abc').status_code == 400
+
+
+def test_org_directory_pages_reach_every_org(app, client, monkeypatch):
+    from app.routes import web_routes
+    from app.services.organization_service import OrgService
+
+    monkeypatch.setattr(web_routes, 'ORG_PAGE_SIZE', 3)
+    with app.app_context():
+        expected = [o['OrgName'] for o in OrgService.get_all_organizations()]
+
+    home = client.get('/').get_data(as_text=True)
+    assert 'href="/orgs"' in home
+
+    seen, url = [], '/orgs'
+    while url:
+        rv = client.get(url)
+        assert rv.status_code == 200
+        body = rv.get_data(as_text=True)
+        seen.extend(name for name in expected if f'<div class="event-title">{name}</div>' in body)
+        marker = '/orgs?after='
+        url = body[body.index(marker):body.index('"', body.index(marker))] if marker in body else None
+    assert sorted(seen) == sorted(expected)
@@ -0,0 +1,80 @@
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from app.database import get_db
+from app.services.membership_service import MembershipService
+from app.services.officer_role_service import OfficerRoleService
+from app.services.permission_cache import permission_cache
+
+
+@pytest.fixture
+def app(make_app):
+    app = make_app()
+    permission_cache.invalidate()
+    yield app
+    permission_cache.invalidate()
+
+
+def test_batch_permissions_match_per_org_lookup(app):
+    with app.app_context():
+        user_ids = sorted({int(m['UserID']) for m in MembershipService.get_all_memberships()})[:10]
+        for uid in user_ids:
+            permission_cache.invalidate()
+            batch = OfficerRoleService.user_permissions_for_all_orgs(uid)
+            permission_cache.invalidate()
+            for oid, perms in batch.items():
+                assert OfficerRoleService.user_permissions_for_org(oid, uid) == perms
+
+
+def test_role_assignment_invalidates_cached_permissions(app):
+    with app.app_context():
+        db = get_db()
+        db.execute("INSERT INTO users (FirstName, LastName, Email, PasswordHash) VALUES ('Perm', 'Tester', 'perm@example.com', 'x')")
+        uid = db.execute("SELECT UserID FROM users WHERE Email = 'perm@example.com'").fetchone()['UserID']
+        db.commit()
+        MembershipService.create_membership(uid, 1, 'Approved')
+        mid = MembershipService.get_membership_by_user_and_org(uid, 1)['MembershipID']
+
+        assert OfficerRoleService.user_permissions_for_org(1, uid)['can_create_events'] == 0
+        hits = permission_cache.stats()['hits']
+        assert OfficerRoleService.user_permissions_for_org(1, uid)['can_create_events'] == 0
+        assert permission_cache.stats()['hits'] == hits + 1
+
+        OfficerRoleService.assign_role_to_membership(mid, 'Events', {'can_create_events': 1})
+        assert OfficerRoleService.user_permissions_for_org(1, uid)['can_create_events'] == 1
+
+        MembershipService.update_membership_status(mid, 'Rejected')
+        assert OfficerRoleService.user_permissions_for_org(1, uid)['can_create_events'] == 0
+
+
+def test_change_from_another_process_is_seen_without_waiting_for_the_ttl(app):
+    import sqlite3
+    with app.app_context():
+        uid, oid = 901, 1
+        db = get_db()
+        db.execute("INSERT INTO users (UserID, FirstName, LastName, Email, PasswordHash) VALUES (?, 'Other', 'Worker', 'ow@example.com', 'x')", (uid,))
+        db.commit()
+        MembershipService.create_membership(uid, oid, 'Approved')
+        mid = MembershipService.get_membership_by_user_and_org(uid, oid)['MembershipID']
+        OfficerRoleService.assign_role_to_membership(mid, 'Approver', {'can_approve_members': 1})
+        assert OfficerRoleService.user_permissions_for_org(oid, uid)['can_approve_members'] == 1
+        assert OfficerRoleService.user_permissions_for_org(oid, uid)['can_approve_members'] == 1
+
+        # another worker revokes the role: no invalidate() reaches this process
+        other = sqlite3.connect(app.config['DATABASE'])
+        other.execute('DELETE FROM officer_roles WHERE MembershipID = ?', (mid,))
+        other.commit()
+        other.close()
+        assert OfficerRoleService.user_permissions_for_org(oid, uid)['can_approve_members'] == 0
+
+
+def test_entries_are_scoped_to_their_database(app, make_app):
+    other_app = make_app(seed=False)
+    with app.app_context():
+        permission_cache.set(5, 1, {'can_assign_roles': 1}, 0)
+        assert permission_cache.get(5, 1, 0) == {'can_assign_roles': 1}
+    with other_app.app_context():
+        assert permission_cache.get(5, 1, 0) is None
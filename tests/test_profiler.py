@@ -0,0 +1,60 @@
+import os
+import pstats
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from app.profiler import profile_token
+
+HEADER = 'X-Campus-Hub-Profile'
+
+
+@pytest.fixture
+def profiled_app(make_app, tmp_path):
+    def make(**overrides):
+        config = {'PROFILER_ENABLED': True, 'PROFILE_DIR': str(tmp_path / 'profiles'), 'PROFILE_INTERVAL': 0.001}
+        config.update(overrides)
+        return make_app(seed=False, **config)
+    return make
+
+
+def test_signed_header_profiles_one_request(profiled_app):
+    app = profiled_app()
+    client = app.test_client()
+    assert 'X-Profile-Id' not in client.get('/').headers
+    assert 'X-Profile-Id' not in client.get('/', headers={HEADER: 'forged'}).headers
+
+    token = profile_token(app)
+    resp = client.get('/', headers={HEADER: token})
+    name = resp.headers['X-Profile-Id']
+    assert name.endswith('.collapsed') and '-web.home-' in name
+
+    assert client.get('/_profiles').status_code == 403
+    listing = client.get('/_profiles', headers={HEADER: token}).get_json()
+    assert [p['name'] for p in listing] == [name]
+    assert listing[0]['endpoint'] == 'web.home'
+    assert client.get(f'/_profiles/{name}?token={token}').status_code == 403
+    body = client.get(f'/_profiles/{name}', headers={HEADER: token}).get_data(as_text=True)
+    for line in body.splitlines():
+        stack, count = line.rsplit(' ', 1)
+        assert int(count) > 0 and ';' in stack
+    assert client.get('/_profiles/campus_0.db', headers={HEADER: token}).status_code == 404
+
+
+def test_sample_rate_cprofile_blueprint_filter_and_rotation(profiled_app, tmp_path):
+    app = profiled_app(PROFILE_SAMPLE_RATE=1.0, PROFILE_MODE='cprofile', PROFILE_MAX_FILES=2)
+    client = app.test_client()
+    assert 'X-Profile-Id' not in client.get('/healthz/live').headers   # not a web page
+    names = [client.get('/').headers['X-Profile-Id'] for _ in range(3)]
+    kept = sorted(os.listdir(tmp_path / 'profiles'))
+    assert kept == sorted(names[1:])
+    stats = pstats.Stats(str(tmp_path / 'profiles' / names[-1]))
+    assert stats.total_calls > 0
+
+
+def test_disabled_by_default(profiled_app):
+    app = profiled_app(PROFILER_ENABLED=None)
+    client = app.test_client()
+    assert 'X-Profile-Id' not in client.get('/', headers={HEADER: profile_token(app)}).headers
+    assert client.get('/_profiles').status_code == 404
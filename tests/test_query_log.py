@@ -0,0 +1,71 @@
+import json
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from app.database import get_db
+from app.metrics import metrics, track_queries
+from app.query_log import query_log, statement_shape
+
+
+@pytest.fixture
+def app(make_app, tmp_path):
+    app = make_app(seed=False, DB_QUERY_LOG=str(tmp_path / 'query_log.jsonl'),
+                   DB_SLOW_QUERY_MS=0.001, DB_REPEAT_QUERY_THRESHOLD=5, METRICS_TOKEN='scrape-token')
+    query_log.reset()
+    metrics.reset()
+
+    @app.route('/_lookups')
+    def lookups():
+        db = get_db()
+        db.execute('SELECT UserID FROM users WHERE FirstName = ?', ('Ada',)).fetchall()
+        for user_id in range(8):
+            db.execute(f'SELECT Email FROM users WHERE UserID = {user_id}').fetchone()
+        return 'ok'
+
+    return app
+
+
+def _findings(app):
+    with open(app.config['DB_QUERY_LOG'], encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_slow_queries_are_logged_with_plan_and_params(app):
+    app.test_client().get('/_lookups')
+    slow = [f for f in _findings(app) if f['kind'] == 'slow_query' and 'FirstName' in f['sql']]
+    assert len(slow) == 1
+    assert slow[0]['params'] == ['Ada']
+    assert slow[0]['full_scan'] == ['users']
+    assert slow[0]['plan'] == ['SCAN users']
+    assert slow[0]['scope'] == 'GET lookups'
+
+
+def test_repeated_statement_shapes_are_flagged_once_per_interval(app):
+    client = app.test_client()
+    client.get('/_lookups')
+    repeated = [f for f in _findings(app) if f['kind'] == 'repeated_query']
+    assert len(repeated) == 1
+    assert repeated[0]['count'] == 8
+    assert repeated[0]['shape'] == 'SELECT Email FROM users WHERE UserID = ?'
+
+    client.get('/_lookups')
+    assert len([f for f in _findings(app) if f['kind'] == 'repeated_query']) == 1
+    assert 'campus_hub_repeated_queries_total{endpoint="lookups"} 2' in client.get('/metrics', headers={'Authorization': 'Bearer scrape-token'}).get_data(as_text=True)
+
+
+def test_track_queries_outside_requests(app):
+    with app.app_context():
+        db = get_db()
+        with track_queries('script') as stats:
+            for i in range(6):
+                db.execute('SELECT * FROM organizations WHERE OrgID IN (?, ?)', (i, i + 1)).fetchall()
+        assert stats.queries == 6
+        assert [r['scope'] for r in stats.repeated_queries] == ['script']
+
+
+def test_statement_shape():
+    assert statement_shape("SELECT * FROM t WHERE a = 'x''y' AND b = 12\n  AND c IN (?, ?, ?)") == \
+        'SELECT * FROM t WHERE a = ? AND b = ? AND c IN (?...)'
@@ -0,0 +1,53 @@
+import copy
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from tools import benchmarks
+
+
+def _report(p50, p95, queries, slope, host=None):
+    route = {'p50_ms': p50, 'p95_ms': p95, 'p99_ms': p95, 'mean_ms': p50, 'max_ms': p95, 'status': 200, 'queries': queries}
+    return {'host': host or benchmarks.host_fingerprint(),
+            'scales': {'1000u_20o': {'users': 1000, 'orgs': 20, 'routes': {'home': route}}}, 'growth': {'home': slope}}
+
+
+def test_compare_flags_slower_routes_extra_queries_and_worse_scaling():
+    baseline = _report(10.0, 12.0, 5, 0.1)
+    assert benchmarks.compare(copy.deepcopy(baseline), baseline) == ([], [])
+    # within max_ratio, or slower by less than min_delta_ms: not a regression
+    assert benchmarks.compare(_report(15.0, 16.0, 5, 0.2), baseline) == ([], [])
+    assert benchmarks.compare(_report(3.0, 4.0, 5, 0.1), _report(1.0, 1.5, 5, 0.1)) == ([], [])
+
+    problems, warnings = benchmarks.compare(_report(30.0, 40.0, 25, 0.9), baseline)
+    assert any('p50' in p for p in problems) and any('p95' in p for p in problems)
+    assert any('25 queries per request' in p for p in problems)
+    assert any('grows with dataset size' in p for p in problems)
+    assert warnings == []
+
+
+def test_latency_from_another_host_only_warns():
+    baseline = _report(10.0, 12.0, 5, 0.1, host={'node': 'ci-runner', 'cpus': 64})
+    problems, warnings = benchmarks.compare(_report(30.0, 40.0, 5, 0.1), baseline)
+    assert problems == []
+    assert any('p50' in w for w in warnings) and any('p95' in w for w in warnings)
+    # query counts and scaling still gate across hosts
+    problems, _ = benchmarks.compare(_report(10.0, 12.0, 6, 0.9), baseline)
+    assert len(problems) == 2
+
+
+def test_suite_runs_every_route_and_counts_queries(monkeypatch):
+    monkeypatch.setenv('SKIP_AUTO_SEED', '1')
+    cache_dir = tempfile.mkdtemp()
+    report = benchmarks.run_suite(scales=((150, 5), (300, 8)), iterations=2, warmup=1, rounds=2, cache_dir=cache_dir)
+    assert set(report['scales']) == {'150u_5o', '300u_8o'}
+    for scale in report['scales'].values():
+        assert set(scale['routes']) == {name for name, _, _ in benchmarks.ROUTES}
+        for name, result in scale['routes'].items():
+            assert result['status'] == 200, name
+            assert result['queries'] and result['p50_ms'] <= result['p99_ms']
+    assert set(report['growth']) == set(report['scales']['150u_5o']['routes'])
+    # the databases are cached, so a second run reuses them
+    assert benchmarks.prepare_database(150, 5, cache_dir=cache_dir) == os.path.join(cache_dir, 'campus_150u_5o_bench.db')
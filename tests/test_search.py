@@ -0,0 +1,79 @@
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from app.services.organization_service import OrgService
+from app.services.user_service import UserService
+from app.services.officer_role_service import OfficerRoleService
+from app.services.announcement_service import AnnouncementService
+from app.services.search_service import SearchService, build_match_query
+
+
+@pytest.fixture
+def app(make_app):
+    app = make_app(seed=False, SEARCH_PAGE_SIZE=2)
+    with app.app_context():
+        org_id = OrgService.create_organization('Robotics Society', 'We build <robots> & drones')
+        UserService.create_user('Rita', 'Bot', 'rita@example.com', '$pbkdf2-sha256$29000$x$y')
+        user_id = UserService.get_user_row_by_email('rita@example.com')['UserID']
+        role_id = OfficerRoleService.get_or_create_officer_role_for_user(org_id, user_id, role_name='Admin')
+        for i in range(3):
+            AnnouncementService.create_announcement(org_id, role_id, f'Robot build night {i}', 'Bring your soldering iron', None)
+        AnnouncementService.create_announcement(org_id, role_id, 'Bake sale', 'Cookies for sale', None)
+    return app
+
+
+def test_match_query_is_sanitized():
+    assert build_match_query('  ') is None
+    assert build_match_query('robot AND "drones') == '"robot"* "AND"* "drones"*'
+
+
+def test_search_ranks_highlights_and_paginates(app):
+    with app.app_context():
+        results = SearchService.search('robot')
+        assert len(results['announcements']) == 2 and results['has_more_announcements']
+        assert '<mark>' in str(results['announcements'][0]['TitleHighlight'])
+        # user content is escaped before the highlight markers are applied
+        org_hit = results['orgs'][0]
+        assert '&lt;' in str(org_hit['Snippet']) and '<robots>' not in str(org_hit['Snippet'])
+
+        page2 = SearchService.search('robot', page=2)
+        assert len(page2['announcements']) == 1 and not page2['has_more_announcements']
+
+        # triggers keep the index in sync on update and delete
+        from app.database import get_db
+        db = get_db()
+        db.execute("UPDATE announcements SET Title = 'Pastry sale' WHERE Title = 'Bake sale'")
+        db.commit()
+        assert SearchService.search('pastry')['announcements']
+        assert not SearchService.search('bake')['announcements']
+
+
+def test_search_page_renders(app):
+    rv = app.test_client().get('/search?q=robot')
+    assert rv.status_code == 200
+    assert 'Next' in rv.get_data(as_text=True)
+
+
+def test_like_fallback_only_when_the_index_is_missing(app):
+    import sqlite3
+    from app.database import get_db
+
+    with app.app_context():
+        db = get_db()
+
+        class LockedFts:
+            def execute(self, sql, params=()):
+                if 'MATCH' in sql:
+                    raise sqlite3.OperationalError('database is locked')
+                raise AssertionError('fell back to a LIKE scan')
+
+        with pytest.raises(sqlite3.OperationalError):
+            SearchService._search_section(LockedFts(), 'announcements', build_match_query('robot'), 'robot', 2, 0)
+
+        db.execute('DROP TABLE announcements_fts')
+        db.commit()
+        items, more = SearchService._search_section(db, 'announcements', build_match_query('robot'), 'Robot', 2, 0)
+        assert len(items) == 2 and more
@@ -0,0 +1,79 @@
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from app.database import get_db
+from app.services.feed_service import FeedService
+from tools.synthetic_data import SyntheticDataset, load_database, write_csv
+from app.utils.errors import AppError
+
+
+@pytest.fixture
+def app(make_app, tmp_path):
+    app = make_app(seed=False)
+    app.config['TMPDIR'] = str(tmp_path)
+    return app
+
+
+def test_same_seed_yields_same_rows():
+    a = SyntheticDataset(users=500, orgs=12, seed=3, password='x')
+    b = SyntheticDataset(users=500, orgs=12, seed=3, password='x')
+    for table in ('organizations', 'memberships', 'officer_roles', 'events', 'announcements', 'announcement_attachments'):
+        assert list(a.rows(table)) == list(b.rows(table))
+    other = SyntheticDataset(users=500, orgs=12, seed=4, password='x')
+    assert list(other.rows('memberships')) != list(a.rows('memberships'))
+
+
+def test_loaded_dataset_is_consistent(app):
+    dataset = SyntheticDataset(users=800, orgs=15, seed=1)
+    with app.app_context():
+        counts = load_database(dataset)
+        db = get_db()
+        assert counts['users'] == 800 and counts['organizations'] == 15
+        assert db.execute('PRAGMA foreign_key_check').fetchall() == []
+        # every org has a President, and creators hold the matching permission in the same org
+        assert db.execute("SELECT COUNT(DISTINCT m.OrgID) FROM officer_roles o JOIN memberships m USING (MembershipID) "
+                          "WHERE o.RoleName = 'President'").fetchone()[0] == 15
+        assert db.execute('SELECT COUNT(*) FROM announcements a JOIN officer_roles o ON o.OfficerRoleID = a.CreatedBy '
+                          'JOIN memberships m ON m.MembershipID = o.MembershipID '
+                          'WHERE m.OrgID != a.OrgID OR o.can_post_announcements = 0').fetchone()[0] == 0
+        # triggers kept the counters, attachment counts and feed in step with the rows
+        assert db.execute("SELECT SUM(ApprovedCount) FROM organizations").fetchone()[0] == \
+            db.execute("SELECT COUNT(*) FROM memberships WHERE Status = 'Approved'").fetchone()[0]
+        assert db.execute('SELECT SUM(AttachmentCount) FROM announcements').fetchone()[0] == counts['announcement_attachments']
+        assert db.execute('SELECT COUNT(*) FROM feed_items').fetchone()[0] == counts['announcements'] + counts['events']
+        with pytest.raises(AppError):
+            load_database(dataset)
+
+
+def test_csv_output_round_trips_through_bulk_importers(app):
+    from app.services.seed_service import SEED_STEPS, _importer
+
+    dataset = SyntheticDataset(users=300, orgs=8, seed=2)
+    out_dir = os.path.join(app.config['TMPDIR'], 'csv')
+    counts = write_csv(dataset, out_dir)
+    with app.app_context():
+        for table, csv_name in SEED_STEPS:
+            report = _importer(table)(os.path.join(out_dir, csv_name))
+            assert report['inserted'] == counts[table] and report['failed'] == 0
+        db = get_db()
+        assert db.execute('PRAGMA foreign_key_check').fetchall() == []
+        row = db.execute("SELECT PasswordHash FROM users WHERE UserID = 1").fetchone()
+        assert row[0] == dataset.password_hash()
+        # the posting time survives the CSV round trip
+        posted = {r['EventID']: r['DatePostedTs'] for r in dataset.rows('events')}
+        assert dict(db.execute('SELECT EventID, DatePostedTs FROM events').fetchall()) == posted
+
+
+def test_bulk_loaded_events_keep_their_posting_time_in_the_feed(app):
+    dataset = SyntheticDataset(users=300, orgs=10, seed=0)
+    with app.app_context():
+        counts = load_database(dataset)
+        db = get_db()
+        keys = [r[0] for r in db.execute("SELECT SortKey FROM feed_items WHERE ItemType = 'event'")]
+        assert len(keys) == counts['events'] and len(set(keys)) > counts['events'] // 2
+        # events posted during the term interleave with the announcements instead of topping the feed
+        page, _ = FeedService.get_feed_page()
+        assert {i['ItemType'] for i in page} == {'announcement', 'event'}
@@ -0,0 +1,143 @@
+import io
+import os
+import sys
+import time
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from app.database import get_db
+from app.services.announcement_service import AnnouncementService
+from app.services.organization_service import OrgService
+from app.services.upload_store import UploadStore
+from app.utils.errors import AppError
+
+
+@pytest.fixture
+def app(make_app, tmp_path):
+    return make_app(seed=False, UPLOAD_DIR=str(tmp_path / 'uploads'), UPLOAD_CHUNK_SIZE=1024,
+                    UPLOAD_SPOOL_SIZE=4096, UPLOAD_MAX_FILE_BYTES=64 * 1024)
+
+
+def _blob_files(app):
+    root = os.path.join(app.config['UPLOAD_DIR'], 'blobs')
+    return [name for _, _, names in os.walk(root) for name in names]
+
+
+def _officer_session(app, client):
+    with app.app_context():
+        org_id = OrgService.create_organization('Upload Club', '')
+        db = get_db()
+        db.execute("INSERT INTO users (FirstName, LastName, Email, PasswordHash) VALUES ('U', 'P', 'up@example.com', 'x')")
+        db.commit()
+        user_id = db.execute("SELECT UserID FROM users WHERE Email = 'up@example.com'").fetchone()['UserID']
+        from app.services.officer_role_service import OfficerRoleService
+        role_id = OfficerRoleService.get_or_create_officer_role_for_user(org_id, user_id)
+    with client.session_transaction() as sess:
+        sess['user_id'] = user_id
+    return org_id, role_id
+
+
+@pytest.mark.parametrize('size', [1000, 20000])  # in memory / spooled to disk
+def test_repeated_uploads_are_stored_once_and_refcounted(app, size):
+    client = app.test_client()
+    org_id, _ = _officer_session(app, client)
+    flyer = os.urandom(size)
+    for i in range(3):
+        data = {'title': f'Post {i}', 'content': 'See flyer', 'attachments': (io.BytesIO(flyer), 'flyer.png', 'image/png')}
+        resp = client.post(f'/orgs/{org_id}/create_announcement', data=data, content_type='multipart/form-data')
+        assert resp.status_code == 302
+
+    assert len(_blob_files(app)) == 1
+    assert os.listdir(os.path.join(app.config['UPLOAD_DIR'], 'tmp')) == []
+    with app.app_context():
+        stats = UploadStore.stats()
+        assert stats == {'blobs': 1, 'stored_bytes': size, 'refs': 3, 'saved_bytes': 2 * size}
+        anns = AnnouncementService.load_attachments(AnnouncementService.get_announcements_by_org(org_id))
+        urls = {a['Attachments'][0]['url'] for a in anns}
+    assert len(urls) == 1
+
+    resp = client.get(urls.pop())
+    assert resp.status_code == 200 and resp.data == flyer
+    assert resp.headers['Cache-Control'] == 'public, max-age=31536000, immutable'
+    assert resp.mimetype == 'image/png'
+    etag = resp.headers['ETag']
+    assert client.get(resp.request.path, headers={'If-None-Match': etag}).status_code == 304
+
+
+def test_size_limits_and_garbage_collection(app):
+    client = app.test_client()
+    org_id, role_id = _officer_session(app, client)
+    data = {'title': 'Huge', 'content': 'x', 'attachments': (io.BytesIO(b'x' * (65 * 1024)), 'big.bin', 'application/octet-stream')}
+    client.post(f'/orgs/{org_id}/create_announcement', data=data, content_type='multipart/form-data')
+    assert _blob_files(app) == []
+    with app.app_context():
+        assert AnnouncementService.get_announcements_by_org(org_id) == []
+        with pytest.raises(AppError):
+            UploadStore.store(io.BytesIO(b'y' * 100), max_bytes=99)
+
+        kept = UploadStore.store(io.BytesIO(b'kept'), 'text/plain')
+        orphan = UploadStore.store(io.BytesIO(b'orphan'), 'text/plain')
+        AnnouncementService.create_announcement(org_id, role_id, 'Ref', 'x', None,
+                                                [{'type': 'file', 'url': '/u', 'sha256': kept['sha256']}])
+        assert UploadStore.collect_garbage(grace=0) == (1, len(b'orphan'))
+        assert UploadStore.get_blob(orphan['sha256']) is None
+        assert UploadStore.get_blob(kept['sha256'])['RefCount'] == 1
+    assert client.get(f"/uploads/{orphan['sha256']}").status_code == 404
+    # non-media blobs download instead of rendering inline
+    resp = client.get(f"/uploads/{kept['sha256']}/notes.txt")
+    assert resp.headers['Content-Disposition'].startswith('attachment')
+
+
+def test_reupload_during_garbage_collection_keeps_the_blob(app, monkeypatch):
+    from app.services import upload_store
+
+    class ReuploadBeforeDelete:
+        # the same bytes arrive again between the collector's SELECT and its DELETE
+        def __init__(self, db):
+            self.db = db
+            self.reuploaded = False
+
+        def __getattr__(self, name):
+            return getattr(self.db, name)
+
+        def execute(self, sql, params=()):
+            if sql.startswith('DELETE FROM upload_blobs') and not self.reuploaded:
+                self.reuploaded = True
+                time.sleep(0.01)
+                assert UploadStore.store(io.BytesIO(b'again'), 'text/plain')['written'] is False
+            return self.db.execute(sql, params)
+
+    with app.app_context():
+        blob = UploadStore.store(io.BytesIO(b'again'), 'text/plain')
+        time.sleep(0.01)
+        real_get_db = upload_store.get_db
+        proxy = ReuploadBeforeDelete(real_get_db())
+        monkeypatch.setattr(upload_store, 'get_db', lambda: proxy)
+        assert UploadStore.collect_garbage(grace=0) == (0, 0)
+        assert proxy.reuploaded
+        assert UploadStore.get_blob(blob['sha256']) is not None
+    assert app.test_client().get(f"/uploads/{blob['sha256']}").status_code == 200
+
+
+def test_only_content_that_matches_its_type_is_served_inline(app):
+    client = app.test_client()
+    org_id, _ = _officer_session(app, client)
+    svg = b'<svg xmlns="http://www.w3.org/2000/svg"><script>alert(document.cookie)</script></svg>'
+    png = b'\x89PNG\r\n\x1a\n' + os.urandom(200)
+    files = [(io.BytesIO(svg), 'logo.svg', 'image/svg+xml'),
+             (io.BytesIO(b'<html><script>alert(1)</script></html>'), 'cat.png', 'image/png'),
+             (io.BytesIO(png), 'real.png', 'image/png')]
+    data = {'title': 'Mixed', 'content': 'x', 'attachments': files}
+    assert client.post(f'/orgs/{org_id}/create_announcement', data=data, content_type='multipart/form-data').status_code == 302
+    with app.app_context():
+        ann = AnnouncementService.load_attachments(AnnouncementService.get_announcements_by_org(org_id))[0]
+        urls = {a['filename']: a['url'] for a in ann['Attachments']}
+
+    for name in ('logo.svg', 'cat.png'):
+        resp = client.get(urls[name])
+        assert resp.headers['Content-Disposition'].startswith('attachment')
+        assert resp.headers['Content-Security-Policy'] == 'sandbox'
+    resp = client.get(urls['real.png'])
+    assert resp.headers['Content-Disposition'].startswith('inline') and resp.mimetype == 'image/png'
+    assert resp.headers['Content-Security-Policy'] == 'sandbox'
@@ -0,0 +1,186 @@
+import os
+import sys
+import sqlite3
+import tempfile
+import threading
+import time
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from app.database import close_pools, get_db, get_read_db
+from app.services.membership_service import MembershipService
+from app.utils.errors import AppError
+from app.write_queue import WriteQueue, get_write_queue, write_queue_stats
+
+
+@pytest.fixture
+def db_path():
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE t (id INTEGER PRIMARY KEY, v TEXT UNIQUE)')
+    conn.commit()
+    conn.close()
+    yield path
+    for suffix in ('', '-wal', '-shm'):
+        try:
+            os.remove(path + suffix)
+        except OSError:
+            pass
+
+
+def _insert(db, value):
+    return db.execute('INSERT INTO t (v) VALUES (?)', (value,)).lastrowid
+
+
+def test_concurrent_writes_share_commits_and_failures_stay_isolated(db_path):
+    writer = WriteQueue(db_path)
+    gate = threading.Event()
+    started = threading.Event()
+
+    def blocking(db):
+        # holds the first group open so the writes below queue up behind it
+        started.set()
+        gate.wait(5)
+        return _insert(db, 'first')
+
+    results, errors = {}, {}
+
+    def submit(name, op, *args):
+        try:
+            results[name] = writer.submit(op, *args, timeout=10)
+        except Exception as e:
+            errors[name] = e
+
+    threads = [threading.Thread(target=submit, args=('first', blocking))]
+    threads[0].start()
+    assert started.wait(5)
+    for i in range(20):
+        threads.append(threading.Thread(target=submit, args=(i, _insert, f'v{i}')))
+    # a duplicate of v0: fails alone, the rest of its group still commits
+    threads.append(threading.Thread(target=submit, args=('dup', _insert, 'v0')))
+    for t in threads[1:]:
+        t.start()
+    while writer.stats()['queued'] < 21:
+        time.sleep(0.001)
+    gate.set()
+    for t in threads:
+        t.join(10)
+    writer.close()
+
+    assert set(errors) == {'dup'} and isinstance(errors['dup'], sqlite3.IntegrityError)
+    stats = writer.stats()
+    assert stats['operations'] == 22 and stats['failed'] == 1
+    assert stats['batches'] == 2 and stats['largest_batch'] == 21
+    conn = sqlite3.connect(db_path)
+    assert conn.execute('SELECT COUNT(*) FROM t').fetchone()[0] == 21
+    assert sorted(conn.execute('SELECT id FROM t').fetchall()) == sorted((v,) for v in results.values())
+    conn.close()
+
+
+def test_caller_timeout_behind_a_held_write_lock(db_path):
+    writer = WriteQueue(db_path, busy_timeout=5.0)
+    writer.submit(_insert, 'warm-up', timeout=5)  # the writer connection is open and in WAL mode
+    blocker = sqlite3.connect(db_path, isolation_level=None)
+    blocker.execute('BEGIN IMMEDIATE')
+    try:
+        # the lock outlasts the caller's timeout: the caller gets a 503 and the write is dropped
+        with pytest.raises(AppError) as info:
+            writer.submit(_insert, 'late', timeout=0.3)
+        assert info.value.code == 'DB_WRITE_TIMEOUT' and info.value.status == 503 and info.value.retry_after
+        time.sleep(0.2)
+    finally:
+        blocker.execute('ROLLBACK')
+        blocker.close()
+    # once the lock is released the next write commits and the cancelled one never runs
+    writer.submit(_insert, 'next', timeout=5)
+    writer.close()
+    conn = sqlite3.connect(db_path)
+    assert [r[0] for r in conn.execute('SELECT v FROM t ORDER BY id')] == ['warm-up', 'next']
+    conn.close()
+
+    # a writer locked out past its own busy timeout fails the group with the same 503
+    writer = WriteQueue(db_path, busy_timeout=0.1)
+    writer.submit(_insert, 'warm-up 2', timeout=5)
+    blocker = sqlite3.connect(db_path, isolation_level=None)
+    blocker.execute('BEGIN IMMEDIATE')
+    try:
+        with pytest.raises(AppError) as info:
+            writer.submit(_insert, 'locked out', timeout=5)
+        assert info.value.code == 'DB_WRITE_TIMEOUT' and info.value.status == 503
+    finally:
+        blocker.execute('ROLLBACK')
+        blocker.close()
+    writer.close()
+
+
+def test_a_started_write_returns_its_outcome_after_the_timeout(db_path):
+    writer = WriteQueue(db_path)
+
+    def slow(db):
+        time.sleep(0.4)
+        return _insert(db, 'slow')
+
+    # already holding the write lock when the caller's timeout expires: wait for the commit
+    row_id = writer.submit(slow, timeout=0.1)
+    writer.close()
+    conn = sqlite3.connect(db_path)
+    assert conn.execute('SELECT id FROM t WHERE v = ?', ('slow',)).fetchone()[0] == row_id
+    conn.close()
+
+
+def test_membership_writes_and_join_route_use_the_queue(make_app):
+    app = make_app(seed=False)
+    path = app.config['DATABASE']
+    with app.app_context():
+        db = get_db()
+        org_id = db.execute("INSERT INTO organizations (OrgName) VALUES ('Queue Club')").lastrowid
+        user_id = db.execute("INSERT INTO users (FirstName, LastName, Email, PasswordHash) "
+                             "VALUES ('Q', 'User', 'q@example.com', 'x')").lastrowid
+        db.commit()
+
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['user_id'] = user_id
+    assert client.post(f'/orgs/{org_id}/join').status_code == 302
+    # the second request finds the pending row written by the first
+    client.post(f'/orgs/{org_id}/join')
+    with app.app_context():
+        rows = get_read_db().execute('SELECT MembershipID, Status FROM memberships WHERE UserID = ?', (user_id,)).fetchall()
+        assert [r['Status'] for r in rows] == ['Pending']
+        MembershipService.update_membership_status(rows[0]['MembershipID'], 'Approved')
+        assert get_read_db().execute('SELECT ApprovedCount FROM organizations WHERE OrgID = ?', (org_id,)).fetchone()[0] == 1
+        with pytest.raises(AppError):
+            MembershipService.create_membership(user_id, 9999, 'Pending')  # foreign key violation
+        writer = get_write_queue()
+        # below the caller's timeout, so a locked-out group fails before its callers give up
+        assert writer._connection_settings['busy_timeout'] < app.config.get('WRITE_QUEUE_TIMEOUT', 30.0)
+    stats = {s['database']: s for s in write_queue_stats()}[path]
+    assert stats['operations'] == 3 and stats['failed'] == 1
+    close_pools(path)
+    assert path not in {s['database'] for s in write_queue_stats()}
+
+
+def test_nested_run_write_leaves_the_callers_transaction_to_the_caller(make_app):
+    from app.write_queue import run_write
+
+    app = make_app(seed=False)
+    with app.test_request_context():
+        db = get_db()
+        db.execute("INSERT INTO organizations (OrgName) VALUES ('Outer')")
+        assert db.in_transaction
+
+        def fails(conn):
+            conn.execute("INSERT INTO organizations (OrgName) VALUES ('Inner')")
+            raise ValueError('boom')
+
+        with pytest.raises(ValueError):
+            run_write(fails)
+        assert run_write(lambda conn: conn.execute("INSERT INTO organizations (OrgName) VALUES ('Second')").lastrowid)
+        # only the failed op was undone, and nothing was committed on the caller's behalf
+        assert db.in_transaction
+        names = [r[0] for r in db.execute('SELECT OrgName FROM organizations ORDER BY OrgID')]
+        assert names == ['Outer', 'Second']
+        assert get_read_db().execute('SELECT COUNT(*) FROM organizations').fetchone()[0] == 0
+        db.rollback()
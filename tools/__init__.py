@@ -0,0 +1,5 @@
+"""Developer tooling that drives the app from outside: synthetic data, route benchmarks and load tests.
+
+Nothing here is imported by the running application; the CLI entry points
+live in scripts/.
+"""
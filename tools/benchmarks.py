@@ -0,0 +1,286 @@
+"""Route-level benchmarks against synthetic datasets, with baseline gating.
+
+run_suite() builds (or reuses) one synthetic database per scale with
+tools/synthetic_data.py, then drives create_app().test_client()
+through the pages and JSON list endpoints in ROUTES. For each route and
+scale it records p50/p95/p99 latency, plus the statements per request and
+SQLite time from the Server-Timing header (app/metrics.py).
+
+compare() checks a run against a stored baseline (see
+scripts/bench_routes.py). Only measures that carry over between machines
+fail the gate:
+  - a route answers with a different status than in the baseline;
+  - it runs more statements per request than the baseline at that scale
+    (for example a new per-row lookup);
+  - its latency grows faster with dataset size than it did in the baseline.
+    growth() gives the log-log slope between the smallest and the largest
+    scale, measured within one run: about 0 for a constant-time page,
+    about 1 for one that reads every row.
+Absolute latency (p50 or p95 more than max_ratio times the baseline and
+slower by at least min_delta_ms) is only a warning, unless the baseline
+was recorded on this host (host_fingerprint()); then it fails too.
+"""
+
+import gc
+import math
+import os
+import platform
+import re
+import time
+
+from .synthetic_data import SyntheticDataset, load_database
+
+DEFAULT_SCALES = ((1000, 20), (5000, 60), (20000, 200))
+DEFAULT_SEED = 'bench'
+DEFAULT_ITERATIONS = 30
+DEFAULT_WARMUP = 3
+DEFAULT_ROUNDS = 3
+DEFAULT_MAX_RATIO = 2.0
+DEFAULT_MIN_DELTA_MS = 5.0
+GATED_PERCENTILES = ('p50_ms', 'p95_ms')
+DEFAULT_MAX_GROWTH_DELTA = 0.35
+
+# (name, path template, log in first?)
+# {org_id} is the largest org and the logged-in user its President: the worst case for org pages
+ROUTES = (
+    ('home', '/', False),
+    ('org_detail', '/orgs/{org_id}', False),
+    ('org_admin', '/orgs/{org_id}/admin', True),
+    ('search', '/search?q=meeting', False),
+    ('events_page', '/events', False),
+    ('profile', '/profile', True),
+    ('api_users', '/users/', False),
+    ('api_organizations', '/organizations/', False),
+    ('api_memberships', '/memberships/', False),
+    ('api_officer_roles', '/officer_roles/', False),
+    ('api_events', '/events/', False),
+    ('api_announcements', '/announcements/', False),
+)
+
+_SERVER_TIMING_RE = re.compile(r'db;dur=([\d.]+);desc="(\d+) queries"')
+
+
+def percentile(samples, pct):
+    """Linear-interpolated percentile (0-100) of a list of numbers."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    k = (len(ordered) - 1) * pct / 100.0
+    lo = math.floor(k)
+    hi = math.ceil(k)
+    if lo == hi:
+        return ordered[lo]
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def summarize(samples):
+    """p50/p95/p99/mean/max of latency samples in seconds, as milliseconds."""
+    return {
+        'p50_ms': round(percentile(samples, 50) * 1000, 3),
+        'p95_ms': round(percentile(samples, 95) * 1000, 3),
+        'p99_ms': round(percentile(samples, 99) * 1000, 3),
+        'mean_ms': round(sum(samples) / len(samples) * 1000, 3),
+        'max_ms': round(max(samples) * 1000, 3),
+    }
+
+
+def host_fingerprint():
+    """Describe the machine and interpreter a run was timed on; runs are only comparable on an equal one."""
+    return {
+        'node': platform.node(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpus': os.cpu_count(),
+        'python': platform.python_version(),
+    }
+
+
+def scale_label(users, orgs):
+    return f'{users}u_{orgs}o'
+
+
+def prepare_database(users, orgs, seed=DEFAULT_SEED, cache_dir=None):
+    """Return the path of a synthetic database for this scale, building it on first use.
+
+    Databases are cached in cache_dir (default instance/bench) by scale and
+    seed; the benchmark only reads them, so later runs reuse them as they are.
+    """
+    from app import create_app
+    from app.database import close_pools
+
+    cache_dir = cache_dir or os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'instance', 'bench')
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, f'campus_{scale_label(users, orgs)}_{seed}.db')
+    if os.path.exists(path):
+        return path
+    # build under a temporary name so an interrupted run never leaves a half-loaded cache entry
+    building = path + '.building'
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(building + suffix):
+            os.remove(building + suffix)
+    app = create_app({'DATABASE': building, 'SEED_MODE': 'off'})
+    with app.app_context():
+        from app.database import get_db
+        from app.services.seed_service import SeedService
+        db = get_db()
+        load_database(SyntheticDataset(users=users, orgs=orgs, seed=seed), db)
+        # so an app started on a cached database never seeds data/*.csv on top of it
+        SeedService.mark_done(db)
+        db.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+    close_pools(building)
+    for suffix in ('-wal', '-shm'):
+        if os.path.exists(building + suffix):
+            os.remove(building + suffix)
+    os.replace(building, path)
+    return path
+
+
+def _targets(app):
+    """Return (OrgID, UserID): the largest org and its President."""
+    from app.database import get_read_db
+    with app.app_context():
+        db = get_read_db()
+        org_id = db.execute('SELECT OrgID FROM organizations ORDER BY ApprovedCount DESC, OrgID LIMIT 1').fetchone()[0]
+        user_id = db.execute(
+            "SELECT m.UserID FROM officer_roles o JOIN memberships m ON m.MembershipID = o.MembershipID "
+            "WHERE m.OrgID = ? AND o.RoleName = 'President' LIMIT 1", (org_id,)
+        ).fetchone()[0]
+    return org_id, user_id
+
+
+def run_routes(db_path, routes=ROUTES, iterations=DEFAULT_ITERATIONS, warmup=DEFAULT_WARMUP, rounds=DEFAULT_ROUNDS,
+               config=None):
+    """Time each route against one database; returns {route name: result dict}.
+
+    The iterations are split over `rounds` passes through all routes, so a
+    burst of noise on the machine is spread over the routes instead of
+    landing on one of them.
+    """
+    from app import create_app
+    from app.database import close_pools
+
+    app_config = {'DATABASE': db_path, 'SEED_MODE': 'off', 'SERVER_TIMING': True, 'METRICS_ENABLED': True}
+    app_config.update(config or {})
+    app = create_app(app_config)
+    org_id, user_id = _targets(app)
+    rounds = max(1, min(rounds, iterations))
+    per_round = [iterations // rounds + (1 if r < iterations % rounds else 0) for r in range(rounds)]
+    clients = {}
+    collected = {name: ([], [], []) for name, _, _ in routes}
+    status = {}
+    try:
+        for r, count in enumerate(per_round):
+            for name, template, login in routes:
+                path = template.format(org_id=org_id)
+                client = clients.get(name)
+                if client is None:
+                    client = clients[name] = app.test_client()
+                    if login:
+                        with client.session_transaction() as session:
+                            session['user_id'] = user_id
+                samples, queries, sql_ms = collected[name]
+                # like timeit: keep collector pauses out of the samples
+                gc.collect()
+                gc.disable()
+                try:
+                    for i in range((warmup if r == 0 else 0) + count):
+                        start = time.perf_counter()
+                        rv = client.get(path)
+                        rv.get_data()
+                        elapsed = time.perf_counter() - start
+                        status[name] = rv.status_code
+                        if r == 0 and i < warmup:
+                            continue
+                        samples.append(elapsed)
+                        m = _SERVER_TIMING_RE.search(rv.headers.get('Server-Timing', ''))
+                        if m:
+                            sql_ms.append(float(m.group(1)))
+                            queries.append(int(m.group(2)))
+                finally:
+                    gc.enable()
+    finally:
+        close_pools(db_path)
+
+    results = {}
+    for name, template, _ in routes:
+        samples, queries, sql_ms = collected[name]
+        result = summarize(samples)
+        result['status'] = status[name]
+        result['queries'] = max(queries) if queries else None
+        result['sql_ms'] = round(percentile(sql_ms, 50), 3) if sql_ms else None
+        result['path'] = template.format(org_id=org_id)
+        results[name] = result
+    return results
+
+
+def run_suite(scales=DEFAULT_SCALES, seed=DEFAULT_SEED, iterations=DEFAULT_ITERATIONS, warmup=DEFAULT_WARMUP,
+              rounds=DEFAULT_ROUNDS, routes=ROUTES, cache_dir=None, progress=None):
+    """Benchmark every route at every (users, orgs) scale; returns a JSON-ready dict."""
+    report = {
+        'seed': seed,
+        'iterations': iterations,
+        'host': host_fingerprint(),
+        'scales': {},
+    }
+    for users, orgs in scales:
+        label = scale_label(users, orgs)
+        if progress is not None:
+            progress(f'preparing {label}')
+        path = prepare_database(users, orgs, seed=seed, cache_dir=cache_dir)
+        if progress is not None:
+            progress(f'benchmarking {label}')
+        report['scales'][label] = {
+            'users': users,
+            'orgs': orgs,
+            'routes': run_routes(path, routes=routes, iterations=iterations, warmup=warmup, rounds=rounds),
+        }
+    report['growth'] = growth(report)
+    return report
+
+
+def growth(report):
+    """Log-log slope of p50 latency between the smallest and largest scale, per route."""
+    scales = sorted(report['scales'].values(), key=lambda s: s['users'])
+    if len(scales) < 2:
+        return {}
+    small, large = scales[0], scales[-1]
+    size_ratio = math.log(large['users'] / small['users'])
+    slopes = {}
+    for name, result in large['routes'].items():
+        before = small['routes'].get(name)
+        if not before or not before['p50_ms'] or not result['p50_ms'] or not size_ratio:
+            continue
+        slopes[name] = round(math.log(result['p50_ms'] / before['p50_ms']) / size_ratio, 3)
+    return slopes
+
+
+def compare(report, baseline, max_ratio=DEFAULT_MAX_RATIO, min_delta_ms=DEFAULT_MIN_DELTA_MS,
+            max_growth_delta=DEFAULT_MAX_GROWTH_DELTA):
+    """Return (problems, warnings): lists of messages, both empty when the run is within the baseline.
+
+    Latency regressions are problems only when report and baseline come from
+    the same host; otherwise they are warnings.
+    """
+    problems, warnings = [], []
+    same_host = baseline.get('host') is not None and baseline.get('host') == report.get('host')
+    latency = problems if same_host else warnings
+    for label, scale in report['scales'].items():
+        base_scale = baseline.get('scales', {}).get(label)
+        if base_scale is None:
+            continue
+        for name, result in scale['routes'].items():
+            base = base_scale['routes'].get(name)
+            if base is None:
+                continue
+            if result['status'] != base['status']:
+                problems.append(f'{label} {name}: status {result["status"]} (baseline {base["status"]})')
+            if result['queries'] is not None and base.get('queries') is not None and result['queries'] > base['queries']:
+                problems.append(f'{label} {name}: {result["queries"]} queries per request (baseline {base["queries"]})')
+            for key in GATED_PERCENTILES:
+                if result[key] > base[key] * max_ratio and result[key] - base[key] >= min_delta_ms:
+                    latency.append(f'{label} {name}: {key[:3]} {result[key]:.1f} ms vs baseline {base[key]:.1f} ms')
+    base_growth = baseline.get('growth', {})
+    for name, slope in report.get('growth', {}).items():
+        if name in base_growth and slope > base_growth[name] + max_growth_delta:
+            problems.append(f'{name}: latency grows with dataset size (slope {slope:.2f}, baseline {base_growth[name]:.2f})')
+    return problems, warnings
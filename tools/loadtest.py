@@ -0,0 +1,338 @@
+"""Concurrent load generator: weighted scenario mixes against the WSGI app.
+
+Each worker thread is a virtual user (VU) with two sessions: a student and
+the President of one organization. In a loop, it picks a scenario from the
+weighted mix and runs it until the duration is over:
+  browse  GET / and one org page
+  search  GET /search with a common term
+  join    student POSTs /orgs/<id>/join for a random org
+  approve admin opens /orgs/<id>/admin and approves or rejects one pending request
+  post    admin POSTs a new announcement
+Requests go through app.test_client() in this process (target='inprocess')
+or over HTTP to a running server (target='http://127.0.0.1:5000'). The
+scenario targets (orgs, officers, students) are read from the database
+file in both cases.
+
+For each scenario the report gives operations, throughput, latency
+percentiles (one operation = all requests of the scenario), error rate, and
+how many operations hit "database is locked". A request is an error when it
+raises or returns a 4xx/5xx status. A lock shows up either in the response body
+(the generic 500 handler) or, in process, as a logged sqlite3 error behind an
+AppError, which the routes turn into a generic message or a flash.
+"""
+
+import logging
+import os
+import random
+import re
+import sqlite3
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from http.cookiejar import CookieJar
+
+from .benchmarks import percentile
+
+DEFAULT_MIX = {'browse': 50, 'search': 15, 'join': 25, 'approve': 7, 'post': 3}
+DEFAULT_CONCURRENCY = 8
+DEFAULT_DURATION = 10.0
+SEARCH_TERMS = ('meeting', 'workshop', 'club', 'tournament', 'schedule', 'results', 'orientation', 'dance')
+LOCKED_MESSAGE = 'database is locked'
+# orgs with the most pending requests are where the approvals happen
+ADMIN_ORGS = 20
+
+_PENDING_RE = re.compile(r'name="membership_id" value="(\d+)">\s*<input type="hidden" name="action" value="approve">')
+
+
+class _LockWatcher(logging.Handler):
+    """Counts logged 'database is locked' errors raised on each thread (in-process target)."""
+
+    def __init__(self):
+        super().__init__(logging.ERROR)
+        self.local = threading.local()
+
+    def emit(self, record):
+        exc = record.exc_info[1] if record.exc_info else None
+        while exc is not None:
+            if isinstance(exc, sqlite3.OperationalError) and LOCKED_MESSAGE in str(exc):
+                self.local.locked = getattr(self.local, 'locked', 0) + 1
+                return
+            exc = exc.__cause__ or exc.__context__
+
+    def take(self):
+        n = getattr(self.local, 'locked', 0)
+        self.local.locked = 0
+        return n
+
+
+class InProcessSession:
+    """One logged-in browser session against the app in this process."""
+
+    def __init__(self, app, user):
+        self.client = app.test_client()
+        if user is not None:
+            with self.client.session_transaction() as session:
+                session['user_id'] = user['UserID']
+
+    def request(self, method, path, data=None):
+        rv = self.client.open(path, method=method, data=data)
+        return rv.status_code, rv.get_data(as_text=True)
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    # report the 302 like the test client does instead of following it
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+class HttpSession:
+    """One logged-in browser session against a server on a local port (cookie-based login)."""
+
+    def __init__(self, base_url, user, password):
+        self.base_url = base_url.rstrip('/')
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(CookieJar()), _NoRedirect())
+        if user is not None:
+            status, _ = self.request('POST', '/login', {'email': user['Email'], 'password': password})
+            if status != 302:
+                raise RuntimeError(f"login as {user['Email']} failed (status {status})")
+
+    def request(self, method, path, data=None):
+        body = urllib.parse.urlencode(data).encode() if data is not None else None
+        req = urllib.request.Request(self.base_url + path, data=body, method=method)
+        try:
+            with self.opener.open(req, timeout=60) as resp:
+                return resp.status, resp.read().decode('utf-8', 'replace')
+        except urllib.error.HTTPError as e:
+            return e.code, e.read().decode('utf-8', 'replace')
+
+
+class Targets:
+    """Organizations, officers and students the scenarios act on, read from the database file."""
+
+    def __init__(self, db_path, concurrency, seed=0):
+        conn = sqlite3.connect(db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            self.org_ids = [r[0] for r in conn.execute('SELECT OrgID FROM organizations ORDER BY OrgID')]
+            admins = conn.execute(
+                "SELECT o.OrgID, u.UserID, u.Email FROM organizations o "
+                "JOIN memberships m ON m.OrgID = o.OrgID JOIN officer_roles r ON r.MembershipID = m.MembershipID "
+                "JOIN users u ON u.UserID = m.UserID WHERE r.can_approve_members = 1 AND r.can_post_announcements = 1 "
+                "GROUP BY o.OrgID ORDER BY o.PendingCount DESC, o.OrgID LIMIT ?", (ADMIN_ORGS,)
+            ).fetchall()
+            # one student per VU, spread over the id range
+            low, high = conn.execute('SELECT MIN(UserID), MAX(UserID) FROM users').fetchone()
+            rng = random.Random(f'{seed}:students')
+            students = {}
+            for _ in range(concurrency if low is not None else 0):
+                row = conn.execute('SELECT UserID, Email FROM users WHERE UserID >= ? ORDER BY UserID LIMIT 1',
+                                   (rng.randint(low, high),)).fetchone()
+                students[row['UserID']] = dict(row)
+            self.students = list(students.values())
+        finally:
+            conn.close()
+        if not self.org_ids or not admins or not self.students:
+            raise ValueError('the database needs organizations, officers and users (see scripts/seed_db.py --users)')
+        self.admins = [{'OrgID': r['OrgID'], 'UserID': r['UserID'], 'Email': r['Email']} for r in admins]
+
+
+def _browse(vu):
+    yield 'GET', '/', None
+    yield 'GET', f'/orgs/{vu.rng.choice(vu.targets.org_ids)}', None
+
+
+def _search(vu):
+    yield 'GET', '/search?q=' + vu.rng.choice(SEARCH_TERMS), None
+
+
+def _join(vu):
+    yield 'POST', f'/orgs/{vu.rng.choice(vu.targets.org_ids)}/join', None
+
+
+def _approve(vu):
+    org_id = vu.admin['OrgID']
+    body = yield 'GET', f'/orgs/{org_id}/admin', None
+    pending = _PENDING_RE.findall(body or '')
+    if pending:
+        action = 'approve' if vu.rng.random() < 0.85 else 'reject'
+        yield 'POST', f'/orgs/{org_id}/admin/approve', {'membership_id': vu.rng.choice(pending), 'action': action}
+
+
+def _post(vu):
+    n = vu.rng.randint(1, 10 ** 6)
+    yield 'POST', f"/orgs/{vu.admin['OrgID']}/create_announcement", {
+        'title': f'Load test notice {n}',
+        'content': 'Posted by scripts/load_test.py while measuring write contention.',
+    }
+
+
+# scenario name -> (generator of (method, path, form data); session it runs as)
+SCENARIOS = {
+    'browse': (_browse, 'student'),
+    'search': (_search, 'student'),
+    'join': (_join, 'student'),
+    'approve': (_approve, 'admin'),
+    'post': (_post, 'admin'),
+}
+
+
+class ScenarioStats:
+    __slots__ = ('latencies', 'errors', 'locked', 'requests', 'statuses')
+
+    def __init__(self):
+        self.latencies = []
+        self.errors = 0
+        self.locked = 0
+        self.requests = 0
+        self.statuses = {}
+
+    def merge(self, other):
+        self.latencies.extend(other.latencies)
+        self.errors += other.errors
+        self.locked += other.locked
+        self.requests += other.requests
+        for status, n in other.statuses.items():
+            self.statuses[status] = self.statuses.get(status, 0) + n
+
+
+class VirtualUser:
+    def __init__(self, index, targets, make_session, seed):
+        self.rng = random.Random(f'{seed}:vu:{index}')
+        self.targets = targets
+        self.student = targets.students[index % len(targets.students)]
+        self.admin = targets.admins[index % len(targets.admins)]
+        self.sessions = {'student': make_session(self.student), 'admin': make_session(self.admin)}
+        self.stats = {}
+
+    def run_once(self, name, watcher=None):
+        scenario, role = SCENARIOS[name]
+        session = self.sessions[role]
+        stats = self.stats.setdefault(name, ScenarioStats())
+        failed = locked = False
+        steps = scenario(self)
+        start = time.perf_counter()
+        try:
+            body = None
+            while True:
+                try:
+                    method, path, data = steps.send(body)
+                except StopIteration:
+                    break
+                stats.requests += 1
+                try:
+                    status, body = session.request(method, path, data)
+                except Exception as e:
+                    failed = True
+                    locked = locked or LOCKED_MESSAGE in str(e)
+                    stats.statuses['exception'] = stats.statuses.get('exception', 0) + 1
+                    break
+                stats.statuses[status] = stats.statuses.get(status, 0) + 1
+                if status >= 400:
+                    failed = True
+                if body and LOCKED_MESSAGE in body:
+                    locked = True
+        finally:
+            stats.latencies.append(time.perf_counter() - start)
+            if watcher is not None and watcher.take():
+                locked = True
+            stats.errors += failed
+            stats.locked += locked
+
+
+def _summary(stats, elapsed):
+    ops = len(stats.latencies)
+    summary = {
+        'ops': ops,
+        'requests': stats.requests,
+        'throughput_per_s': round(ops / elapsed, 2) if elapsed else None,
+        'errors': stats.errors,
+        'error_rate': round(stats.errors / ops, 4) if ops else 0.0,
+        'locked': stats.locked,
+        'statuses': {str(k): v for k, v in sorted(stats.statuses.items(), key=lambda kv: str(kv[0]))},
+    }
+    for pct in (50, 95, 99):
+        value = percentile(stats.latencies, pct)
+        summary[f'p{pct}_ms'] = round(value * 1000, 3) if value is not None else None
+    summary['max_ms'] = round(max(stats.latencies) * 1000, 3) if stats.latencies else None
+    return summary
+
+
+def run_load(db_path, target='inprocess', mix=None, concurrency=DEFAULT_CONCURRENCY, duration=DEFAULT_DURATION,
+             max_ops=None, seed=0, password=None, app=None, config=None):
+    """Drive the scenario mix from `concurrency` threads; returns a JSON-ready report.
+
+    db_path: database the app serves (and the targets are read from).
+    target: 'inprocess' (create_app on db_path, or the given app) or a base URL.
+    duration / max_ops: stop after this many seconds or operations per VU, whichever comes first.
+    """
+    mix = dict(mix or DEFAULT_MIX)
+    unknown = set(mix) - set(SCENARIOS)
+    if unknown:
+        raise ValueError('unknown scenario(s): ' + ', '.join(sorted(unknown)))
+    names = [n for n, w in mix.items() if w > 0]
+    weights = [mix[n] for n in names]
+    targets = Targets(db_path, concurrency, seed=seed)
+
+    watcher = None
+    if target == 'inprocess':
+        if app is None:
+            from app import create_app
+            app_config = {'DATABASE': db_path, 'SEED_MODE': 'off'}
+            app_config.update(config or {})
+            app = create_app(app_config)
+        watcher = _LockWatcher()
+        logging.getLogger('campus_hub').addHandler(watcher)
+        app.logger.addHandler(watcher)
+
+        def make_session(user):
+            return InProcessSession(app, user)
+    else:
+        if password is None:
+            password = os.environ.get('SEED_DEFAULT_PASSWORD', 'pass123')
+
+        def make_session(user):
+            return HttpSession(target, user, password)
+
+    vus = [VirtualUser(i, targets, make_session, seed) for i in range(concurrency)]
+    barrier = threading.Barrier(concurrency + 1)
+    deadline = [None]
+
+    def worker(vu):
+        barrier.wait()
+        ops = 0
+        while time.perf_counter() < deadline[0] and (max_ops is None or ops < max_ops):
+            vu.run_once(vu.rng.choices(names, weights=weights)[0], watcher)
+            ops += 1
+
+    threads = [threading.Thread(target=worker, args=(vu,), name=f'campus-hub-load-{i}', daemon=True)
+               for i, vu in enumerate(vus)]
+    for t in threads:
+        t.start()
+    try:
+        deadline[0] = time.perf_counter() + duration
+        start = time.perf_counter()
+        barrier.wait()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - start
+    finally:
+        if watcher is not None:
+            logging.getLogger('campus_hub').removeHandler(watcher)
+            app.logger.removeHandler(watcher)
+
+    per_scenario = {}
+    total = ScenarioStats()
+    for vu in vus:
+        for name, stats in vu.stats.items():
+            per_scenario.setdefault(name, ScenarioStats()).merge(stats)
+            total.merge(stats)
+    return {
+        'target': target,
+        'concurrency': concurrency,
+        'duration_s': round(elapsed, 3),
+        'mix': mix,
+        'scenarios': {name: _summary(per_scenario[name], elapsed) for name in names if name in per_scenario},
+        'total': _summary(total, elapsed),
+    }
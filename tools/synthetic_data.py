@@ -0,0 +1,506 @@
+"""Deterministic synthetic campus data for benchmarks and capacity planning.
+
+data/*.csv only holds a few dozen rows, so nothing slow shows up in
+development. SyntheticDataset produces a consistent campus of any size from
+a seed: the same (seed, scale) always yields the same rows, and every
+foreign key points at a row generated before it.
+
+Shape of the data:
+  - org popularity follows a Zipf curve, so a few clubs have thousands of
+    members and most have a handful;
+  - most students join 1-3 orgs, some none, a few many; memberships are
+    mostly Approved with a tail of Pending and Rejected;
+  - every org has a board (President first, then Vice President,
+    Secretary, ...) with the usual permission flags; events and
+    announcements are created by board members allowed to post them;
+  - about a quarter of the announcements carry 1-3 attachment rows (files
+    and links, metadata only: no blobs are written).
+
+Rows are produced by generators and written in DEFAULT_CHUNK_SIZE batches,
+either as CSV files the bulk importers read (write_csv) or straight into
+the database with executemany (load_database).
+"""
+
+import csv
+import math
+import os
+import random
+import sqlite3
+import time
+from calendar import timegm
+from flask import current_app
+from passlib.hash import pbkdf2_sha256
+from app.database import get_db
+from app.services.bulk_import import DEFAULT_CHUNK_SIZE
+from app.services.feed_service import SYNC_SQL
+from app.services.permission_cache import permission_cache
+from app.utils.errors import AppError
+
+# academic year the generated dates fall into (UTC)
+TERM_START = timegm((2025, 8, 18, 0, 0, 0))
+TERM_DAYS = 300
+DAY = 86400
+
+ZIPF_EXPONENT = 1.07
+# memberships per student -> relative frequency
+MEMBERSHIPS_PER_USER = {0: 18, 1: 34, 2: 24, 3: 13, 4: 6, 5: 3, 6: 1, 8: 1}
+STATUS_WEIGHTS = (('Approved', 78), ('Pending', 14), ('Rejected', 8))
+ATTACHMENT_RATE = 0.25
+
+# (RoleName, can_post_announcements, can_create_events, can_approve_members, can_assign_roles)
+BOARD_ROLES = (
+    ('President', 1, 1, 1, 1),
+    ('Vice President', 1, 1, 1, 0),
+    ('Secretary', 1, 0, 0, 0),
+    ('Treasurer', 0, 0, 0, 0),
+    ('Events Coordinator', 0, 1, 0, 0),
+    ('Editor', 1, 0, 0, 0),
+    ('Coach', 0, 1, 0, 0),
+    ('Public Relations Officer', 1, 0, 0, 0),
+)
+
+FIRST_NAMES = (
+    'John', 'Ana', 'Mark', 'Maria', 'Paolo', 'Liza', 'Carlo', 'Bea', 'Miguel', 'Sofia', 'Rafael', 'Isabel',
+    'Daniel', 'Camille', 'Joshua', 'Andrea', 'Gabriel', 'Patricia', 'Nathan', 'Kristine', 'Adrian', 'Nicole',
+    'Joseph', 'Angela', 'Kevin', 'Jasmine', 'Ryan', 'Erika', 'Christian', 'Denise', 'Luis', 'Hannah', 'Marco',
+    'Joanna', 'Vincent', 'Bianca', 'Paul', 'Clarisse', 'Jerome', 'Trisha', 'Aaron', 'Mae', 'Elijah', 'Grace',
+    'Samuel', 'Ella', 'Noah', 'Chloe', 'Ethan', 'Mia', 'Lucas', 'Ava', 'Leo', 'Zoe', 'Ivan', 'Nina',
+)
+LAST_NAMES = (
+    'Cruz', 'Santos', 'Reyes', 'Garcia', 'Mendoza', 'Torres', 'Flores', 'Ramos', 'Castillo', 'Villanueva',
+    'Bautista', 'Aquino', 'Navarro', 'Gonzales', 'Lopez', 'Rivera', 'Fernandez', 'Domingo', 'Salazar', 'Morales',
+    'Pascual', 'Dela Cruz', 'Mercado', 'Aguilar', 'Castro', 'Valdez', 'Soriano', 'Manalo', 'Ocampo', 'Lim',
+    'Tan', 'Chua', 'Go', 'Sy', 'Yap', 'Rodriguez', 'Alfarita', 'Sutarez', 'Balingit', 'Ebreo', 'Perez', 'Diaz',
+)
+ORG_ADJECTIVES = (
+    'Campus', 'Student', 'Young', 'United', 'Creative', 'Green', 'Global', 'Future', 'Open', 'Modern',
+    'Junior', 'Varsity', 'Eastside', 'Northern', 'Applied', 'Independent', 'Digital', 'Classic', 'Rising', 'Active',
+)
+ORG_TOPICS = (
+    'Tech', 'Film', 'Dance', 'Chess', 'Robotics', 'Debate', 'Photography', 'Music', 'Theater', 'Literature',
+    'Math', 'Physics', 'Chemistry', 'Biology', 'Economics', 'Marketing', 'Entrepreneurs', 'Environmental', 'Hiking',
+    'Basketball', 'Volleyball', 'Football', 'Badminton', 'Swimming', 'Esports', 'Anime', 'Cooking', 'Journalism',
+    'Volunteer', 'Language', 'History', 'Psychology', 'Nursing', 'Architecture', 'Law', 'Astronomy', 'Art',
+    'Coding', 'Data Science', 'Cycling',
+)
+ORG_KINDS = ('Club', 'Society', 'Guild', 'Circle', 'Association', 'League', 'Collective', 'Union', 'Team', 'Network')
+LOCATIONS = (
+    'Room 101', 'Room 102', 'Room 204', 'Room 310', 'Gym', 'Auditorium', 'Library Hall', 'Main Quad', 'Chapel',
+    'Science Lab', 'Computer Lab 2', 'Student Center', 'Covered Court', 'Music Room', 'Online',
+)
+EVENT_KINDS = ('General Assembly', 'Workshop', 'Tech Talk', 'Tournament', 'Outreach', 'Showcase', 'Orientation',
+               'Fundraiser', 'Seminar', 'Practice Session', 'Team Building', 'Open House')
+ANNOUNCEMENT_KINDS = ('Meeting Reminder', 'Call for Members', 'Results Posted', 'Schedule Update', 'Venue Change',
+                      'Officer Elections', 'Dues Reminder', 'Photo Album', 'Thank You', 'Registration Open')
+ATTACHMENT_TYPES = (
+    ('file', 'pdf', 'application/pdf'),
+    ('file', 'docx', 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'),
+    ('file', 'jpg', 'image/jpeg'),
+    ('file', 'png', 'image/png'),
+    ('file', 'mp4', 'video/mp4'),
+    ('link', None, None),
+)
+
+# table -> (CSV file name, header); file names and headers follow data/*.csv
+CSV_FILES = {
+    'organizations': ('organizations.csv', ('OrgID', 'OrgName', 'OrgDescription')),
+    'users': ('users.csv', ('UserID', 'FirstName', 'LastName', 'Email', 'PasswordHash')),
+    'memberships': ('membership.csv', ('MembershipID', 'UserID', 'OrgID', 'Status', 'DateApplied', 'DateApproved')),
+    'officer_roles': ('officer_roles.csv', ('OfficerRoleID', 'MembershipID', 'RoleName', 'RoleStart', 'RoleEnd',
+                                            'can_post_announcements', 'can_create_events', 'can_approve_members',
+                                            'can_assign_roles')),
+    'events': ('events.csv', ('EventID', 'OrgID', 'CreatedBy', 'EventName', 'EventDescription', 'EventDate', 'Location',
+                              'DatePosted')),
+    'announcements': ('announcements.csv', ('AnnouncementID', 'OrgID', 'CreatedBy', 'Title', 'Content', 'DatePosted')),
+    'announcement_attachments': ('announcement_attachments.csv', ('AnnouncementID', 'Position', 'Type', 'Url',
+                                                                  'Filename', 'MimeType')),
+}
+
+# table -> INSERT used by load_database; the *Ts columns are filled from the generated epochs
+_INSERT_SQL = {
+    'organizations': 'INSERT INTO organizations (OrgID, OrgName, Description) VALUES (?, ?, ?)',
+    'users': 'INSERT INTO users (UserID, FirstName, LastName, Email, PasswordHash) VALUES (?, ?, ?, ?, ?)',
+    'memberships': 'INSERT INTO memberships (MembershipID, UserID, OrgID, Status, DateApplied, DateApproved, DateAppliedTs) '
+                   'VALUES (?, ?, ?, ?, ?, ?, ?)',
+    'officer_roles': 'INSERT INTO officer_roles (OfficerRoleID, MembershipID, RoleName, StartDate, EndDate, can_post_announcements, '
+                     'can_create_events, can_approve_members, can_assign_roles, StartDateTs, EndDateTs) '
+                     'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+    'events': 'INSERT INTO events (EventID, OrgID, CreatedBy, EventName, Description, EventDate, Location, EventDateTs, '
+              'DatePostedTs) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+    'announcements': 'INSERT INTO announcements (AnnouncementID, OrgID, CreatedBy, Title, Content, DatePosted, DatePostedTs) '
+                     'VALUES (?, ?, ?, ?, ?, ?, ?)',
+    'announcement_attachments': 'INSERT INTO announcement_attachments (AnnouncementID, Position, Type, Url, Filename, MimeType) '
+                                'VALUES (?, ?, ?, ?, ?, ?)',
+}
+
+# FOREIGN KEY order, same as SeedService.SEED_STEPS plus the attachments
+TABLES = tuple(_INSERT_SQL)
+
+
+def _date(ts):
+    return time.strftime('%Y-%m-%d', time.gmtime(ts))
+
+
+def _datetime(ts):
+    return time.strftime('%Y-%m-%d %H:%M', time.gmtime(ts))
+
+
+class SyntheticDataset:
+    """A reproducible campus of `users` students and `orgs` organizations.
+
+    Each table has its own generator method yielding rows as dicts keyed by
+    column (see CSV_FILES / _INSERT_SQL). Each table draws from its own
+    random stream derived from the seed, so tables can be generated
+    independently and in any order.
+    """
+
+    def __init__(self, users=1000, orgs=50, seed=0, events_per_org=12, announcements_per_org=20, password=None):
+        if int(users) < 1 or int(orgs) < 1:
+            raise AppError('INVALID_REQUEST', 'users and orgs must be at least 1', log=False)
+        self.users = int(users)
+        self.orgs = int(orgs)
+        self.seed = seed
+        self.events_per_org = events_per_org
+        self.announcements_per_org = announcements_per_org
+        self.password = password if password is not None else os.environ.get('SEED_DEFAULT_PASSWORD', 'pass123')
+        self._weights = None
+        self._boards = None
+        self._password_hash = None
+
+    def _rng(self, stream):
+        return random.Random(f'{self.seed}:{stream}')
+
+    def org_weights(self):
+        """Relative popularity per org (index = OrgID - 1): Zipf over a seeded ranking."""
+        if self._weights is None:
+            ranks = list(range(1, self.orgs + 1))
+            self._rng('popularity').shuffle(ranks)
+            self._weights = [1.0 / (r ** ZIPF_EXPONENT) for r in ranks]
+        return self._weights
+
+    def _activity(self):
+        # posting activity grows with popularity, damped so the top club isn't 1000x the median
+        damped = [math.sqrt(w) for w in self.org_weights()]
+        mean = sum(damped) / len(damped)
+        return [d / mean for d in damped]
+
+    def boards(self):
+        """Return [(OrgID, [(MembershipID, UserID, role tuple), ...])], the officers of each org.
+
+        Board memberships take the first MembershipIDs, so officer roles,
+        events and announcements can be generated without replaying the
+        (much larger) memberships stream.
+        """
+        if self._boards is None:
+            rng = self._rng('boards')
+            weights = self.org_weights()
+            top = max(weights)
+            membership_id = 0
+            boards = []
+            for org_id in range(1, self.orgs + 1):
+                size = min(len(BOARD_ROLES), self.users, 2 + int(round(6 * weights[org_id - 1] / top)) + rng.randint(0, 2))
+                members = []
+                for user_id, role in zip(rng.sample(range(1, self.users + 1), size), BOARD_ROLES):
+                    membership_id += 1
+                    members.append((membership_id, user_id, role))
+                boards.append((org_id, members))
+            self._boards = boards
+        return self._boards
+
+    def password_hash(self):
+        """One hash of the seed password shared by every generated user (1M pbkdf2 rounds would take hours)."""
+        if self._password_hash is None:
+            self._password_hash = pbkdf2_sha256.hash(self.password)
+        return self._password_hash
+
+    def generate_organizations(self):
+        rng = self._rng('organizations')
+        combos = len(ORG_ADJECTIVES) * len(ORG_TOPICS) * len(ORG_KINDS)
+        order = list(range(combos))
+        rng.shuffle(order)
+        for org_id in range(1, self.orgs + 1):
+            n = order[(org_id - 1) % combos]
+            adjective = ORG_ADJECTIVES[n % len(ORG_ADJECTIVES)]
+            topic = ORG_TOPICS[(n // len(ORG_ADJECTIVES)) % len(ORG_TOPICS)]
+            kind = ORG_KINDS[n // (len(ORG_ADJECTIVES) * len(ORG_TOPICS))]
+            name = f'{adjective} {topic} {kind}'
+            if org_id > combos:
+                # OrgName is UNIQUE; number the names once the combinations run out
+                name += f' {(org_id - 1) // combos + 1}'
+            yield {
+                'OrgID': org_id,
+                'OrgName': name,
+                'OrgDescription': f'{topic} {kind.lower()} for students interested in {topic.lower()}.',
+            }
+
+    def generate_users(self):
+        rng = self._rng('users')
+        password_hash = self.password_hash()
+        for user_id in range(1, self.users + 1):
+            first = rng.choice(FIRST_NAMES)
+            last = rng.choice(LAST_NAMES)
+            yield {
+                'UserID': user_id,
+                'FirstName': first,
+                'LastName': last,
+                # the id keeps Email UNIQUE
+                'Email': f"{first.lower()}.{last.lower().replace(' ', '')}.{user_id}@campus.example.edu",
+                'PasswordHash': password_hash,
+            }
+
+    def generate_memberships(self):
+        rng = self._rng('memberships')
+        boards = self.boards()
+        seated = {}
+        for org_id, members in boards:
+            for membership_id, user_id, _ in members:
+                seated.setdefault(user_id, set()).add(org_id)
+                applied = TERM_START - rng.randint(30, 700) * DAY
+                yield self._membership(membership_id, user_id, org_id, 'Approved', applied, applied + rng.randint(1, 14) * DAY)
+
+        membership_id = sum(len(members) for _, members in boards)
+        org_ids = range(1, self.orgs + 1)
+        cum_orgs = []
+        total = 0.0
+        for w in self.org_weights():
+            total += w
+            cum_orgs.append(total)
+        counts, count_weights = zip(*MEMBERSHIPS_PER_USER.items())
+        cum_counts = []
+        total = 0
+        for w in count_weights:
+            total += w
+            cum_counts.append(total)
+        statuses, status_weights = zip(*STATUS_WEIGHTS)
+        cum_statuses = []
+        total = 0
+        for w in status_weights:
+            total += w
+            cum_statuses.append(total)
+
+        for user_id in range(1, self.users + 1):
+            n = min(rng.choices(counts, cum_weights=cum_counts)[0], self.orgs)
+            if not n:
+                continue
+            # popular orgs are drawn more often; duplicates and board seats are dropped
+            skip = seated.get(user_id, ())
+            chosen = []
+            for org_id in rng.choices(org_ids, cum_weights=cum_orgs, k=n):
+                if org_id not in skip and org_id not in chosen:
+                    chosen.append(org_id)
+            for org_id, status in zip(chosen, rng.choices(statuses, cum_weights=cum_statuses, k=len(chosen))):
+                membership_id += 1
+                applied = TERM_START + rng.randint(-365, TERM_DAYS) * DAY + rng.randint(8, 21) * 3600
+                approved = applied + rng.randint(1, 10) * DAY if status == 'Approved' else None
+                yield self._membership(membership_id, user_id, org_id, status, applied, approved)
+
+    @staticmethod
+    def _membership(membership_id, user_id, org_id, status, applied, approved):
+        return {
+            'MembershipID': membership_id,
+            'UserID': user_id,
+            'OrgID': org_id,
+            'Status': status,
+            'DateApplied': _datetime(applied),
+            'DateApproved': _datetime(approved) if approved is not None else None,
+            'DateAppliedTs': applied,
+        }
+
+    def generate_officer_roles(self):
+        officer_role_id = 0
+        for _, members in self.boards():
+            for membership_id, _, (role_name, post, events, approve, assign) in members:
+                officer_role_id += 1
+                yield {
+                    'OfficerRoleID': officer_role_id,
+                    'MembershipID': membership_id,
+                    'RoleName': role_name,
+                    'RoleStart': _date(TERM_START),
+                    'RoleEnd': _date(TERM_START + 365 * DAY),
+                    'can_post_announcements': post,
+                    'can_create_events': events,
+                    'can_approve_members': approve,
+                    'can_assign_roles': assign,
+                    'StartDateTs': TERM_START,
+                    'EndDateTs': TERM_START + 365 * DAY,
+                }
+
+    def _creators(self, flag_index):
+        """Return {OrgID: [OfficerRoleID, ...]} of board members holding one permission flag."""
+        creators = {}
+        officer_role_id = 0
+        for org_id, members in self.boards():
+            for _, _, role in members:
+                officer_role_id += 1
+                if role[flag_index]:
+                    creators.setdefault(org_id, []).append(officer_role_id)
+        return creators
+
+    def generate_events(self):
+        rng = self._rng('events')
+        creators = self._creators(2)
+        activity = self._activity()
+        # posting lead times come from their own stream so the events themselves stay as before
+        lead_rng = self._rng('event_posts')
+        event_id = 0
+        for org_id in range(1, self.orgs + 1):
+            mean = self.events_per_org * activity[org_id - 1]
+            for _ in range(rng.randint(0, int(round(2 * mean)))):
+                event_id += 1
+                kind = rng.choice(EVENT_KINDS)
+                ts = TERM_START + rng.randint(0, TERM_DAYS) * DAY + rng.randint(8, 19) * 3600
+                posted = ts - lead_rng.randint(1, 21) * DAY - lead_rng.randint(0, 1439) * 60
+                yield {
+                    'EventID': event_id,
+                    'OrgID': org_id,
+                    'CreatedBy': rng.choice(creators[org_id]),
+                    'EventName': f'{kind} #{event_id}',
+                    'EventDescription': f'{kind} open to all members. Bring a friend!',
+                    'EventDate': _datetime(ts),
+                    'Location': rng.choice(LOCATIONS),
+                    'DatePosted': _datetime(posted),
+                    'EventDateTs': ts,
+                    'DatePostedTs': posted,
+                }
+
+    def generate_announcements(self):
+        rng = self._rng('announcements')
+        creators = self._creators(1)
+        activity = self._activity()
+        announcement_id = 0
+        for org_id in range(1, self.orgs + 1):
+            mean = self.announcements_per_org * activity[org_id - 1]
+            for _ in range(rng.randint(0, int(round(2 * mean)))):
+                announcement_id += 1
+                kind = rng.choice(ANNOUNCEMENT_KINDS)
+                ts = TERM_START + rng.randint(0, TERM_DAYS) * DAY + rng.randint(0, 86399)
+                yield {
+                    'AnnouncementID': announcement_id,
+                    'OrgID': org_id,
+                    'CreatedBy': rng.choice(creators[org_id]),
+                    'Title': kind,
+                    'Content': f'{kind}: please check the details below and reply to the officers with any questions.',
+                    'DatePosted': _datetime(ts),
+                    'DatePostedTs': ts,
+                }
+
+    def generate_announcement_attachments(self):
+        # walks the announcement stream so attachment rows line up with its ids
+        rng = self._rng('attachments')
+        for announcement in self.generate_announcements():
+            if rng.random() >= ATTACHMENT_RATE:
+                continue
+            announcement_id = announcement['AnnouncementID']
+            for position in range(rng.randint(1, 3)):
+                kind, ext, mimetype = rng.choice(ATTACHMENT_TYPES)
+                if kind == 'link':
+                    url, filename = f'https://campus.example.edu/a/{announcement_id}/{position}', None
+                else:
+                    filename = f'attachment_{announcement_id}_{position}.{ext}'
+                    url = f'/static/uploads/synthetic/{filename}'
+                yield {
+                    'AnnouncementID': announcement_id,
+                    'Position': position,
+                    'Type': kind,
+                    'Url': url,
+                    'Filename': filename,
+                    'MimeType': mimetype,
+                }
+
+    def rows(self, table):
+        return getattr(self, f'generate_{table}')()
+
+
+def _chunks(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def write_csv(dataset, out_dir, progress=None):
+    """Write every table as a CSV under out_dir; returns {table: row count}.
+
+    The files use the data/*.csv names and headers, so scripts/seed_db.py
+    --data-dir (or SeedService) can import them into an empty database.
+    announcement_attachments.csv has no importer; load_database writes it.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    counts = {}
+    for table in TABLES:
+        file_name, header = CSV_FILES[table]
+        n = 0
+        with open(os.path.join(out_dir, file_name), 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            for chunk in _chunks(dataset.rows(table), DEFAULT_CHUNK_SIZE):
+                writer.writerows([[row[col] for col in header] for row in chunk])
+                n += len(chunk)
+        counts[table] = n
+        if progress is not None:
+            progress(table, n)
+    return counts
+
+
+def _params(table, row):
+    if table == 'organizations':
+        return (row['OrgID'], row['OrgName'], row['OrgDescription'])
+    if table == 'users':
+        return (row['UserID'], row['FirstName'], row['LastName'], row['Email'], row['PasswordHash'])
+    if table == 'memberships':
+        return (row['MembershipID'], row['UserID'], row['OrgID'], row['Status'], row['DateApplied'],
+                row['DateApproved'], row['DateAppliedTs'])
+    if table == 'officer_roles':
+        return (row['OfficerRoleID'], row['MembershipID'], row['RoleName'], row['RoleStart'], row['RoleEnd'],
+                row['can_post_announcements'], row['can_create_events'], row['can_approve_members'],
+                row['can_assign_roles'], row['StartDateTs'], row['EndDateTs'])
+    if table == 'events':
+        return (row['EventID'], row['OrgID'], row['CreatedBy'], row['EventName'], row['EventDescription'],
+                row['EventDate'], row['Location'], row['EventDateTs'], row['DatePostedTs'])
+    if table == 'announcements':
+        return (row['AnnouncementID'], row['OrgID'], row['CreatedBy'], row['Title'], row['Content'],
+                row['DatePosted'], row['DatePostedTs'])
+    return (row['AnnouncementID'], row['Position'], row['Type'], row['Url'], row['Filename'], row['MimeType'])
+
+
+def load_database(dataset, db=None, chunk_size=None, progress=None):
+    """Insert the dataset into an empty database with chunked executemany; returns {table: row count}.
+
+    Requires an app context. Rows keep their generated ids, the counter,
+    attachment-count and search triggers run as usual, and the home feed is
+    synced at the end. Raises AppError if any target table already has rows.
+    """
+    db = db or get_db()
+    chunk_size = max(1, int(chunk_size or current_app.config.get('IMPORT_CHUNK_SIZE') or DEFAULT_CHUNK_SIZE))
+    for table in TABLES:
+        if db.execute(f'SELECT 1 FROM {table} LIMIT 1').fetchone() is not None:
+            raise AppError('INVALID_REQUEST', f'{table} is not empty; load synthetic data into a new database', log=False)
+    counts = {}
+    try:
+        for table in TABLES:
+            sql = _INSERT_SQL[table]
+            n = 0
+            for chunk in _chunks(dataset.rows(table), chunk_size):
+                if db.in_transaction:
+                    db.commit()
+                db.execute('BEGIN')
+                db.executemany(sql, [_params(table, row) for row in chunk])
+                db.commit()
+                n += len(chunk)
+            counts[table] = n
+            if progress is not None:
+                progress(table, n)
+        for sql in SYNC_SQL:
+            db.execute(sql)
+        db.commit()
+    except sqlite3.DatabaseError as e:
+        db.rollback()
+        current_app.logger.exception('Database error while loading synthetic data')
+        raise AppError('DB_ERROR', 'Could not load synthetic data', original_exception=e)
+    permission_cache.invalidate()
+    current_app.logger.info('Loaded synthetic dataset (seed=%s): %s', dataset.seed, counts)
+    return counts